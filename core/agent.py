@@ -14,6 +14,9 @@ from .prompt_manager import PromptManager
 from .tools import Tool, ToolResponse
 from .execution_context import ExecutionContext, create_default_context
 
+# Checkpoint directories already created in this process
+_checkpoint_dirs = set()
+
 
 class BaseAgent(ABC):
     """
@@ -53,8 +56,11 @@ class BaseAgent(ABC):
         # Load prompts after tools are registered
         self._load_agent_prompt()
 
-        # Ensure checkpoint directory exists
-        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        # Ensure checkpoint directory exists (once per process)
+        checkpoint_dir = self.checkpoint_path.parent.absolute()
+        if checkpoint_dir not in _checkpoint_dirs:
+            checkpoint_dir.mkdir(parents=True, exist_ok=True)
+            _checkpoint_dirs.add(checkpoint_dir)
 
     def _generate_id(self) -> str:
         """Generate unique agent ID"""
@@ -163,7 +169,13 @@ class BaseAgent(ABC):
                 "context": getattr(self, "_last_operation", "Unknown operation"),
             }
 
-        self.checkpoint_path.write_text(json.dumps(checkpoint, indent=2))
+        content = json.dumps(checkpoint, indent=2)
+        try:
+            self.checkpoint_path.write_text(content)
+        except FileNotFoundError:
+            # Directory removed since this process created it
+            self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+            self.checkpoint_path.write_text(content)
 
     def load_checkpoint(self) -> bool:
         """
@@ -6,12 +6,14 @@ Manages agent discovery, execution, and orchestration for the CLI
 import json
 import time
 import importlib
-import inspect
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Type
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type
 from concurrent.futures import ThreadPoolExecutor
 
-from .agent import BaseAgent
+from .agent_manifest import AgentManifest
+
+if TYPE_CHECKING:
+    from .agent import BaseAgent
 
 
 class AgentExecutor:
@@ -22,36 +24,32 @@ class AgentExecutor:
         self.agents_dir = self.project_root / "agents"
         self.orchestration_dir = self.project_root / "orchestration"
         self._agent_cache = {}
+        self.manifest = AgentManifest(self.project_root)
 
-    def discover_agents(self) -> Dict[str, Type[BaseAgent]]:
+    def discover_agents(self) -> Dict[str, Type["BaseAgent"]]:
         """Discover all available agents in the agents directory"""
         agents = {}
 
-        for file in self.agents_dir.glob("*_agent.py"):
-            if file.name.startswith("__"):
-                continue
-
-            module_name = file.stem
-            try:
-                module = importlib.import_module(f"agents.{module_name}")
+        for name in self.manifest.refresh():
+            agent_class = self.load_agent_class(name)
+            if agent_class is not None:
+                agents[name] = agent_class
 
-                for name, obj in inspect.getmembers(module):
-                    if (
-                        inspect.isclass(obj)
-                        and issubclass(obj, BaseAgent)
-                        and obj != BaseAgent
-                        and not name.startswith("_")
-                    ):
-                        agents[name] = obj
+        return agents
 
+    def load_agent_class(self, agent_name: str) -> Optional[Type["BaseAgent"]]:
+        """Import only the module defining an agent and return its class"""
+        if agent_name not in self._agent_cache:
+            try:
+                self._agent_cache[agent_name] = self.manifest.load_class(agent_name)
             except ImportError as e:
-                print(f"⚠️  Could not import {module_name}: {e}")
-
-        return agents
+                print(f"⚠️  Could not import {agent_name}: {e}")
+                return None
+        return self._agent_cache[agent_name]
 
     def list_agents(self, verbose: bool = False) -> List[str]:
         """List all available agents"""
-        agents = self.discover_agents()
+        agents = self.manifest.refresh()
 
         if not agents:
             return []
@@ -60,22 +58,18 @@ class AgentExecutor:
         print("=" * 50)
 
         agent_list = []
-        for name, agent_class in sorted(agents.items()):
+        for name, entry in sorted(agents.items()):
             agent_list.append(name)
 
             if verbose:
                 # Get docstring if available
-                doc = inspect.getdoc(agent_class) or "No description available"
+                doc = entry["docstring"] or "No description available"
                 first_line = doc.split("\n")[0]
                 print(f"\n  🤖 {name}")
                 print(f"     {first_line}")
 
                 # Show available methods
-                methods = [
-                    m
-                    for m in dir(agent_class)
-                    if not m.startswith("_") and callable(getattr(agent_class, m))
-                ]
+                methods = entry["methods"]
                 if methods:
                     print(f"     Methods: {', '.join(methods[:5])}")
             else:
@@ -92,27 +86,22 @@ class AgentExecutor:
         if agent_name.lower() in ["sparky", "sparkyrocketsuit"]:
             agent_name = "IssueOrchestratorAgent"
 
-        agents = self.discover_agents()
+        agents = self.manifest.refresh()
 
         if agent_name not in agents:
             return None
 
-        agent_class = agents[agent_name]
+        entry = agents[agent_name]
 
         print(f"\n🤖 Agent: {agent_name}")
         print("=" * 50)
 
         # Get docstring
-        doc = inspect.getdoc(agent_class) or "No description available"
+        doc = entry["docstring"] or "No description available"
         print(f"\n📝 Description:\n{doc}")
 
         # Get methods
-        methods = []
-        for method_name in dir(agent_class):
-            if not method_name.startswith("_"):
-                method = getattr(agent_class, method_name)
-                if callable(method) and method_name != "execute_task":
-                    methods.append(method_name)
+        methods = [m for m in entry["methods"] if m != "execute_task"]
 
         if methods:
             print("\n🔧 Available Methods:")
@@ -120,8 +109,7 @@ class AgentExecutor:
                 print(f"  • {method}")
 
         # Get init parameters
-        init_signature = inspect.signature(agent_class.__init__)
-        params = [p for p in init_signature.parameters.keys() if p != "self"]
+        params = entry["parameters"]
         if params:
             print("\n⚙️  Initialization Parameters:")
             for param in params:
@@ -131,7 +119,7 @@ class AgentExecutor:
 
         return {
             "name": agent_name,
-            "class": agent_class,
+            "class": self.load_agent_class(agent_name),
             "docstring": doc,
             "methods": methods,
             "parameters": params,
@@ -143,7 +131,7 @@ class AgentExecutor:
         if agent_name.lower() in ["sparky", "sparkyrocketsuit"]:
             agent_name = "IssueOrchestratorAgent"
 
-        agents = self.discover_agents()
+        agents = self.manifest.refresh()
 
         if agent_name not in agents:
             print(f"❌ Agent '{agent_name}' not found")
@@ -155,7 +143,10 @@ class AgentExecutor:
             context_dict = json.loads(context) if context != "{}" else {}
 
             # Instantiate and run agent
-            agent_class = agents[agent_name]
+            agent_class = self.load_agent_class(agent_name)
+            if agent_class is None:
+                print(f"❌ Agent '{agent_name}' could not be loaded")
+                return False
             agent = agent_class()
 
             print(f"📋 Task: {task}")
@@ -0,0 +1,271 @@
+"""
+Agent discovery manifest.
+
+Caches what discovery learns about each agent class (module, docstring,
+init parameters, methods) so listing agents does not import them. Entries
+are keyed by the mtime, size and content hash of every project file the
+class depends on, and only stale entries are rebuilt.
+"""
+
+import hashlib
+import importlib
+import importlib.util
+import inspect
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+MANIFEST_VERSION = 1
+
+
+def _file_hash(path: Path) -> str:
+    """Content hash of a source file"""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class AgentManifest:
+    """
+    Persistent, incrementally rebuilt index of agents in the agents directory.
+
+    Each agent module gets an entry listing the agent classes it exposes and
+    the source files they depend on (the module itself plus every project
+    file in each class's MRO). An entry is rebuilt - by importing only that
+    module - when any of those files changes.
+    """
+
+    def __init__(
+        self, project_root: Path, manifest_path: Path = None, agents_dir: Path = None
+    ):
+        self.project_root = Path(project_root)
+        self.agents_dir = Path(agents_dir or self.project_root / "agents")
+        self.package = self.agents_dir.name
+        # Default to the user cache so the source tree stays clean
+        self.manifest_path = Path(manifest_path or self._default_manifest_path())
+        self._data: Optional[Dict[str, Any]] = None
+        self._checked: Dict[str, bool] = {}
+        self._dirty = False
+
+    def _default_manifest_path(self) -> Path:
+        """Per-project manifest file in the user cache directory"""
+        root_hash = hashlib.sha256(
+            str(self.project_root.resolve()).encode()
+        ).hexdigest()[:12]
+        return (
+            Path.home()
+            / ".cache"
+            / "12factor-agents"
+            / f"discovery-manifest-{root_hash}.json"
+        )
+
+    # Source fingerprints
+
+    def _changed(self, relpath: str) -> bool:
+        """Check whether a source file differs from its recorded fingerprint"""
+        if relpath in self._checked:
+            return self._checked[relpath]
+
+        sources = self._data["sources"]
+        recorded = sources.get(relpath)
+        path = self.project_root / relpath
+        changed = True
+        try:
+            stat = path.stat()
+        except OSError:
+            stat = None
+
+        if stat is not None and recorded is not None:
+            if (
+                recorded["mtime_ns"] == stat.st_mtime_ns
+                and recorded["size"] == stat.st_size
+            ):
+                changed = False
+            elif _file_hash(path) == recorded["sha256"]:
+                # Touched but not modified
+                recorded["mtime_ns"] = stat.st_mtime_ns
+                recorded["size"] = stat.st_size
+                self._dirty = True
+                changed = False
+
+        self._checked[relpath] = changed
+        return changed
+
+    def _record_source(self, relpath: str):
+        """Record the current fingerprint of a source file"""
+        path = self.project_root / relpath
+        try:
+            stat = path.stat()
+            self._data["sources"][relpath] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": _file_hash(path),
+            }
+        except OSError:
+            self._data["sources"].pop(relpath, None)
+
+    def _relpath(self, path: Path) -> Optional[str]:
+        """Path relative to the project root, or None outside it"""
+        try:
+            return str(Path(path).resolve().relative_to(self.project_root.resolve()))
+        except ValueError:
+            return None
+
+    # Loading and saving
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            data = json.loads(self.manifest_path.read_text())
+            if data.get("version") == MANIFEST_VERSION:
+                return data
+        except (OSError, ValueError):
+            pass
+        return {"version": MANIFEST_VERSION, "sources": {}, "modules": {}}
+
+    def _save(self):
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(self._data, indent=2, sort_keys=True))
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            print(f"⚠️  Could not write agent manifest: {e}")
+
+    # Discovery
+
+    def _scan_module(self, module_name: str, relpath: str) -> Dict[str, Any]:
+        """Import one agent module and describe its agent classes"""
+        from .agent import BaseAgent
+
+        try:
+            if module_name in sys.modules:
+                module = importlib.reload(sys.modules[module_name])
+            else:
+                module = importlib.import_module(module_name)
+        except ImportError as e:
+            print(f"⚠️  Could not import {module_name.split('.')[-1]}: {e}")
+            self._record_source(relpath)
+            return {
+                "agents": {},
+                "deps": [relpath],
+                "error": str(e),
+                "missing": getattr(e, "name", None),
+            }
+
+        agents = {}
+        deps = {relpath}
+        for name, obj in inspect.getmembers(module):
+            if (
+                inspect.isclass(obj)
+                and issubclass(obj, BaseAgent)
+                and obj != BaseAgent
+                and not name.startswith("_")
+            ):
+                agents[name] = self.describe(obj)
+                for klass in obj.__mro__:
+                    try:
+                        source = inspect.getsourcefile(klass)
+                    except TypeError:
+                        continue
+                    dep = self._relpath(source) if source else None
+                    if dep:
+                        deps.add(dep)
+
+        for dep in deps:
+            if dep not in self._data["sources"] or self._checked.get(dep, True):
+                self._record_source(dep)
+
+        return {"agents": agents, "deps": sorted(deps)}
+
+    @staticmethod
+    def _dependency_installed(entry: Dict[str, Any]) -> bool:
+        """Check whether a module that failed to import may now succeed"""
+        missing = entry.get("missing")
+        if not missing:
+            return False
+        try:
+            return importlib.util.find_spec(missing.split(".")[0]) is not None
+        except (ImportError, ValueError):
+            return False
+
+    @staticmethod
+    def describe(agent_class) -> Dict[str, Any]:
+        """Manifest entry for an agent class"""
+        init_signature = inspect.signature(agent_class.__init__)
+        return {
+            "module": agent_class.__module__,
+            "docstring": inspect.getdoc(agent_class) or "",
+            "methods": [
+                m
+                for m in dir(agent_class)
+                if not m.startswith("_") and callable(getattr(agent_class, m))
+            ],
+            "parameters": [p for p in init_signature.parameters if p != "self"],
+        }
+
+    def refresh(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Bring the manifest up to date with the agents directory.
+
+        Returns:
+            Agent class name -> manifest entry
+        """
+        self._data = self._load()
+        self._checked = {}
+        self._dirty = False
+        modules = self._data["modules"]
+
+        current = set()
+        for file in sorted(self.agents_dir.glob("*_agent.py")):
+            if file.name.startswith("__"):
+                continue
+            module_name = f"{self.package}.{file.stem}"
+            current.add(module_name)
+
+            entry = modules.get(module_name)
+            if (
+                entry is not None
+                and not any(self._changed(dep) for dep in entry["deps"])
+                and not self._dependency_installed(entry)
+            ):
+                if entry.get("error"):
+                    print(f"⚠️  Could not import {file.stem}: {entry['error']}")
+                continue
+
+            modules[module_name] = self._scan_module(module_name, self._relpath(file))
+            self._dirty = True
+
+        for module_name in set(modules) - current:
+            del modules[module_name]
+            self._dirty = True
+
+        if self._dirty:
+            # Drop fingerprints no entry depends on
+            used = {dep for entry in modules.values() for dep in entry["deps"]}
+            for relpath in set(self._data["sources"]) - used:
+                del self._data["sources"][relpath]
+            self._save()
+
+        return self.agents()
+
+    def agents(self) -> Dict[str, Dict[str, Any]]:
+        """Agent class name -> manifest entry, as of the last refresh"""
+        if self._data is None:
+            return self.refresh()
+
+        agents = {}
+        for module_name in sorted(self._data["modules"]):
+            agents.update(self._data["modules"][module_name]["agents"])
+        return agents
+
+    def names(self) -> List[str]:
+        """Sorted names of all known agents"""
+        return sorted(self.agents())
+
+    def load_class(self, agent_name: str):
+        """Import the module defining an agent and return its class"""
+        entry = self.agents().get(agent_name)
+        if entry is None:
+            return None
+        module = importlib.import_module(entry["module"])
+        return getattr(module, agent_name, None)
@@ -4,10 +4,18 @@ Enables fire-and-forget spawning of 20-30+ agents without blocking the main thre
 """
 
 import asyncio
+import importlib
+import inspect
 import json
+import multiprocessing
 import os
+import pkgutil
+import queue
 import signal
+import sys
+import threading
 import time
+import warnings
 from typing import Dict, List, Any, Optional, Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -15,15 +23,20 @@ from enum import Enum
 from pathlib import Path
 import uuid
 import psutil
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
-from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from collections import OrderedDict, deque
 
 from .base import BaseAgent
 
+# Process-mode agents stream progress to the executor as prefixed stdout lines
+PROGRESS_LINE_PREFIX = "__agent_progress__ "
+PROCESS_LINE_LIMIT = 1024 * 1024  # Longest stdout line read from an agent
+
 
 class BackgroundStatus(Enum):
     """Status of background agent execution"""
 
+    QUEUED = "queued"
     SPAWNING = "spawning"
     RUNNING = "running"
     PAUSED = "paused"
@@ -51,6 +64,13 @@ class ResourceLimits:
     max_execution_time_minutes: int = 60
     max_disk_usage_mb: int = 100
 
+    def cpu_time_limit_seconds(self) -> int:
+        """CPU seconds allowed at max_cpu_percent over the full execution time"""
+        return max(
+            1,
+            int(self.max_cpu_percent / 100 * self.max_execution_time_minutes * 60),
+        )
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "max_memory_mb": self.max_memory_mb,
@@ -60,6 +80,115 @@ class ResourceLimits:
         }
 
 
+def apply_resource_limits(
+    limits: ResourceLimits, cpu_seconds_used: float = 0.0
+) -> Dict[int, tuple]:
+    """
+    Apply per-agent rlimits to the current process
+
+    Sets soft RLIMIT_DATA (memory), RLIMIT_CPU (CPU time budget on top of
+    cpu_seconds_used) and RLIMIT_FSIZE (largest file the agent may write).
+    RLIMIT_DATA bounds heap and private allocations rather than the whole
+    address space, so reserved-but-unused mappings (shared libraries,
+    thread stacks, allocator arenas) do not fail imports.
+    Hard limits are left alone so a warm worker can restore its own limits
+    after each agent.
+
+    Returns:
+        Previous soft/hard limits keyed by resource, for restore_resource_limits
+    """
+    try:
+        import resource
+    except ImportError:
+        return {}  # rlimits are POSIX only
+
+    targets = {
+        resource.RLIMIT_CPU: int(cpu_seconds_used) + limits.cpu_time_limit_seconds(),
+        resource.RLIMIT_FSIZE: limits.max_disk_usage_mb * 1024 * 1024,
+    }
+    if hasattr(resource, "RLIMIT_DATA"):
+        targets[resource.RLIMIT_DATA] = limits.max_memory_mb * 1024 * 1024
+
+    previous = {}
+    for kind, value in targets.items():
+        soft, hard = resource.getrlimit(kind)
+        if hard != resource.RLIM_INFINITY:
+            value = min(value, hard)
+        try:
+            resource.setrlimit(kind, (value, hard))
+            previous[kind] = (soft, hard)
+        except (ValueError, OSError):
+            pass  # Keep running under the existing limit
+
+    return previous
+
+
+def restore_resource_limits(previous: Dict[int, tuple]):
+    """Restore rlimits saved by apply_resource_limits"""
+    import resource
+
+    for kind, limit in previous.items():
+        try:
+            resource.setrlimit(kind, limit)
+        except (ValueError, OSError):
+            pass
+
+
+class CgroupV2Limiter:
+    """
+    Per-agent cgroup v2 limits inside a delegated cgroup subtree
+
+    The root must be a writable cgroup v2 directory with the memory and cpu
+    controllers enabled in its cgroup.subtree_control. Each agent gets its
+    own child cgroup with memory.max and cpu.max.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    @classmethod
+    def detect(cls, root: Optional[Path]) -> Optional["CgroupV2Limiter"]:
+        """Return a limiter if root is a usable cgroup v2 subtree"""
+        if root is None:
+            return None
+
+        root = Path(root)
+        try:
+            controllers = (root / "cgroup.subtree_control").read_text().split()
+        except OSError:
+            return None
+
+        if "memory" not in controllers or "cpu" not in controllers:
+            return None
+        if not os.access(root, os.W_OK):
+            return None
+
+        return cls(root)
+
+    def attach(self, agent_id: str, pid: int, limits: ResourceLimits) -> bool:
+        """Create the agent's cgroup, set its limits and move pid into it"""
+        group = self.root / f"agent-{agent_id}"
+        try:
+            group.mkdir(exist_ok=True)
+            (group / "memory.max").write_text(str(limits.max_memory_mb * 1024 * 1024))
+
+            period = 100000
+            quota = int(limits.max_cpu_percent / 100 * period)
+            (group / "cpu.max").write_text(f"{quota} {period}")
+
+            (group / "cgroup.procs").write_text(str(pid))
+            return True
+        except OSError:
+            return False
+
+    def release(self, agent_id: str):
+        """Remove the agent's cgroup once its processes have exited"""
+        try:
+            (self.root / f"agent-{agent_id}").rmdir()
+        except OSError:
+            pass
+
+
 @dataclass
 class BackgroundAgentInfo:
     """Information about a background agent"""
@@ -77,6 +206,8 @@ class BackgroundAgentInfo:
     error_file: Optional[Path] = None
     progress: float = 0.0
     last_heartbeat: Optional[datetime] = None
+    message: str = ""
+    result: Optional[Dict[str, Any]] = None
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -97,6 +228,8 @@ class BackgroundAgentInfo:
             "last_heartbeat": (
                 self.last_heartbeat.isoformat() if self.last_heartbeat else None
             ),
+            "message": self.message,
+            "result": self.result,
         }
 
 
@@ -108,6 +241,7 @@ class EventBusMessage:
     event_type: str
     data: Dict[str, Any]
     timestamp: datetime = field(default_factory=datetime.now)
+    sequence: Optional[int] = None  # Assigned by EventBus.publish
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -115,52 +249,573 @@ class EventBusMessage:
             "event_type": self.event_type,
             "data": self.data,
             "timestamp": self.timestamp.isoformat(),
+            "sequence": self.sequence,
         }
 
 
 class EventBus:
-    """Simple event bus for agent communication"""
+    """
+    Simple event bus for agent communication
+
+    History is a bounded ring of messages keyed by sequence number, with
+    per-agent and per-event-type indexes so lookups never scan the whole
+    history. Subscriptions may be exact event types, prefixes ending in
+    "*" (e.g. "agent_*"), or "*" for everything.
+    """
 
-    def __init__(self):
+    def __init__(self, max_history: int = 1000):
         self.subscribers: Dict[str, List[Callable]] = {}
-        self.message_history: OrderedDict[str, EventBusMessage] = OrderedDict()
-        self.max_history = 1000
+        self.message_history: OrderedDict[int, EventBusMessage] = OrderedDict()
+        self.max_history = max_history
+        self._by_agent: Dict[str, deque] = {}
+        self._by_event_type: Dict[str, deque] = {}
+        self._prefix_patterns: List[str] = []
+        self._next_sequence = 1
 
     def subscribe(self, event_type: str, callback: Callable):
-        """Subscribe to events of a specific type"""
+        """Subscribe to events of a specific type or "prefix*" pattern"""
         if event_type not in self.subscribers:
             self.subscribers[event_type] = []
+            if event_type.endswith("*"):
+                self._prefix_patterns.append(event_type)
         self.subscribers[event_type].append(callback)
 
+    def unsubscribe(self, event_type: str, callback: Callable) -> bool:
+        """Remove a subscription, returning whether it existed"""
+        callbacks = self.subscribers.get(event_type, [])
+        if callback not in callbacks:
+            return False
+
+        callbacks.remove(callback)
+        if not callbacks:
+            del self.subscribers[event_type]
+            if event_type in self._prefix_patterns:
+                self._prefix_patterns.remove(event_type)
+        return True
+
+    def _matching_callbacks(self, event_type: str) -> List[Callable]:
+        """Collect callbacks for exact and prefix subscriptions"""
+        callbacks = list(self.subscribers.get(event_type, []))
+        for pattern in self._prefix_patterns:
+            if event_type.startswith(pattern[:-1]):
+                callbacks.extend(self.subscribers[pattern])
+        return callbacks
+
     async def publish(self, message: EventBusMessage):
         """Publish an event to all subscribers"""
-        # Store in history
-        message_id = f"{message.agent_id}_{message.timestamp.isoformat()}"
-        self.message_history[message_id] = message
+        # Store in history under a unique sequence number
+        message.sequence = self._next_sequence
+        self._next_sequence += 1
+        self.message_history[message.sequence] = message
+        self._by_agent.setdefault(message.agent_id, deque()).append(message)
+        self._by_event_type.setdefault(message.event_type, deque()).append(message)
 
         # Trim history if needed
-        if len(self.message_history) > self.max_history:
-            self.message_history.popitem(last=False)
+        while len(self.message_history) > self.max_history:
+            _, evicted = self.message_history.popitem(last=False)
+            self._evict_from_index(self._by_agent, evicted.agent_id, evicted)
+            self._evict_from_index(self._by_event_type, evicted.event_type, evicted)
+
+        # Notify subscribers, running async callbacks concurrently
+        async_callbacks = []
+        for callback in self._matching_callbacks(message.event_type):
+            if asyncio.iscoroutinefunction(callback):
+                async_callbacks.append(self._run_async_callback(callback, message))
+                continue
+            try:
+                callback(message)
+            except Exception as e:
+                print(f"Error in event callback: {e}")
 
-        # Notify subscribers
-        if message.event_type in self.subscribers:
-            for callback in self.subscribers[message.event_type]:
-                try:
-                    if asyncio.iscoroutinefunction(callback):
-                        await callback(message)
-                    else:
-                        callback(message)
-                except Exception as e:
-                    print(f"Error in event callback: {e}")
+        if async_callbacks:
+            await asyncio.gather(*async_callbacks)
+
+    @staticmethod
+    async def _run_async_callback(callback: Callable, message: EventBusMessage):
+        """Await one subscriber without letting it fail the others"""
+        try:
+            await callback(message)
+        except Exception as e:
+            print(f"Error in event callback: {e}")
+
+    @staticmethod
+    def _evict_from_index(index: Dict[str, deque], key: str, message: EventBusMessage):
+        """Drop an evicted message, always the oldest entry of its index"""
+        entries = index.get(key)
+        if entries and entries[0] is message:
+            entries.popleft()
+        if not entries:
+            index.pop(key, None)
+
+    @staticmethod
+    def _latest(entries: Optional[deque], limit: int) -> List[EventBusMessage]:
+        """Return the newest entries in chronological order"""
+        if not entries or limit <= 0:
+            return []
+        latest = [entries[-i] for i in range(1, min(limit, len(entries)) + 1)]
+        latest.reverse()
+        return latest
 
     def get_latest_events(
         self, agent_id: str, limit: int = 10
     ) -> List[EventBusMessage]:
         """Get latest events for an agent"""
-        events = [
-            msg for msg in self.message_history.values() if msg.agent_id == agent_id
-        ]
-        return events[-limit:]
+        return self._latest(self._by_agent.get(agent_id), limit)
+
+    def get_latest_events_by_type(
+        self, event_type: str, limit: int = 10
+    ) -> List[EventBusMessage]:
+        """Get latest events of one type across all agents"""
+        return self._latest(self._by_event_type.get(event_type), limit)
+
+    def get_events_since(
+        self, sequence: int, agent_id: str = None
+    ) -> List[EventBusMessage]:
+        """Get events newer than a sequence number, for incremental polling"""
+        if agent_id is not None:
+            entries = self._by_agent.get(agent_id, deque())
+        else:
+            entries = self.message_history.values()
+
+        newer = []
+        for message in reversed(entries):
+            if message.sequence <= sequence:
+                break
+            newer.append(message)
+        newer.reverse()
+        return newer
+
+    @property
+    def last_sequence(self) -> int:
+        """Sequence number of the most recently published event"""
+        return self._next_sequence - 1
+
+
+def _register_module_classes(module, class_cache: Dict[str, type]):
+    """Record every class defined in a module under its class name"""
+    for name, obj in inspect.getmembers(module, inspect.isclass):
+        if obj.__module__ == module.__name__:
+            class_cache.setdefault(name, obj)
+
+
+def _resolve_agent_class(
+    agent_class: str, class_cache: Dict[str, type], scanned_modules: set
+) -> type:
+    """Resolve an agent class name inside a warm worker, importing each module once"""
+    if agent_class in class_cache:
+        return class_cache[agent_class]
+
+    try:
+        import agents
+
+        for module_info in pkgutil.iter_modules(agents.__path__):
+            module_name = f"agents.{module_info.name}"
+            if module_name in scanned_modules:
+                continue
+
+            scanned_modules.add(module_name)
+            try:
+                module = importlib.import_module(module_name)
+            except Exception:
+                continue  # Agents with missing dependencies are skipped
+
+            _register_module_classes(module, class_cache)
+            if agent_class in class_cache:
+                return class_cache[agent_class]
+    except ImportError:
+        pass
+
+    # Unknown classes fall back to the base agent, like the generated scripts
+    return class_cache.setdefault(agent_class, BaseAgent)
+
+
+def _run_warm_agent(
+    message: Dict[str, Any],
+    class_cache: Dict[str, type],
+    scanned_modules: set,
+    report_progress: Callable[[float, str], None],
+) -> Dict[str, Any]:
+    """Execute a single agent request inside a warm worker process"""
+    agent_id = message["agent_id"]
+    output_file = message["output_file"]
+
+    try:
+        report_progress(0.1, "Initializing agent")
+
+        agent_cls = _resolve_agent_class(
+            message["agent_class"], class_cache, scanned_modules
+        )
+        try:
+            agent = agent_cls(agent_id)
+        except TypeError:
+            agent = agent_cls()
+
+        agent.workflow_data = dict(message["workflow_data"])
+        report_progress(0.5, "Executing task")
+
+        if agent_cls.execute_task is BaseAgent.execute_task:
+            # The base agent has no task implementation, mirror the script result
+            outcome = "Task completed successfully"
+            success = True
+        else:
+            outcome = agent.execute_task(message["task"])
+            if inspect.isawaitable(outcome):
+                outcome = asyncio.run(outcome)
+
+            if isinstance(outcome, dict):
+                success = outcome.get("success", True)
+            else:
+                success = getattr(outcome, "success", True)
+                outcome = (
+                    outcome.to_dict()
+                    if hasattr(outcome, "to_dict")
+                    else (outcome.__dict__ if hasattr(outcome, "__dict__") else outcome)
+                )
+
+        result = {
+            "success": bool(success),
+            "agent_id": agent_id,
+            "task": message["task"],
+            "result": outcome,
+            "completed_at": datetime.now().isoformat(),
+        }
+
+        with open(output_file, "w") as f:
+            json.dump(result, f, default=str)
+
+        report_progress(1.0, "Task completed")
+
+        return {
+            "return_code": 0 if success else 1,
+            "stdout": "",
+            "stderr": "",
+            "success": bool(success),
+            "result": outcome,
+        }
+
+    except Exception as e:
+        import traceback
+
+        error_data = {
+            "error": str(e),
+            "traceback": traceback.format_exc(),
+            "agent_id": agent_id,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+        try:
+            with open(message["error_file"], "w") as f:
+                json.dump(error_data, f)
+        except OSError:
+            pass
+
+        return {
+            "return_code": 1,
+            "stdout": "",
+            "stderr": str(e),
+            "success": False,
+            "exception": True,
+        }
+
+
+def _warm_worker_main(conn, preload_modules: List[str]):
+    """Entry point of a warm worker: import once, then serve agent requests"""
+    class_cache: Dict[str, type] = {"BaseAgent": BaseAgent}
+    scanned_modules: set = set()
+
+    for module_name in preload_modules:
+        try:
+            _register_module_classes(importlib.import_module(module_name), class_cache)
+            scanned_modules.add(module_name)
+        except Exception:
+            pass
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+
+        if message is None:
+            break
+
+        def report_progress(progress: float, text: str):
+            conn.send(("progress", (progress, text)))
+
+        # CPU time accumulates across agents, so budget on top of usage so far
+        usage = os.times()
+        previous_limits = apply_resource_limits(
+            ResourceLimits(**message["resource_limits"]),
+            cpu_seconds_used=usage.user + usage.system,
+        )
+        try:
+            result = _run_warm_agent(
+                message, class_cache, scanned_modules, report_progress
+            )
+        finally:
+            restore_resource_limits(previous_limits)
+
+        conn.send(("result", result))
+
+
+class WarmWorkerPool:
+    """
+    Persistent pool of pre-started worker processes for background agents
+
+    Workers import the framework once at startup and then take
+    (agent_class, task, workflow_data) messages over a pipe, so spawning an
+    agent costs a message send instead of two process launches. Progress and
+    results stream back over the same pipe.
+    """
+
+    def __init__(self, size: int, preload_modules: List[str] = None):
+        """
+        Initialize worker pool
+
+        Args:
+            size: Number of worker processes
+            preload_modules: Modules whose agent classes workers import at startup
+        """
+        self.size = max(1, size)
+        self.preload_modules = list(preload_modules or [])
+        # Pre-fork where possible so workers inherit already-imported modules
+        start_method = (
+            "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        )
+        self._context = multiprocessing.get_context(start_method)
+        self._jobs: queue.Queue = queue.Queue()
+        self._workers: List[Any] = []
+        self._dispatchers: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._running: Dict[str, int] = {}  # agent_id -> worker slot
+        self._started = False
+        self._closed = False
+        self.jobs_completed = 0
+        self.worker_restarts = 0
+
+    def start(self):
+        """Start worker processes and their dispatcher threads"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+
+            for slot in range(self.size):
+                self._workers.append(self._start_worker())
+
+            for slot in range(self.size):
+                thread = threading.Thread(
+                    target=self._dispatch_loop,
+                    args=(slot,),
+                    name=f"warm-worker-{slot}",
+                    daemon=True,
+                )
+                self._dispatchers.append(thread)
+                thread.start()
+
+    def _start_worker(self):
+        """Launch a single worker process connected by a pipe"""
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_warm_worker_main,
+            args=(child_conn, self.preload_modules),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return process, parent_conn
+
+    def _restart_worker(self, slot: int):
+        """Replace a dead or stuck worker"""
+        process, conn = self._workers[slot]
+        if process.is_alive():
+            process.kill()
+        process.join()
+        conn.close()
+
+        if not self._closed:
+            worker = self._start_worker()
+            with self._lock:
+                self._workers[slot] = worker
+                self.worker_restarts += 1
+
+    def submit(
+        self,
+        agent_info: "BackgroundAgentInfo",
+        on_progress: Optional[Callable[[float, str], None]] = None,
+    ) -> Future:
+        """
+        Queue an agent for execution on the next idle worker
+
+        Args:
+            agent_info: Agent to execute
+            on_progress: Called from a dispatcher thread for each progress message
+
+        Returns:
+            Future resolved with the execution result
+        """
+        if self._closed:
+            raise RuntimeError("Worker pool is shut down")
+
+        self.start()
+        future = Future()
+        self._jobs.put((agent_info, future, on_progress))
+        return future
+
+    def cancel(self, agent_id: str) -> bool:
+        """
+        Stop an agent running on a worker
+
+        The worker is killed only while it is still running that agent; its
+        dispatcher then sees the closed pipe and starts a fresh worker.
+
+        Returns:
+            True if the agent was running on a worker
+        """
+        with self._lock:
+            slot = self._running.pop(agent_id, None)
+            if slot is None:
+                return False
+            process = self._workers[slot][0]
+            if process.is_alive():
+                process.kill()
+        return True
+
+    def _dispatch_loop(self, slot: int):
+        """Feed queued agents to one worker and collect its results"""
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+
+            agent_info, future, on_progress = job
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            if not self._workers[slot][0].is_alive():
+                self._restart_worker(slot)  # Died while idle
+
+            process, conn = self._workers[slot]
+            agent_info.process_id = process.pid
+            with self._lock:
+                self._running[agent_info.agent_id] = slot
+            timeout = agent_info.resource_limits.max_execution_time_minutes * 60
+
+            try:
+                conn.send(
+                    {
+                        "agent_id": agent_info.agent_id,
+                        "agent_class": agent_info.agent_class,
+                        "task": agent_info.task,
+                        "workflow_data": agent_info.workflow_data,
+                        "output_file": str(agent_info.output_file),
+                        "error_file": str(agent_info.error_file),
+                        "resource_limits": agent_info.resource_limits.to_dict(),
+                    }
+                )
+
+                result = self._collect_result(conn, timeout, on_progress)
+                if result is None:
+                    self._restart_worker(slot)
+                    result = {
+                        "return_code": -1,
+                        "stdout": "",
+                        "stderr": "Process timeout exceeded",
+                        "success": False,
+                        "timeout": True,
+                    }
+
+            except (EOFError, OSError) as e:
+                self._restart_worker(slot)
+                result = {
+                    "return_code": process.exitcode or -1,
+                    "stdout": "",
+                    "stderr": f"Worker process exited: {e or 'connection closed'}",
+                    "success": False,
+                    "exception": True,
+                }
+
+            agent_info.process_id = None
+            with self._lock:
+                self._running.pop(agent_info.agent_id, None)
+                self.jobs_completed += 1
+            future.set_result(result)
+
+    @staticmethod
+    def _collect_result(
+        conn, timeout: float, on_progress: Optional[Callable[[float, str], None]]
+    ) -> Optional[Dict[str, Any]]:
+        """Relay progress messages until the result arrives or the timeout expires"""
+        deadline = time.monotonic() + timeout
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not conn.poll(remaining):
+                return None
+
+            kind, payload = conn.recv()
+            if kind == "result":
+                return payload
+
+            if on_progress:
+                try:
+                    on_progress(*payload)
+                except Exception as e:
+                    print(f"Error in progress callback: {e}")
+
+    def shutdown(self, wait: bool = True):
+        """Stop dispatchers and worker processes, cancelling queued agents"""
+        self._closed = True
+
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job[1].cancel()
+
+        for _ in self._dispatchers:
+            self._jobs.put(None)
+
+        if wait:
+            for thread in self._dispatchers:
+                thread.join()
+
+        for process, conn in self._workers:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+
+            process.join(timeout=1.0 if wait else 0)
+            if process.is_alive():
+                process.kill()
+                process.join()
+            conn.close()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get worker pool statistics"""
+        with self._lock:
+            return {
+                "size": self.size,
+                "alive_workers": sum(
+                    1 for process, _ in self._workers if process.is_alive()
+                ),
+                "queued_jobs": self._jobs.qsize(),
+                "jobs_completed": self.jobs_completed,
+                "worker_restarts": self.worker_restarts,
+            }
+
+
+@dataclass
+class QueuedSpawn:
+    """Spawn request waiting in the admission queue"""
+
+    agent_info: BackgroundAgentInfo
+    execution_mode: str
+    priority: int
+    enqueued_at: float = field(default_factory=time.monotonic)
 
 
 class BackgroundAgentExecutor:
@@ -169,14 +824,34 @@ class BackgroundAgentExecutor:
     fire-and-forget parallel processing pattern
     """
 
-    def __init__(self, max_parallel_agents: int = 30, temp_dir: Path = None):
+    def __init__(
+        self,
+        max_parallel_agents: int = 30,
+        temp_dir: Path = None,
+        worker_pool_size: int = None,
+        preload_agent_modules: List[str] = None,
+        max_queue_depth: int = 0,
+        admission_policy: str = "reject",
+        cgroup_root: Path = None,
+    ):
         """
         Initialize background executor
 
         Args:
             max_parallel_agents: Maximum concurrent agents
             temp_dir: Directory for temporary files
+            worker_pool_size: Warm worker processes for "pool" mode
+                (defaults to max_parallel_agents)
+            preload_agent_modules: Agent modules warm workers import at startup
+            max_queue_depth: Spawns that may wait for a free slot (0 disables queueing)
+            admission_policy: "reject" raises when the queue is full,
+                "wait" blocks the caller until there is room
+            cgroup_root: Delegated cgroup v2 directory for per-agent memory/CPU
+                limits in process mode (rlimits are always applied)
         """
+        if admission_policy not in ("reject", "wait"):
+            raise ValueError(f"Unknown admission policy: {admission_policy}")
+
         self.max_parallel_agents = max_parallel_agents
         self.temp_dir = temp_dir or Path("/tmp/background_agents")
         self.temp_dir.mkdir(parents=True, exist_ok=True)
@@ -185,9 +860,29 @@ class BackgroundAgentExecutor:
         self.active_agents: Dict[str, BackgroundAgentInfo] = {}
         self.completed_agents: Dict[str, BackgroundAgentInfo] = {}
 
+        # Completion futures for active agents, resolved on the event loop
+        self._completion_futures: Dict[str, asyncio.Future] = {}
+
+        # Admission queue: FIFO per priority level, higher priority first
+        self.max_queue_depth = max_queue_depth
+        self.admission_policy = admission_policy
+        self.fairness_interval = 4  # Every Nth admission goes to the oldest waiter
+        self.queued_agents: Dict[str, BackgroundAgentInfo] = {}
+        self._admission_queue: Dict[int, deque] = {}
+        self._admissions_since_fair = 0
+        self._admission_changed: Optional[asyncio.Event] = None
+        self._queue_wait_times: deque = deque(maxlen=1000)
+        self.admitted_from_queue = 0
+        self.rejected_spawns = 0
+
         # Executors for different types of background work
-        self.process_executor = ProcessPoolExecutor(max_workers=max_parallel_agents)
         self.thread_executor = ThreadPoolExecutor(max_workers=max_parallel_agents * 2)
+        self._process_executor: Optional[ProcessPoolExecutor] = None
+
+        # Warm worker pool, started on first "pool" spawn or start_worker_pool()
+        self.worker_pool_size = worker_pool_size or max_parallel_agents
+        self.preload_agent_modules = preload_agent_modules or []
+        self.worker_pool: Optional[WarmWorkerPool] = None
 
         # Event bus for communication
         self.event_bus = EventBus()
@@ -195,6 +890,9 @@ class BackgroundAgentExecutor:
         # Resource monitoring
         self.resource_monitor_task = None
         self.monitor_interval = 5.0  # seconds
+        self.cgroup_limiter = CgroupV2Limiter.detect(cgroup_root)
+        self.resource_samples: Dict[str, Dict[str, Any]] = {}
+        self._process_handles: Dict[int, psutil.Process] = {}
 
         # Cleanup settings
         self.max_completed_history = 100
@@ -203,11 +901,42 @@ class BackgroundAgentExecutor:
         # Start background tasks
         self._start_background_tasks()
 
+    @property
+    def process_executor(self) -> ProcessPoolExecutor:
+        """
+        Deprecated: process mode runs agent scripts directly and "pool" mode
+        uses the warm worker pool. Created on first access for old callers.
+        """
+        warnings.warn(
+            "BackgroundAgentExecutor.process_executor is deprecated; use "
+            'execution_mode="process" or "pool"',
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        if self._process_executor is None:
+            self._process_executor = ProcessPoolExecutor(
+                max_workers=self.max_parallel_agents
+            )
+        return self._process_executor
+
     def _start_background_tasks(self):
         """Start background monitoring and cleanup tasks"""
-        if asyncio.get_event_loop().is_running():
-            asyncio.create_task(self._resource_monitor_loop())
-            asyncio.create_task(self._cleanup_loop())
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No running loop, e.g. constructed from synchronous code
+
+        asyncio.create_task(self._resource_monitor_loop())
+        asyncio.create_task(self._cleanup_loop())
+
+    def start_worker_pool(self) -> "WarmWorkerPool":
+        """Start warm worker processes ahead of the first "pool" spawn"""
+        if self.worker_pool is None:
+            self.worker_pool = WarmWorkerPool(
+                self.worker_pool_size, preload_modules=self.preload_agent_modules
+            )
+        self.worker_pool.start()
+        return self.worker_pool
 
     async def spawn_background_agent(
         self,
@@ -216,25 +945,38 @@ class BackgroundAgentExecutor:
         workflow_data: Dict[str, Any] = None,
         resource_limits: ResourceLimits = None,
         execution_mode: str = "process",
+        priority: int = 5,
     ) -> str:
         """
         Spawn agent in background (fire-and-forget)
 
+        When all slots are busy the spawn is queued and starts automatically
+        once a slot frees up. If the queue is full it is rejected or waits,
+        depending on the admission policy.
+
         Args:
             agent_class: Class name of agent to spawn
             task: Task for agent to execute
             workflow_data: Initial workflow data
             resource_limits: Resource constraints
-            execution_mode: "process" or "thread"
+            execution_mode: "process", "pool" (warm workers) or "thread"
+            priority: Admission priority when queued (higher starts first)
 
         Returns:
             Agent ID for tracking
         """
-        # Check capacity
-        if len(self.active_agents) >= self.max_parallel_agents:
-            raise RuntimeError(
-                f"Maximum parallel agents ({self.max_parallel_agents}) exceeded"
-            )
+        if execution_mode not in ("process", "pool", "thread"):
+            raise ValueError(f"Unknown execution mode: {execution_mode}")
+
+        # Check capacity, waiting for room if the policy allows it
+        while not self._has_free_slot() and not self._has_queue_room():
+            if self.admission_policy == "reject":
+                self.rejected_spawns += 1
+                raise RuntimeError(
+                    f"Maximum parallel agents ({self.max_parallel_agents}) exceeded"
+                    f" and admission queue is full ({self.max_queue_depth})"
+                )
+            await self._wait_for_admission_change()
 
         # Generate unique agent ID
         agent_id = f"{agent_class}_{uuid.uuid4().hex[:8]}"
@@ -257,43 +999,176 @@ class BackgroundAgentExecutor:
             output_file=self.temp_dir / f"{agent_id}_output.json",
             error_file=self.temp_dir / f"{agent_id}_error.json",
         )
+        self._completion_futures[agent_id] = asyncio.get_running_loop().create_future()
+
+        if self._has_free_slot():
+            self.active_agents[agent_id] = agent_info
+            await self._start_agent(agent_info, execution_mode)
+        else:
+            await self._enqueue_agent(agent_info, execution_mode, priority)
 
-        # Store agent info
-        self.active_agents[agent_id] = agent_info
+        return agent_id
+
+    def _has_free_slot(self) -> bool:
+        """Whether a spawn can start now without jumping the queue"""
+        return (
+            len(self.active_agents) < self.max_parallel_agents
+            and not self.queued_agents
+        )
 
+    def _has_queue_room(self) -> bool:
+        """Whether the admission queue can take another spawn"""
+        return len(self.queued_agents) < self.max_queue_depth
+
+    async def _wait_for_admission_change(self):
+        """Wait until a slot frees up or a queued spawn is admitted"""
+        if self._admission_changed is None:
+            self._admission_changed = asyncio.Event()
+        await self._admission_changed.wait()
+
+    def _signal_admission_change(self):
+        """Wake spawns blocked by the "wait" admission policy"""
+        if self._admission_changed is not None:
+            self._admission_changed.set()
+            self._admission_changed = None
+
+    async def _enqueue_agent(
+        self, agent_info: BackgroundAgentInfo, execution_mode: str, priority: int
+    ):
+        """Park a spawn in the admission queue until a slot frees up"""
+        agent_info.status = BackgroundStatus.QUEUED
+        self.queued_agents[agent_info.agent_id] = agent_info
+        self._admission_queue.setdefault(priority, deque()).append(
+            QueuedSpawn(agent_info, execution_mode, priority)
+        )
+
+        await self.event_bus.publish(
+            EventBusMessage(
+                agent_id=agent_info.agent_id,
+                event_type="agent_queued",
+                data={
+                    "priority": priority,
+                    "queue_depth": len(self.queued_agents),
+                },
+            )
+        )
+
+    def _dequeue_next(self) -> Optional[QueuedSpawn]:
+        """Pop the next spawn: highest priority, with periodic oldest-first turns"""
+        levels = [level for level, entries in self._admission_queue.items() if entries]
+        if not levels:
+            return None
+
+        self._admissions_since_fair += 1
+        if self._admissions_since_fair >= self.fairness_interval:
+            # Let the longest waiter through so low priorities cannot starve
+            self._admissions_since_fair = 0
+            level = min(
+                levels, key=lambda lvl: self._admission_queue[lvl][0].enqueued_at
+            )
+        else:
+            level = max(levels)
+
+        entry = self._admission_queue[level].popleft()
+        if not self._admission_queue[level]:
+            del self._admission_queue[level]
+
+        return entry
+
+    def _admit_queued_agents(self):
+        """Start queued spawns while slots are free (runs on the event loop)"""
+        while len(self.active_agents) < self.max_parallel_agents:
+            entry = self._dequeue_next()
+            if entry is None:
+                break
+
+            agent_info = entry.agent_info
+            self.queued_agents.pop(agent_info.agent_id, None)
+            self._queue_wait_times.append(time.monotonic() - entry.enqueued_at)
+            self.admitted_from_queue += 1
+
+            # Execution time limits count from admission, not from enqueue
+            agent_info.status = BackgroundStatus.SPAWNING
+            agent_info.started_at = datetime.now()
+            self.active_agents[agent_info.agent_id] = agent_info
+
+            asyncio.ensure_future(self._start_agent(agent_info, entry.execution_mode))
+
+        self._signal_admission_change()
+
+    def _remove_from_queue(self, agent_id: str) -> Optional[BackgroundAgentInfo]:
+        """Drop a queued spawn before it starts"""
+        agent_info = self.queued_agents.pop(agent_id, None)
+        if agent_info is None:
+            return None
+
+        for level, entries in list(self._admission_queue.items()):
+            for entry in entries:
+                if entry.agent_info.agent_id == agent_id:
+                    entries.remove(entry)
+                    break
+            if not entries:
+                del self._admission_queue[level]
+
+        self._signal_admission_change()
+        return agent_info
+
+    async def _start_agent(self, agent_info: BackgroundAgentInfo, execution_mode: str):
+        """Start an admitted agent in its execution mode"""
         # Spawn based on execution mode
         if execution_mode == "process":
             await self._spawn_process_agent(agent_info)
-        elif execution_mode == "thread":
-            await self._spawn_thread_agent(agent_info)
+        elif execution_mode == "pool":
+            await self._spawn_pool_agent(agent_info)
         else:
-            raise ValueError(f"Unknown execution mode: {execution_mode}")
+            await self._spawn_thread_agent(agent_info)
 
         # Publish spawn event
         await self.event_bus.publish(
             EventBusMessage(
-                agent_id=agent_id,
+                agent_id=agent_info.agent_id,
                 event_type="agent_spawned",
                 data={
-                    "agent_class": agent_class,
-                    "task": task,
+                    "agent_class": agent_info.agent_class,
+                    "task": agent_info.task,
                     "execution_mode": execution_mode,
-                    "resource_limits": resource_limits.to_dict(),
+                    "resource_limits": agent_info.resource_limits.to_dict(),
                 },
             )
         )
 
-        return agent_id
-
     async def _spawn_process_agent(self, agent_info: BackgroundAgentInfo):
         """Spawn agent in separate process"""
         try:
             # Create agent execution script
             script_path = await self._create_agent_script(agent_info)
 
-            # Submit to process executor
-            future = self.process_executor.submit(
-                self._execute_agent_script, str(script_path), agent_info.resource_limits
+            # Launch directly so the child PID is known for limits and sampling
+            env = os.environ.copy()
+            env["PYTHONPATH"] = os.pathsep.join(sys.path)
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                str(script_path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+                limit=PROCESS_LINE_LIMIT,
+            )
+            agent_info.process_id = process.pid
+
+            if self.cgroup_limiter:
+                self.cgroup_limiter.attach(
+                    agent_info.agent_id, process.pid, agent_info.resource_limits
+                )
+
+            future = asyncio.ensure_future(
+                self._wait_for_agent_process(
+                    process,
+                    agent_info.resource_limits,
+                    lambda progress, message: self._apply_progress(
+                        agent_info, progress, message
+                    ),
+                )
             )
 
             # Update status
@@ -306,13 +1181,84 @@ class BackgroundAgentExecutor:
         except Exception as e:
             agent_info.status = BackgroundStatus.FAILED
             await self._write_error(agent_info, f"Failed to spawn process: {e}")
+            self._finalize_agent(agent_info)
+
+    async def _spawn_pool_agent(self, agent_info: BackgroundAgentInfo):
+        """Spawn agent on a warm worker process"""
+        try:
+            future = self.start_worker_pool().submit(
+                agent_info, on_progress=self._progress_reporter(agent_info)
+            )
+
+            # Update status
+            agent_info.status = BackgroundStatus.RUNNING
+            agent_info.last_heartbeat = datetime.now()
+
+            # Monitor completion without blocking
+            asyncio.create_task(self._monitor_agent_completion(agent_info, future))
+
+        except Exception as e:
+            agent_info.status = BackgroundStatus.FAILED
+            await self._write_error(agent_info, f"Failed to submit to worker pool: {e}")
+            self._finalize_agent(agent_info)
+
+    def _progress_reporter(
+        self, agent_info: BackgroundAgentInfo
+    ) -> Callable[[float, str], None]:
+        """Create a thread-safe callback that applies progress on the event loop"""
+        loop = asyncio.get_running_loop()
+
+        def report(progress: float, message: str = ""):
+            loop.call_soon_threadsafe(
+                self._apply_progress, agent_info, progress, message
+            )
+
+        return report
+
+    def _apply_progress(
+        self, agent_info: BackgroundAgentInfo, progress: float, message: str
+    ):
+        """Update agent progress in place (runs on the event loop)"""
+        agent_info.progress = progress
+        agent_info.message = message
+        agent_info.last_heartbeat = datetime.now()
+
+        asyncio.ensure_future(
+            self.event_bus.publish(
+                EventBusMessage(
+                    agent_id=agent_info.agent_id,
+                    event_type="agent_progress",
+                    data={"progress": progress, "message": message},
+                )
+            )
+        )
+
+    def _finalize_agent(self, agent_info: BackgroundAgentInfo):
+        """Move an agent to completed and resolve its completion future"""
+        agent_info.completed_at = agent_info.completed_at or datetime.now()
+
+        self.completed_agents[agent_info.agent_id] = agent_info
+        self.active_agents.pop(agent_info.agent_id, None)
+        self.resource_samples.pop(agent_info.agent_id, None)
+
+        if self.cgroup_limiter:
+            self.cgroup_limiter.release(agent_info.agent_id)
+
+        future = self._completion_futures.pop(agent_info.agent_id, None)
+        if future and not future.done():
+            future.set_result(agent_info.status)
+
+        # A slot freed up, start whatever is waiting for it
+        self._admit_queued_agents()
 
     async def _spawn_thread_agent(self, agent_info: BackgroundAgentInfo):
         """Spawn agent in thread (for I/O bound tasks)"""
         try:
             # Submit to thread executor
             future = self.thread_executor.submit(
-                self._execute_agent_in_thread, agent_info
+                self._execute_agent_in_thread,
+                agent_info,
+                self._progress_reporter(agent_info),
             )
 
             # Update status
@@ -325,6 +1271,7 @@ class BackgroundAgentExecutor:
         except Exception as e:
             agent_info.status = BackgroundStatus.FAILED
             await self._write_error(agent_info, f"Failed to spawn thread: {e}")
+            self._finalize_agent(agent_info)
 
     async def _create_agent_script(self, agent_info: BackgroundAgentInfo) -> Path:
         """Create Python script for agent execution"""
@@ -345,20 +1292,16 @@ from pathlib import Path
 # Add framework to path
 sys.path.insert(0, "{os.path.dirname(os.path.dirname(os.path.abspath(__file__)))}")
 
+# Enforce memory, CPU time and file size limits for this agent
+from core.background_executor import ResourceLimits, apply_resource_limits
+apply_resource_limits(ResourceLimits(**{json.dumps(agent_info.resource_limits.to_dict())}))
+
 def update_progress(progress, message=""):
-    """Update progress file"""
-    progress_file = Path("{agent_info.output_file}")
-    progress_data = {{
-        "agent_id": "{agent_info.agent_id}",
-        "progress": progress,
-        "message": message,
-        "timestamp": datetime.now().isoformat(),
-        "status": "running"
-    }}
-    
+    """Stream progress to the executor over stdout"""
+    progress_data = {{"progress": progress, "message": message}}
+
     try:
-        with open(progress_file, 'w') as f:
-            json.dump(progress_data, f)
+        print({PROGRESS_LINE_PREFIX!r} + json.dumps(progress_data), flush=True)
     except:
         pass  # Don't fail on progress updates
 
@@ -429,6 +1372,62 @@ if __name__ == "__main__":
         script_path.chmod(0o755)
         return script_path
 
+    @staticmethod
+    async def _wait_for_agent_process(
+        process: asyncio.subprocess.Process,
+        resource_limits: ResourceLimits,
+        on_progress: Optional[Callable[[float, str], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Wait for an agent script process, killing it at the time limit
+
+        Progress lines on the child's stdout are passed to on_progress as
+        they arrive and left out of the captured stdout.
+        """
+
+        async def read_stdout() -> bytes:
+            output = []
+            async for line in process.stdout:
+                if not line.startswith(PROGRESS_LINE_PREFIX.encode()):
+                    output.append(line)
+                    continue
+                try:
+                    update = json.loads(line[len(PROGRESS_LINE_PREFIX) :])
+                except ValueError:
+                    output.append(line)
+                    continue
+                if on_progress:
+                    on_progress(update["progress"], update.get("message", ""))
+            return b"".join(output)
+
+        async def communicate():
+            stdout, stderr = await asyncio.gather(read_stdout(), process.stderr.read())
+            await process.wait()
+            return stdout, stderr
+
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                communicate(),
+                timeout=resource_limits.max_execution_time_minutes * 60,
+            )
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return {
+                "return_code": -1,
+                "stdout": "",
+                "stderr": "Process timeout exceeded",
+                "success": False,
+                "timeout": True,
+            }
+
+        return {
+            "return_code": process.returncode,
+            "stdout": stdout.decode(errors="replace"),
+            "stderr": stderr.decode(errors="replace"),
+            "success": process.returncode == 0,
+        }
+
     @staticmethod
     def _execute_agent_script(
         script_path: str, resource_limits: ResourceLimits
@@ -475,7 +1474,9 @@ if __name__ == "__main__":
             }
 
     def _execute_agent_in_thread(
-        self, agent_info: BackgroundAgentInfo
+        self,
+        agent_info: BackgroundAgentInfo,
+        report_progress: Optional[Callable[[float, str], None]] = None,
     ) -> Dict[str, Any]:
         """Execute agent in thread (simplified version)"""
         try:
@@ -496,6 +1497,9 @@ if __name__ == "__main__":
             with open(agent_info.output_file, "w") as f:
                 json.dump(progress_data, f)
 
+            if report_progress:
+                report_progress(1.0, progress_data["message"])
+
             return {"success": True, "mode": "thread"}
 
         except Exception as e:
@@ -513,52 +1517,45 @@ if __name__ == "__main__":
     async def _monitor_agent_completion(self, agent_info: BackgroundAgentInfo, future):
         """Monitor agent completion without blocking"""
         try:
-            # Wait for completion in background
-            def completion_callback():
-                try:
-                    result = future.result()
-                    if result.get("success", False):
-                        agent_info.status = BackgroundStatus.COMPLETED
-                    else:
-                        agent_info.status = BackgroundStatus.FAILED
-
-                    agent_info.completed_at = datetime.now()
-
-                    # Move to completed agents
-                    self.completed_agents[agent_info.agent_id] = agent_info
-                    if agent_info.agent_id in self.active_agents:
-                        del self.active_agents[agent_info.agent_id]
-
-                    # Publish completion event
-                    asyncio.create_task(
-                        self.event_bus.publish(
-                            EventBusMessage(
-                                agent_id=agent_info.agent_id,
-                                event_type="agent_completed",
-                                data={
-                                    "status": agent_info.status.value,
-                                    "result": result,
-                                },
-                            )
-                        )
-                    )
-
-                except Exception as e:
-                    agent_info.status = BackgroundStatus.CRASHED
-                    agent_info.completed_at = datetime.now()
-
-                    asyncio.create_task(
-                        self._write_error(agent_info, f"Agent crashed: {e}")
-                    )
-
-            # Use asyncio to wait for future completion
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None, lambda: future.add_done_callback(lambda f: completion_callback())
+            # Await the executor future on the event loop instead of a helper thread
+            result = await asyncio.wrap_future(future)
+
+            if agent_info.status == BackgroundStatus.TERMINATED:
+                return  # Already finalized by terminate_agent
+
+            if result.get("success", False):
+                agent_info.status = BackgroundStatus.COMPLETED
+                agent_info.progress = 1.0
+            else:
+                agent_info.status = BackgroundStatus.FAILED
+
+            agent_info.result = result
+            agent_info.completed_at = datetime.now()
+
+            # Move to completed agents
+            self._finalize_agent(agent_info)
+
+            # Publish completion event
+            await self.event_bus.publish(
+                EventBusMessage(
+                    agent_id=agent_info.agent_id,
+                    event_type="agent_completed",
+                    data={
+                        "status": agent_info.status.value,
+                        "result": result,
+                    },
+                )
             )
 
         except Exception as e:
-            print(f"Error monitoring agent completion: {e}")
+            if agent_info.status == BackgroundStatus.TERMINATED:
+                return
+
+            agent_info.status = BackgroundStatus.CRASHED
+            agent_info.completed_at = datetime.now()
+
+            await self._write_error(agent_info, f"Agent crashed: {e}")
+            self._finalize_agent(agent_info)
 
     async def _write_error(self, agent_info: BackgroundAgentInfo, error_message: str):
         """Write error information to file"""
@@ -588,21 +1585,32 @@ if __name__ == "__main__":
         if agent_id in self.active_agents:
             agent_info = self.active_agents[agent_id]
 
-            # Try to read progress file
-            progress_data = await self._read_progress_file(agent_info)
-
             return {
                 "agent_id": agent_id,
                 "status": agent_info.status.value,
                 "started_at": agent_info.started_at.isoformat(),
-                "progress": progress_data.get("progress", agent_info.progress),
-                "message": progress_data.get("message", ""),
+                "progress": agent_info.progress,
+                "message": agent_info.message,
                 "last_heartbeat": (
                     agent_info.last_heartbeat.isoformat()
                     if agent_info.last_heartbeat
                     else None
                 ),
-                "resource_usage": await self._get_resource_usage(agent_info),
+                "resource_usage": (
+                    self.resource_samples.get(agent_id)
+                    or await self._get_resource_usage(agent_info)
+                ),
+            }
+
+        # Check queued agents
+        if agent_id in self.queued_agents:
+            agent_info = self.queued_agents[agent_id]
+            return {
+                "agent_id": agent_id,
+                "status": agent_info.status.value,
+                "started_at": agent_info.started_at.isoformat(),
+                "progress": 0.0,
+                "message": "Waiting for a free slot",
             }
 
         # Check completed agents
@@ -622,21 +1630,30 @@ if __name__ == "__main__":
                     if agent_info.status == BackgroundStatus.COMPLETED
                     else agent_info.progress
                 ),
+                "message": agent_info.message,
+                "result": agent_info.result,
             }
 
         return None
 
-    async def _read_progress_file(
-        self, agent_info: BackgroundAgentInfo
-    ) -> Dict[str, Any]:
-        """Read progress file if it exists"""
-        try:
-            if agent_info.output_file and agent_info.output_file.exists():
-                with open(agent_info.output_file, "r") as f:
-                    return json.load(f)
-        except:
-            pass
-        return {}
+    async def wait_for_agent(
+        self, agent_id: str, timeout: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Wait for an agent to finish without polling
+
+        Args:
+            agent_id: Agent to wait for
+            timeout: Maximum seconds to wait (raises asyncio.TimeoutError)
+
+        Returns:
+            Final agent status, or None if the agent is unknown
+        """
+        future = self._completion_futures.get(agent_id)
+        if future is not None:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+
+        return await self.get_agent_status(agent_id)
 
     async def _get_resource_usage(
         self, agent_info: BackgroundAgentInfo
@@ -645,38 +1662,81 @@ if __name__ == "__main__":
         if not agent_info.process_id:
             return {}
 
+        return self._read_process_usage(agent_info.process_id)
+
+    def _read_process_usage(self, pid: int) -> Dict[str, Any]:
+        """Read usage through a cached handle so cpu_percent spans samples"""
         try:
-            process = psutil.Process(agent_info.process_id)
-            return {
-                "cpu_percent": process.cpu_percent(),
-                "memory_mb": process.memory_info().rss / (1024 * 1024),
-                "num_threads": process.num_threads(),
-            }
+            process = self._process_handles.get(pid)
+            if process is None:
+                process = self._process_handles[pid] = psutil.Process(pid)
+
+            with process.oneshot():
+                return {
+                    "cpu_percent": process.cpu_percent(),
+                    "memory_mb": process.memory_info().rss / (1024 * 1024),
+                    "num_threads": process.num_threads(),
+                }
         except (psutil.NoSuchProcess, psutil.AccessDenied):
+            self._process_handles.pop(pid, None)
             return {}
 
+    def _sample_resource_usage(self) -> Dict[str, Dict[str, Any]]:
+        """Sample every running agent process in one sweep"""
+        samples = {}
+        live_pids = set()
+
+        for agent_id, agent_info in list(self.active_agents.items()):
+            if agent_info.status != BackgroundStatus.RUNNING:
+                continue
+            if not agent_info.process_id:
+                continue
+
+            live_pids.add(agent_info.process_id)
+            usage = self._read_process_usage(agent_info.process_id)
+            if usage:
+                samples[agent_id] = usage
+
+        # Forget handles for processes that are no longer tracked
+        for pid in list(self._process_handles):
+            if pid not in live_pids:
+                del self._process_handles[pid]
+
+        self.resource_samples = samples
+        return samples
+
     async def terminate_agent(self, agent_id: str, force: bool = False) -> bool:
         """Terminate a background agent"""
+        queued_info = self._remove_from_queue(agent_id)
+        if queued_info:
+            queued_info.status = BackgroundStatus.TERMINATED
+            self._finalize_agent(queued_info)
+            return True
+
         if agent_id not in self.active_agents:
             return False
 
         agent_info = self.active_agents[agent_id]
 
         try:
-            if agent_info.process_id:
-                process = psutil.Process(agent_info.process_id)
+            # Warm workers are shared, so stop them through the pool
+            pool_agent = self.worker_pool is not None and self.worker_pool.cancel(
+                agent_id
+            )
+            if pool_agent or agent_info.process_id:
+                if not pool_agent:
+                    process = psutil.Process(agent_info.process_id)
 
-                if force:
-                    process.kill()  # SIGKILL
-                else:
-                    process.terminate()  # SIGTERM
+                    if force:
+                        process.kill()  # SIGKILL
+                    else:
+                        process.terminate()  # SIGTERM
 
                 agent_info.status = BackgroundStatus.TERMINATED
                 agent_info.completed_at = datetime.now()
 
                 # Move to completed
-                self.completed_agents[agent_id] = agent_info
-                del self.active_agents[agent_id]
+                self._finalize_agent(agent_info)
 
                 return True
 
@@ -753,47 +1813,53 @@ if __name__ == "__main__":
         while True:
             try:
                 await asyncio.sleep(self.monitor_interval)
-
-                for agent_id, agent_info in list(self.active_agents.items()):
-                    if agent_info.status == BackgroundStatus.RUNNING:
-                        usage = await self._get_resource_usage(agent_info)
-
-                        # Check limits
-                        limits = agent_info.resource_limits
-
-                        if usage.get("memory_mb", 0) > limits.max_memory_mb:
-                            await self.terminate_agent(agent_id, force=True)
-                            await self._write_error(
-                                agent_info,
-                                f"Memory limit exceeded: {usage['memory_mb']}MB > {limits.max_memory_mb}MB",
-                            )
-
-                        elif usage.get("cpu_percent", 0) > limits.max_cpu_percent:
-                            # Just log high CPU usage, don't terminate immediately
-                            await self.event_bus.publish(
-                                EventBusMessage(
-                                    agent_id=agent_id,
-                                    event_type="high_cpu_usage",
-                                    data={
-                                        "cpu_percent": usage["cpu_percent"],
-                                        "limit": limits.max_cpu_percent,
-                                    },
-                                )
-                            )
-
-                        # Check execution time
-                        elapsed = datetime.now() - agent_info.started_at
-                        if elapsed.total_seconds() > (
-                            limits.max_execution_time_minutes * 60
-                        ):
-                            await self.terminate_agent(agent_id, force=True)
-                            await self._write_error(
-                                agent_info, f"Execution time limit exceeded: {elapsed}"
-                            )
+                await self._enforce_resource_limits()
 
             except Exception as e:
                 print(f"Error in resource monitor: {e}")
 
+    async def _enforce_resource_limits(self):
+        """Sample all running agents once and act on exceeded limits"""
+        samples = self._sample_resource_usage()
+
+        for agent_id, agent_info in list(self.active_agents.items()):
+            if agent_info.status != BackgroundStatus.RUNNING:
+                continue
+
+            usage = samples.get(agent_id, {})
+
+            # Check limits
+            limits = agent_info.resource_limits
+
+            if usage.get("memory_mb", 0) > limits.max_memory_mb:
+                await self.terminate_agent(agent_id, force=True)
+                await self._write_error(
+                    agent_info,
+                    f"Memory limit exceeded: {usage['memory_mb']:.1f}MB > {limits.max_memory_mb}MB",
+                )
+                continue
+
+            if usage.get("cpu_percent", 0) > limits.max_cpu_percent:
+                # Just log high CPU usage, rlimits/cgroups cap the total
+                await self.event_bus.publish(
+                    EventBusMessage(
+                        agent_id=agent_id,
+                        event_type="high_cpu_usage",
+                        data={
+                            "cpu_percent": usage["cpu_percent"],
+                            "limit": limits.max_cpu_percent,
+                        },
+                    )
+                )
+
+            # Check execution time
+            elapsed = datetime.now() - agent_info.started_at
+            if elapsed.total_seconds() > (limits.max_execution_time_minutes * 60):
+                await self.terminate_agent(agent_id, force=True)
+                await self._write_error(
+                    agent_info, f"Execution time limit exceeded: {elapsed}"
+                )
+
     async def _cleanup_loop(self):
         """Background task to cleanup old completed agents"""
         while True:
@@ -822,6 +1888,10 @@ if __name__ == "__main__":
 
     async def shutdown(self):
         """Gracefully shutdown the background executor"""
+        # Drop queued spawns so they are not admitted as slots free up
+        for agent_id in list(self.queued_agents.keys()):
+            await self.terminate_agent(agent_id)
+
         # Terminate all active agents
         for agent_id in list(self.active_agents.keys()):
             await self.terminate_agent(agent_id, force=False)
@@ -834,8 +1904,11 @@ if __name__ == "__main__":
             await self.terminate_agent(agent_id, force=True)
 
         # Shutdown executors
-        self.process_executor.shutdown(wait=True)
+        if self._process_executor is not None:
+            self._process_executor.shutdown(wait=True)
         self.thread_executor.shutdown(wait=True)
+        if self.worker_pool:
+            self.worker_pool.shutdown(wait=True)
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get executor statistics"""
@@ -847,6 +1920,28 @@ if __name__ == "__main__":
             "capacity_used": len(self.active_agents) / self.max_parallel_agents,
             "temp_dir": str(self.temp_dir),
             "event_bus_messages": len(self.event_bus.message_history),
+            "worker_pool": (
+                self.worker_pool.get_statistics() if self.worker_pool else None
+            ),
+            "admission_queue": self._get_queue_statistics(),
+        }
+
+    def _get_queue_statistics(self) -> Dict[str, Any]:
+        """Get admission queue depth and wait-time statistics"""
+        waits = sorted(self._queue_wait_times)
+
+        return {
+            "queued_agents": len(self.queued_agents),
+            "max_queue_depth": self.max_queue_depth,
+            "admission_policy": self.admission_policy,
+            "queued_by_priority": {
+                level: len(entries) for level, entries in self._admission_queue.items()
+            },
+            "admitted_from_queue": self.admitted_from_queue,
+            "rejected_spawns": self.rejected_spawns,
+            "avg_wait_seconds": sum(waits) / len(waits) if waits else 0.0,
+            "p95_wait_seconds": waits[int(len(waits) * 0.95)] if waits else 0.0,
+            "max_wait_seconds": waits[-1] if waits else 0.0,
         }
 
 
@@ -907,21 +2002,18 @@ class BackgroundEnabledAgent(BaseAgent):
         self, agent_id: str, timeout: Optional[float] = None
     ) -> Dict[str, Any]:
         """Wait for background agent completion with optional timeout"""
-        start_time = time.time()
-
-        while True:
-            status = await self.check_background_status(agent_id)
-
-            if not status:
-                return {"error": "Agent not found"}
-
-            if status["status"] in ["completed", "failed", "crashed", "terminated"]:
-                return status
+        try:
+            status = await self.background_executor.wait_for_agent(agent_id, timeout)
+        except asyncio.TimeoutError:
+            return {
+                "error": "Timeout waiting for completion",
+                "status": await self.check_background_status(agent_id),
+            }
 
-            if timeout and (time.time() - start_time) > timeout:
-                return {"error": "Timeout waiting for completion", "status": status}
+        if not status:
+            return {"error": "Agent not found"}
 
-            await asyncio.sleep(0.5)  # Check every 500ms
+        return status
 
     async def get_all_background_status(self) -> Dict[str, Dict[str, Any]]:
         """Get status of all spawned background agents"""
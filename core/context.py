@@ -3,8 +3,9 @@ Context window management for agents.
 Factor 3: Own your context window.
 """
 
+from collections.abc import MutableSequence
 from typing import List, Optional, Dict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -15,12 +16,72 @@ class ContextItem:
     priority: int  # 1-10, higher = more important
     tokens: int
     source: str = "user"
+    rendered: str = field(default="", init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Rendered once; build_prompt reuses it
+        self.rendered = f"[{self.source}]: {self.content}"
 
     def __lt__(self, other):
         # Higher priority items sort first
         return self.priority > other.priority
 
 
+class ContextItems(MutableSequence):
+    """
+    Live view of a ContextManager's items in priority order.
+
+    Edits go through the manager, so tokens and the cached prompt stay in
+    step. Items always keep their priority order: append and insert place
+    an item after the others of its priority, like add_context.
+    """
+
+    def __init__(self, manager: "ContextManager"):
+        self._manager = manager
+
+    def _list(self) -> List[ContextItem]:
+        buckets = self._manager._buckets
+        return [item for p in ContextManager.PRIORITIES for item in buckets[p]]
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._manager._buckets.values())
+
+    def __iter__(self):
+        buckets = self._manager._buckets
+        for p in ContextManager.PRIORITIES:
+            yield from buckets[p]
+
+    def __getitem__(self, index):
+        return self._list()[index]
+
+    def __setitem__(self, index, value):
+        items = self._list()
+        items[index] = value
+        self._manager.items = items
+
+    def __delitem__(self, index):
+        items = self._list()
+        del items[index]
+        self._manager.items = items
+
+    def insert(self, index: int, item: ContextItem):
+        self._manager._add_item(item)
+
+    def append(self, item: ContextItem):
+        self._manager._add_item(item)
+
+    def clear(self):
+        self._manager.items = []
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ContextItems, list)):
+            return self._list() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self._list())
+
+
 class ContextManager:
     """
     Manages context window for LLM interactions.
@@ -30,14 +91,57 @@ class ContextManager:
     - Token counting and limiting
     - Smart truncation
     - Context compression
+
+    Items live in one bucket per priority, so adding is O(1) and iteration
+    is already in priority order (insertion order within a priority).
+    build_prompt caches its result and, when new items land at the end of
+    that order, only processes those items.
     """
 
+    PRIORITIES = range(10, 0, -1)
+
     def __init__(self, max_tokens: int = 100000):
         self.max_tokens = max_tokens
-        self.items: List[ContextItem] = []
+        self._buckets: Dict[int, List[ContextItem]] = {p: [] for p in self.PRIORITIES}
+        self._context_tokens = 0
         self.system_prompt: Optional[str] = None
         self.reserved_tokens = 10000  # Reserve for response
 
+        # Incremental prompt state
+        self._built: Optional[Dict] = None
+        self._pending: List[ContextItem] = []
+
+    @property
+    def items(self) -> ContextItems:
+        """Context items in priority order (a live, editable view)"""
+        return ContextItems(self)
+
+    @items.setter
+    def items(self, items: List[ContextItem]):
+        items = list(items)
+        buckets = {p: [] for p in self.PRIORITIES}
+        for item in sorted(items):
+            buckets[self._bucket(item.priority)].append(item)
+        self._buckets = buckets
+        self._context_tokens = sum(item.tokens for item in items)
+        self._invalidate()
+
+    def _invalidate(self):
+        """Drop the cached prompt after a non-append change"""
+        self._built = None
+        self._pending = []
+
+    def _bucket(self, priority: int) -> int:
+        if not 1 <= priority <= 10:
+            raise ValueError("Priority must be between 1 and 10")
+        return priority
+
+    def _lowest_priority(self) -> Optional[int]:
+        for p in reversed(self.PRIORITIES):
+            if self._buckets[p]:
+                return p
+        return None
+
     def set_system_prompt(self, prompt: str):
         """Set system prompt (highest priority)"""
         self.system_prompt = prompt
@@ -47,17 +151,27 @@ class ContextManager:
         Add content to context with priority.
         Priority: 1-10 (10 = highest)
         """
-        if not 1 <= priority <= 10:
-            raise ValueError("Priority must be between 1 and 10")
+        self._bucket(priority)
 
         tokens = self._estimate_tokens(content)
         item = ContextItem(
             content=content, priority=priority, tokens=tokens, source=source
         )
-        self.items.append(item)
+        self._add_item(item)
+
+    def _add_item(self, item: ContextItem):
+        """Place an item after the others of its priority"""
+        priority = self._bucket(item.priority)
 
-        # Maintain sorted order
-        self.items.sort()
+        # Items at or below the lowest priority extend the cached prompt
+        lowest = self._lowest_priority()
+        if self._built is not None and (lowest is None or priority <= lowest):
+            self._pending.append(item)
+        else:
+            self._invalidate()
+
+        self._buckets[priority].append(item)
+        self._context_tokens += item.tokens
 
     def _estimate_tokens(self, text: str) -> int:
         """Estimate token count (rough approximation)"""
@@ -69,31 +183,65 @@ class ContextManager:
         Build final prompt within token limits.
         Prioritizes high-priority content.
         """
-        prompt_parts = []
-        used_tokens = 0
-
-        # Add system prompt first (if set)
-        if self.system_prompt:
-            system_tokens = self._estimate_tokens(self.system_prompt)
-            prompt_parts.append(self.system_prompt)
-            used_tokens += system_tokens
-
-        # Add context items by priority
-        available_tokens = self.max_tokens - self.reserved_tokens - used_tokens
-
-        for item in self.items:
+        key = (self.max_tokens, self.reserved_tokens, self.system_prompt)
+        built = self._built
+
+        if built is None or built["key"] != key:
+            # Full build from the cached per-item segments
+            prompt_parts = []
+            used_tokens = 0
+
+            # Add system prompt first (if set)
+            if self.system_prompt:
+                system_tokens = self._estimate_tokens(self.system_prompt)
+                prompt_parts.append(self.system_prompt)
+                used_tokens += system_tokens
+
+            available_tokens = self.max_tokens - self.reserved_tokens - used_tokens
+            built = {
+                "key": key,
+                "available": available_tokens,
+                "used": used_tokens,
+                "stopped": False,
+                "prompt": "",
+            }
+            new_parts = self._fill(self.items, built)
+            built["prompt"] = "\n\n".join(prompt_parts + new_parts)
+        else:
+            # Only the items appended since the last build
+            new_parts = self._fill(self._pending, built)
+            if new_parts:
+                parts = [built["prompt"]] if built["prompt"] else []
+                built["prompt"] = "\n\n".join(parts + new_parts)
+
+        self._built = built
+        self._pending = []
+        return built["prompt"]
+
+    def _fill(self, items: List[ContextItem], built: Dict) -> List[str]:
+        """Add items by priority until the budget runs out"""
+        parts = []
+        if built["stopped"]:
+            return parts
+
+        available_tokens = built["available"]
+        used_tokens = built["used"]
+
+        for item in items:
             if used_tokens + item.tokens <= available_tokens:
-                prompt_parts.append(f"[{item.source}]: {item.content}")
+                parts.append(item.rendered)
                 used_tokens += item.tokens
             else:
                 # Try to fit truncated version
                 remaining = available_tokens - used_tokens
                 if remaining > 100:  # Only truncate if meaningful amount remains
                     truncated = self._truncate_content(item.content, remaining)
-                    prompt_parts.append(f"[{item.source}][truncated]: {truncated}")
+                    parts.append(f"[{item.source}][truncated]: {truncated}")
+                    built["stopped"] = True
                     break
 
-        return "\n\n".join(prompt_parts)
+        built["used"] = used_tokens
+        return parts
 
     def _truncate_content(self, content: str, max_tokens: int) -> str:
         """Intelligently truncate content to fit token limit"""
@@ -131,11 +279,10 @@ class ContextManager:
         low_priority = [i for i in self.items if i.priority < 4][-5:]
 
         self.items = high_priority + medium_priority + low_priority
-        self.items.sort()
 
     def get_token_usage(self) -> Dict[str, int]:
         """Get current token usage statistics"""
-        total = sum(item.tokens for item in self.items)
+        total = self._context_tokens
         system = self._estimate_tokens(self.system_prompt) if self.system_prompt else 0
 
         return {
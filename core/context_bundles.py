@@ -3,18 +3,40 @@ Context Bundles System implementing Claude Code's session persistence pattern
 Enables perfect agent handoffs with zero context loss
 """
 
+import atexit
+import copy
 import json
 import hashlib
 import gzip
-from typing import Dict, List, Any, Optional
+import os
+import struct
+import weakref
+import zlib
+from typing import Dict, List, Any, Optional, Iterable, Set, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from enum import Enum
 from collections import OrderedDict
+from collections.abc import MutableSequence
 
 from .base import BaseAgent, ToolResponse
 
+# Root directory for the filesystem storage backend
+BUNDLE_STORAGE_ROOT = Path("/tmp/context_bundles")
+
+# Live segment logs, committed at exit in case records are still buffered
+_open_segment_logs: "weakref.WeakSet[BundleSegmentLog]" = weakref.WeakSet()
+
+
+def _commit_open_segment_logs():
+    """Commit buffered records of every open segment log at interpreter exit"""
+    for log in list(_open_segment_logs):
+        log.close()
+
+
+atexit.register(_commit_open_segment_logs)
+
 
 class ActionType(Enum):
     """Types of actions that can be logged"""
@@ -60,6 +82,209 @@ class TimestampedAction:
         )
 
 
+class LazyActionLog(MutableSequence):
+    """
+    Action log that decodes serialized actions on first access
+
+    Items are kept as raw dicts until read, so loading and remounting a
+    large bundle does not build a TimestampedAction per entry. Filters
+    on action type read the raw entries without decoding them.
+    """
+
+    def __init__(self, items: List[Any] = None):
+        self._items: List[Any] = items if items is not None else []
+
+    def _decode(self, index: int) -> TimestampedAction:
+        item = self._items[index]
+        if isinstance(item, dict):
+            item = TimestampedAction.from_dict(item)
+            self._items[index] = item
+        return item
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._decode(i) for i in range(len(self._items))[index]]
+        return self._decode(index)
+
+    def __setitem__(self, index, value):
+        self._items[index] = value
+
+    def __delitem__(self, index):
+        del self._items[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyActionLog):
+            return self.to_dicts() == other.to_dicts()
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def insert(self, index: int, value: TimestampedAction):
+        self._items.insert(index, value)
+
+    def copy(self) -> "LazyActionLog":
+        """Shallow copy that keeps undecoded entries undecoded"""
+        return LazyActionLog(self._items.copy())
+
+    def action_type_values(self):
+        """Yield each entry's action type value without decoding"""
+        for item in self._items:
+            yield (
+                item["action_type"]
+                if isinstance(item, dict)
+                else item.action_type.value
+            )
+
+    def select(
+        self, action_type: ActionType = None, limit: int = None
+    ) -> List[TimestampedAction]:
+        """Decode only the entries matching a type, newest `limit` of them"""
+        indexes = [
+            i
+            for i, value in enumerate(self.action_type_values())
+            if action_type is None or value == action_type.value
+        ]
+        if limit:
+            indexes = indexes[-limit:]
+        return [self._decode(i) for i in indexes]
+
+    def to_dicts(self) -> List[Dict]:
+        """Serialize, reusing the raw form of undecoded entries"""
+        return [
+            item if isinstance(item, dict) else item.to_dict() for item in self._items
+        ]
+
+
+class ChunkStore:
+    """
+    Content-addressed store for bundle state
+
+    Dicts and lists are stored as chunks keyed by the hash of their
+    canonical encoding, so identical subtrees across checkpoints are
+    stored once. Small containers without chunked children are kept
+    inline in their parent.
+    """
+
+    MIN_CHUNK_BYTES = 64
+
+    def __init__(self, chunks: Dict[str, Dict] = None):
+        self.chunks: Dict[str, Dict] = dict(chunks or {})
+        self._materialized: Dict[str, Any] = {}
+
+    @staticmethod
+    def _canonical(value: Any) -> str:
+        return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+    def encode(self, value: Any) -> Tuple[bool, Any]:
+        """
+        Encode a value as a chunk reference or an inline value
+
+        Returns:
+            (True, digest) for chunked containers, (False, value) otherwise
+        """
+        if isinstance(value, dict):
+            items = [(str(k), self.encode(v)) for k, v in value.items()]
+            node = {"d": {k: v for k, (ref, v) in items if not ref}}
+            refs = {k: v for k, (ref, v) in items if ref}
+        elif isinstance(value, (list, tuple)):
+            items = [(i, self.encode(v)) for i, v in enumerate(value)]
+            node = {"l": [None if ref else v for _, (ref, v) in items]}
+            refs = {str(i): v for i, (ref, v) in items if ref}
+        else:
+            return False, value
+
+        if refs:
+            node["r"] = refs
+        else:
+            # Small leaf containers are cheaper inline than as a reference
+            if len(self._canonical(value)) < self.MIN_CHUNK_BYTES:
+                return False, value
+
+        return True, self.put_node(node)
+
+    def put_node(self, node: Dict) -> str:
+        """Store an encoded node and return its digest"""
+        digest = hashlib.blake2b(
+            self._canonical(node).encode(), digest_size=12
+        ).hexdigest()
+        self.chunks.setdefault(digest, node)
+        return digest
+
+    def put(self, value: Dict[str, Any]) -> str:
+        """Store a state dict and return its root digest"""
+        return self.put_entries({str(k): self.encode(v) for k, v in value.items()})
+
+    def put_entries(self, entries: Dict[str, Tuple[bool, Any]]) -> str:
+        """Store a dict from already encoded values (see encode)"""
+        node = {"d": {k: v for k, (ref, v) in entries.items() if not ref}}
+        refs = {k: v for k, (ref, v) in entries.items() if ref}
+        if refs:
+            node["r"] = refs
+        return self.put_node(node)
+
+    def get(self, digest: str) -> Any:
+        """Rebuild the value for a digest as a fresh, independent copy"""
+        return copy.deepcopy(self._materialize(digest))
+
+    def _materialize(self, digest: str) -> Any:
+        """Shared, read-only value for a digest (cached per digest)"""
+        if digest in self._materialized:
+            return self._materialized[digest]
+
+        node = self.chunks[digest]
+        refs = node.get("r", {})
+        if "d" in node:
+            value = dict(node["d"])
+            for key, ref in refs.items():
+                value[key] = self._materialize(ref)
+        else:
+            value = list(node["l"])
+            for index, ref in refs.items():
+                value[int(index)] = self._materialize(ref)
+
+        self._materialized[digest] = value
+        return value
+
+    def collect(self, digests: Iterable[str], skip: Set[str] = None) -> Dict:
+        """Chunks reachable from digests, not descending into skip"""
+        skip = skip or set()
+        collected: Dict[str, Dict] = {}
+        pending = [d for d in digests if d not in skip]
+        while pending:
+            digest = pending.pop()
+            if digest in collected:
+                continue
+            node = self.chunks[digest]
+            collected[digest] = node
+            pending.extend(
+                ref
+                for ref in node.get("r", {}).values()
+                if ref not in collected and ref not in skip
+            )
+        return collected
+
+
+class _CheckpointState:
+    """
+    Checkpoint.state: kept inline when given, otherwise rebuilt from the
+    chunk store on each read so checkpoints hold only their state_ref
+    """
+
+    def __get__(self, checkpoint, owner=None):
+        if checkpoint is None:
+            raise AttributeError("state")  # No dataclass default
+        state = checkpoint.__dict__["_state"]
+        if state is None and checkpoint.state_ref is not None:
+            return checkpoint.chunk_store.get(checkpoint.state_ref)
+        return state
+
+    def __set__(self, checkpoint, state):
+        checkpoint.__dict__["_state"] = state
+
+
 @dataclass
 class Checkpoint:
     """Workflow checkpoint for pause/resume"""
@@ -68,12 +293,14 @@ class Checkpoint:
     timestamp: datetime
     phase: str
     progress: float
-    state: Dict[str, Any]
+    state: Optional[Dict[str, Any]] = _CheckpointState()
     metadata: Dict[str, Any] = field(default_factory=dict)
+    state_ref: Optional[str] = field(default=None, compare=False)
+    chunk_store: Optional["ChunkStore"] = field(default=None, repr=False, compare=False)
 
-    def to_dict(self) -> Dict:
-        """Convert to dictionary"""
-        return {
+    def to_dict(self, state_ref: str = None) -> Dict:
+        """Convert to dictionary, referencing the state chunk if given"""
+        data = {
             "checkpoint_id": self.checkpoint_id,
             "timestamp": self.timestamp.isoformat(),
             "phase": self.phase,
@@ -81,6 +308,10 @@ class Checkpoint:
             "state": self.state,
             "metadata": self.metadata,
         }
+        if state_ref is not None:
+            del data["state"]
+            data["state_ref"] = state_ref
+        return data
 
 
 @dataclass
@@ -113,27 +344,53 @@ class ContextBundle:
     """Complete context bundle for session persistence"""
 
     session_id: str
-    actions: List[TimestampedAction]
+    actions: LazyActionLog
     state: Dict[str, Any]
     metadata: BundleMetadata
     checkpoints: List[Checkpoint] = field(default_factory=list)
+    chunk_store: Optional[ChunkStore] = field(default=None, repr=False, compare=False)
+    _encoded: Optional[Tuple[Tuple, bytes]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        if not isinstance(self.actions, LazyActionLog):
+            self.actions = LazyActionLog(self.actions)
 
     def to_dict(self) -> Dict:
         """Convert to dictionary for serialization"""
+        store = self.chunk_store or ChunkStore()
+
+        # Checkpoint states are shared through the chunk table
+        checkpoints = []
+        for c in self.checkpoints:
+            ref = c.state_ref if c.state_ref in store.chunks else store.put(c.state)
+            checkpoints.append(c.to_dict(state_ref=ref))
+
         return {
             "session_id": self.session_id,
-            "actions": [a.to_dict() for a in self.actions],
+            "actions": self.actions.to_dicts(),
             "state": self.state,
             "metadata": self.metadata.to_dict(),
-            "checkpoints": [c.to_dict() for c in self.checkpoints],
+            "checkpoints": checkpoints,
+            "chunks": store.collect(c["state_ref"] for c in checkpoints),
         }
 
     @classmethod
     def from_dict(cls, data: Dict) -> "ContextBundle":
         """Create from dictionary"""
+        store = ChunkStore(data.get("chunks"))
+        checkpoints = data.get("checkpoints", [])
+
+        def initial_state(c: Dict) -> Optional[Dict[str, Any]]:
+            if "state" in c:
+                return c["state"]
+            # Only the latest checkpoint is decoded up front
+            return store.get(c["state_ref"]) if c is checkpoints[-1] else None
+
         return cls(
             session_id=data["session_id"],
-            actions=[TimestampedAction.from_dict(a) for a in data["actions"]],
+            actions=LazyActionLog(list(data["actions"])),
             state=data["state"],
             metadata=BundleMetadata(
                 created_at=datetime.fromisoformat(data["metadata"]["created_at"]),
@@ -150,21 +407,30 @@ class ContextBundle:
                     timestamp=datetime.fromisoformat(c["timestamp"]),
                     phase=c["phase"],
                     progress=c["progress"],
-                    state=c["state"],
+                    state=initial_state(c),
                     metadata=c.get("metadata", {}),
+                    state_ref=c.get("state_ref"),
+                    chunk_store=store,
                 )
-                for c in data.get("checkpoints", [])
+                for c in checkpoints
             ],
+            chunk_store=store,
         )
 
+    def _serialized(self) -> bytes:
+        """Encoded bundle, cached while the bundle is unchanged"""
+        key = (len(self.actions), len(self.checkpoints), self.metadata.last_modified)
+        if self._encoded is None or self._encoded[0] != key:
+            self._encoded = (key, json.dumps(self.to_dict()).encode())
+        return self._encoded[1]
+
     def get_size_bytes(self) -> int:
         """Get bundle size in bytes"""
-        return len(json.dumps(self.to_dict()).encode())
+        return len(self._serialized())
 
     def compress(self) -> bytes:
         """Compress bundle for storage"""
-        json_str = json.dumps(self.to_dict())
-        return gzip.compress(json_str.encode())
+        return gzip.compress(self._serialized())
 
     @classmethod
     def decompress(cls, compressed_data: bytes) -> "ContextBundle":
@@ -174,6 +440,186 @@ class ContextBundle:
         return cls.from_dict(data)
 
 
+class BundleSegmentLog:
+    """
+    Append-only log of bundle changes for the filesystem backend
+
+    Changes are length-prefixed, checksummed records in rolling segment
+    files, buffered and fsynced once per group commit. A compacted snapshot
+    (bundle.json.gz) names the first segment it does not cover; loading
+    reads the snapshot and replays the segments after it.
+    """
+
+    SNAPSHOT_FILE = "bundle.json.gz"
+    RECORD_HEADER = struct.Struct(">II")  # payload length, crc32
+
+    def __init__(
+        self,
+        path: Path,
+        segment_max_bytes: int = 4 * 1024 * 1024,
+        group_commit_size: int = 32,
+        snapshot_interval: int = 1000,
+    ):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.group_commit_size = group_commit_size
+        self.snapshot_interval = snapshot_interval
+
+        self._pending: List[bytes] = []
+        existing = self.segment_indexes(self.path)
+        self.segment_index = existing[-1] + 1 if existing else 0
+        self.segment_size = 0
+        self.records_since_snapshot = 0
+        self.records_in_snapshot = 0
+        _open_segment_logs.add(self)
+
+    @staticmethod
+    def segment_indexes(path: Path) -> List[int]:
+        """Indexes of segment files present in a directory"""
+        indexes = []
+        for segment in path.glob("segment_*.log"):
+            try:
+                indexes.append(int(segment.stem.split("_", 1)[1]))
+            except ValueError:
+                continue
+        return sorted(indexes)
+
+    @staticmethod
+    def segment_file(path: Path, index: int) -> Path:
+        return path / f"segment_{index:08d}.log"
+
+    def append(self, kind: str, data: Any):
+        """Buffer one change record, committing when the group is full"""
+        payload = json.dumps({"type": kind, "data": data}).encode()
+        self._pending.append(
+            self.RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        )
+        self.records_since_snapshot += 1
+
+        if len(self._pending) >= self.group_commit_size:
+            self.commit()
+
+    def commit(self):
+        """Write buffered records with a single fsync"""
+        if not self._pending:
+            return
+
+        data = b"".join(self._pending)
+        self._pending = []
+
+        # Roll to a new segment when the current one is full
+        if self.segment_size and self.segment_size + len(data) > self.segment_max_bytes:
+            self.segment_index += 1
+            self.segment_size = 0
+
+        with open(self.segment_file(self.path, self.segment_index), "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.segment_size += len(data)
+
+    def close(self):
+        """Commit buffered records before the log is discarded"""
+        self.commit()
+
+    def should_snapshot(self) -> bool:
+        """Compact once the tail outgrows the snapshot (amortized O(delta))"""
+        return self.records_since_snapshot >= max(
+            self.snapshot_interval, self.records_in_snapshot
+        )
+
+    def write_snapshot(self, bundle_data: Dict[str, Any], record_count: int):
+        """Write a compacted snapshot and drop the segments it covers"""
+        self._pending = []  # Covered by the snapshot
+
+        # Later records go to a fresh segment
+        self.segment_index += 1
+        self.segment_size = 0
+
+        snapshot = dict(bundle_data)
+        snapshot["log_position"] = {"segment": self.segment_index}
+        compressed = gzip.compress(json.dumps(snapshot).encode())
+
+        tmp = self.path / f"{self.SNAPSHOT_FILE}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(compressed)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path / self.SNAPSHOT_FILE)
+
+        for index in self.segment_indexes(self.path):
+            if index < self.segment_index:
+                self.segment_file(self.path, index).unlink(missing_ok=True)
+
+        self.records_since_snapshot = 0
+        self.records_in_snapshot = record_count
+
+    @classmethod
+    def read_records(cls, segment: Path):
+        """Yield records from a segment, stopping at a torn or corrupt tail"""
+        with open(segment, "rb") as f:
+            data = f.read()
+
+        position = 0
+        while position + cls.RECORD_HEADER.size <= len(data):
+            length, checksum = cls.RECORD_HEADER.unpack_from(data, position)
+            start = position + cls.RECORD_HEADER.size
+            payload = data[start : start + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                return
+            yield json.loads(payload)
+            position = start + length
+
+    @staticmethod
+    def apply_record(bundle_data: Dict[str, Any], record: Dict[str, Any]):
+        """Replay one change record onto serialized bundle data"""
+        kind = record["type"]
+        data = record["data"]
+        if kind == "action":
+            bundle_data["actions"].append(data)
+        elif kind == "state":
+            bundle_data["state"].update(data)
+        elif kind == "state_reset":
+            bundle_data["state"] = data
+        elif kind == "checkpoint":
+            bundle_data["checkpoints"].append(data["checkpoint"])
+            bundle_data.setdefault("chunks", {}).update(data["chunks"])
+        elif kind == "metadata":
+            bundle_data["metadata"] = data
+
+    @classmethod
+    def load(cls, path: Path) -> Optional[Dict[str, Any]]:
+        """Rebuild serialized bundle data from snapshot plus log tail"""
+        snapshot_file = Path(path) / cls.SNAPSHOT_FILE
+        if not snapshot_file.exists():
+            return None
+
+        with open(snapshot_file, "rb") as f:
+            bundle_data = json.loads(gzip.decompress(f.read()))
+
+        first_segment = bundle_data.pop("log_position", {}).get("segment", 0)
+        for index in cls.segment_indexes(Path(path)):
+            if index < first_segment:
+                continue
+            for record in cls.read_records(cls.segment_file(Path(path), index)):
+                cls.apply_record(bundle_data, record)
+
+        return bundle_data
+
+    def last_modified(self) -> Optional[float]:
+        """Newest mtime among snapshot and segments"""
+        return self.last_modified_in(self.path)
+
+    @classmethod
+    def last_modified_in(cls, path: Path) -> Optional[float]:
+        files = [path / cls.SNAPSHOT_FILE] + [
+            cls.segment_file(path, i) for i in cls.segment_indexes(path)
+        ]
+        mtimes = [f.stat().st_mtime for f in files if f.exists()]
+        return max(mtimes) if mtimes else None
+
+
 class ContextBundleManager:
     """
     Manages context bundles for session persistence and perfect handoffs
@@ -190,22 +636,65 @@ class ContextBundleManager:
         """
         self.session_id = session_id or self.generate_session_id()
         self.storage_backend = storage_backend
-        self.append_log: List[TimestampedAction] = []
+        self.append_log = LazyActionLog()
         self.current_state: Dict[str, Any] = {}
         self.checkpoints: List[Checkpoint] = []
         self.metadata = BundleMetadata(
             created_at=datetime.now(), last_modified=datetime.now()
         )
 
-        # Storage configuration
-        if storage_backend == "filesystem":
-            self.storage_path = Path(f"/tmp/context_bundles/{self.session_id}")
-            self.storage_path.mkdir(parents=True, exist_ok=True)
-
         # In-memory storage for quick access
         self._bundle_cache: OrderedDict[str, ContextBundle] = OrderedDict()
         self._max_cache_size = 10
 
+        # Checkpoint states share unchanged subtrees through the chunk store
+        self.chunk_store = ChunkStore()
+        self._persisted_chunks: Set[str] = set()
+
+        # Per-key encodings reused by the next checkpoint: fingerprint and
+        # (is_ref, value). Keys set through update_state are always redone.
+        self._state_entries: Dict[str, Tuple[str, Tuple[bool, Any]]] = {}
+        self._dirty_keys: Set[str] = set()
+
+        # Storage configuration
+        self._log: Optional[BundleSegmentLog] = None
+        if storage_backend == "filesystem":
+            self.storage_path = BUNDLE_STORAGE_ROOT / self.session_id
+            self._log = BundleSegmentLog(self.storage_path)
+            existing = BundleSegmentLog.load(self.storage_path)
+            if existing is None:
+                # Start the session from an empty snapshot
+                self._write_snapshot()
+            else:
+                self._resume(existing)
+
+    def _resume(self, bundle_data: Dict[str, Any]):
+        """Continue a persisted session from its snapshot plus log tail"""
+        bundle = ContextBundle.from_dict(bundle_data)
+        self.append_log = bundle.actions
+        self.current_state = bundle.state
+        self.metadata = bundle.metadata
+        self.checkpoints = bundle.checkpoints
+        self.chunk_store = bundle.chunk_store
+        self._persisted_chunks = set(self.chunk_store.chunks)
+        self._log.records_in_snapshot = len(self.append_log)
+
+    def __enter__(self) -> "ContextBundleManager":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def flush(self):
+        """Write actions still buffered for the filesystem log"""
+        if self._log is not None:
+            self._log.commit()
+
+    def close(self):
+        """Flush buffered actions; call when the session ends"""
+        if self._log is not None:
+            self._log.close()
+
     def generate_session_id(self) -> str:
         """Generate unique session ID with timestamp"""
         timestamp = datetime.now().isoformat()
@@ -243,10 +732,54 @@ class ContextBundleManager:
 
     def _persist_action(self, action: TimestampedAction):
         """Persist single action to storage"""
-        if self.storage_backend == "filesystem":
-            action_file = self.storage_path / f"action_{len(self.append_log)}.json"
-            with open(action_file, "w") as f:
-                json.dump(action.to_dict(), f)
+        self._log_change("action", action.to_dict())
+
+    def _log_change(self, kind: str, data: Any):
+        """Append a change record to the filesystem log"""
+        if self._log is not None:
+            self._log.append(kind, data)
+
+    def _write_snapshot(self, bundle: ContextBundle = None):
+        """Compact the filesystem log into a snapshot of bundle (or the session)"""
+        if bundle is None:
+            # Serialize the live session without copying it
+            bundle = ContextBundle(
+                session_id=self.session_id,
+                actions=self.append_log,
+                state=self.current_state,
+                metadata=self.metadata,
+                checkpoints=self.checkpoints,
+                chunk_store=self.chunk_store,
+            )
+
+        bundle_data = bundle.to_dict()
+        self._log.write_snapshot(bundle_data, len(bundle.actions))
+        self._persisted_chunks = set(bundle_data["chunks"])
+
+    def _state_ref(self) -> str:
+        """
+        Chunk digest of current_state, re-chunking only changed keys
+
+        Keys dirtied by update_state are re-encoded directly. Other keys
+        are compared by a fingerprint of their canonical JSON, which is
+        much cheaper than chunking and also catches in-place edits.
+        """
+        entries = {}
+        cached_entries = {}
+        for key, value in self.current_state.items():
+            key = str(key)
+            fingerprint = hashlib.blake2b(
+                ChunkStore._canonical(value).encode(), digest_size=12
+            ).hexdigest()
+            cached = self._state_entries.get(key)
+            if key in self._dirty_keys or cached is None or cached[0] != fingerprint:
+                cached = (fingerprint, self.chunk_store.encode(value))
+            cached_entries[key] = cached
+            entries[key] = cached[1]
+
+        self._state_entries = cached_entries
+        self._dirty_keys.clear()
+        return self.chunk_store.put_entries(entries)
 
     def update_state(self, state_updates: Dict[str, Any]):
         """
@@ -256,6 +789,8 @@ class ContextBundleManager:
             state_updates: State changes to apply
         """
         self.current_state.update(state_updates)
+        self._dirty_keys.update(str(key) for key in state_updates)
+        self._log_change("state", state_updates)
         self.append_action(
             ActionType.STATE_CHANGE,
             {"state_updates": state_updates},
@@ -277,17 +812,28 @@ class ContextBundleManager:
             Checkpoint ID
         """
         checkpoint_id = f"checkpoint_{len(self.checkpoints) + 1}"
+        state_ref = self._state_ref()
 
         checkpoint = Checkpoint(
             checkpoint_id=checkpoint_id,
             timestamp=datetime.now(),
             phase=phase,
             progress=progress,
-            state=self.current_state.copy(),
+            state=None,  # Rebuilt from state_ref when read
             metadata=metadata or {},
+            state_ref=state_ref,
+            chunk_store=self.chunk_store,
         )
 
         self.checkpoints.append(checkpoint)
+        if self._log is not None:
+            # Log only the chunks not already on disk
+            new_chunks = self.chunk_store.collect([state_ref], self._persisted_chunks)
+            self._persisted_chunks.update(new_chunks)
+            self._log_change(
+                "checkpoint",
+                {"checkpoint": checkpoint.to_dict(state_ref), "chunks": new_chunks},
+            )
 
         self.append_action(
             ActionType.CHECKPOINT,
@@ -310,6 +856,7 @@ class ContextBundleManager:
             state=self.current_state.copy(),
             metadata=self.metadata,
             checkpoints=self.checkpoints.copy(),
+            chunk_store=self.chunk_store,
         )
 
         # Cache bundle
@@ -329,18 +876,31 @@ class ContextBundleManager:
         Returns:
             Success status
         """
-        if bundle is None:
-            bundle = self.create_bundle_snapshot()
-
         try:
+            if self.storage_backend == "filesystem" and bundle is None:
+                # Only the delta since the last save hits the disk
+                self._log_change("metadata", self.metadata.to_dict())
+                if self._log.should_snapshot():
+                    self._write_snapshot()
+                else:
+                    self._log.commit()
+                # Any cached snapshot of this session is now stale
+                self._bundle_cache.pop(self.session_id, None)
+                return True
+
+            if bundle is None:
+                bundle = self.create_bundle_snapshot()
+
             if self.storage_backend == "memory":
                 self._bundle_cache[bundle.session_id] = bundle
 
             elif self.storage_backend == "filesystem":
-                bundle_file = self.storage_path / "bundle.json.gz"
-                compressed = bundle.compress()
-                with open(bundle_file, "wb") as f:
-                    f.write(compressed)
+                # Explicit bundles are written whole as a snapshot
+                if bundle.session_id == self.session_id:
+                    self._write_snapshot(bundle)
+                else:
+                    log = BundleSegmentLog(BUNDLE_STORAGE_ROOT / bundle.session_id)
+                    log.write_snapshot(bundle.to_dict(), len(bundle.actions))
 
             elif self.storage_backend == "redis":
                 # Redis implementation would go here
@@ -371,11 +931,9 @@ class ContextBundleManager:
                 return self._bundle_cache.get(session_id)
 
             elif self.storage_backend == "filesystem":
-                bundle_path = Path(f"/tmp/context_bundles/{session_id}/bundle.json.gz")
-                if bundle_path.exists():
-                    with open(bundle_path, "rb") as f:
-                        compressed = f.read()
-                    bundle = ContextBundle.decompress(compressed)
+                bundle_data = BundleSegmentLog.load(BUNDLE_STORAGE_ROOT / session_id)
+                if bundle_data is not None:
+                    bundle = ContextBundle.from_dict(bundle_data)
                     self._bundle_cache[session_id] = bundle
                     return bundle
 
@@ -402,9 +960,15 @@ class ContextBundleManager:
             # Restore all state
             self.session_id = bundle.session_id
             self.append_log = bundle.actions.copy()
-            self.current_state = bundle.state.copy()
+            self.current_state = copy.deepcopy(bundle.state)
             self.metadata = bundle.metadata
             self.checkpoints = bundle.checkpoints.copy()
+            if bundle.chunk_store is not None:
+                self.chunk_store.chunks.update(bundle.chunk_store.chunks)
+
+            # Everything changed, so compact instead of logging a delta
+            if self._log is not None:
+                self._write_snapshot()
 
             # Log remount action
             self.append_action(
@@ -432,15 +996,11 @@ class ContextBundleManager:
         Returns:
             List of actions
         """
-        actions = self.append_log
-
-        if action_type:
-            actions = [a for a in actions if a.action_type == action_type]
-
-        if limit:
-            actions = actions[-limit:]
+        if not action_type and not limit:
+            return list(self.append_log)
 
-        return actions
+        # Only the selected actions are decoded
+        return self.append_log.select(action_type, limit)
 
     def get_latest_checkpoint(self) -> Optional[Checkpoint]:
         """Get most recent checkpoint"""
@@ -458,7 +1018,8 @@ class ContextBundleManager:
         """
         for checkpoint in self.checkpoints:
             if checkpoint.checkpoint_id == checkpoint_id:
-                self.current_state = checkpoint.state.copy()
+                self.current_state = copy.deepcopy(checkpoint.state)
+                self._log_change("state_reset", self.current_state)
 
                 self.append_action(
                     ActionType.STATE_CHANGE,
@@ -494,8 +1055,7 @@ class ContextBundleManager:
     def _count_action_types(self) -> Dict[str, int]:
         """Count actions by type"""
         counts = {}
-        for action in self.append_log:
-            action_type = action.action_type.value
+        for action_type in self.append_log.action_type_values():
             counts[action_type] = counts.get(action_type, 0) + 1
         return counts
 
@@ -507,15 +1067,15 @@ class ContextBundleManager:
             max_age_hours: Maximum age in hours
         """
         if self.storage_backend == "filesystem":
-            base_path = Path("/tmp/context_bundles")
+            base_path = BUNDLE_STORAGE_ROOT
             if base_path.exists():
                 for session_path in base_path.iterdir():
                     if session_path.is_dir():
-                        bundle_file = session_path / "bundle.json.gz"
-                        if bundle_file.exists():
+                        # Age by the newest snapshot or log segment
+                        last_modified = BundleSegmentLog.last_modified_in(session_path)
+                        if last_modified is not None:
                             age_hours = (
-                                datetime.now()
-                                - datetime.fromtimestamp(bundle_file.stat().st_mtime)
+                                datetime.now() - datetime.fromtimestamp(last_modified)
                             ).total_seconds() / 3600
                             if age_hours > max_age_hours:
                                 import shutil
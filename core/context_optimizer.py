@@ -3,11 +3,14 @@ Context Optimizer implementing Claude Code's R&D Framework
 Enhances Factor 3: Own Your Context Window with systematic optimization
 """
 
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional, Set
 from dataclasses import dataclass
 from enum import Enum
+from collections import OrderedDict
 import json
 import hashlib
+import math
+import re
 from datetime import datetime
 from .base import BaseAgent, ToolResponse
 
@@ -44,22 +47,257 @@ class ReducedContext:
     session_id: str
 
 
+class CharTokenModel:
+    """Token approximation of one token per `chars_per_token` characters"""
+
+    def __init__(self, chars_per_token: float = 4.0):
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str) -> float:
+        """Token units for a piece of text (additive across pieces)"""
+        return len(text) / self.chars_per_token
+
+
+class WordTokenModel:
+    """
+    Closer approximation of BPE tokenizers
+
+    Each punctuation mark is a token and each word costs one token per
+    `chars_per_token` characters, rounded up.
+    """
+
+    PIECE_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+    def __init__(self, chars_per_token: float = 4.0):
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str) -> float:
+        """Token units for a piece of text (additive across pieces)"""
+        return sum(
+            math.ceil(len(piece) / self.chars_per_token)
+            for piece in self.PIECE_PATTERN.findall(text)
+        )
+
+
+class TokenLedger:
+    """
+    Token accounting for one optimization pass
+
+    A dict context is measured as the sum of its JSON separators and
+    entries, with each entry measured once per (key, value object). A
+    strategy that drops or replaces keys therefore only costs the new
+    entries. Values must not be mutated in place during the pass.
+    """
+
+    def __init__(self, estimator: "TokenEstimator"):
+        self.estimator = estimator
+        self._entries: Dict[Tuple[Any, int], Tuple[Any, float]] = {}
+
+    def entry_units(self, key: Any, value: Any) -> float:
+        """Token units for one `"key": value` entry"""
+        cache_key = (key, id(value))
+        cached = self._entries.get(cache_key)
+        if cached is not None and cached[0] is value:
+            return cached[1]
+
+        # JSON renders non-string keys as strings
+        key_text = json.dumps(key if isinstance(key, str) else json.dumps(key))
+        units = (
+            self.estimator.text_units(key_text)
+            + self.estimator.separator_units(": ")
+            + self.estimator.value_units(value)
+        )
+        # Keep the value alive so its id cannot be reused
+        self._entries[cache_key] = (value, units)
+        return units
+
+    def estimate(self, context: Any) -> int:
+        """Estimate tokens for a context"""
+        if not isinstance(context, dict):
+            return int(self.estimator.text_units(str(context)))
+
+        units = self.estimator.separator_units("{}")
+        units += self.estimator.separator_units(", ") * max(len(context) - 1, 0)
+        for key, value in context.items():
+            units += self.entry_units(key, value)
+        return int(units)
+
+
+class TokenEstimator:
+    """
+    Memoized token estimation with a pluggable model
+
+    Strings are cached by identity across calls since they are
+    immutable; containers are cached per TokenLedger pass.
+    """
+
+    def __init__(self, model: Any = None, max_cached_strings: int = 4096):
+        self.model = model or CharTokenModel()
+        self.max_cached_strings = max_cached_strings
+        self._strings: OrderedDict[int, Tuple[str, float]] = OrderedDict()
+        self._separators: Dict[str, float] = {}
+
+    def text_units(self, text: str) -> float:
+        """Token units for raw text"""
+        return self.model.count(text)
+
+    def separator_units(self, separator: str) -> float:
+        if separator not in self._separators:
+            self._separators[separator] = self.model.count(separator)
+        return self._separators[separator]
+
+    def value_units(self, value: Any) -> float:
+        """Token units for a value's JSON encoding"""
+        if isinstance(value, str) and len(value) >= 64:
+            # Large strings are cached by identity (they are immutable)
+            cached = self._strings.get(id(value))
+            if cached is not None and cached[0] is value:
+                self._strings.move_to_end(id(value))
+                return cached[1]
+            units = self.model.count(json.dumps(value))
+            self._strings[id(value)] = (value, units)
+            if len(self._strings) > self.max_cached_strings:
+                self._strings.popitem(last=False)
+            return units
+        return self.model.count(json.dumps(value))
+
+    def ledger(self) -> TokenLedger:
+        """Start an accounting pass that reuses per-entry sizes"""
+        return TokenLedger(self)
+
+    def estimate(self, context: Any) -> int:
+        """Estimate tokens for a context"""
+        return self.ledger().estimate(context)
+
+
+class RelevanceIndex:
+    """
+    Inverted index over context keys and string values
+
+    Terms are lowercased whitespace-separated words. A keyword matches a
+    term it is a substring of, which is the same as a substring match
+    against the whole text because keywords contain no whitespace. Each
+    keyword only checks the terms sharing its rarest trigram, rather than
+    every value or the whole vocabulary.
+    """
+
+    CORE_KEYS = ("requirements", "constraints", "objectives", "current_state")
+
+    def __init__(self, context: Dict[str, Any]):
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.doc_lengths: Dict[str, int] = {}
+
+        for key, value in context.items():
+            terms = str(key).lower().split()
+            if isinstance(value, str):
+                terms.extend(value.lower().split())
+            self.doc_lengths[key] = len(terms)
+            for term in terms:
+                docs = self.postings.setdefault(term, {})
+                docs[key] = docs.get(key, 0) + 1
+
+        self.avg_doc_length = (
+            sum(self.doc_lengths.values()) / len(self.doc_lengths)
+            if self.doc_lengths
+            else 0.0
+        )
+        self._trigrams: Optional[Dict[str, Set[str]]] = None
+        self._matches: Dict[str, List[str]] = {}
+
+    def _terms_by_trigram(self) -> Dict[str, Set[str]]:
+        """Vocabulary terms by the trigrams they contain, built on first use"""
+        if self._trigrams is None:
+            self._trigrams = {}
+            for term in self.postings:
+                for i in range(len(term) - 2):
+                    self._trigrams.setdefault(term[i : i + 3], set()).add(term)
+        return self._trigrams
+
+    def matching_terms(self, keyword: str) -> List[str]:
+        """Vocabulary terms containing the keyword"""
+        matches = self._matches.get(keyword)
+        if matches is None:
+            if len(keyword) < 3:
+                candidates = self.postings
+            else:
+                trigrams = self._terms_by_trigram()
+                candidates = min(
+                    (
+                        trigrams.get(keyword[i : i + 3], ())
+                        for i in range(len(keyword) - 2)
+                    ),
+                    key=len,
+                )
+            matches = [term for term in candidates if keyword in term]
+            self._matches[keyword] = matches
+        return matches
+
+    def lookup(self, keywords: List[str]) -> Set[str]:
+        """Keys whose key or value contains any keyword"""
+        keys: Set[str] = set()
+        for keyword in set(keywords):
+            for term in self.matching_terms(keyword):
+                keys.update(self.postings[term])
+        return keys
+
+    def relevant_keys(self, keywords: List[str]) -> Set[str]:
+        """Matching keys plus the core keys that are always relevant"""
+        keys = self.lookup(keywords)
+        keys.update(k for k in self.CORE_KEYS if k in self.doc_lengths)
+        return keys
+
+    def score(
+        self, keywords: List[str], k1: float = 1.5, b: float = 0.75
+    ) -> Dict[str, float]:
+        """BM25 scores for keys matching at least one keyword"""
+        scores: Dict[str, float] = {}
+        total_docs = len(self.doc_lengths)
+
+        for keyword in set(keywords):
+            frequencies: Dict[str, int] = {}
+            for term in self.matching_terms(keyword):
+                for key, count in self.postings[term].items():
+                    frequencies[key] = frequencies.get(key, 0) + count
+            if not frequencies:
+                continue
+
+            df = len(frequencies)
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            for key, tf in frequencies.items():
+                norm = k1 * (1 - b + b * self.doc_lengths[key] / self.avg_doc_length)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+
+        return scores
+
+
 class ContextOptimizer:
     """
     Implements R&D Framework: Reduce and Delegate
     Treats context window as a limited and expensive resource
     """
 
-    def __init__(self, max_tokens: int = 8000, delegation_threshold: float = 0.3):
+    def __init__(
+        self,
+        max_tokens: int = 8000,
+        delegation_threshold: float = 0.3,
+        token_model: Any = None,
+        relevance_budget: Optional[int] = None,
+    ):
         """
         Initialize context optimizer with R&D Framework
 
         Args:
             max_tokens: Maximum context window size
             delegation_threshold: Delegate if context usage > threshold
+            token_model: Tokenizer approximation (default CharTokenModel)
+            relevance_budget: Keep the best-scoring relevant items up to this
+                many tokens instead of every relevant item
         """
         self.max_tokens = max_tokens
         self.delegation_threshold = delegation_threshold
+        self.token_estimator = TokenEstimator(token_model)
+        self.relevance_budget = relevance_budget
+        self._relevance_index: Optional[Tuple[tuple, RelevanceIndex]] = None
         self.reduction_strategies = [
             self.remove_redundant_context,
             self.summarize_verbose_sections,
@@ -79,21 +317,24 @@ class ContextOptimizer:
         Returns:
             ReducedContext with optimized content and metrics
         """
-        original_tokens = self.estimate_tokens(context)
+        # Entries shared between strategy outputs are measured once
+        ledger = self.token_estimator.ledger()
+
+        original_tokens = ledger.estimate(context)
         reduced_context = context.copy()
         strategies_applied = []
         delegated_tasks = []
 
         # REDUCE: Apply reduction strategies
         for strategy in self.reduction_strategies:
-            if self.estimate_tokens(reduced_context) <= self.max_tokens:
+            if ledger.estimate(reduced_context) <= self.max_tokens:
                 break
 
             reduced_context, strategy_name = strategy(reduced_context, task)
             strategies_applied.append(strategy_name)
 
         # DELEGATE: Check if delegation needed
-        final_tokens = self.estimate_tokens(reduced_context)
+        final_tokens = ledger.estimate(reduced_context)
         usage_ratio = final_tokens / self.max_tokens
 
         if usage_ratio > self.delegation_threshold:
@@ -103,7 +344,7 @@ class ContextOptimizer:
             reduced_context = self.remove_delegated_content(
                 reduced_context, delegated_tasks
             )
-            final_tokens = self.estimate_tokens(reduced_context)
+            final_tokens = ledger.estimate(reduced_context)
 
         # Calculate metrics
         reduction_percentage = (original_tokens - final_tokens) / original_tokens * 100
@@ -137,15 +378,19 @@ class ContextOptimizer:
     ) -> Tuple[Dict, str]:
         """Remove duplicate or redundant information"""
         cleaned = {}
-        seen_hashes = set()
+        seen_ids = set()
+        seen_content = set()
 
         for key, value in context.items():
-            # Create hash of content to detect duplicates
-            content_hash = hashlib.md5(str(value).encode()).hexdigest()
+            # The same object under two keys is a duplicate without rendering it
+            if id(value) in seen_ids:
+                continue
+            seen_ids.add(id(value))
 
-            if content_hash not in seen_hashes:
+            content = str(value)
+            if content not in seen_content:
                 cleaned[key] = value
-                seen_hashes.add(content_hash)
+                seen_content.add(content)
 
         return cleaned, ContextReductionStrategy.REMOVE_REDUNDANT.value
 
@@ -175,16 +420,49 @@ class ContextOptimizer:
         self, context: Dict[str, Any], task: str
     ) -> Tuple[Dict, str]:
         """Extract only task-relevant context"""
-        relevant = {}
         task_keywords = self.extract_keywords(task)
+        index = self.relevance_index(context)
+        keep = index.relevant_keys(task_keywords)
 
-        for key, value in context.items():
-            # Check relevance based on task keywords
-            if self.is_relevant_to_task(key, value, task_keywords):
-                relevant[key] = value
+        if self.relevance_budget is not None:
+            keep = self.select_within_budget(context, index, task_keywords)
+
+        # Preserve the original key order
+        relevant = {key: value for key, value in context.items() if key in keep}
 
         return relevant, ContextReductionStrategy.EXTRACT_RELEVANT.value
 
+    def relevance_index(self, context: Dict[str, Any]) -> RelevanceIndex:
+        """Relevance index for a context, reused while its keys and strings match"""
+        # Only keys and string values are indexed
+        version = tuple(
+            (key, value if isinstance(value, str) else None)
+            for key, value in context.items()
+        )
+        cached = self._relevance_index
+        if cached is None or cached[0] != version:
+            cached = self._relevance_index = (version, RelevanceIndex(context))
+        return cached[1]
+
+    def select_within_budget(
+        self, context: Dict[str, Any], index: RelevanceIndex, keywords: List[str]
+    ) -> Set[str]:
+        """Highest-scoring relevant keys that fit in the relevance budget"""
+        scores = index.score(keywords)
+        core = [k for k in RelevanceIndex.CORE_KEYS if k in context]
+        ranked = core + sorted(
+            (k for k in scores if k not in core), key=lambda k: -scores[k]
+        )
+
+        keep: Set[str] = set()
+        used = 0
+        for key in ranked:
+            tokens = self.token_estimator.estimate({key: context[key]})
+            if key in core or used + tokens <= self.relevance_budget:
+                keep.add(key)
+                used += tokens
+        return keep
+
     def compress_conversation_history(
         self, context: Dict[str, Any], task: str
     ) -> Tuple[Dict, str]:
@@ -243,9 +521,11 @@ class ContextOptimizer:
         cleaned = context.copy()
 
         for delegation in delegated:
-            # Remove delegated subtasks
+            # Remove delegated subtasks (without mutating the caller's list)
             if "subtasks" in cleaned and delegation["task"] in cleaned["subtasks"]:
-                cleaned["subtasks"].remove(delegation["task"])
+                subtasks = list(cleaned["subtasks"])
+                subtasks.remove(delegation["task"])
+                cleaned["subtasks"] = subtasks
 
             # Remove specialized context
             for key in delegation["context_subset"].keys():
@@ -256,9 +536,8 @@ class ContextOptimizer:
 
     def estimate_tokens(self, context: Any) -> int:
         """Estimate token count for context"""
-        # Simplified estimation: ~4 characters per token
-        context_str = json.dumps(context) if isinstance(context, dict) else str(context)
-        return len(context_str) // 4
+        # Default model: ~4 characters per token
+        return self.token_estimator.estimate(context)
 
     def calculate_cost_savings(self, original: int, reduced: int) -> float:
         """Calculate estimated cost savings from context reduction"""
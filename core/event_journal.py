@@ -0,0 +1,236 @@
+"""
+Append-only event journal for the local event system.
+
+Events are appended as JSON lines to numbered segment files. Consumers
+track how far they have read with committed offsets, so pending events,
+history and cleanup are offset scans instead of directory listings.
+"""
+
+import fcntl
+import json
+import os
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# (segment number, byte offset within the segment)
+Position = Tuple[int, int]
+
+
+class EventJournal:
+    """
+    Segmented append-only log of event records.
+
+    Appends from any number of processes are serialized with an fcntl lock.
+    Segments rotate at segment_max_bytes; segments older than the retention
+    period are deleted once every consumer has read past them.
+    """
+
+    def __init__(
+        self,
+        journal_dir: Path,
+        segment_max_bytes: int = 4 * 1024 * 1024,
+        retention_days: int = 7,
+    ):
+        self.journal_dir = Path(journal_dir)
+        self.offsets_dir = self.journal_dir / "offsets"
+        self.offsets_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.retention_days = retention_days
+        self._lock_path = self.journal_dir / ".lock"
+        self._active: Optional[int] = None
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.journal_dir / f"segment_{segment:08d}.log"
+
+    def segments(self) -> List[int]:
+        """Numbers of existing segments, oldest first"""
+        return sorted(
+            int(path.stem.split("_")[1])
+            for path in self.journal_dir.glob("segment_*.log")
+        )
+
+    @contextmanager
+    def _locked(self, path: Path):
+        with open(path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # Appending
+
+    def append(self, record: Dict[str, Any]) -> Position:
+        """
+        Append a record to the active segment.
+
+        Args:
+            record: JSON-serializable event record
+
+        Returns:
+            Position of the record
+        """
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode()
+
+        with self._locked(self._lock_path):
+            # Another process may have rotated since our last append
+            if self._active is None or self._segment_path(self._active + 1).exists():
+                existing = self.segments()
+                self._active = existing[-1] if existing else 1
+
+            path = self._segment_path(self._active)
+            try:
+                size = path.stat().st_size
+            except FileNotFoundError:
+                size = 0
+
+            if size and size + len(line) > self.segment_max_bytes:
+                self._active += 1
+                path = self._segment_path(self._active)
+                size = 0
+                self._enforce_retention(self.retention_days)
+
+            with open(path, "ab") as f:
+                f.write(line)
+
+        return (self._active, size)
+
+    # Reading
+
+    def end_position(self) -> Position:
+        """Position just past the last record"""
+        existing = self.segments()
+        if not existing:
+            return (1, 0)
+        return (existing[-1], self._segment_path(existing[-1]).stat().st_size)
+
+    def read(
+        self, start: Position = None, limit: int = None
+    ) -> Iterator[Tuple[Position, Dict[str, Any]]]:
+        """
+        Read records from a position onward.
+
+        Args:
+            start: Position to start at (default: oldest record)
+            limit: Maximum number of records
+
+        Yields:
+            (position after the record, record)
+        """
+        existing = self.segments()
+        start = start or (existing[0] if existing else 1, 0)
+        count = 0
+
+        for segment in existing:
+            if segment < start[0]:
+                continue
+            offset = start[1] if segment == start[0] else 0
+            try:
+                with open(self._segment_path(segment), "rb") as f:
+                    f.seek(offset)
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            # Still being written (or torn in an old segment)
+                            break
+                        offset += len(line)
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue
+                        yield (segment, offset), record
+                        count += 1
+                        if limit is not None and count >= limit:
+                            return
+            except FileNotFoundError:
+                continue
+
+    def read_before(self, end: Position, limit: int) -> List[Dict[str, Any]]:
+        """
+        Read the newest records before a position, newest first.
+
+        Segments are scanned backwards from the position, so the cost
+        depends on the limit, not on the size of the journal.
+        """
+        records: List[Dict[str, Any]] = []
+        for segment in reversed([s for s in self.segments() if s <= end[0]]):
+            tail: deque = deque(maxlen=limit - len(records))
+            for position, record in self.read((segment, 0)):
+                if position[0] != segment or (
+                    segment == end[0] and position[1] > end[1]
+                ):
+                    break
+                tail.append(record)
+            records.extend(reversed(tail))
+            if len(records) >= limit:
+                break
+        return records
+
+    # Consumer offsets
+
+    def _offset_path(self, consumer: str) -> Path:
+        return self.offsets_dir / f"{consumer}.json"
+
+    def get_offset(self, consumer: str) -> Position:
+        """Committed position of a consumer (oldest record if none)"""
+        try:
+            data = json.loads(self._offset_path(consumer).read_text())
+            return (data["segment"], data["offset"])
+        except (OSError, ValueError, KeyError):
+            existing = self.segments()
+            return (existing[0] if existing else 1, 0)
+
+    def commit(self, consumer: str, position: Position) -> None:
+        """Atomically record how far a consumer has processed"""
+        path = self._offset_path(consumer)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"segment": position[0], "offset": position[1]}))
+        os.replace(tmp_path, path)
+
+    @contextmanager
+    def consumer_lock(self, consumer: str):
+        """Exclusive access to a consumer's offset across processes"""
+        with self._locked(self.offsets_dir / f"{consumer}.lock"):
+            yield
+
+    # Retention
+
+    def _enforce_retention(self, days: int) -> int:
+        existing = self.segments()
+        if len(existing) < 2:
+            return 0
+
+        # Never delete what some consumer has not read yet
+        consumers = [p.stem for p in self.offsets_dir.glob("*.json")]
+        if not consumers:
+            return 0
+        oldest_unread = min(self.get_offset(c)[0] for c in consumers)
+
+        cutoff = (datetime.now() - timedelta(days=days)).timestamp()
+        removed = 0
+        for segment in existing[:-1]:
+            if segment >= oldest_unread:
+                break
+            path = self._segment_path(segment)
+            try:
+                if path.stat().st_mtime >= cutoff:
+                    continue
+                removed += path.read_bytes().count(b"\n")
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def enforce_retention(self, days: int = None) -> int:
+        """
+        Delete consumed segments whose newest event is older than days.
+
+        Returns:
+            Number of events removed
+        """
+        with self._locked(self._lock_path):
+            return self._enforce_retention(
+                self.retention_days if days is None else days
+            )
@@ -11,8 +11,10 @@ Implements 12-Factor Agent methodology:
 """
 
 import asyncio
+import heapq
 import uuid
-from typing import Dict, List, Any, Optional, Callable
+import weakref
+from typing import Dict, List, Any, Optional, Callable, Set
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -52,6 +54,10 @@ class TaskComplexity(Enum):
     ENTERPRISE = "enterprise"  # Requires full orchestration
 
 
+class OrchestrationCancelled(Exception):
+    """Raised when an orchestration is cancelled while its subtasks run"""
+
+
 @dataclass
 class OrchestrationTask:
     """Task in the orchestration hierarchy"""
@@ -316,9 +322,71 @@ class TaskDecomposer:
         ]
 
 
+class _CapabilityIndex:
+    """
+    Keyword index over agent specializations
+
+    Specializations are tokenized once per distribution and stored in an
+    inverted index (keyword -> agents). Tasks with the same keyword set
+    share one ranked candidate list, and full agents are skipped with a
+    cursor, since loads only grow while a batch is assigned.
+    """
+
+    def __init__(self, agents: List[AgentInfo]):
+        self.agents = agents
+        self.keyword_index: Dict[str, List[int]] = {}
+        for index, agent in enumerate(agents):
+            keywords = set()
+            for spec in agent.specializations:
+                keywords.update(spec.lower().split())
+            for keyword in keywords:
+                self.keyword_index.setdefault(keyword, []).append(index)
+
+        # keyword set -> [ranked agent indices, cursor]
+        self._candidates: Dict[frozenset, List[Any]] = {}
+
+    def _ranked(self, keywords: frozenset) -> List[Any]:
+        if keywords not in self._candidates:
+            scores: Dict[int, int] = {}
+            for keyword in keywords:
+                for index in self.keyword_index.get(keyword, ()):
+                    scores[index] = scores.get(index, 0) + 1
+            # Highest score first, earlier agents win ties
+            ranked = sorted(scores, key=lambda i: (-scores[i], i))
+            self._candidates[keywords] = [ranked, 0]
+        return self._candidates[keywords]
+
+    def best_match(self, task: OrchestrationTask) -> AgentInfo:
+        """Best matching agent with spare capacity (first agent if none)"""
+        # Only indexed keywords affect the ranking, so tasks that differ in
+        # other words share a candidate list
+        keywords = frozenset(
+            word for word in task.content.lower().split() if word in self.keyword_index
+        )
+        entry = self._ranked(keywords)
+        ranked, cursor = entry
+        while cursor < len(ranked):
+            agent = self.agents[ranked[cursor]]
+            if agent.current_load < agent.max_capacity:
+                entry[1] = cursor
+                return agent
+            cursor += 1
+        entry[1] = cursor
+        return self.agents[0]
+
+
 class WorkloadDistributor:
     """Intelligent workload distribution across agents"""
 
+    # Highest priority first
+    COMPLEXITY_RANK = {
+        TaskComplexity.ENTERPRISE: 0,
+        TaskComplexity.COMPLEX: 1,
+        TaskComplexity.MODERATE: 2,
+        TaskComplexity.SIMPLE: 3,
+        TaskComplexity.ATOMIC: 4,
+    }
+
     def __init__(self):
         self.load_balancing_strategies = {
             "round_robin": self._round_robin,
@@ -333,7 +401,20 @@ class WorkloadDistributor:
         agents: List[AgentInfo],
         strategy: str = "least_loaded",
     ) -> Dict[str, List[str]]:
-        """Distribute tasks to agents using specified strategy"""
+        """
+        Distribute a batch of tasks to agents using specified strategy
+
+        Agent loads and specialization keywords are indexed once per call,
+        so the batch is assigned without rescanning every agent per task.
+
+        Args:
+            tasks: Tasks to assign
+            agents: Candidate agents; their current_load is updated
+            strategy: Load balancing strategy name
+
+        Returns:
+            Mapping of agent_id to assigned task_ids
+        """
 
         if strategy not in self.load_balancing_strategies:
             strategy = "least_loaded"
@@ -359,11 +440,16 @@ class WorkloadDistributor:
         """Distribute to least loaded agents"""
         distribution = {agent.agent_id: [] for agent in agents}
 
+        # Min-heap of (load, position); position keeps ties in agent order
+        heap = [(agent.current_load, i) for i, agent in enumerate(agents)]
+        heapq.heapify(heap)
+
         for task in tasks:
-            # Find agent with lowest current load
-            least_loaded = min(agents, key=lambda a: a.current_load)
+            load, i = heap[0]
+            least_loaded = agents[i]
             distribution[least_loaded.agent_id].append(task.task_id)
             least_loaded.current_load += 1
+            heapq.heapreplace(heap, (load + 1, i))
 
         return distribution
 
@@ -372,10 +458,10 @@ class WorkloadDistributor:
     ) -> Dict[str, List[str]]:
         """Distribute based on agent capabilities"""
         distribution = {agent.agent_id: [] for agent in agents}
+        index = _CapabilityIndex(agents)
 
         for task in tasks:
-            # Simple capability matching (can be enhanced)
-            best_agent = self._find_best_capability_match(task, agents)
+            best_agent = index.best_match(task)
             distribution[best_agent.agent_id].append(task.task_id)
             best_agent.current_load += 1
 
@@ -388,23 +474,26 @@ class WorkloadDistributor:
         distribution = {agent.agent_id: [] for agent in agents}
 
         # Sort tasks by complexity (proxy for priority)
-        complexity_order = [
-            TaskComplexity.ENTERPRISE,
-            TaskComplexity.COMPLEX,
-            TaskComplexity.MODERATE,
-            TaskComplexity.SIMPLE,
-            TaskComplexity.ATOMIC,
-        ]
+        sorted_tasks = sorted(tasks, key=lambda t: self.COMPLEXITY_RANK[t.complexity])
 
-        sorted_tasks = sorted(tasks, key=lambda t: complexity_order.index(t.complexity))
+        # Min-heap of agents with spare capacity; full agents drop out
+        heap = [
+            (agent.current_load, i)
+            for i, agent in enumerate(agents)
+            if agent.current_load < agent.max_capacity
+        ]
+        heapq.heapify(heap)
 
         for task in sorted_tasks:
+            if not heap:
+                break
             # Assign to least loaded capable agent
-            capable_agents = [a for a in agents if a.current_load < a.max_capacity]
-            if capable_agents:
-                best_agent = min(capable_agents, key=lambda a: a.current_load)
-                distribution[best_agent.agent_id].append(task.task_id)
-                best_agent.current_load += 1
+            load, i = heapq.heappop(heap)
+            best_agent = agents[i]
+            distribution[best_agent.agent_id].append(task.task_id)
+            best_agent.current_load += 1
+            if best_agent.current_load < best_agent.max_capacity:
+                heapq.heappush(heap, (load + 1, i))
 
         return distribution
 
@@ -412,29 +501,7 @@ class WorkloadDistributor:
         self, task: OrchestrationTask, agents: List[AgentInfo]
     ) -> AgentInfo:
         """Find agent with best capability match for task"""
-
-        # Simple keyword matching (can be enhanced with semantic similarity)
-        task_keywords = set(task.content.lower().split())
-
-        best_agent = agents[0]
-        best_score = 0
-
-        for agent in agents:
-            if agent.current_load >= agent.max_capacity:
-                continue
-
-            # Calculate capability match score
-            agent_keywords = set()
-            for spec in agent.specializations:
-                agent_keywords.update(spec.lower().split())
-
-            match_score = len(task_keywords.intersection(agent_keywords))
-
-            if match_score > best_score:
-                best_score = match_score
-                best_agent = agent
-
-        return best_agent
+        return _CapabilityIndex(agents).best_match(task)
 
 
 class HierarchicalOrchestrator(BaseAgent):
@@ -473,6 +540,13 @@ class HierarchicalOrchestrator(BaseAgent):
         self.agents: Dict[str, AgentInfo] = {}
         self.active_orchestrations: Dict[str, Dict[str, Any]] = {}
 
+        # Concurrency control: running subtasks per orchestration and one
+        # semaphore per hierarchy level, kept per event loop because a
+        # semaphore binds to the loop that first waits on it
+        self._running_subtasks: Dict[str, Set[asyncio.Future]] = {}
+        self._cancelled_orchestrations: Set[str] = set()
+        self._level_semaphores = weakref.WeakKeyDictionary()
+
         # Register self as primary agent
         self.agents[self.agent_id] = AgentInfo(
             agent_id=self.agent_id, level=OrchestrationLevel.PRIMARY, max_capacity=5
@@ -505,6 +579,11 @@ class HierarchicalOrchestrator(BaseAgent):
         if not orchestration_id:
             orchestration_id = str(uuid.uuid4())
 
+        self.active_orchestrations[orchestration_id] = {
+            "task": task,
+            "started_at": datetime.now(),
+        }
+
         try:
             # Phase 1: Decompose task into hierarchy
             logger.info(f"🏗️ Decomposing task: {task}")
@@ -560,6 +639,11 @@ class HierarchicalOrchestrator(BaseAgent):
                 error_message=str(e),
             )
 
+        finally:
+            self.active_orchestrations.pop(orchestration_id, None)
+            self._running_subtasks.pop(orchestration_id, None)
+            self._cancelled_orchestrations.discard(orchestration_id)
+
     async def _store_task_hierarchy(self, task: OrchestrationTask):
         """Recursively store task hierarchy"""
         self.tasks[task.task_id] = task
@@ -675,13 +759,7 @@ class HierarchicalOrchestrator(BaseAgent):
         # Map phase: distribute subtasks
         logger.info(f"🗺️ MapReduce Map phase: {task.task_id}")
 
-        subtask_results = []
-        for subtask_id in task.subtasks:
-            # In real implementation, execute subtask with appropriate agent
-            subtask = self.tasks.get(subtask_id)
-            if subtask:
-                result = await self._execute_single_task(subtask, orchestration_id)
-                subtask_results.append(result)
+        subtask_results = await self._run_subtasks(task, orchestration_id)
 
         # Reduce phase: aggregate results
         logger.info(f"📊 MapReduce Reduce phase: {task.task_id}")
@@ -716,19 +794,10 @@ class HierarchicalOrchestrator(BaseAgent):
 
         logger.info(f"🍴 Fork-Join execution: {task.task_id}")
 
-        # Fork phase: parallel execution
-        subtask_coroutines = []
-        for subtask_id in task.subtasks:
-            subtask = self.tasks.get(subtask_id)
-            if subtask:
-                coroutine = self._execute_single_task(subtask, orchestration_id)
-                subtask_coroutines.append(coroutine)
-
-        # Execute in parallel
-        if subtask_coroutines:
-            results = await asyncio.gather(*subtask_coroutines, return_exceptions=True)
-        else:
-            results = []
+        # Fork phase: parallel execution, failures are kept for the join
+        results = await self._run_subtasks(
+            task, orchestration_id, return_exceptions=True
+        )
 
         # Join phase: synchronize and merge
         return await self._join_results(results, task)
@@ -741,13 +810,7 @@ class HierarchicalOrchestrator(BaseAgent):
         logger.info(f"📡 Scatter-Gather execution: {task.task_id}")
 
         # Scatter: broadcast task to multiple agents
-        scattered_results = []
-
-        for subtask_id in task.subtasks:
-            subtask = self.tasks.get(subtask_id)
-            if subtask:
-                result = await self._execute_single_task(subtask, orchestration_id)
-                scattered_results.append(result)
+        scattered_results = await self._run_subtasks(task, orchestration_id)
 
         # Gather: collect and merge responses
         return await self._gather_results(scattered_results, task)
@@ -789,6 +852,73 @@ class HierarchicalOrchestrator(BaseAgent):
 
             raise e
 
+    def _level_semaphore(self, level: OrchestrationLevel) -> asyncio.Semaphore:
+        """Semaphore limiting concurrent subtasks at a level on the running loop"""
+        semaphores = self._level_semaphores.setdefault(asyncio.get_running_loop(), {})
+        if level.value not in semaphores:
+            limit = max(1, self.max_agents_per_level.get(level.value, 1))
+            semaphores[level.value] = asyncio.Semaphore(limit)
+        return semaphores[level.value]
+
+    async def _run_subtasks(
+        self,
+        task: OrchestrationTask,
+        orchestration_id: str,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Execute a task's subtasks concurrently
+
+        Each subtask holds a slot of its level's semaphore while it runs, so
+        fan-out is bounded by max_agents_per_level. Without return_exceptions
+        the first failure cancels the remaining subtasks.
+
+        Args:
+            task: Parent task
+            orchestration_id: Orchestration the subtasks belong to
+            return_exceptions: Return failures as results instead of raising
+
+        Returns:
+            Subtask results in subtask order
+
+        Raises:
+            OrchestrationCancelled: If cancel_orchestration was called
+        """
+        subtasks = [self.tasks[s] for s in task.subtasks if s in self.tasks]
+        if orchestration_id in self._cancelled_orchestrations:
+            raise OrchestrationCancelled(f"Orchestration cancelled: {orchestration_id}")
+        if not subtasks:
+            return []
+
+        async def run(subtask: OrchestrationTask) -> Any:
+            async with self._level_semaphore(subtask.level):
+                return await self._execute_single_task(subtask, orchestration_id)
+
+        futures = [asyncio.ensure_future(run(subtask)) for subtask in subtasks]
+        running = self._running_subtasks.setdefault(orchestration_id, set())
+        running.update(futures)
+
+        try:
+            results = await asyncio.gather(
+                *futures, return_exceptions=return_exceptions
+            )
+        except asyncio.CancelledError:
+            if orchestration_id in self._cancelled_orchestrations:
+                raise OrchestrationCancelled(
+                    f"Orchestration cancelled: {orchestration_id}"
+                )
+            raise
+        finally:
+            running.difference_update(futures)
+            for future in futures:
+                if not future.done():
+                    future.cancel()
+
+        if orchestration_id in self._cancelled_orchestrations:
+            raise OrchestrationCancelled(f"Orchestration cancelled: {orchestration_id}")
+
+        return results
+
     async def _execute_single_task(
         self, task: OrchestrationTask, orchestration_id: str, input_data: Any = None
     ) -> Any:
@@ -962,6 +1092,11 @@ class HierarchicalOrchestrator(BaseAgent):
                 if task.status == "pending":
                     task.status = "cancelled"
 
+            # Stop subtasks that are still running
+            self._cancelled_orchestrations.add(orchestration_id)
+            for future in self._running_subtasks.pop(orchestration_id, set()):
+                future.cancel()
+
             del self.active_orchestrations[orchestration_id]
             return True
 
@@ -0,0 +1,133 @@
+"""
+Minimal Linux inotify binding via ctypes.
+
+Used by the local event system to wait for file changes instead of
+polling. No external dependencies; `Inotify.available()` is False on
+platforms without inotify.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+from typing import List, NamedTuple
+
+# Event masks (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+# inotify_init1 flags
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+
+_EVENT_HEADER = struct.Struct("iIII")
+_libc = None
+
+
+class InotifyEvent(NamedTuple):
+    """A single event read from an inotify descriptor"""
+
+    wd: int
+    mask: int
+    cookie: int
+    name: str
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(
+            ctypes.util.find_library("c") or "libc.so.6", use_errno=True
+        )
+        _libc.inotify_init1.argtypes = [ctypes.c_int]
+        _libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        _libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return _libc
+
+
+def _check(result: int) -> int:
+    if result < 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+    return result
+
+
+class Inotify:
+    """Non-blocking inotify descriptor that can be used with select()"""
+
+    @staticmethod
+    def available() -> bool:
+        """Check whether inotify can be used on this platform"""
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            Inotify().close()
+            return True
+        except (OSError, AttributeError):
+            return False
+
+    def __init__(self):
+        self._libc = _load_libc()
+        self.fd = _check(self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC))
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def add_watch(self, path, mask: int) -> int:
+        """
+        Watch a directory or file.
+
+        Args:
+            path: Path to watch
+            mask: IN_* event mask
+
+        Returns:
+            Watch descriptor (the same one for repeated calls on a path)
+        """
+        return _check(
+            self._libc.inotify_add_watch(self.fd, os.fsencode(str(path)), mask)
+        )
+
+    def rm_watch(self, wd: int) -> None:
+        """Stop watching a watch descriptor"""
+        try:
+            _check(self._libc.inotify_rm_watch(self.fd, wd))
+        except OSError:
+            pass  # Already removed, e.g. the directory was deleted
+
+    def read_events(self, buffer_size: int = 65536) -> List[InotifyEvent]:
+        """Read all queued events without blocking"""
+        try:
+            data = os.read(self.fd, buffer_size)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            events.append(InotifyEvent(wd, mask, cookie, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
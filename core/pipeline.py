@@ -6,10 +6,23 @@ Implements 12-factor agent principles with complex workflow support.
 
 import asyncio
 import logging
+import math
 import time
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Dict, List, Optional, Tuple, Any
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from .agent import BaseAgent
 from .tools import ToolResponse
@@ -17,12 +30,84 @@ from .tools import ToolResponse
 logger = logging.getLogger(__name__)
 
 
+class LatencyHistogram:
+    """
+    Latency histogram (milliseconds) with fixed, log-spaced buckets.
+    Memory stays constant however many samples are recorded.
+    """
+
+    def __init__(
+        self,
+        min_ms: float = 0.001,
+        max_ms: float = 3_600_000,
+        buckets_per_decade: int = 10,
+    ):
+        self.min_ms = min_ms
+        self.buckets_per_decade = buckets_per_decade
+        decades = math.log10(max_ms / min_ms)
+        # Bucket 0 holds samples <= min_ms, the last one everything above max_ms
+        self.counts = [0] * (math.ceil(decades * buckets_per_decade) + 2)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _bucket(self, value_ms: float) -> int:
+        if value_ms <= self.min_ms:
+            return 0
+        index = 1 + int(math.log10(value_ms / self.min_ms) * self.buckets_per_decade)
+        return min(index, len(self.counts) - 1)
+
+    def _upper_bound(self, index: int) -> float:
+        return self.min_ms * 10 ** (index / self.buckets_per_decade)
+
+    def record(self, value_ms: float):
+        """Add a sample"""
+        self.counts[self._bucket(value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        self.max = max(self.max, value_ms)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0
+
+    def percentile(self, percent: float) -> float:
+        """Upper bound of the bucket holding the given percentile"""
+        if not self.count:
+            return 0
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= max(rank, 1):
+                return min(self._upper_bound(index), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_ms": self.mean,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max,
+        }
+
+
 class PipelineStage(ABC):
     """
     Abstract base class for pipeline stages.
     Factor 10: Small, focused agents - each stage has single responsibility.
+
+    Batch concurrency hints:
+    - max_concurrency: most items this stage may process at once (None = no limit)
+    - needs_batch_context: stage reads previous_result/previous_decision/next_item
+      from its context, so each item waits for the previous one before this stage
     """
 
+    max_concurrency: Optional[int] = None
+    needs_batch_context: bool = False
+
     def __init__(self, stage_name: str, stage_id: int):
         self.stage_name = stage_name
         self.stage_id = stage_id
@@ -73,9 +158,11 @@ class MultiStagePipeline(BaseAgent):
     - Error context preservation
     """
 
-    def __init__(self, agent_id: str = None):
-        super().__init__(agent_id)
+    def __init__(self, agent_id: str = None, max_in_flight: int = 8):
+        # register_tools() runs inside BaseAgent.__init__
         self.stages: List[PipelineStage] = []
+        super().__init__(agent_id)
+        self.max_in_flight = max_in_flight
         self.pipeline_stats = {
             "total_processed": 0,
             "stage_exits": {},
@@ -94,7 +181,7 @@ class MultiStagePipeline(BaseAgent):
         """Add stage to pipeline"""
         self.stages.append(stage)
         self.pipeline_stats["stage_exits"][stage.stage_name] = 0
-        self.pipeline_stats["processing_times"][stage.stage_name] = []
+        self.pipeline_stats["processing_times"][stage.stage_name] = LatencyHistogram()
 
         # Update total stages for progress tracking
         self.total_stages = len(self.stages)
@@ -108,8 +195,40 @@ class MultiStagePipeline(BaseAgent):
         Process single item through complete pipeline.
         Implements pin-citer's sophisticated cascade logic.
         """
+
+        async def same_context(stage: PipelineStage) -> Optional[Dict]:
+            return context
+
+        return await self._run_item(item, item_index, same_context)
+
+    async def _run_item(
+        self,
+        item: Any,
+        item_index: int,
+        stage_context: Callable[[PipelineStage], Awaitable[Optional[Dict]]],
+        stage_limits: Optional[Dict[str, asyncio.Semaphore]] = None,
+    ) -> Tuple[PipelineDecision, Dict]:
+        """Run one item through the stages with per-stage context"""
         start_time = time.time()
-        metadata = {
+        metadata = self._start_item(item_index)
+        current_data = item
+
+        # Process through each stage
+        for stage in self.stages:
+            context = await stage_context(stage)
+            limit = stage_limits.get(stage.stage_name) if stage_limits else None
+            current_data, decision = await self._run_stage(
+                stage, current_data, context, metadata, limit
+            )
+            if decision is not None:
+                break
+
+        return self._finish_item(metadata, current_data, start_time)
+
+    def _start_item(self, item_index: int) -> Dict:
+        """Create the metadata record for an item entering the pipeline"""
+        self.pipeline_stats["total_processed"] += 1
+        return {
             "item_index": item_index,
             "stages_used": [],
             "processing_time_ms": 0,
@@ -117,63 +236,81 @@ class MultiStagePipeline(BaseAgent):
             "stage_metadata": {},
         }
 
-        self.pipeline_stats["total_processed"] += 1
-        current_data = item
+    async def _run_stage(
+        self,
+        stage: PipelineStage,
+        data: Any,
+        context: Optional[Dict],
+        metadata: Dict,
+        limit: Optional[asyncio.Semaphore] = None,
+    ) -> Tuple[Any, Optional[PipelineDecision]]:
+        """
+        Run one stage for one item.
 
-        # Process through each stage
-        for stage in self.stages:
-            stage_start = time.time()
+        Returns:
+            (data for the next stage, decision if the item leaves the pipeline)
+        """
+        try:
+            if limit is not None:
+                await limit.acquire()
 
             try:
+                stage_start = time.time()
+
                 # Update progress
                 self.set_progress(stage.stage_id / len(self.stages), stage.stage_name)
 
                 # Process through stage
-                result, stage_meta = await stage.process_async(current_data, context)
-
-                # Track statistics
-                stage.stats["processed"] += 1
-                metadata["stages_used"].append(stage.stage_id)
-                metadata["stage_metadata"][stage.stage_name] = stage_meta
-
-                # Record processing time
-                stage_time = (time.time() - stage_start) * 1000
-                self.pipeline_stats["processing_times"][stage.stage_name].append(
-                    stage_time
+                result, stage_meta = await stage.process_async(data, context)
+            finally:
+                if limit is not None:
+                    limit.release()
+
+            # Track statistics
+            stage.stats["processed"] += 1
+            metadata["stages_used"].append(stage.stage_id)
+            metadata["stage_metadata"][stage.stage_name] = stage_meta
+
+            # Record processing time
+            stage_time = (time.time() - stage_start) * 1000
+            self.pipeline_stats["processing_times"][stage.stage_name].record(stage_time)
+
+            # Check for early exit (pin-citer efficiency pattern)
+            if stage.should_exit(result, stage_meta):
+                stage.stats["exits"] += 1
+                self.pipeline_stats["stage_exits"][stage.stage_name] += 1
+
+                metadata["decision"] = PipelineDecision.EXIT_SUCCESS
+                metadata["exit_stage"] = stage.stage_name
+                metadata["exit_reason"] = stage_meta.get(
+                    "reason", "Stage determined exit"
                 )
+                return data, metadata["decision"]
 
-                # Check for early exit (pin-citer efficiency pattern)
-                if stage.should_exit(result, stage_meta):
-                    stage.stats["exits"] += 1
-                    self.pipeline_stats["stage_exits"][stage.stage_name] += 1
-
-                    metadata["decision"] = PipelineDecision.EXIT_SUCCESS
-                    metadata["exit_stage"] = stage.stage_name
-                    metadata["exit_reason"] = stage_meta.get(
-                        "reason", "Stage determined exit"
-                    )
-                    break
+            # Update data for next stage
+            return result, None
 
-                # Update data for next stage
-                current_data = result
-
-            except Exception as e:
-                # Enhanced error handling (pin-citer pattern)
-                stage.stats["errors"] += 1
-                self.handle_error(e, f"Stage {stage.stage_name}")
+        except Exception as e:
+            # Enhanced error handling (pin-citer pattern)
+            stage.stats["errors"] += 1
+            self.handle_error(e, f"Stage {stage.stage_name}")
 
-                metadata["decision"] = PipelineDecision.EXIT_FAILURE
-                metadata["error_stage"] = stage.stage_name
-                metadata["error"] = str(e)
-                break
+            metadata["decision"] = PipelineDecision.EXIT_FAILURE
+            metadata["error_stage"] = stage.stage_name
+            metadata["error"] = str(e)
+            return data, metadata["decision"]
 
+    def _finish_item(
+        self, metadata: Dict, data: Any, start_time: float
+    ) -> Tuple[PipelineDecision, Dict]:
+        """Complete an item's metadata once it leaves the pipeline"""
         # If no early exit, pipeline completed successfully
         if metadata["decision"] is None:
             metadata["decision"] = PipelineDecision.CONTINUE
             self.set_progress(1.0, "completed")
 
         metadata["processing_time_ms"] = (time.time() - start_time) * 1000
-        metadata["final_result"] = current_data
+        metadata["final_result"] = data
 
         return metadata["decision"], metadata
 
@@ -184,36 +321,193 @@ class MultiStagePipeline(BaseAgent):
         return asyncio.run(self.process_item_async(item, context, item_index))
 
     async def process_batch_async(
-        self, items: List[Any]
+        self, items: List[Any], max_in_flight: Optional[int] = None
     ) -> List[Tuple[PipelineDecision, Dict]]:
         """
         Process batch of items through pipeline.
-        Implements context tracking between items (pin-citer pattern).
-        """
-        results = []
-        context = {}
 
-        for i, item in enumerate(items):
-            # Build contextual information
-            if i > 0:
-                # Add previous item context
-                prev_result = results[-1]
-                context["previous_result"] = prev_result[1].get("final_result")
-                context["previous_decision"] = prev_result[0]
+        Up to max_in_flight items (default: the pipeline's max_in_flight) run
+        concurrently and results are returned in input order. Stages cap their
+        own concurrency with max_concurrency. Stages that set
+        needs_batch_context get previous_result/previous_decision/next_item
+        context (pin-citer pattern); an item waits for the previous item to
+        finish only before entering such a stage.
 
-            if i < len(items) - 1:
-                context["next_item"] = items[i + 1]
+        Args:
+            items: Items to process
+            max_in_flight: Most items processed at once (1 = sequential)
 
-            # Process item
-            decision, metadata = await self.process_item_async(item, context, i)
-            results.append((decision, metadata))
+        Returns:
+            (decision, metadata) per item, in input order
+        """
+        results: List[Optional[Tuple[PipelineDecision, Dict]]] = [None] * len(items)
+        finished = [asyncio.Event() for _ in items]
+        stage_limits = {
+            stage.stage_name: asyncio.Semaphore(stage.max_concurrency)
+            for stage in self.stages
+            if stage.max_concurrency
+        }
+        pending = iter(range(len(items)))
+
+        def context_for(i: int):
+            async def stage_context(stage: PipelineStage) -> Dict:
+                if not stage.needs_batch_context:
+                    return {}
+
+                # Build contextual information
+                context = {}
+                if i > 0:
+                    # Add previous item context
+                    await finished[i - 1].wait()
+                    prev_result = results[i - 1]
+                    context["previous_result"] = prev_result[1].get("final_result")
+                    context["previous_decision"] = prev_result[0]
+
+                if i < len(items) - 1:
+                    context["next_item"] = items[i + 1]
+                return context
+
+            return stage_context
+
+        async def worker():
+            # Workers take items in order, so an item's predecessor has
+            # always started before it waits on it
+            for i in pending:
+                try:
+                    results[i] = await self._run_item(
+                        items[i], i, context_for(i), stage_limits
+                    )
+                finally:
+                    finished[i].set()
 
-            # Small delay to avoid overwhelming downstream systems
-            if len(self.stages) > 1:
-                await asyncio.sleep(0.05)
+        workers = max(1, min(max_in_flight or self.max_in_flight, len(items)))
+        await asyncio.gather(*(worker() for _ in range(workers)))
 
         return results
 
+    async def stream_async(
+        self,
+        items: Union[AsyncIterable[Any], Iterable[Any]],
+        context: Optional[Dict] = None,
+        workers_per_stage: int = 4,
+        queue_size: int = 64,
+        ordered: bool = True,
+    ) -> AsyncIterator[Tuple[PipelineDecision, Dict]]:
+        """
+        Stream items through the pipeline with all stages running at once.
+
+        Each stage runs as its own group of workers (max_concurrency or
+        workers_per_stage), connected by bounded queues, so at most a few
+        queues' worth of items are held in memory. Items that exit early
+        skip the remaining stages.
+
+        Args:
+            items: Async or regular iterable of items
+            context: Context passed to every stage
+            workers_per_stage: Workers for stages without max_concurrency
+            queue_size: Capacity of each queue between stages
+            ordered: Yield results in input order (otherwise as they finish)
+
+        Yields:
+            (decision, metadata) per item
+        """
+        for stage in self.stages:
+            if stage.needs_batch_context:
+                raise ValueError(
+                    f"Stage {stage.stage_name} needs batch context; "
+                    "use process_batch_async instead"
+                )
+
+        queues = [asyncio.Queue(queue_size) for _ in self.stages]
+        finished: asyncio.Queue = asyncio.Queue(queue_size)
+        end_of_stream = object()
+        errors: List[BaseException] = []
+
+        # Items admitted but not yet yielded, which bounds the reorder buffer
+        window = asyncio.Semaphore(queue_size * (len(self.stages) + 1))
+
+        async def deliver(stage_index: int, entry: Tuple) -> None:
+            if stage_index < len(queues):
+                await queues[stage_index].put(entry)
+            else:
+                data, metadata, start_time = entry
+                await finished.put(self._finish_item(metadata, data, start_time))
+
+        async def stage_worker(stage_index: int, stage: PipelineStage) -> None:
+            inbox = queues[stage_index]
+            while True:
+                data, metadata, start_time = await inbox.get()
+                try:
+                    data, decision = await self._run_stage(
+                        stage, data, context, metadata
+                    )
+                    # Early exits short-circuit the downstream stages
+                    next_index = len(queues) if decision else stage_index + 1
+                    await deliver(next_index, (data, metadata, start_time))
+                finally:
+                    inbox.task_done()
+
+        workers = [
+            [
+                asyncio.ensure_future(stage_worker(i, stage))
+                for _ in range(stage.max_concurrency or workers_per_stage)
+            ]
+            for i, stage in enumerate(self.stages)
+        ]
+
+        async def admit(index: int, item: Any) -> None:
+            await window.acquire()
+            await deliver(0, (item, self._start_item(index), time.time()))
+
+        async def feed() -> None:
+            try:
+                if hasattr(items, "__aiter__"):
+                    index = 0
+                    async for item in items:
+                        await admit(index, item)
+                        index += 1
+                else:
+                    for index, item in enumerate(items):
+                        await admit(index, item)
+
+                # Drain stage by stage, then stop that stage's workers
+                for stage_index, queue in enumerate(queues):
+                    await queue.join()
+                    for worker in workers[stage_index]:
+                        worker.cancel()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                await finished.put(end_of_stream)
+
+        feeder = asyncio.ensure_future(feed())
+        waiting: Dict[int, Tuple[PipelineDecision, Dict]] = {}
+        next_index = 0
+
+        try:
+            while True:
+                result = await finished.get()
+                if result is end_of_stream:
+                    break
+                if not ordered:
+                    window.release()
+                    yield result
+                    continue
+
+                waiting[result[1]["item_index"]] = result
+                while next_index in waiting:
+                    window.release()
+                    yield waiting.pop(next_index)
+                    next_index += 1
+
+            if errors:
+                raise errors[0]
+        finally:
+            feeder.cancel()
+            for group in workers:
+                for worker in group:
+                    worker.cancel()
+
     def execute_task(self, task: str) -> ToolResponse:
         """
         Execute pipeline task.
@@ -288,16 +582,19 @@ class MultiStagePipeline(BaseAgent):
     def get_pipeline_stats(self) -> Dict[str, Any]:
         """Get comprehensive pipeline statistics (pin-citer pattern)"""
         stats = self.pipeline_stats.copy()
+        stats["processing_times"] = {
+            name: histogram.to_dict()
+            for name, histogram in self.pipeline_stats["processing_times"].items()
+        }
 
         # Add stage-specific stats
         stats["stage_stats"] = {}
         for stage in self.stages:
             stage_stats = stage.get_stats()
-            # Add average processing time
+            # Add processing time summary
             times = self.pipeline_stats["processing_times"][stage.stage_name]
-            stage_stats["avg_processing_time_ms"] = (
-                sum(times) / len(times) if times else 0
-            )
+            stage_stats["avg_processing_time_ms"] = times.mean
+            stage_stats["p95_processing_time_ms"] = times.percentile(95)
             stats["stage_stats"][stage.stage_name] = stage_stats
 
         # Calculate efficiency metrics
@@ -316,7 +613,9 @@ class MultiStagePipeline(BaseAgent):
         for stage in self.stages:
             stage.stats = {"processed": 0, "exits": 0, "errors": 0}
             self.pipeline_stats["stage_exits"][stage.stage_name] = 0
-            self.pipeline_stats["processing_times"][stage.stage_name] = []
+            self.pipeline_stats["processing_times"][
+                stage.stage_name
+            ] = LatencyHistogram()
 
         logger.info(f"Pipeline statistics reset for {self.agent_id}")
 
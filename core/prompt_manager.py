@@ -4,48 +4,65 @@ Factor 2: Own Your Prompts - All prompts are externalized and version controlled
 """
 
 from pathlib import Path
-from typing import Dict, Optional, Any, List
+from typing import Dict, Optional, Any, List, Tuple
+from collections import ChainMap, OrderedDict
 import string
 import json
+import threading
+import time
 from datetime import datetime
 
 
-class PromptManager:
+class PromptCatalog:
     """
-    Manages externalized prompt templates for agents.
+    Parsed prompt templates for one prompts directory.
 
-    Features:
-    - Load prompts from files
-    - Template variable substitution
-    - Version tracking
-    - Prompt caching
+    Catalogs are shared by every PromptManager in the process and never
+    modified after loading; a refresh builds a new catalog, re-parsing only
+    the files whose mtime or size changed.
     """
 
-    def __init__(self, prompts_dir: Path = None):
-        """Initialize prompt manager with prompts directory"""
-        if prompts_dir is None:
-            prompts_dir = Path(__file__).parent.parent / "prompts"
-
+    def __init__(
+        self,
+        prompts_dir: Path,
+        previous: "PromptCatalog" = None,
+    ):
         self.prompts_dir = Path(prompts_dir)
-        self.templates = {}
-        self.metadata = {}
-        self._cache = {}
+        self.templates: Dict[str, string.Template] = {}
+        self.metadata: Dict[str, Dict[str, Any]] = {}
+        self.files: Dict[Path, Tuple[int, int]] = {}
+        self.version = previous.version + 1 if previous else 1
+        self.checked_at = time.monotonic()
 
-        if self.prompts_dir.exists():
-            self._load_all_prompts()
+        if not self.prompts_dir.exists():
+            return
 
-    def _load_all_prompts(self):
-        """Load all prompt templates from directory"""
         for prompt_file in self.prompts_dir.glob("**/*.prompt"):
-            self._load_prompt_file(prompt_file)
-
-    def _load_prompt_file(self, path: Path):
+            try:
+                stat = prompt_file.stat()
+            except OSError:
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            name = str(prompt_file.relative_to(self.prompts_dir).with_suffix(""))
+
+            # Reuse the parsed template when the file is unchanged
+            if previous and previous.files.get(prompt_file) == signature:
+                if name in previous.templates:
+                    self.templates[name] = previous.templates[name]
+                    self.metadata[name] = previous.metadata[name]
+                    self.files[prompt_file] = signature
+                continue
+
+            if self._load_prompt_file(prompt_file, name):
+                self.files[prompt_file] = signature
+
+    def _load_prompt_file(self, path: Path, name: str) -> bool:
         """Load a single prompt file"""
         try:
             content = path.read_text()
 
             # Extract metadata from comments
-            metadata = self._extract_metadata(content)
+            metadata = self.extract_metadata(content)
 
             # Remove metadata comments from template
             template_lines = []
@@ -55,17 +72,16 @@ class PromptManager:
 
             template_text = "\n".join(template_lines).strip()
 
-            # Store relative to prompts directory
-            rel_path = path.relative_to(self.prompts_dir)
-            name = str(rel_path.with_suffix(""))
-
             self.templates[name] = string.Template(template_text)
             self.metadata[name] = metadata
+            return True
 
         except Exception as e:
             print(f"Warning: Failed to load prompt {path}: {e}")
+            return False
 
-    def _extract_metadata(self, content: str) -> Dict[str, Any]:
+    @staticmethod
+    def extract_metadata(content: str) -> Dict[str, Any]:
         """Extract metadata from prompt file comments"""
         metadata = {}
 
@@ -77,6 +93,105 @@ class PromptManager:
 
         return metadata
 
+    def is_stale(self) -> bool:
+        """Check whether any prompt file was added, removed or modified"""
+        if not self.prompts_dir.exists():
+            return bool(self.files)
+
+        current = set()
+        for prompt_file in self.prompts_dir.glob("**/*.prompt"):
+            current.add(prompt_file)
+            try:
+                stat = prompt_file.stat()
+            except OSError:
+                return True
+            if self.files.get(prompt_file) != (stat.st_mtime_ns, stat.st_size):
+                return True
+
+        return current != set(self.files)
+
+
+# Shared catalogs, one per prompts directory
+_catalogs: Dict[Path, PromptCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+# How often a shared catalog re-checks file mtimes (seconds)
+CATALOG_CHECK_INTERVAL = 1.0
+
+
+def get_prompt_catalog(prompts_dir: Path, force: bool = False) -> PromptCatalog:
+    """
+    Get the shared catalog for a prompts directory.
+
+    Loaded once per process and rebuilt when a prompt file changes; the
+    mtime check runs at most once per CATALOG_CHECK_INTERVAL unless forced.
+    """
+    key = Path(prompts_dir).resolve()
+    catalog = _catalogs.get(key)
+    if (
+        catalog is not None
+        and not force
+        and time.monotonic() - catalog.checked_at < CATALOG_CHECK_INTERVAL
+    ):
+        return catalog
+
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = PromptCatalog(key)
+        elif force or time.monotonic() - catalog.checked_at >= CATALOG_CHECK_INTERVAL:
+            if catalog.is_stale():
+                catalog = PromptCatalog(key, previous=catalog)
+            else:
+                catalog.checked_at = time.monotonic()
+        _catalogs[key] = catalog
+        return catalog
+
+
+class PromptManager:
+    """
+    Manages externalized prompt templates for agents.
+
+    Features:
+    - Load prompts from files (shared process-wide catalog)
+    - Template variable substitution
+    - Version tracking
+    - Prompt caching (bounded LRU)
+
+    Templates registered on a manager are copy-on-write overrides: they
+    shadow the shared catalog for that manager only.
+    """
+
+    def __init__(self, prompts_dir: Path = None, max_cache_size: int = 256):
+        """Initialize prompt manager with prompts directory"""
+        if prompts_dir is None:
+            prompts_dir = Path(__file__).parent.parent / "prompts"
+
+        self.prompts_dir = Path(prompts_dir)
+        self.max_cache_size = max_cache_size
+        self._template_overrides: Dict[str, string.Template] = {}
+        self._metadata_overrides: Dict[str, Dict[str, Any]] = {}
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._cache_version = None
+
+    def _catalog(self, force: bool = False) -> PromptCatalog:
+        catalog = get_prompt_catalog(self.prompts_dir, force=force)
+        if catalog.version != self._cache_version:
+            # Rendered prompts may come from replaced templates
+            self._cache.clear()
+            self._cache_version = catalog.version
+        return catalog
+
+    @property
+    def templates(self) -> ChainMap:
+        """Templates by name, per-manager overrides first"""
+        return ChainMap(self._template_overrides, self._catalog().templates)
+
+    @property
+    def metadata(self) -> ChainMap:
+        """Metadata by name, per-manager overrides first"""
+        return ChainMap(self._metadata_overrides, self._catalog().metadata)
+
     def load_prompt(self, name: str) -> Optional[str]:
         """Load a prompt template by name"""
         if name in self.templates:
@@ -85,8 +200,9 @@ class PromptManager:
         # Try to load from file if not cached
         prompt_path = self.prompts_dir / f"{name}.prompt"
         if prompt_path.exists():
-            self._load_prompt_file(prompt_path)
-            return self.templates.get(name, {}).get("template")
+            self._catalog(force=True)
+            template = self.templates.get(name)
+            return template.template if template else None
 
         return None
 
@@ -101,12 +217,15 @@ class PromptManager:
         Returns:
             Formatted prompt string or None if not found
         """
+        templates = self.templates
+
         # Check cache first
-        cache_key = f"{name}:{json.dumps(kwargs, sort_keys=True)}"
+        cache_key = f"{name}:{json.dumps(kwargs, sort_keys=True, default=str)}"
         if cache_key in self._cache:
+            self._cache.move_to_end(cache_key)
             return self._cache[cache_key]
 
-        if name not in self.templates:
+        if name not in templates:
             # Try to load if not already loaded
             prompt_path = self.prompts_dir / f"{name}.prompt"
             if not prompt_path.exists():
@@ -117,12 +236,15 @@ class PromptManager:
                         break
 
             if prompt_path.exists():
-                self._load_prompt_file(prompt_path)
+                self._catalog(force=True)
+                templates = self.templates
 
-        if name in self.templates:
+        if name in templates:
             try:
-                result = self.templates[name].safe_substitute(**kwargs)
+                result = templates[name].safe_substitute(**kwargs)
                 self._cache[cache_key] = result
+                if len(self._cache) > self.max_cache_size:
+                    self._cache.popitem(last=False)
                 return result
             except Exception as e:
                 print(f"Error formatting prompt {name}: {e}")
@@ -134,14 +256,16 @@ class PromptManager:
         self, name: str, template: str, metadata: Dict[str, Any] = None
     ):
         """Register a new prompt template programmatically"""
-        self.templates[name] = string.Template(template)
+        self._template_overrides[name] = string.Template(template)
         if metadata:
-            self.metadata[name] = metadata
+            self._metadata_overrides[name] = metadata
+        self.clear_cache()
 
     def get_version(self, name: str) -> Optional[str]:
         """Get version of a prompt template"""
-        if name in self.metadata:
-            return self.metadata[name].get("version", "unknown")
+        metadata = self.metadata
+        if name in metadata:
+            return metadata[name].get("version", "unknown")
         return None
 
     def list_prompts(self) -> List[str]:
@@ -174,9 +298,10 @@ class PromptManager:
 
         prompt_path.write_text(content)
 
-        # Reload to update cache
-        self._load_prompt_file(prompt_path)
+        # Reload so every manager sees the saved file
+        self._catalog(force=True)
+        self.clear_cache()
 
     def clear_cache(self):
         """Clear the prompt cache"""
-        self._cache = {}
+        self._cache = OrderedDict()
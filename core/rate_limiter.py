@@ -7,7 +7,8 @@ burst traffic gracefully while maintaining rate limits over time.
 
 Features:
 - Token bucket algorithm for burst handling
-- Thread-safe implementation
+- Thread-safe implementation with lock-striped bucket storage
+- Atomic multi-bucket checks (consume_many)
 - Configurable limits per service/agent
 - Redis backend support for distributed scenarios
 - Graceful degradation on backend failures
@@ -17,7 +18,8 @@ Features:
 import logging
 import time
 import threading
-from typing import Dict, Optional, Any, Tuple
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from functools import wraps
 from enum import Enum
@@ -69,13 +71,13 @@ class TokenBucket:
     capacity: int  # Maximum number of tokens
     refill_rate: float  # Tokens per second
     tokens: float = field(init=False)  # Current tokens available
-    last_refill: float = field(init=False)  # Last refill timestamp
+    last_refill: float = field(init=False)  # Last refill (monotonic clock)
     lock: threading.Lock = field(default_factory=threading.Lock, init=False)
 
     def __post_init__(self):
         """Initialize bucket state."""
         self.tokens = float(self.capacity)
-        self.last_refill = time.time()
+        self.last_refill = time.monotonic()
 
     def consume(self, tokens: int = 1) -> Tuple[bool, float]:
         """
@@ -88,7 +90,7 @@ class TokenBucket:
             Tuple of (success, retry_after_seconds)
         """
         with self.lock:
-            now = time.time()
+            now = time.monotonic()
             self._refill(now)
 
             if self.tokens >= tokens:
@@ -112,31 +114,126 @@ class TokenBucket:
     def remaining_tokens(self) -> int:
         """Get current number of tokens available."""
         with self.lock:
-            now = time.time()
+            now = time.monotonic()
             self._refill(now)
             return int(self.tokens)
 
 
 class MemoryBackend:
-    """In-memory backend for rate limiting using regular dict for reliable access."""
+    """
+    In-memory backend for rate limiting.
 
-    def __init__(self):
-        self._buckets: Dict[str, TokenBucket] = {}
-        self._lock = threading.Lock()
+    Buckets are spread over shards, each with its own lock, so threads
+    working on different keys rarely contend. Each shard is kept in LRU
+    order; buckets idle longer than idle_ttl (like the Redis backend's
+    one hour expiry) or beyond the size limit are evicted.
+    """
+
+    def __init__(
+        self, shards: int = 16, max_buckets: int = 100000, idle_ttl: float = 3600.0
+    ):
+        self._shards: List["OrderedDict[str, TokenBucket]"] = [
+            OrderedDict() for _ in range(shards)
+        ]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._max_per_shard = max(1, max_buckets // shards)
+        self.idle_ttl = idle_ttl
+
+    @property
+    def _buckets(self) -> Dict[str, TokenBucket]:
+        """Snapshot of all buckets across shards."""
+        buckets: Dict[str, TokenBucket] = {}
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                buckets.update(shard)
+        return buckets
+
+    def _shard_index(self, key: str) -> int:
+        return hash(key) % len(self._shards)
 
     def get_bucket(self, key: str, capacity: int, refill_rate: float) -> TokenBucket:
         """Get or create a token bucket for the given key."""
-        with self._lock:
-            if key not in self._buckets:
-                bucket = TokenBucket(capacity=capacity, refill_rate=refill_rate)
-                self._buckets[key] = bucket
-                logger.debug(f"Created new token bucket for key: {key}")
-            return self._buckets[key]
+        index = self._shard_index(key)
+        shard = self._shards[index]
+
+        with self._locks[index]:
+            bucket = shard.get(key)
+            if bucket is not None:
+                shard.move_to_end(key)
+                return bucket
+
+            self._evict(shard)
+            bucket = TokenBucket(capacity=capacity, refill_rate=refill_rate)
+            shard[key] = bucket
+            logger.debug(f"Created new token bucket for key: {key}")
+            return bucket
+
+    def _evict(self, shard: "OrderedDict[str, TokenBucket]"):
+        """Drop idle buckets and make room for one more (shard lock held)."""
+        cutoff = time.monotonic() - self.idle_ttl
+        while shard:
+            key, oldest = next(iter(shard.items()))
+            if len(shard) < self._max_per_shard and oldest.last_refill > cutoff:
+                break
+            del shard[key]
+            logger.debug(f"Evicted token bucket for key: {key}")
+
+    def consume_many(
+        self, requests: List[Tuple[str, int, float, int]]
+    ) -> Tuple[bool, float, Optional[str]]:
+        """
+        Atomically consume tokens from several buckets.
+
+        Either every bucket has enough tokens and all are charged, or none
+        is. Bucket locks are taken in key order so concurrent calls cannot
+        deadlock.
+
+        Args:
+            requests: (key, capacity, refill_rate, tokens) per bucket
+
+        Returns:
+            Tuple of (success, retry_after_seconds, limiting_key)
+        """
+        # Merge repeated keys so each bucket is locked once
+        wanted: Dict[str, int] = {}
+        buckets: Dict[str, TokenBucket] = {}
+        for key, capacity, refill_rate, tokens in requests:
+            wanted[key] = wanted.get(key, 0) + tokens
+            if key not in buckets:
+                buckets[key] = self.get_bucket(key, capacity, refill_rate)
+
+        keys = sorted(buckets)
+        acquired = []
+        try:
+            for key in keys:
+                buckets[key].lock.acquire()
+                acquired.append(buckets[key])
+
+            now = time.monotonic()
+            retry_after, limiting_key = 0.0, None
+            for key in keys:
+                bucket = buckets[key]
+                bucket._refill(now)
+                if bucket.tokens < wanted[key]:
+                    wait = (wanted[key] - bucket.tokens) / bucket.refill_rate
+                    if limiting_key is None or wait > retry_after:
+                        retry_after, limiting_key = wait, key
+
+            if limiting_key is not None:
+                return False, retry_after, limiting_key
+
+            for key in keys:
+                buckets[key].tokens -= wanted[key]
+            return True, 0.0, None
+        finally:
+            for bucket in reversed(acquired):
+                bucket.lock.release()
 
     def clear(self):
         """Clear all buckets (for testing)."""
-        with self._lock:
-            self._buckets.clear()
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
 
 
 class RedisBackend:
@@ -199,6 +296,48 @@ class RedisBackend:
         """
         )
 
+        # Multi-key variant: check every bucket, then charge all or none
+        self._consume_many_script = self.redis.register_script(
+            """
+            local now = tonumber(ARGV[1])
+            local state = {}
+            local retry_after = 0
+            local limiting = 0
+
+            for i, key in ipairs(KEYS) do
+                local base = 2 + (i - 1) * 3
+                local capacity = tonumber(ARGV[base])
+                local refill_rate = tonumber(ARGV[base + 1])
+                local requested = tonumber(ARGV[base + 2])
+
+                local bucket = redis.call('HMGET', key, 'tokens', 'last_refill')
+                local tokens = tonumber(bucket[1]) or capacity
+                local last_refill = tonumber(bucket[2]) or now
+                tokens = math.min(capacity, tokens + (now - last_refill) * refill_rate)
+
+                if tokens < requested then
+                    local wait = (requested - tokens) / refill_rate
+                    if limiting == 0 or wait > retry_after then
+                        retry_after = wait
+                        limiting = i
+                    end
+                end
+                state[i] = {tokens, requested}
+            end
+
+            for i, key in ipairs(KEYS) do
+                local tokens = state[i][1]
+                if limiting == 0 then
+                    tokens = tokens - state[i][2]
+                end
+                redis.call('HMSET', key, 'tokens', tokens, 'last_refill', now)
+                redis.call('EXPIRE', key, 3600)
+            end
+
+            return {limiting == 0 and 1 or 0, tostring(retry_after), limiting}
+        """
+        )
+
     def consume_tokens(
         self, key: str, capacity: int, refill_rate: float, tokens: int = 1
     ) -> Tuple[bool, float]:
@@ -220,6 +359,42 @@ class RedisBackend:
             logger.error(f"Redis operation failed for key {key}: {e}")
             raise RateLimitBackendError(f"Redis backend error: {e}")
 
+    def consume_many(
+        self, requests: List[Tuple[str, int, float, int]]
+    ) -> Tuple[bool, float, Optional[str]]:
+        """
+        Atomically consume tokens from several Redis-backed buckets.
+
+        Args:
+            requests: (key, capacity, refill_rate, tokens) per bucket
+
+        Returns:
+            Tuple of (success, retry_after_seconds, limiting_key)
+        """
+        # Merge repeated keys so each bucket is charged once
+        merged: Dict[str, List[Any]] = {}
+        for key, capacity, refill_rate, tokens in requests:
+            if key in merged:
+                merged[key][2] += tokens
+            else:
+                merged[key] = [capacity, refill_rate, tokens]
+
+        keys = list(merged)
+        args: List[Any] = [time.time()]
+        for key in keys:
+            args.extend(merged[key])
+
+        try:
+            result = self._consume_many_script(
+                keys=[f"rate_limit:{key}" for key in keys], args=args
+            )
+            success = bool(result[0])
+            limiting_key = None if success else keys[int(result[2]) - 1]
+            return success, float(result[1]), limiting_key
+        except Exception as e:
+            logger.error(f"Redis operation failed for keys {keys}: {e}")
+            raise RateLimitBackendError(f"Redis backend error: {e}")
+
     def clear(self):
         """Clear all rate limit data (for testing)."""
         try:
@@ -367,6 +542,73 @@ class RateLimiter:
                 return True
             raise RateLimitBackendError(f"Rate limit check failed: {e}")
 
+    def consume_many(self, requests: List[Tuple], tokens: int = 1) -> bool:
+        """
+        Check several rate limits atomically.
+
+        Tokens are taken from every (service, agent) bucket or from none,
+        e.g. to charge both a per-agent and a shared service limit for one
+        call without leaking tokens when only one of them is exhausted.
+
+        Args:
+            requests: (service, agent_id) or (service, agent_id, tokens)
+            tokens: Tokens to consume where a request does not specify them
+
+        Returns:
+            True if all requests are allowed
+
+        Raises:
+            RateLimitExceeded: When any of the rate limits is exceeded
+            RateLimitBackendError: When backend fails
+        """
+        bucket_requests = []
+        services: Dict[str, str] = {}
+        for request in requests:
+            service, agent_id = request[0], request[1]
+            amount = request[2] if len(request) > 2 else tokens
+            config = self._get_service_config(service)
+            key = f"{service}:{agent_id}"
+            services[key] = service
+            bucket_requests.append(
+                (
+                    key,
+                    config["capacity"],
+                    config["refill_rate"],
+                    amount,
+                )
+            )
+
+        if not bucket_requests:
+            return True
+
+        try:
+            success, retry_after, limiting_key = self._backend.consume_many(
+                bucket_requests
+            )
+        except Exception as e:
+            logger.error(f"Rate limit backend error for {len(requests)} requests: {e}")
+            if self.backend_type == RateLimitBackend.REDIS:
+                logger.warning(
+                    "Falling back to allowing request due to backend failure"
+                )
+                return True
+            raise RateLimitBackendError(f"Rate limit check failed: {e}")
+
+        if not success:
+            service = services[limiting_key]
+            logger.warning(
+                f"Rate limit exceeded for {limiting_key}, "
+                f"retry after {retry_after:.2f}s"
+            )
+            raise RateLimitExceeded(
+                f"Rate limit exceeded for service '{service}'. "
+                f"Retry after {retry_after:.2f} seconds.",
+                retry_after=retry_after,
+                service=service,
+            )
+
+        return True
+
     def get_status(self, service: str, agent_id: str = "default") -> Dict[str, Any]:
         """
         Get current rate limit status for service/agent.
@@ -4,7 +4,7 @@ Comprehensive Retry Utilities for 12-factor-agents
 
 Provides configurable retry logic with exponential backoff for common agent failures:
 - Network/API operations
-- File system operations 
+- File system operations
 - Git operations
 - External process calls
 
@@ -23,7 +23,11 @@ from pathlib import Path
 from typing import Any, Callable, Dict, Optional, Union
 import json
 
-from core.telemetry import EnhancedTelemetryCollector, EventType
+from core.telemetry import (
+    EnhancedTelemetryCollector,
+    EventType,
+    get_telemetry_collector,
+)
 
 
 class RetryPolicy(Enum):
@@ -51,6 +55,8 @@ class RetryConfig:
     stop_exceptions: tuple = ()
     backoff_strategy: str = "exponential"  # exponential, linear, constant
     telemetry_enabled: bool = True
+    # Fraction of first-attempt successes to record (retries are always recorded)
+    telemetry_sample_rate: float = 0.0
 
     def __post_init__(self):
         """Validate configuration"""
@@ -60,6 +66,8 @@ class RetryConfig:
             raise ValueError("base_delay must be non-negative")
         if self.max_delay < self.base_delay:
             raise ValueError("max_delay must be >= base_delay")
+        if not 0.0 <= self.telemetry_sample_rate <= 1.0:
+            raise ValueError("telemetry_sample_rate must be between 0 and 1")
 
 
 class RetryPolicyManager:
@@ -67,7 +75,8 @@ class RetryPolicyManager:
 
     def __init__(self):
         self._policies = self._create_default_policies()
-        self.telemetry = EnhancedTelemetryCollector()
+        self._sample_rates: Dict[str, float] = {}
+        self.telemetry = get_telemetry_collector()
 
     def _create_default_policies(self) -> Dict[RetryPolicy, RetryConfig]:
         """Create default retry policies optimized for different operations"""
@@ -144,6 +153,16 @@ class RetryPolicyManager:
         """Update a retry policy configuration"""
         self._policies[policy] = config
 
+    def set_sample_rate(self, operation_name: str, rate: float):
+        """Sample first-attempt successes of one operation at the given rate"""
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError("rate must be between 0 and 1")
+        self._sample_rates[operation_name] = rate
+
+    def get_sample_rate(self, operation_name: str, config: RetryConfig) -> float:
+        """Get the success sampling rate for an operation"""
+        return self._sample_rates.get(operation_name, config.telemetry_sample_rate)
+
     def load_from_file(self, config_path: Path):
         """Load retry policies from configuration file"""
         if not config_path.exists():
@@ -175,12 +194,38 @@ retry_policy_manager = RetryPolicyManager()
 class RetryHandler:
     """Handles retry logic with telemetry integration"""
 
-    def __init__(self, config: RetryConfig, operation_name: str = "unknown"):
+    def __init__(
+        self,
+        config: RetryConfig,
+        operation_name: str = "unknown",
+        telemetry: Optional[EnhancedTelemetryCollector] = None,
+    ):
         self.config = config
         self.operation_name = operation_name
-        self.telemetry = EnhancedTelemetryCollector()
+        self.telemetry = telemetry or get_telemetry_collector()
         self.logger = logging.getLogger(__name__)
 
+    def sample_success(self) -> bool:
+        """Decide whether a first-attempt success of this call is recorded"""
+        if not self.config.telemetry_enabled:
+            return False
+        rate = retry_policy_manager.get_sample_rate(self.operation_name, self.config)
+        return rate > 0 and random.random() < rate
+
+    def should_record(self, attempt: int, sampled: bool) -> bool:
+        """Telemetry is skipped on the unsampled first-attempt fast path"""
+        return self.config.telemetry_enabled and (attempt > 1 or sampled)
+
+    def record_attempt(self, handler_name: str, attempt: int, function_name: str):
+        """Record the start of an attempt"""
+        self.telemetry.record_workflow_event(
+            EventType.WORKFLOW_START,
+            "retry_system",
+            f"{handler_name}-{self.operation_name}",
+            f"Attempt {attempt}/{self.config.max_attempts}",
+            context={"attempt": attempt, "function": function_name},
+        )
+
     def calculate_delay(self, attempt: int) -> float:
         """Calculate delay for next retry attempt"""
         if self.config.backoff_strategy == "constant":
@@ -216,24 +261,19 @@ class RetryHandler:
     def execute_with_retry(self, func: Callable, *args, **kwargs) -> Any:
         """Execute function with retry logic"""
         last_exception = None
+        sampled = self.sample_success()
 
         for attempt in range(1, self.config.max_attempts + 1):
             try:
                 # Record attempt if telemetry enabled
-                if self.config.telemetry_enabled:
-                    self.telemetry.record_workflow_event(
-                        EventType.WORKFLOW_START,
-                        "retry_system",
-                        f"RetryHandler-{self.operation_name}",
-                        f"Attempt {attempt}/{self.config.max_attempts}",
-                        context={"attempt": attempt, "function": func.__name__},
-                    )
+                if self.should_record(attempt, sampled):
+                    self.record_attempt("RetryHandler", attempt, func.__name__)
 
                 # Execute the function
                 result = func(*args, **kwargs)
 
                 # Record success
-                if self.config.telemetry_enabled:
+                if self.should_record(attempt, sampled):
                     self.telemetry.record_workflow_event(
                         EventType.WORKFLOW_END,
                         "retry_system",
@@ -252,8 +292,10 @@ class RetryHandler:
                     f"Attempt {attempt} failed for {self.operation_name}: {e}"
                 )
 
-                # Record failure
+                # Record failure, including the skipped first-attempt start
                 if self.config.telemetry_enabled:
+                    if not self.should_record(attempt, sampled):
+                        self.record_attempt("RetryHandler", attempt, func.__name__)
                     self.telemetry.record_workflow_event(
                         EventType.ERROR,
                         "retry_system",
@@ -361,24 +403,21 @@ async def async_retry(
 
             handler = RetryHandler(config, op_name)
             last_exception = None
+            sampled = handler.sample_success()
 
             for attempt in range(1, config.max_attempts + 1):
                 try:
                     # Record attempt if telemetry enabled
-                    if config.telemetry_enabled:
-                        handler.telemetry.record_workflow_event(
-                            EventType.WORKFLOW_START,
-                            "retry_system",
-                            f"AsyncRetryHandler-{op_name}",
-                            f"Attempt {attempt}/{config.max_attempts}",
-                            context={"attempt": attempt, "function": func.__name__},
+                    if handler.should_record(attempt, sampled):
+                        handler.record_attempt(
+                            "AsyncRetryHandler", attempt, func.__name__
                         )
 
                     # Execute the async function
                     result = await func(*args, **kwargs)
 
                     # Record success
-                    if config.telemetry_enabled:
+                    if handler.should_record(attempt, sampled):
                         handler.telemetry.record_workflow_event(
                             EventType.WORKFLOW_END,
                             "retry_system",
@@ -392,8 +431,12 @@ async def async_retry(
                 except Exception as e:
                     last_exception = e
 
-                    # Record failure
+                    # Record failure, including the skipped first-attempt start
                     if config.telemetry_enabled:
+                        if not handler.should_record(attempt, sampled):
+                            handler.record_attempt(
+                                "AsyncRetryHandler", attempt, func.__name__
+                            )
                         handler.telemetry.record_workflow_event(
                             EventType.ERROR,
                             "retry_system",
@@ -13,7 +13,7 @@ from typing import Any, Dict, List, Optional, Union
 import json
 
 from core.retry import retry, RetryPolicy
-from core.telemetry import EnhancedTelemetryCollector
+from core.telemetry import get_telemetry_collector
 
 
 class RetrySubprocess:
@@ -99,7 +99,7 @@ class RetryGitOperations:
 
     def __init__(self, repo_path: Optional[Path] = None):
         self.repo_path = repo_path or Path.cwd()
-        self.telemetry = EnhancedTelemetryCollector()
+        self.telemetry = get_telemetry_collector()
 
     @retry(RetryPolicy.GIT_OPERATION, "git_clone")
     def clone(
@@ -408,7 +408,7 @@ class RetryNetworkOperations:
     """Network operations with retry logic (placeholder for future HTTP/API wrappers)"""
 
     def __init__(self):
-        self.telemetry = EnhancedTelemetryCollector()
+        self.telemetry = get_telemetry_collector()
 
     # Future: Add HTTP client wrappers with retry logic
     # @retry(RetryPolicy.NETWORK, "http_get")
@@ -6,10 +6,13 @@ Intelligent state handling with cross-repository awareness and pipeline continui
 
 import json
 import hashlib
+import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
 
 
@@ -54,6 +57,150 @@ class StateSnapshot:
             self.checksum = hashlib.sha256(content.encode()).hexdigest()[:16]
 
 
+class StateStore:
+    """
+    SQLite (WAL) storage for state snapshots
+
+    One row per state with indexed metadata columns, so lookups by type,
+    status, parent and age are queries rather than scans. The data and
+    context payload is only decoded when a snapshot is loaded.
+    """
+
+    COLUMNS = "state_id, timestamp, state_type, status, parent_state_id, checksum"
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+
+        # Autocommit; batch() groups writes into one transaction
+        self._conn = sqlite3.connect(
+            str(self.db_path), isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS states (
+                state_id TEXT PRIMARY KEY,
+                timestamp TEXT NOT NULL,
+                state_type TEXT NOT NULL,
+                status TEXT NOT NULL,
+                parent_state_id TEXT,
+                checksum TEXT NOT NULL,
+                payload TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_states_type_status
+                ON states (state_type, status);
+            CREATE INDEX IF NOT EXISTS idx_states_status_timestamp
+                ON states (status, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_states_parent
+                ON states (parent_state_id);
+            """)
+
+    @contextmanager
+    def batch(self):
+        """Group writes into a single transaction"""
+        with self._lock:
+            if self._batch_depth == 0:
+                self._conn.execute("BEGIN")
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._conn.execute("ROLLBACK")
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._conn.execute("COMMIT")
+
+    def put(self, state: StateSnapshot):
+        """Insert or replace a snapshot, keeping its original row order"""
+        payload = json.dumps({"data": state.data, "context": state.context})
+        with self._lock:
+            self._conn.execute(
+                f"""
+                INSERT INTO states ({self.COLUMNS}, payload)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(state_id) DO UPDATE SET
+                    timestamp = excluded.timestamp,
+                    state_type = excluded.state_type,
+                    status = excluded.status,
+                    parent_state_id = excluded.parent_state_id,
+                    checksum = excluded.checksum,
+                    payload = excluded.payload
+                """,
+                (
+                    state.state_id,
+                    state.timestamp,
+                    state.state_type.value,
+                    state.status.value,
+                    state.parent_state_id,
+                    state.checksum,
+                    payload,
+                ),
+            )
+
+    def delete(self, state_ids: List[str]):
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM states WHERE state_id = ?", [(s,) for s in state_ids]
+            )
+
+    def load(self, state_ids: List[str]) -> Dict[str, StateSnapshot]:
+        """Load full snapshots by ID"""
+        loaded = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(state_ids), 500):
+                chunk = state_ids[i : i + 500]
+                rows = self._conn.execute(
+                    f"SELECT {self.COLUMNS}, payload FROM states "
+                    f"WHERE state_id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for row in rows:
+                    state = self._from_row(row)
+                    loaded[state.state_id] = state
+        return loaded
+
+    def query_ids(self, where: str = "1", params: tuple = ()) -> List[str]:
+        """State IDs matching a WHERE clause, in creation order"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT state_id FROM states WHERE {where} ORDER BY rowid", params
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def scalar(self, sql: str, params: tuple = ()) -> Any:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def rows(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _from_row(row: tuple) -> StateSnapshot:
+        state_id, timestamp, state_type, status, parent_id, checksum, payload = row
+        payload = json.loads(payload)
+        return StateSnapshot(
+            state_id=state_id,
+            timestamp=timestamp,
+            state_type=StateType(state_type),
+            status=StateStatus(status),
+            data=payload["data"],
+            context=payload["context"],
+            checksum=checksum,
+            parent_state_id=parent_id,
+        )
+
+
 class SmartStateManager:
     """
     Intelligent state manager that understands context and relationships.
@@ -70,13 +217,16 @@ class SmartStateManager:
         self.base_dir = base_dir or Path.home() / ".12factor-agents-state"
         self.base_dir.mkdir(parents=True, exist_ok=True)
 
-        # In-memory state cache for performance
+        # Snapshots are loaded on demand and cached
         self._state_cache: Dict[str, StateSnapshot] = {}
-        self._active_states: Dict[StateType, List[str]] = {}
-        self._state_relationships: Dict[str, List[str]] = {}
+        self.store = StateStore(self.base_dir / "states.db")
+
+        # Import states written by the older one-file-per-state layout
+        self._import_legacy_states()
 
-        # Initialize from persistent storage
-        self._load_persistent_state()
+    def batch(self):
+        """Commit the state writes made inside the block in one transaction"""
+        return self.store.batch()
 
     def create_state(
         self,
@@ -116,14 +266,6 @@ class SmartStateManager:
         self._state_cache[state_id] = snapshot
         self._persist_state(snapshot)
 
-        # Update relationship tracking
-        self._update_relationships(state_id, parent_state_id)
-
-        # Track active states by type
-        if state_type not in self._active_states:
-            self._active_states[state_type] = []
-        self._active_states[state_type].append(state_id)
-
         print(f"🔄 Created state {state_id} ({state_type.value})")
         return state_id
 
@@ -146,12 +288,11 @@ class SmartStateManager:
         Returns:
             True if update succeeded
         """
-        if state_id not in self._state_cache:
+        current_state = self.get_state(state_id)
+        if current_state is None:
             print(f"⚠️ State {state_id} not found")
             return False
 
-        current_state = self._state_cache[state_id]
-
         # Create updated data
         updated_data = current_state.data.copy()
         if data_updates:
@@ -180,14 +321,10 @@ class SmartStateManager:
             )
             new_snapshot = self._resolve_conflicts(current_state, new_snapshot)
 
-        # Update cache and persist
+        # Update cache and persist (status is an indexed column)
         self._state_cache[state_id] = new_snapshot
         self._persist_state(new_snapshot)
 
-        # Update active state tracking
-        if status and status != StateStatus.ACTIVE:
-            self._remove_from_active(state_id, current_state.state_type)
-
         print(
             f"🔄 Updated state {state_id} -> {status.value if status else 'data_update'}"
         )
@@ -195,27 +332,27 @@ class SmartStateManager:
 
     def get_state(self, state_id: str) -> Optional[StateSnapshot]:
         """Get current state snapshot"""
+        if state_id not in self._state_cache:
+            self._state_cache.update(self.store.load([state_id]))
         return self._state_cache.get(state_id)
 
     def get_active_states(self, state_type: StateType = None) -> List[StateSnapshot]:
         """Get all active states of a given type"""
         if state_type:
-            state_ids = self._active_states.get(state_type, [])
-            return [
-                self._state_cache[sid] for sid in state_ids if sid in self._state_cache
-            ]
+            state_ids = self.store.query_ids(
+                "status = ? AND state_type = ?",
+                (StateStatus.ACTIVE.value, state_type.value),
+            )
         else:
-            # All active states
-            all_active = []
-            for state_ids in self._active_states.values():
-                all_active.extend(
-                    [
-                        self._state_cache[sid]
-                        for sid in state_ids
-                        if sid in self._state_cache
-                    ]
-                )
-            return all_active
+            state_ids = self.store.query_ids("status = ?", (StateStatus.ACTIVE.value,))
+        return self._get_states(state_ids)
+
+    def _get_states(self, state_ids: List[str]) -> List[StateSnapshot]:
+        """Snapshots for IDs, loading uncached payloads in one query"""
+        missing = [sid for sid in state_ids if sid not in self._state_cache]
+        if missing:
+            self._state_cache.update(self.store.load(missing))
+        return [self._state_cache[sid] for sid in state_ids if sid in self._state_cache]
 
     def create_pipeline_state(
         self, pipeline_name: str, stages: List[str], context: Dict[str, Any] = None
@@ -295,9 +432,9 @@ class SmartStateManager:
             data_updates={
                 "current_stage": next_stage,
                 "stage_results": stage_results,
-                "last_stage_completed": stages[current_stage]
-                if current_stage < len(stages)
-                else None,
+                "last_stage_completed": (
+                    stages[current_stage] if current_stage < len(stages) else None
+                ),
                 "updated_at": datetime.now().isoformat(),
             },
             status=new_status,
@@ -389,43 +526,53 @@ class SmartStateManager:
         from datetime import timedelta
 
         cutoff_time = datetime.now() - timedelta(hours=older_than_hours)
-        cleanup_count = 0
-
-        states_to_remove = []
-        for state_id, state in self._state_cache.items():
-            if (
-                state.status == StateStatus.COMPLETED
-                and datetime.fromisoformat(state.timestamp) < cutoff_time
-            ):
-                # Don't cleanup if it has active dependents
-                if not self._has_active_dependents(state_id):
-                    states_to_remove.append(state_id)
+
+        # ISO timestamps compare correctly as strings
+        states_to_remove = self.store.query_ids(
+            """
+            status = ? AND timestamp < ? AND NOT EXISTS (
+                SELECT 1 FROM states AS dependent
+                WHERE dependent.parent_state_id = states.state_id
+                AND dependent.status = ?
+            )
+            """,
+            (
+                StateStatus.COMPLETED.value,
+                cutoff_time.isoformat(),
+                StateStatus.ACTIVE.value,
+            ),
+        )
 
         # Remove states
+        with self.batch():
+            self._remove_persistent_state(states_to_remove)
         for state_id in states_to_remove:
-            del self._state_cache[state_id]
-            self._remove_persistent_state(state_id)
-            cleanup_count += 1
+            self._state_cache.pop(state_id, None)
+        cleanup_count = len(states_to_remove)
 
         print(f"🧹 Cleaned up {cleanup_count} completed states")
         return cleanup_count
 
     def get_state_summary(self) -> Dict[str, Any]:
         """Get intelligent summary of current state management"""
-        active_counts = {}
-        for state_type, state_ids in self._active_states.items():
-            active_counts[state_type.value] = len(state_ids)
+        active_counts = dict(
+            self.store.rows(
+                "SELECT state_type, COUNT(*) FROM states WHERE status = ? "
+                "GROUP BY state_type",
+                (StateStatus.ACTIVE.value,),
+            )
+        )
 
-        total_states = len(self._state_cache)
-        total_relationships = sum(
-            len(deps) for deps in self._state_relationships.values()
+        total_states = self.store.scalar("SELECT COUNT(*) FROM states")
+        total_relationships = self.store.scalar(
+            "SELECT COUNT(*) FROM states WHERE parent_state_id IS NOT NULL"
         )
 
         return {
             "total_states": total_states,
             "active_by_type": active_counts,
             "total_relationships": total_relationships,
-            "cache_size": total_states,
+            "cache_size": len(self._state_cache),
             "state_types": list(StateType),
             "performance_metrics": {
                 "cache_hit_ratio": "98%",  # Would calculate from actual metrics
@@ -478,88 +625,63 @@ class SmartStateManager:
             parent_state_id=new.parent_state_id,
         )
 
-    def _update_relationships(self, state_id: str, parent_state_id: Optional[str]):
-        """Update state relationship tracking"""
-        if parent_state_id:
-            if parent_state_id not in self._state_relationships:
-                self._state_relationships[parent_state_id] = []
-            self._state_relationships[parent_state_id].append(state_id)
-
-    def _remove_from_active(self, state_id: str, state_type: StateType):
-        """Remove state from active tracking"""
-        if (
-            state_type in self._active_states
-            and state_id in self._active_states[state_type]
-        ):
-            self._active_states[state_type].remove(state_id)
-
     def _find_dependent_states(self, state_id: str) -> List[str]:
         """Find states that depend on the given state"""
-        return self._state_relationships.get(state_id, [])
+        return self.store.query_ids("parent_state_id = ?", (state_id,))
 
     def _has_active_dependents(self, state_id: str) -> bool:
         """Check if state has active dependent states"""
-        dependents = self._find_dependent_states(state_id)
-        for dep_id in dependents:
-            if dep_id in self._state_cache:
-                dep_state = self._state_cache[dep_id]
-                if dep_state.status == StateStatus.ACTIVE:
-                    return True
-        return False
+        return bool(
+            self.store.scalar(
+                "SELECT EXISTS (SELECT 1 FROM states "
+                "WHERE parent_state_id = ? AND status = ?)",
+                (state_id, StateStatus.ACTIVE.value),
+            )
+        )
 
     def _find_rollback_target(
         self, state_id: str, target_timestamp: str = None
     ) -> Optional[StateSnapshot]:
         """Find appropriate rollback target"""
         # For now, return current state (would implement version history)
-        return self._state_cache.get(state_id)
+        return self.get_state(state_id)
 
     def _persist_state(self, state: StateSnapshot):
         """Persist state to storage"""
-        state_file = self.base_dir / f"{state.state_id}.json"
-        # Convert to dict with proper enum serialization
-        state_dict = asdict(state)
-        state_dict["state_type"] = state.state_type.value
-        state_dict["status"] = state.status.value
-        with open(state_file, "w") as f:
-            json.dump(state_dict, f, indent=2)
-
-    def _remove_persistent_state(self, state_id: str):
-        """Remove persistent state file"""
-        state_file = self.base_dir / f"{state_id}.json"
-        if state_file.exists():
-            state_file.unlink()
-
-    def _load_persistent_state(self):
-        """Load state from persistent storage on startup"""
-        if not self.base_dir.exists():
+        self.store.put(state)
+
+    def _remove_persistent_state(self, state_ids: List[str]):
+        """Remove persisted states"""
+        self.store.delete(state_ids)
+
+    def _import_legacy_states(self):
+        """Move per-state JSON files from older versions into the store"""
+        legacy_files = list(self.base_dir.glob("*.json"))
+        if not legacy_files:
             return
 
-        for state_file in self.base_dir.glob("*.json"):
-            try:
-                with open(state_file) as f:
-                    state_data = json.load(f)
+        imported_dir = self.base_dir / "imported_json"
+        imported_dir.mkdir(exist_ok=True)
 
-                # Convert string enum values back to enums
-                if "state_type" in state_data and isinstance(
-                    state_data["state_type"], str
-                ):
+        imported = []
+        with self.batch():
+            for state_file in legacy_files:
+                try:
+                    with open(state_file) as f:
+                        state_data = json.load(f)
+
+                    # Convert string enum values back to enums
                     state_data["state_type"] = StateType(state_data["state_type"])
-                if "status" in state_data and isinstance(state_data["status"], str):
                     state_data["status"] = StateStatus(state_data["status"])
+                    self._persist_state(StateSnapshot(**state_data))
+                    imported.append(state_file)
 
-                # Reconstruct StateSnapshot
-                state = StateSnapshot(**state_data)
-                self._state_cache[state.state_id] = state
-
-                # Rebuild active state tracking
-                if state.status == StateStatus.ACTIVE:
-                    if state.state_type not in self._active_states:
-                        self._active_states[state.state_type] = []
-                    self._active_states[state.state_type].append(state.state_id)
+                except Exception as e:
+                    print(f"⚠️ Error loading state from {state_file}: {e}")
 
-            except Exception as e:
-                print(f"⚠️ Error loading state from {state_file}: {e}")
+        # Only move files once their states are committed
+        for state_file in imported:
+            state_file.replace(imported_dir / state_file.name)
 
 
 # Global smart state manager instance
@@ -5,7 +5,10 @@ Collects comprehensive workflow data, error patterns, and performance metrics
 across all sister repositories with privacy protection.
 """
 
+import atexit
 import json
+import os
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Optional, List, Any
@@ -14,6 +17,8 @@ import re
 from enum import Enum
 from dataclasses import dataclass, field
 
+from core.telemetry_store import TelemetryStore
+
 
 class EventType(Enum):
     """Types of telemetry events"""
@@ -52,6 +57,167 @@ class WorkflowEvent:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+class BufferedTelemetryWriter:
+    """
+    Batched JSONL writer shared by every collector using a telemetry dir.
+
+    Lines are queued in memory and written by a background thread when the
+    batch fills up or the flush interval elapses. Each sink keeps a single
+    append handle open, and fsync happens once per flush rather than per
+    event. Pending lines are flushed on close and at interpreter exit.
+    """
+
+    def __init__(self, max_batch_size: int = 100, flush_interval: float = 1.0):
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self._reset_state()
+
+    def _reset_state(self):
+        """Initialize locks, buffers and handles (also used after fork)"""
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._pending: List[tuple] = []
+        self._handles: Dict[Path, Any] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.lines_written = 0
+        self.flush_count = 0
+
+    def write(self, path: Path, line: str):
+        """Queue a line for the given sink"""
+        with self._lock:
+            self._pending.append((path, line))
+            pending = len(self._pending)
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(
+                    target=self._flush_loop, name="telemetry-writer", daemon=True
+                )
+                self._thread.start()
+
+        if self._closed:
+            # No background thread after close, write through
+            self.flush()
+        elif pending >= self.max_batch_size:
+            self._flush_requested.set()
+
+    def _flush_loop(self):
+        """Flush on size trigger or interval until closed"""
+        while not self._closed:
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            self.flush()
+
+    def flush(self):
+        """Write all queued lines, one write and fsync per sink"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+
+            # Group by sink, preserving order within each file
+            by_path: Dict[Path, List[str]] = {}
+            for path, line in batch:
+                by_path.setdefault(path, []).append(line)
+
+            for path, lines in by_path.items():
+                try:
+                    handle = self._handles.get(path)
+                    if handle is None:
+                        handle = open(path, "a")
+                        self._handles[path] = handle
+                    handle.write("".join(lines))
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                    self.lines_written += len(lines)
+                except Exception as e:
+                    print(f"Error writing telemetry to {path}: {e}")
+                    self._close_handle(path)
+
+            self.flush_count += 1
+
+    def _close_handle(self, path: Path):
+        """Close and forget a sink handle"""
+        handle = self._handles.pop(path, None)
+        if handle is not None:
+            try:
+                handle.close()
+            except Exception:
+                pass
+
+    def close(self):
+        """Stop the background thread, flush pending lines and close sinks"""
+        self._closed = True
+        self._flush_requested.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self.flush()
+        with self._flush_lock:
+            for path in list(self._handles):
+                self._close_handle(path)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get writer statistics"""
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "pending": pending,
+            "open_sinks": len(self._handles),
+            "lines_written": self.lines_written,
+            "flush_count": self.flush_count,
+        }
+
+
+# One writer per telemetry directory, shared across collectors
+_telemetry_writers: Dict[Path, BufferedTelemetryWriter] = {}
+_telemetry_writers_lock = threading.Lock()
+
+
+def get_telemetry_writer(telemetry_dir: Path) -> BufferedTelemetryWriter:
+    """Get the shared buffered writer for a telemetry directory"""
+    key = Path(telemetry_dir).resolve()
+    with _telemetry_writers_lock:
+        writer = _telemetry_writers.get(key)
+        if writer is None:
+            writer = BufferedTelemetryWriter()
+            _telemetry_writers[key] = writer
+        return writer
+
+
+def flush_all_telemetry():
+    """Flush every shared telemetry writer"""
+    with _telemetry_writers_lock:
+        writers = list(_telemetry_writers.values())
+    for writer in writers:
+        writer.flush()
+
+
+def _close_all_telemetry_writers():
+    """Flush and close writers at interpreter exit"""
+    with _telemetry_writers_lock:
+        writers = list(_telemetry_writers.values())
+    for writer in writers:
+        writer.close()
+
+
+def _reset_telemetry_writers_after_fork():
+    """Forked children inherit no flush thread and maybe held locks, so start clean"""
+    global _telemetry_writers_lock, _shared_collectors_lock
+    _telemetry_writers_lock = threading.Lock()
+    for writer in _telemetry_writers.values():
+        writer._reset_state()
+    _shared_collectors_lock = threading.Lock()
+    for collector in _shared_collectors.values():
+        collector._sequence_lock = threading.Lock()
+
+
+atexit.register(_close_all_telemetry_writers)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_telemetry_writers_after_fork)
+
+
 class EnhancedTelemetryCollector:
     """
     Enhanced telemetry collector that captures comprehensive workflow data
@@ -63,10 +229,17 @@ class EnhancedTelemetryCollector:
         self.telemetry_dir = telemetry_dir or Path("/tmp/12-factor-telemetry")
         self.telemetry_dir.mkdir(exist_ok=True)
 
+        # Batched writes, shared with other collectors on this directory
+        self.writer = get_telemetry_writer(self.telemetry_dir)
+
         # Session tracking
         self.session_id = hashlib.md5(str(datetime.now()).encode()).hexdigest()[:8]
         self.active_workflows = {}
         self.event_sequence = 0
+        self._sequence_lock = threading.Lock()
+
+        # Columnar error store, opened on first summary
+        self._errors: Optional[TelemetryStore] = None
 
         # Strategy learning storage
         self.strategy_patterns = {}
@@ -107,8 +280,10 @@ class EnhancedTelemetryCollector:
         Returns event_id for tracking.
         """
         # Generate unique event ID
-        self.event_sequence += 1
-        event_id = f"{self.session_id}_{self.event_sequence:04d}"
+        with self._sequence_lock:
+            self.event_sequence += 1
+            sequence = self.event_sequence
+        event_id = f"{self.session_id}_{sequence:04d}"
 
         # Sanitize sensitive data
         safe_message = self._sanitize_message(message)
@@ -127,7 +302,7 @@ class EnhancedTelemetryCollector:
             parent_event_id=parent_event_id,
             metadata={
                 "session_id": self.session_id,
-                "sequence": self.event_sequence,
+                "sequence": sequence,
             },
         )
 
@@ -146,18 +321,17 @@ class EnhancedTelemetryCollector:
             "metadata": event.metadata,
         }
 
-        # Write to repo-specific file
-        repo_file = self.telemetry_dir / f"{repo_name}_workflow.jsonl"
-        with open(repo_file, "a") as f:
-            f.write(json.dumps(event_dict) + "\n")
-
-        # Also write to central workflow file
-        central_file = self.telemetry_dir / "all_workflow_events.jsonl"
-        with open(central_file, "a") as f:
-            f.write(json.dumps(event_dict) + "\n")
+        # Queue for repo-specific and central workflow files
+        line = json.dumps(event_dict) + "\n"
+        self.writer.write(self.telemetry_dir / f"{repo_name}_workflow.jsonl", line)
+        self.writer.write(self.telemetry_dir / "all_workflow_events.jsonl", line)
 
         return event_id
 
+    def flush(self):
+        """Write any buffered events to disk"""
+        self.writer.flush()
+
     def _sanitize_message(self, message: str) -> str:
         """Remove potentially sensitive data from error messages"""
         # Remove file paths with user names
@@ -443,75 +617,62 @@ class EnhancedTelemetryCollector:
 
     def get_error_summary(self) -> Dict:
         """Analyze collected errors to find patterns"""
+        self.flush()
         central_file = self.telemetry_dir / "all_errors.jsonl"
         if not central_file.exists():
             return {"total_errors": 0, "patterns": []}
 
-        errors = []
-        with open(central_file) as f:
-            for line in f:
-                errors.append(json.loads(line))
-
-        # Analyze patterns
-        error_types = {}
-        agent_errors = {}
-        repo_errors = {}
-
-        for error in errors:
-            # Count by error type
-            err_type = error["error_type"]
-            error_types[err_type] = error_types.get(err_type, 0) + 1
+        # Compact new errors, then answer from columns without loading rows
+        store = self._error_store()
+        store.ingest_file(central_file)
 
-            # Count by agent
-            agent = error["agent"]
-            agent_errors[agent] = agent_errors.get(agent, 0) + 1
+        error_types = store.group_by("error_type")
+        agent_errors = store.group_by("agent")
+        repo_errors = store.group_by("repo")
 
-            # Count by repo
-            repo = error["repo"]
-            repo_errors[repo] = repo_errors.get(repo, 0) + 1
+        # Count message patterns from the message column only
+        file_not_found = permission_errors = git_errors = 0
+        for error_message in store.column_values("error_message"):
+            error_message = error_message.lower()
+            file_not_found += "not found" in error_message
+            permission_errors += "permission" in error_message
+            git_errors += "git" in error_message
 
         # Find most common patterns
         patterns = []
 
         # Pattern: File not found errors
-        file_not_found = [
-            e for e in errors if "not found" in e["error_message"].lower()
-        ]
-        if len(file_not_found) > 2:
+        if file_not_found > 2:
             patterns.append(
                 {
                     "pattern": "File not found errors",
-                    "count": len(file_not_found),
+                    "count": file_not_found,
                     "suggestion": "Add file existence checks before operations",
                 }
             )
 
         # Pattern: Permission errors
-        permission_errors = [
-            e for e in errors if "permission" in e["error_message"].lower()
-        ]
-        if len(permission_errors) > 2:
+        if permission_errors > 2:
             patterns.append(
                 {
                     "pattern": "Permission denied errors",
-                    "count": len(permission_errors),
+                    "count": permission_errors,
                     "suggestion": "Add retry logic for locked files",
                 }
             )
 
         # Pattern: Git conflicts
-        git_errors = [e for e in errors if "git" in e["error_message"].lower()]
-        if len(git_errors) > 2:
+        if git_errors > 2:
             patterns.append(
                 {
                     "pattern": "Git operation failures",
-                    "count": len(git_errors),
+                    "count": git_errors,
                     "suggestion": "Add git index.lock handling",
                 }
             )
 
         return {
-            "total_errors": len(errors),
+            "total_errors": sum(error_types.values()),
             "by_type": error_types,
             "by_agent": agent_errors,
             "by_repo": repo_errors,
@@ -521,11 +682,46 @@ class EnhancedTelemetryCollector:
             ],
         }
 
+    def _error_store(self) -> TelemetryStore:
+        """Columnar store compacted from all_errors.jsonl"""
+        if self._errors is None:
+            self._errors = TelemetryStore(
+                self.telemetry_dir / "store" / "errors",
+                dictionary_columns=("error_type", "agent", "repo"),
+                text_columns=("error_message",),
+            )
+        return self._errors
+
 
 # Backward compatibility alias
 TelemetryCollector = EnhancedTelemetryCollector
 
 
+# Process-wide collectors, one per telemetry directory
+_shared_collectors: Dict[Path, EnhancedTelemetryCollector] = {}
+_shared_collectors_lock = threading.Lock()
+
+
+def get_telemetry_collector(telemetry_dir: Path = None) -> EnhancedTelemetryCollector:
+    """
+    Get the shared collector for a telemetry directory.
+
+    Hot paths (retry handlers, I/O wrappers) should use this instead of
+    constructing a collector per call.
+    """
+    key = Path(telemetry_dir or "/tmp/12-factor-telemetry").resolve()
+    collector = _shared_collectors.get(key)
+    if collector is not None:
+        return collector
+
+    with _shared_collectors_lock:
+        collector = _shared_collectors.get(key)
+        if collector is None:
+            collector = EnhancedTelemetryCollector(key)
+            _shared_collectors[key] = collector
+        return collector
+
+
 def main():
     """Test the enhanced telemetry collector"""
     print("🔍 Testing Enhanced Telemetry Collector")
@@ -15,11 +15,12 @@ import json
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
-from collections import defaultdict, Counter
-from dataclasses import dataclass
+from collections import Counter
+from dataclasses import dataclass, field
 from enum import Enum
 
 from core.telemetry import EnhancedTelemetryCollector
+from core.telemetry_store import TelemetryStore
 from core.quality_patterns import get_pattern_manager
 
 
@@ -58,12 +59,78 @@ class SuccessPattern:
     last_seen: str
 
 
+def _add_distinct(values: List, new_values: List, limit: Optional[int] = 3):
+    """Extend a list with unseen values, keeping at most limit entries"""
+    for value in new_values:
+        if limit is not None and len(values) >= limit:
+            break
+        if value not in values:
+            values.append(value)
+
+
+@dataclass
+class PatternAggregates:
+    """Running pattern counts in hourly buckets, plus the store cursor"""
+
+    window_start: str
+    cursor: Dict[str, int] = field(default_factory=dict)
+    buckets: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    pending_failures: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def bucket(self, timestamp: str) -> Dict[str, Any]:
+        """Bucket for the hour an event happened in"""
+        return self.buckets.setdefault(
+            timestamp[:13], {"failures": {}, "successes": {}, "fixes": []}
+        )
+
+    def ordered_buckets(self) -> List[tuple]:
+        """Buckets oldest first"""
+        return sorted(self.buckets.items())
+
+    def fix_mappings(self) -> List[Dict]:
+        """All fix mappings in the window, oldest first"""
+        return [fix for _, bucket in self.ordered_buckets() for fix in bucket["fixes"]]
+
+    def expire(self, cutoff: datetime):
+        """Drop buckets and unmatched failures that left the window"""
+        cutoff_iso = cutoff.isoformat()
+        for key in [k for k in self.buckets if k < cutoff_iso[:13]]:
+            del self.buckets[key]
+        for workflow_id in [
+            w for w, f in self.pending_failures.items() if f["timestamp"] < cutoff_iso
+        ]:
+            del self.pending_failures[workflow_id]
+        self.window_start = max(self.window_start, cutoff_iso)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "window_start": self.window_start,
+            "cursor": self.cursor,
+            "buckets": self.buckets,
+            "pending_failures": self.pending_failures,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PatternAggregates":
+        return cls(
+            window_start=data["window_start"],
+            cursor=data.get("cursor", {}),
+            buckets=data.get("buckets", {}),
+            pending_failures=data.get("pending_failures", {}),
+        )
+
+
 class TelemetryPatternLearner:
     """
     Learns patterns from telemetry data to improve code generation.
     Keeps telemetry LOCAL while sharing learned patterns.
     """
 
+    # Event types each analysis reads from the store
+    FAILURE_EVENT_TYPES = {"agent_failure", "error", "implementation_gap"}
+    SUCCESS_EVENT_TYPES = {"agent_success", "workflow_end"}
+    FIX_EVENT_TYPES = {"AGENT_FAILURE", "ERROR", "AGENT_SUCCESS"}
+
     def __init__(self, telemetry_dir: Path = None):
         """Initialize with local telemetry directory"""
         # IMPORTANT: Keep telemetry LOCAL to our repo
@@ -79,6 +146,12 @@ class TelemetryPatternLearner:
         # Use existing telemetry collector for strategy learning
         self.telemetry_collector = EnhancedTelemetryCollector(self.telemetry_dir)
 
+        # Compacted, day-partitioned copy of the raw telemetry files
+        self.store = TelemetryStore(self.telemetry_dir / "store" / "events")
+
+        # Aggregates and cursor carried between incremental runs
+        self.state_file = self.store.store_dir / "learner_state.json"
+
         # In-memory caches
         self.failure_patterns = {}
         self.success_patterns = {}
@@ -87,65 +160,48 @@ class TelemetryPatternLearner:
         # Load existing patterns
         self._load_learned_patterns()
 
-    def analyze_telemetry(self, days_back: int = 7) -> Dict[str, Any]:
+    def analyze_telemetry(
+        self, days_back: int = 7, incremental: bool = False
+    ) -> Dict[str, Any]:
         """
         Analyze recent telemetry to identify patterns.
 
+        Args:
+            days_back: Size of the analysis window in days
+            incremental: Fold only events stored since the last run into the
+                persisted aggregates instead of rescanning the whole window
+
         Returns:
             Dictionary of learned patterns and insights
         """
-        insights = {
-            "failure_patterns": [],
-            "success_patterns": [],
-            "fix_mappings": [],
-            "recommendations": [],
-        }
-
-        # Read telemetry files (LOCAL ONLY) - support both .json and .jsonl
-        telemetry_files = list(self.telemetry_dir.glob("*.json")) + list(
-            self.telemetry_dir.glob("*.jsonl")
-        )
-        recent_events = []
+        # Make buffered events visible before reading
+        self.telemetry_collector.flush()
 
+        # Compact new raw telemetry (LOCAL ONLY) - both .json and .jsonl
+        self.store.ingest_directory(self.telemetry_dir)
         cutoff_date = datetime.now() - timedelta(days=days_back)
 
-        for file in telemetry_files:
-            try:
-                with open(file, "r") as f:
-                    # Try JSONL format first (one JSON per line)
-                    if file.suffix == ".jsonl":
-                        for line in f:
-                            if line.strip():
-                                event = json.loads(line)
-                                event_date = datetime.fromisoformat(
-                                    event.get("timestamp", "")
-                                )
-                                if event_date >= cutoff_date:
-                                    recent_events.append(event)
-                    else:
-                        # Regular JSON format
-                        events = json.load(f)
-                        # Handle both single event and list of events
-                        if isinstance(events, dict):
-                            events = [events]
-                        # Filter recent events
-                        for event in events:
-                            event_date = datetime.fromisoformat(
-                                event.get("timestamp", "")
-                            )
-                            if event_date >= cutoff_date:
-                                recent_events.append(event)
-            except Exception:
-                continue  # Skip corrupted files
-
-        # Analyze failure patterns
-        insights["failure_patterns"] = self._analyze_failure_patterns(recent_events)
+        aggregates = self._load_aggregates() if incremental else None
+        if aggregates is None or aggregates.window_start > cutoff_date.isoformat():
+            # Rebuild from the store, also when the window grew
+            aggregates = PatternAggregates(window_start=cutoff_date.isoformat())
 
-        # Analyze success patterns
-        insights["success_patterns"] = self._analyze_success_patterns(recent_events)
+        # Only materialize events the analyses look at
+        new_events = self.store.iter_new_events(
+            aggregates.cursor,
+            start=cutoff_date,
+            where={"event_type": self._is_analyzed_event_type},
+        )
+        self._fold_events(aggregates, new_events)
+        aggregates.expire(cutoff_date)
+        self._save_aggregates(aggregates)
 
-        # Find fix mappings (what fixes what)
-        insights["fix_mappings"] = self._find_fix_mappings(recent_events)
+        insights = {
+            "failure_patterns": self._failure_patterns_from(aggregates),
+            "success_patterns": self._success_patterns_from(aggregates),
+            "fix_mappings": aggregates.fix_mappings(),
+            "recommendations": [],
+        }
 
         # Generate recommendations
         insights["recommendations"] = self._generate_recommendations(insights)
@@ -155,48 +211,164 @@ class TelemetryPatternLearner:
 
         return insights
 
-    def _analyze_failure_patterns(self, events: List[Dict]) -> List[FailurePattern]:
-        """Identify patterns that commonly lead to failures"""
-        failure_contexts = defaultdict(list)
+    def _is_analyzed_event_type(self, event_type: str) -> bool:
+        """Event types that feed any of the pattern analyses"""
+        return (
+            event_type.lower() in self.FAILURE_EVENT_TYPES
+            or event_type.lower() in self.SUCCESS_EVENT_TYPES
+            or event_type in self.FIX_EVENT_TYPES
+        )
 
+    def _load_aggregates(self) -> Optional["PatternAggregates"]:
+        """Load aggregates persisted by the previous run"""
+        if not self.state_file.exists():
+            return None
+        try:
+            with open(self.state_file, "r") as f:
+                return PatternAggregates.from_dict(json.load(f))
+        except Exception:
+            return None  # Corrupted state, rebuild
+
+    def _save_aggregates(self, aggregates: "PatternAggregates"):
+        """Persist aggregates and the store cursor for the next run"""
+        tmp = self.state_file.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(aggregates.to_dict(), f)
+        tmp.replace(self.state_file)
+
+    def _fold_events(self, aggregates: "PatternAggregates", events):
+        """Add events to the running per-hour aggregates"""
         for event in events:
-            # Handle different event type formats
-            event_type = event.get("event_type", "").lower()
-            if event_type in ["agent_failure", "error", "implementation_gap"]:
-                context = event.get("context", {})
-
-                # Extract patterns from context
-                if "code_pattern" in context:
-                    pattern = context["code_pattern"]
-                    error = event.get("message", "Unknown error")
-                    failure_contexts[pattern].append(error)
-
-                # Look for common failure indicators
-                message = event.get("message", "")
-                if "placeholder" in message.lower():
-                    failure_contexts["placeholder_code"].append(message)
-                if "todo" in message.lower():
-                    failure_contexts["todo_in_code"].append(message)
-                if "not implemented" in message.lower():
-                    failure_contexts["empty_implementation"].append(message)
-                if "routing mismatch" in message.lower():
-                    failure_contexts["routing_mismatch"].append(message)
-                if "takes 2 positional arguments but 3 were given" in message:
-                    failure_contexts["method_signature_error"].append(message)
-                if "got an unexpected keyword argument" in message:
-                    failure_contexts["parameter_mismatch"].append(message)
+            bucket = aggregates.bucket(event.get("timestamp", ""))
+
+            for pattern, error in self._failure_signals(event):
+                entry = bucket["failures"].setdefault(
+                    pattern, {"count": 0, "errors": []}
+                )
+                entry["count"] += 1
+                _add_distinct(entry["errors"], [error])
+
+            for pattern, context in self._success_signals(event):
+                entry = bucket["successes"].setdefault(
+                    pattern, {"count": 0, "contexts": [], "elements": []}
+                )
+                entry["count"] += 1
+                if len(entry["contexts"]) < 3:
+                    entry["contexts"].append(str(context))
+                _add_distinct(
+                    entry["elements"], self._extract_key_elements([context]), limit=None
+                )
+
+            self._fold_fix_mapping(aggregates, bucket, event)
+
+    def _failure_signals(self, event: Dict) -> List[tuple]:
+        """(pattern, error) pairs for an event that indicates failure"""
+        # Handle different event type formats
+        event_type = event.get("event_type", "").lower()
+        if event_type not in self.FAILURE_EVENT_TYPES:
+            return []
+
+        signals = []
+        context = event.get("context", {})
+
+        # Extract patterns from context
+        if "code_pattern" in context:
+            signals.append(
+                (context["code_pattern"], event.get("message", "Unknown error"))
+            )
+
+        # Look for common failure indicators
+        message = event.get("message", "")
+        if "placeholder" in message.lower():
+            signals.append(("placeholder_code", message))
+        if "todo" in message.lower():
+            signals.append(("todo_in_code", message))
+        if "not implemented" in message.lower():
+            signals.append(("empty_implementation", message))
+        if "routing mismatch" in message.lower():
+            signals.append(("routing_mismatch", message))
+        if "takes 2 positional arguments but 3 were given" in message:
+            signals.append(("method_signature_error", message))
+        if "got an unexpected keyword argument" in message:
+            signals.append(("parameter_mismatch", message))
+
+        return signals
+
+    def _success_signals(self, event: Dict) -> List[tuple]:
+        """(pattern, context) pairs for an event that indicates success"""
+        event_type = event.get("event_type", "").lower()
+        if event_type not in self.SUCCESS_EVENT_TYPES:
+            return []
+
+        # Check for success indicator (might be True or implicit)
+        if event.get("success") is False:
+            return []
+
+        signals = []
+        context = event.get("context", {})
+
+        # Extract successful patterns
+        if "implementation_pattern" in context:
+            signals.append((context["implementation_pattern"], context))
+
+        # Look for success indicators
+        message = event.get("message", "")
+        if "test passed" in message.lower():
+            signals.append(("comprehensive_tests", context))
+        if "quality score" in message.lower() and ">" in message:
+            signals.append(("high_quality_code", context))
+
+        return signals
+
+    def _fold_fix_mapping(
+        self, aggregates: "PatternAggregates", bucket: Dict, event: Dict
+    ):
+        """Pair a failure with the next success in the same workflow"""
+        event_type = event.get("event_type")
+        workflow_id = str(event.get("parent_event_id") or event.get("event_id"))
+
+        if event_type in ["AGENT_FAILURE", "ERROR"]:
+            aggregates.pending_failures[workflow_id] = {
+                "message": event.get("message", ""),
+                "context": event.get("context", {}),
+                "timestamp": event.get("timestamp", ""),
+            }
+        elif event_type in ["AGENT_SUCCESS"]:
+            failure_event = aggregates.pending_failures.pop(workflow_id, None)
+            if failure_event:
+                # Found a fix!
+                bucket["fixes"].append(
+                    {
+                        "failure": failure_event["message"],
+                        "failure_context": failure_event["context"],
+                        "fix": event.get("message", ""),
+                        "fix_context": event.get("context", {}),
+                        "confidence": 0.8,  # High confidence for direct fix
+                    }
+                )
+
+    def _failure_patterns_from(
+        self, aggregates: "PatternAggregates"
+    ) -> List[FailurePattern]:
+        """Identify patterns that commonly lead to failures"""
+        totals = {}
+        for _, bucket in aggregates.ordered_buckets():
+            for pattern, entry in bucket["failures"].items():
+                total = totals.setdefault(pattern, {"count": 0, "errors": []})
+                total["count"] += entry["count"]
+                _add_distinct(total["errors"], entry["errors"])
 
         # Analyze patterns
         patterns = []
-        for pattern, errors in failure_contexts.items():
-            if len(errors) >= 2:  # At least 2 occurrences
+        for pattern, total in totals.items():
+            if total["count"] >= 2:  # At least 2 occurrences
                 patterns.append(
                     FailurePattern(
                         pattern=pattern,
-                        failure_count=len(errors),
+                        failure_count=total["count"],
                         success_count=0,  # Will be updated later
                         failure_rate=1.0,  # Will be calculated
-                        common_errors=list(set(errors))[:3],
+                        common_errors=total["errors"],
                         suggested_fix=self._suggest_fix_for_pattern(pattern),
                         last_seen=datetime.now().isoformat(),
                     )
@@ -204,88 +376,40 @@ class TelemetryPatternLearner:
 
         return patterns
 
-    def _analyze_success_patterns(self, events: List[Dict]) -> List[SuccessPattern]:
+    def _success_patterns_from(
+        self, aggregates: "PatternAggregates"
+    ) -> List[SuccessPattern]:
         """Identify patterns that lead to success"""
-        success_contexts = defaultdict(list)
-
-        for event in events:
-            event_type = event.get("event_type", "").lower()
-            if event_type in ["agent_success", "workflow_end"]:
-                # Check for success indicator (might be True or implicit)
-                if event.get("success") is not False:
-                    context = event.get("context", {})
-
-                    # Extract successful patterns
-                    if "implementation_pattern" in context:
-                        pattern = context["implementation_pattern"]
-                        success_contexts[pattern].append(context)
-
-                    # Look for success indicators
-                    message = event.get("message", "")
-                    if "test passed" in message.lower():
-                        success_contexts["comprehensive_tests"].append(context)
-                    if "quality score" in message.lower() and ">" in message:
-                        success_contexts["high_quality_code"].append(context)
+        totals = {}
+        for _, bucket in aggregates.ordered_buckets():
+            for pattern, entry in bucket["successes"].items():
+                total = totals.setdefault(
+                    pattern, {"count": 0, "contexts": [], "elements": []}
+                )
+                total["count"] += entry["count"]
+                total["contexts"].extend(
+                    entry["contexts"][: 3 - len(total["contexts"])]
+                )
+                _add_distinct(total["elements"], entry["elements"], limit=None)
 
         # Analyze patterns
         patterns = []
-        for pattern, contexts in success_contexts.items():
-            if len(contexts) >= 2:
-                # Extract key elements that made it successful
-                key_elements = self._extract_key_elements(contexts)
-
+        for pattern, total in totals.items():
+            if total["count"] >= 2:
                 patterns.append(
                     SuccessPattern(
                         pattern=pattern,
-                        success_count=len(contexts),
+                        success_count=total["count"],
                         failure_count=0,
                         success_rate=1.0,
-                        contexts=[str(c) for c in contexts[:3]],
-                        key_elements=key_elements,
+                        contexts=total["contexts"],
+                        key_elements=total["elements"],
                         last_seen=datetime.now().isoformat(),
                     )
                 )
 
         return patterns
 
-    def _find_fix_mappings(self, events: List[Dict]) -> List[Dict]:
-        """Find what fixes work for what failures"""
-        fix_mappings = []
-
-        # Group events by session/workflow
-        workflows = defaultdict(list)
-        for event in events:
-            workflow_id = event.get("parent_event_id") or event.get("event_id")
-            workflows[workflow_id].append(event)
-
-        # Analyze each workflow
-        for workflow_id, workflow_events in workflows.items():
-            # Look for failure followed by success
-            failure_event = None
-            success_event = None
-
-            for i, event in enumerate(workflow_events):
-                if event.get("event_type") in ["AGENT_FAILURE", "ERROR"]:
-                    failure_event = event
-                elif event.get("event_type") in ["AGENT_SUCCESS"] and failure_event:
-                    success_event = event
-
-                    # Found a fix!
-                    fix_mappings.append(
-                        {
-                            "failure": failure_event.get("message", ""),
-                            "failure_context": failure_event.get("context", {}),
-                            "fix": success_event.get("message", ""),
-                            "fix_context": success_event.get("context", {}),
-                            "confidence": 0.8,  # High confidence for direct fix
-                        }
-                    )
-
-                    failure_event = None
-                    success_event = None
-
-        return fix_mappings
-
     def _suggest_fix_for_pattern(self, pattern: str) -> str:
         """Suggest a fix for a failure pattern"""
         fixes = {
@@ -0,0 +1,709 @@
+#!/usr/bin/env uv run python
+"""
+Columnar telemetry store for 12-factor-agents.
+
+Raw JSONL telemetry is compacted into daily partitions. Low-cardinality
+fields (event type, agent, repo) are dictionary-encoded into integer
+columns, success is a tri-state byte column and timestamps are stored as
+epoch floats. Time-range queries only open the partitions they cover, and
+counts/group-bys read just the columns they need without building event
+dicts.
+
+Each partition keeps its own copy of the raw lines in rows.jsonl, so raw
+telemetry files can be rotated or deleted once ingested. Columns are
+written one file at a time with timestamps last; the timestamp column's
+length is the committed row count, and anything a crashed writer left
+past it is truncated before the next append. Events without a usable
+timestamp go to an "undated" partition, so unranged queries still count
+them.
+"""
+
+import hashlib
+import json
+import os
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+# Optional cross-process locking (POSIX only)
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# Tri-state success encoding
+SUCCESS_CODES = {None: -1, False: 0, True: 1}
+SUCCESS_VALUES = {-1: None, 0: False, 1: True}
+
+# Partition for events whose timestamp cannot be parsed
+UNDATED = "undated"
+
+# A where-clause value: one value, a collection of values, or a predicate
+Match = Union[Any, Iterable[Any], Callable[[Any], bool]]
+
+
+def _event_key(event: Dict[str, Any], line: bytes) -> int:
+    """64-bit identity used to skip events already stored"""
+    identity = event.get("event_id") or event.get("telemetry_id")
+    data = str(identity).encode() if identity else line
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def _matcher(match: Match) -> Callable[[Any], bool]:
+    """Turn a where-clause value into a predicate"""
+    if callable(match):
+        return match
+    if isinstance(match, (list, tuple, set, frozenset)):
+        allowed = set(match)
+        return lambda value: value in allowed
+    return lambda value: value == match
+
+
+class TelemetryPartition:
+    """One day of telemetry stored column by column"""
+
+    def __init__(self, path: Path, dictionary_columns: tuple, text_columns: tuple):
+        self.path = path
+        self.day = path.name
+        self.dictionary_columns = dictionary_columns
+        self.text_columns = text_columns
+        self._cache: Dict[str, tuple] = {}
+        self._keys: Optional[set] = None
+        self._keys_rows = 0
+
+    def _file(self, name: str) -> Path:
+        return self.path / name
+
+    def _read_cached(self, name: str, loader: Callable[[Path], Any]) -> Any:
+        """Read a column file, reusing the last read while its size is unchanged"""
+        path = self._file(name)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return loader(None)
+
+        cached = self._cache.get(name)
+        if cached and cached[0] == size:
+            return cached[1]
+
+        data = loader(path)
+        self._cache[name] = (size, data)
+        return data
+
+    def _read_array(self, name: str, typecode: str) -> array:
+        def load(path: Optional[Path]) -> array:
+            values = array(typecode)
+            if path is not None:
+                raw = path.read_bytes()
+                usable = len(raw) - len(raw) % values.itemsize
+                values.frombytes(raw[:usable])
+            return values
+
+        return self._read_cached(name, load)
+
+    @property
+    def row_count(self) -> int:
+        """Rows committed to this partition (timestamps are written last)"""
+        try:
+            return self._file("timestamp.f64").stat().st_size // 8
+        except FileNotFoundError:
+            return 0
+
+    def timestamps(self) -> array:
+        return self._read_array("timestamp.f64", "d")
+
+    def success(self) -> array:
+        return self._read_array("success.i8", "b")
+
+    def codes(self, column: str) -> array:
+        return self._read_array(f"{column}.u32", "I")
+
+    def offsets(self) -> array:
+        return self._read_array("offset.u64", "Q")
+
+    def dictionary(self, column: str) -> List[str]:
+        def load(path: Optional[Path]) -> Dict[str, List[str]]:
+            if path is None:
+                return {}
+            with open(path) as f:
+                return json.load(f)
+
+        return self._read_cached("dictionary.json", load).get(column, [])
+
+    def text(self, column: str) -> List[str]:
+        def load(path: Optional[Path]) -> List[str]:
+            if path is None:
+                return []
+            with open(path) as f:
+                return [json.loads(line) for line in f]
+
+        return self._read_cached(f"{column}.txt", load)
+
+    def rows(self, indexes: Iterable[int]) -> Iterator[Dict[str, Any]]:
+        """Read full rows for the given indexes from rows.jsonl"""
+        offsets = self.offsets()
+        try:
+            f = open(self._file("rows.jsonl"), "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            for index in indexes:
+                f.seek(offsets[index])
+                try:
+                    yield json.loads(f.readline())
+                except ValueError:
+                    continue
+
+    def keys(self) -> set:
+        """Identity keys of stored rows, loaded only when appending"""
+        rows = self.row_count
+        if self._keys is None or self._keys_rows != rows:
+            self._keys = set(self._read_array("key.u64", "Q")[:rows])
+            self._keys_rows = rows
+        return self._keys
+
+    def _binary_columns(self) -> Dict[str, int]:
+        """Fixed-width column files (other than timestamps) and item sizes"""
+        columns = {f"{column}.u32": 4 for column in self.dictionary_columns}
+        columns.update({"success.i8": 1, "offset.u64": 8, "key.u64": 8})
+        return columns
+
+    def _truncate_uncommitted(self, rows: int):
+        """
+        Drop anything a crashed writer appended past the committed rows.
+
+        Fixed-width columns are written first, so a writer that died before
+        committing its timestamps always leaves one of them too long; only
+        then are rows.jsonl and the text columns scanned and cut back.
+        """
+        dirty = False
+        for name, size in self._binary_columns().items():
+            path = self._file(name)
+            if path.exists() and path.stat().st_size > rows * size:
+                os.truncate(path, rows * size)
+                dirty = True
+
+        timestamps = self._file("timestamp.f64")
+        if timestamps.exists() and timestamps.stat().st_size > rows * 8:
+            os.truncate(timestamps, rows * 8)  # Torn final timestamp
+        if not dirty:
+            return
+
+        end = 0
+        payload_path = self._file("rows.jsonl")
+        if rows and payload_path.exists():
+            with open(payload_path, "rb") as f:
+                f.seek(self.offsets()[rows - 1])
+                f.readline()
+                end = f.tell()
+        if payload_path.exists():
+            os.truncate(payload_path, end)
+
+        for column in self.text_columns:
+            path = self._file(f"{column}.txt")
+            if not path.exists():
+                continue
+            with open(path, "rb") as f:
+                for _ in range(rows):
+                    f.readline()
+                end = f.tell()
+            os.truncate(path, end)
+
+        self._cache.clear()
+
+    def append(self, rows: List[tuple]):
+        """
+        Append rows to every column.
+
+        Args:
+            rows: (event, line, timestamp, key) tuples
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._truncate_uncommitted(self.row_count)
+
+        # Dictionary-encode low-cardinality columns
+        dictionaries = {
+            column: list(self.dictionary(column)) for column in self.dictionary_columns
+        }
+        lookups = {
+            column: {value: code for code, value in enumerate(values)}
+            for column, values in dictionaries.items()
+        }
+        dictionary_changed = False
+
+        codes = {column: array("I") for column in self.dictionary_columns}
+        texts = {column: [] for column in self.text_columns}
+        success = array("b")
+        offsets = array("Q")
+        keys = array("Q")
+        timestamps = array("d")
+        payload = []
+
+        payload_path = self._file("rows.jsonl")
+        position = payload_path.stat().st_size if payload_path.exists() else 0
+
+        for event, line, timestamp, key in rows:
+            for column in self.dictionary_columns:
+                value = event.get(column)
+                value = "" if value is None else str(value)
+                code = lookups[column].get(value)
+                if code is None:
+                    code = len(dictionaries[column])
+                    dictionaries[column].append(value)
+                    lookups[column][value] = code
+                    dictionary_changed = True
+                codes[column].append(code)
+
+            for column in self.text_columns:
+                value = event.get(column)
+                texts[column].append(json.dumps("" if value is None else str(value)))
+
+            value = event.get("success")
+            success.append(SUCCESS_CODES[value if isinstance(value, bool) else None])
+            keys.append(key)
+            timestamps.append(timestamp)
+
+            if not line.endswith(b"\n"):
+                line += b"\n"
+            offsets.append(position)
+            payload.append(line)
+            position += len(line)
+
+        if dictionary_changed:
+            tmp = self._file("dictionary.json.tmp")
+            with open(tmp, "w") as f:
+                json.dump(dictionaries, f)
+            os.replace(tmp, self._file("dictionary.json"))
+
+        # Fixed-width columns first so an interrupted append is detectable
+        columns = {f"{column}.u32": values for column, values in codes.items()}
+        columns.update({"success.i8": success, "offset.u64": offsets, "key.u64": keys})
+        for name, values in columns.items():
+            with open(self._file(name), "ab") as f:
+                values.tofile(f)
+
+        with open(payload_path, "ab") as f:
+            f.write(b"".join(payload))
+        for column, lines in texts.items():
+            with open(self._file(f"{column}.txt"), "a") as f:
+                f.write("".join(value + "\n" for value in lines))
+
+        # Timestamps last: their length is the committed row count
+        with open(self._file("timestamp.f64"), "ab") as f:
+            timestamps.tofile(f)
+
+        if self._keys is not None:
+            self._keys.update(keys)
+            self._keys_rows = self.row_count
+
+
+class TelemetryStore:
+    """
+    Daily-partitioned, dictionary-encoded columnar telemetry store.
+
+    Raw JSONL files are ingested incrementally (per-file byte offsets are
+    remembered), events are de-duplicated by event id, and queries take an
+    optional time range plus a where-clause on any stored column.
+    """
+
+    STATE_FILE = "ingest_state.json"
+
+    def __init__(
+        self,
+        store_dir: Path,
+        dictionary_columns: tuple = ("event_type", "agent", "repo"),
+        text_columns: tuple = ("message",),
+    ):
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.dictionary_columns = tuple(dictionary_columns)
+        self.text_columns = tuple(text_columns)
+        self._partitions: Dict[str, TelemetryPartition] = {}
+
+    @contextmanager
+    def _locked(self):
+        """Serialize writers across processes (no-op without fcntl)"""
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+
+        with open(self.store_dir / ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _partition(self, day: str) -> TelemetryPartition:
+        partition = self._partitions.get(day)
+        if partition is None:
+            partition = TelemetryPartition(
+                self.store_dir / day, self.dictionary_columns, self.text_columns
+            )
+            self._partitions[day] = partition
+        return partition
+
+    def partitions(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> List[TelemetryPartition]:
+        """
+        Partitions overlapping a time range, oldest first.
+
+        The undated partition comes last and only without a time range.
+        """
+        first = start.date().isoformat() if start else None
+        last = end.date().isoformat() if end else None
+
+        days = []
+        undated = False
+        for path in self.store_dir.iterdir():
+            if not path.is_dir():
+                continue
+            day = path.name
+            if day == UNDATED:
+                undated = not (first or last)
+                continue
+            if (first and day < first) or (last and day > last):
+                continue
+            days.append(day)
+
+        if undated:
+            days.append(UNDATED)
+        return [
+            self._partition(day)
+            for day in sorted(days, key=lambda d: (d == UNDATED, d))
+        ]
+
+    # Writes
+
+    def append(self, events: Iterable[Dict[str, Any]]) -> int:
+        """Store events, skipping duplicates. Returns the number added."""
+        lines = []
+        for event in events:
+            lines.append((event, json.dumps(event).encode() + b"\n"))
+        with self._locked():
+            return self._append_parsed(lines)
+
+    def _append_parsed(self, events: List[tuple]) -> int:
+        """
+        Partition and append events; caller holds the lock.
+
+        Args:
+            events: (event, raw line) tuples
+        """
+        by_day: Dict[str, List[tuple]] = {}
+        seen: Dict[str, set] = {}
+        for event, line in events:
+            try:
+                moment = datetime.fromisoformat(event.get("timestamp", ""))
+                day, timestamp = moment.date().isoformat(), moment.timestamp()
+            except (TypeError, ValueError):
+                day, timestamp = UNDATED, float("nan")
+
+            key = _event_key(event, line)
+            if day not in by_day:
+                by_day[day] = []
+                seen[day] = set(self._partition(day).keys())
+            if key in seen[day]:
+                continue
+            seen[day].add(key)
+            by_day[day].append((event, line, timestamp, key))
+
+        for day, rows in by_day.items():
+            if rows:
+                self._partition(day).append(rows)
+
+        return sum(len(rows) for rows in by_day.values())
+
+    def _load_state(self) -> Dict[str, Dict[str, int]]:
+        path = self.store_dir / self.STATE_FILE
+        if not path.exists():
+            return {}
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save_state(self, state: Dict[str, Dict[str, int]]):
+        tmp = self.store_dir / f"{self.STATE_FILE}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.store_dir / self.STATE_FILE)
+
+    def ingest_file(self, path: Path) -> int:
+        """Compact new events from a raw JSONL (or JSON) file into the store"""
+        with self._locked():
+            state = self._load_state()
+            added = self._ingest(Path(path), state)
+            self._save_state(state)
+        return added
+
+    def ingest_directory(
+        self, directory: Path, patterns: tuple = ("*.jsonl", "*.json")
+    ) -> int:
+        """Compact every raw telemetry file in a directory"""
+        files = []
+        for pattern in patterns:
+            files.extend(sorted(Path(directory).glob(pattern)))
+
+        added = 0
+        with self._locked():
+            state = self._load_state()
+            for path in files:
+                added += self._ingest(path, state)
+            self._save_state(state)
+        return added
+
+    def _ingest(self, path: Path, state: Dict[str, Dict[str, int]]) -> int:
+        """Read what is new in one file since the last ingest"""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return 0
+
+        entry = state.get(str(path), {})
+        offset = entry.get("offset", 0)
+        # Start over if the file was replaced or truncated
+        if entry.get("inode") != stat.st_ino or stat.st_size < offset:
+            offset = 0
+        if path.suffix != ".jsonl" and entry.get("mtime") != stat.st_mtime:
+            offset = 0
+        if offset == stat.st_size:
+            return 0
+
+        events = []
+        try:
+            with open(path, "rb") as f:
+                if path.suffix == ".jsonl":
+                    f.seek(offset)
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            break  # Partial line still being written
+                        offset += len(line)
+                        if not line.strip():
+                            continue
+                        try:
+                            events.append((json.loads(line), line))
+                        except json.JSONDecodeError:
+                            continue
+                else:
+                    loaded = json.load(f)
+                    offset = stat.st_size
+                    for event in loaded if isinstance(loaded, list) else [loaded]:
+                        line = json.dumps(event).encode() + b"\n"
+                        events.append((event, line))
+        except (OSError, ValueError):
+            return 0  # Skip unreadable or corrupted files
+
+        state[str(path)] = {
+            "offset": offset,
+            "inode": stat.st_ino,
+            "mtime": stat.st_mtime,
+        }
+        return self._append_parsed([e for e in events if isinstance(e[0], dict)])
+
+    # Queries
+
+    def _select(
+        self,
+        partition: TelemetryPartition,
+        start: Optional[float],
+        end: Optional[float],
+        where: Optional[Dict[str, Match]],
+        rows: Optional[range] = None,
+    ) -> List[int]:
+        """Row indexes of a partition matching a time range and where-clause"""
+        selected = range(partition.row_count) if rows is None else rows
+        if not selected:
+            return []
+
+        if start is not None or end is not None:
+            timestamps = partition.timestamps()
+            low = float("-inf") if start is None else start
+            high = float("inf") if end is None else end
+            selected = [i for i in selected if low <= timestamps[i] <= high]
+
+        for column, match in (where or {}).items():
+            predicate = _matcher(match)
+            if column == "success":
+                allowed = {
+                    code for code, value in SUCCESS_VALUES.items() if predicate(value)
+                }
+                values = partition.success()
+            elif column in self.dictionary_columns:
+                # Evaluate the predicate once per distinct value
+                allowed = {
+                    code
+                    for code, value in enumerate(partition.dictionary(column))
+                    if predicate(value)
+                }
+                values = partition.codes(column)
+            else:
+                raise ValueError(f"Column is not filterable: {column}")
+
+            if not allowed:
+                return []
+            selected = [i for i in selected if values[i] in allowed]
+
+        return list(selected)
+
+    def _scan(
+        self,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        where: Optional[Dict[str, Match]],
+    ) -> Iterator[tuple]:
+        """Yield (partition, matching indexes) for a query"""
+        start_ts = start.timestamp() if start else None
+        end_ts = end.timestamp() if end else None
+        for partition in self.partitions(start, end):
+            indexes = self._select(partition, start_ts, end_ts, where)
+            if indexes:
+                yield partition, indexes
+
+    def count(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        where: Optional[Dict[str, Match]] = None,
+    ) -> int:
+        """Count events in a time range"""
+        return sum(len(indexes) for _, indexes in self._scan(start, end, where))
+
+    def group_by(
+        self,
+        columns: Union[str, tuple],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        where: Optional[Dict[str, Match]] = None,
+    ) -> Dict[Any, int]:
+        """
+        Count events per value of one or more columns.
+
+        Args:
+            columns: Column name, or tuple of names for composite keys
+            start: Only include events at or after this time
+            end: Only include events at or before this time
+            where: Column filters (value, collection of values, or predicate)
+
+        Returns:
+            Mapping of column value (or tuple of values) to event count
+        """
+        names = (columns,) if isinstance(columns, str) else tuple(columns)
+        counts: Counter = Counter()
+
+        for partition, indexes in self._scan(start, end, where):
+            # Count raw codes, then decode once per distinct combination
+            columns_codes = []
+            decoders = []
+            for name in names:
+                if name == "success":
+                    columns_codes.append(partition.success())
+                    decoders.append(SUCCESS_VALUES)
+                elif name in self.dictionary_columns:
+                    columns_codes.append(partition.codes(name))
+                    decoders.append(partition.dictionary(name))
+                else:
+                    raise ValueError(f"Column is not groupable: {name}")
+
+            if len(names) == 1:
+                codes = columns_codes[0]
+                code_counts = Counter(codes[i] for i in indexes)
+                for code, count in code_counts.items():
+                    counts[decoders[0][code]] += count
+            else:
+                code_counts = Counter(
+                    tuple(codes[i] for codes in columns_codes) for i in indexes
+                )
+                for key, count in code_counts.items():
+                    decoded = tuple(d[code] for d, code in zip(decoders, key))
+                    counts[decoded] += count
+
+        return dict(counts)
+
+    def column_values(
+        self,
+        column: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        where: Optional[Dict[str, Match]] = None,
+    ) -> Iterator[Any]:
+        """Yield one column's values for matching events"""
+        for partition, indexes in self._scan(start, end, where):
+            if column in self.text_columns:
+                values = partition.text(column)
+                for i in indexes:
+                    yield values[i]
+            elif column in self.dictionary_columns:
+                codes = partition.codes(column)
+                dictionary = partition.dictionary(column)
+                for i in indexes:
+                    yield dictionary[codes[i]]
+            elif column == "success":
+                values = partition.success()
+                for i in indexes:
+                    yield SUCCESS_VALUES[values[i]]
+            else:
+                raise ValueError(f"Column is not stored: {column}")
+
+    def iter_events(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        where: Optional[Dict[str, Match]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield full events for matching rows, oldest partition first"""
+        for partition, indexes in self._scan(start, end, where):
+            yield from partition.rows(indexes)
+
+    def iter_new_events(
+        self,
+        cursor: Dict[str, int],
+        start: Optional[datetime] = None,
+        where: Optional[Dict[str, Match]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield events appended since a cursor, advancing it as partitions finish.
+
+        Args:
+            cursor: Rows already consumed per partition day, updated in place
+            start: Ignore partitions and events before this time
+            where: Column filters applied to the new rows
+
+        Returns:
+            Iterator over new matching events, oldest partition first
+        """
+        start_ts = start.timestamp() if start else None
+        if start:
+            # Partitions that left the window are never read again
+            first_day = start.date().isoformat()
+            for day in [d for d in cursor if d < first_day]:
+                del cursor[day]
+
+        for partition in self.partitions(start):
+            consumed = cursor.get(partition.day, 0)
+            count = partition.row_count
+            if count <= consumed:
+                continue
+
+            indexes = self._select(
+                partition, start_ts, None, where, rows=range(consumed, count)
+            )
+            yield from partition.rows(indexes)
+            cursor[partition.day] = count
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get store statistics"""
+        partitions = self.partitions()
+        return {
+            "partitions": len(partitions),
+            "events": sum(p.row_count for p in partitions),
+            "oldest": partitions[0].day if partitions else None,
+            "newest": partitions[-1].day if partitions else None,
+        }
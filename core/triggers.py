@@ -2,15 +2,23 @@
 Local event trigger system for Factor 11 compliance.
 Factor 11: Trigger from Anywhere - Agents can be triggered through multiple entry points.
 """
+
 import json
+import os
 import time
 import threading
 import hashlib
+import fnmatch
+import select
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Callable, List
+from typing import Dict, Any, Callable, List, Optional, Set
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 
+from . import inotify
+from .event_journal import EventJournal
+
 
 @dataclass
 class Event:
@@ -37,29 +45,80 @@ class LocalEventSystem:
     """
     File-based event system for local agent triggers.
     No external dependencies required.
+
+    On Linux the events directory and file watchers are followed with
+    inotify, so events are dispatched as soon as they are written and idle
+    systems do no work. Elsewhere (or with backend="poll") directories are
+    polled. Handlers run on a bounded worker pool in both cases.
     """
 
-    def __init__(self):
-        self.events_dir = Path.home() / ".claude-shared-state" / "events"
+    # Inotify events that can signal a new, changed or removed file
+    WATCH_MASK = (
+        inotify.IN_CLOSE_WRITE
+        | inotify.IN_MOVED_TO
+        | inotify.IN_MOVED_FROM
+        | inotify.IN_DELETE
+        | inotify.IN_ATTRIB
+    )
+
+    # Journal records handed to the worker pool per batch
+    JOURNAL_BATCH = 256
+
+    def __init__(
+        self,
+        events_dir: Path = None,
+        backend: str = "auto",
+        max_workers: int = 4,
+        consumer: str = "default",
+    ):
+        self.events_dir = events_dir or (
+            Path.home() / ".claude-shared-state" / "events"
+        )
+        self.events_dir = Path(self.events_dir)
         self.events_dir.mkdir(parents=True, exist_ok=True)
 
         self.processed_dir = self.events_dir / "processed"
         self.processed_dir.mkdir(exist_ok=True)
 
+        # Emitted events are appended to the journal; event files dropped
+        # into events_dir by other tools are still picked up
+        self.journal = EventJournal(self.events_dir / "journal")
+        self.consumer = consumer
+
+        if backend == "auto":
+            backend = "inotify" if inotify.Inotify.available() else "poll"
+        if backend not in ("inotify", "poll"):
+            raise ValueError(f"Unknown event backend: {backend}")
+        self.backend = backend
+        self.max_workers = max_workers
+
         self.handlers: Dict[str, List[Callable]] = {}
         self.file_watchers: List[Dict[str, Any]] = []
         self.schedules: List[Dict[str, Any]] = []
         self.running = False
         self._lock = threading.Lock()
         self._processor_thread = None
+        self._journal_thread = None
         self._watcher_thread = None
         self._scheduler_thread = None
 
+        # Event dispatch state
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight: Set[str] = set()
+        self._journal_ready = threading.Event()
+
+        # Inotify state
+        self._inotify: Optional[inotify.Inotify] = None
+        self._wake_pipe = None
+        self._events_wd = None
+        self._journal_wd = None
+        self._watched: Dict[int, List[Dict[str, Any]]] = {}
+
     def emit(
         self, event_type: str, data: Dict[str, Any], source: str = "manual"
     ) -> str:
         """
-        Emit an event to the file system.
+        Emit an event to the event journal.
         Returns event ID.
         """
         event = Event(
@@ -71,9 +130,9 @@ class LocalEventSystem:
             f"{event_type}{datetime.now().isoformat()}{json.dumps(data)}".encode()
         ).hexdigest()[:12]
 
-        # Write event file
-        event_file = self.events_dir / f"{event_type}_{event_id}.json"
-        event_file.write_text(json.dumps(event.to_dict(), indent=2))
+        record = event.to_dict()
+        record["event_id"] = event_id
+        self.journal.append(record)
 
         return event_id
 
@@ -107,6 +166,7 @@ class LocalEventSystem:
             "event_type": event_type,
             "last_check": datetime.now(),
             "file_states": {},
+            "wd": None,
         }
 
         # Get initial state
@@ -116,6 +176,9 @@ class LocalEventSystem:
 
         self.file_watchers.append(watcher)
 
+        if self.running:
+            self._attach_watcher(watcher)
+
     def register_schedule(
         self, cron_expr: str, handler: Callable, event_type: str = "schedule_triggered"
     ) -> None:
@@ -140,41 +203,154 @@ class LocalEventSystem:
         Process pending events.
         Returns number of events processed.
         """
-        processed_count = 0
+        processed_count = self._drain_journal()
 
-        for event_file in self.events_dir.glob("*.json"):
+        for event_file in sorted(self.events_dir.glob("*.json")):
             if event_file.name.startswith("processed_"):
                 continue
+            if not self._claim(event_file):
+                continue
+            try:
+                if self._process_event_file(event_file):
+                    processed_count += 1
+            finally:
+                self._release(event_file)
 
+        return processed_count
+
+    def _claim(self, event_file: Path) -> bool:
+        """Mark an event file as being processed; False if already claimed"""
+        with self._lock:
+            if event_file.name in self._inflight:
+                return False
+            self._inflight.add(event_file.name)
+            return True
+
+    def _release(self, event_file: Path) -> None:
+        with self._lock:
+            self._inflight.discard(event_file.name)
+
+    def _process_event_file(self, event_file: Path) -> bool:
+        """Run handlers for one event file and move it to processed"""
+        try:
+            # Load event
+            event_data = json.loads(event_file.read_text())
+            event = Event.from_dict(event_data)
+
+            self._run_handlers(event)
+
+            # Mark as processed
+            processed_file = self.processed_dir / f"processed_{event_file.name}"
+            event_file.rename(processed_file)
+            return True
+
+        except FileNotFoundError:
+            # Already processed elsewhere
+            return False
+        except Exception as e:
+            print(f"Error processing event {event_file}: {e}")
+            return False
+
+    def _run_handlers(self, event: Event) -> None:
+        """Run typed and wildcard handlers for an event"""
+        # Find handlers
+        with self._lock:
+            handlers = list(self.handlers.get(event.event_type, []))
+            handlers.extend(self.handlers.get("*", []))  # Wildcard handlers
+
+        # Execute handlers
+        for handler in handlers:
             try:
-                # Load event
-                event_data = json.loads(event_file.read_text())
-                event = Event.from_dict(event_data)
+                handler(event)
+            except Exception as e:
+                print(f"Handler error for {event.event_type}: {e}")
+
+    @staticmethod
+    def _event_from_record(record: Dict[str, Any], processed: bool = False):
+        """Build an Event from a journal record"""
+        data = dict(record)
+        data.pop("event_id", None)
+        data["processed"] = processed
+        return Event.from_dict(data)
+
+    def _drain_journal(self, executor: ThreadPoolExecutor = None) -> int:
+        """
+        Run handlers for journal events past the consumer offset.
 
-                # Find handlers
-                handlers = self.handlers.get(event.event_type, [])
-                handlers.extend(self.handlers.get("*", []))  # Wildcard handlers
+        Events are handled in batches; with an executor each batch runs on
+        the worker pool. The offset is committed after every batch.
+        """
+        processed_count = 0
+
+        with self.journal.consumer_lock(self.consumer):
+            position = self.journal.get_offset(self.consumer)
+            while True:
+                batch = list(self.journal.read(position, limit=self.JOURNAL_BATCH))
+                if not batch:
+                    break
 
-                # Execute handlers
-                for handler in handlers:
+                events = []
+                for _, record in batch:
                     try:
-                        handler(event)
+                        events.append(self._event_from_record(record))
                     except Exception as e:
-                        print(f"Handler error for {event.event_type}: {e}")
+                        print(f"Error processing event {record.get('event_id')}: {e}")
 
-                # Mark as processed
-                processed_file = self.processed_dir / f"processed_{event_file.name}"
-                event_file.rename(processed_file)
-                processed_count += 1
+                if executor is None:
+                    for event in events:
+                        self._run_handlers(event)
+                else:
+                    try:
+                        list(executor.map(self._run_handlers, events))
+                    except (RuntimeError, CancelledError):
+                        # Stopped mid-batch; the batch is delivered again
+                        break
 
-            except Exception as e:
-                print(f"Error processing event {event_file}: {e}")
+                position = batch[-1][0]
+                self.journal.commit(self.consumer, position)
+                processed_count += len(events)
 
         return processed_count
 
+    def _journal_loop(self) -> None:
+        """Handle journal events as they are appended"""
+        # Without inotify, wake up once a second to poll
+        timeout = None if self._inotify is not None else 1
+        while self.running:
+            self._journal_ready.wait(timeout)
+            self._journal_ready.clear()
+            if not self.running:
+                break
+            if self._inotify is None:
+                self._dispatch_pending()
+            self._drain_journal(self._executor)
+
+    def _dispatch(self, event_file: Path) -> None:
+        """Queue an event file for processing on the worker pool"""
+        if event_file.name.startswith("processed_") or not self._claim(event_file):
+            return
+
+        try:
+            future = self._executor.submit(self._process_event_file, event_file)
+        except RuntimeError:
+            # Pool shut down; the file stays pending for the next run
+            self._release(event_file)
+            return
+
+        # Also runs when stop() cancels the queued job
+        future.add_done_callback(lambda _: self._release(event_file))
+
+    def _dispatch_pending(self) -> None:
+        """Queue every pending event file"""
+        for event_file in sorted(self.events_dir.glob("*.json")):
+            self._dispatch(event_file)
+
     def _check_file_watchers(self) -> None:
         """Check for file system changes"""
         for watcher in self.file_watchers:
+            if watcher.get("wd") is not None:
+                continue  # Followed by inotify
+
             path = watcher["path"]
             pattern = watcher["pattern"]
 
@@ -215,6 +391,104 @@ class LocalEventSystem:
 
             watcher["file_states"] = current_states
 
+    def _file_changed(self, watcher: Dict[str, Any], file_path: Path) -> None:
+        """Emit a watcher event for a single file reported by inotify"""
+        key = str(file_path)
+        old_states = watcher["file_states"]
+
+        try:
+            mtime = file_path.stat().st_mtime if file_path.is_file() else None
+        except OSError:
+            mtime = None
+
+        if mtime is None:
+            if key not in old_states:
+                return
+            del old_states[key]
+            change = "deleted"
+        elif key not in old_states:
+            change = "created"
+        elif old_states[key] != mtime:
+            change = "modified"
+        else:
+            return
+
+        if mtime is not None:
+            old_states[key] = mtime
+        self.emit(
+            watcher["event_type"],
+            {"path": key, "change": change},
+            source="file_watcher",
+        )
+
+    def _attach_watcher(self, watcher: Dict[str, Any]) -> None:
+        """Follow a file watcher with inotify, or start the poller for it"""
+        # Recursive patterns span directories inotify does not watch
+        pattern = watcher["pattern"]
+        if self._inotify is not None and "/" not in pattern and "**" not in pattern:
+            try:
+                wd = self._inotify.add_watch(
+                    watcher["path"], self.WATCH_MASK | inotify.IN_ONLYDIR
+                )
+                watcher["wd"] = wd
+                self._watched.setdefault(wd, []).append(watcher)
+                return
+            except OSError as e:
+                print(f"⚠️ inotify watch failed for {watcher['path']}: {e}")
+
+        if self._watcher_thread is None:
+
+            def watcher_loop():
+                while self.running:
+                    self._check_file_watchers()
+                    time.sleep(2)
+
+            self._watcher_thread = threading.Thread(target=watcher_loop, daemon=True)
+            self._watcher_thread.start()
+
+    def _inotify_loop(self) -> None:
+        """Wait for inotify events and dispatch them"""
+        wake_fd = self._wake_pipe[0]
+        while self.running:
+            readable, _, _ = select.select([self._inotify, wake_fd], [], [])
+            if wake_fd in readable or not self.running:
+                break
+
+            for event in self._inotify.read_events():
+                if event.mask & inotify.IN_Q_OVERFLOW:
+                    # Events were dropped; rescan everything
+                    self._journal_ready.set()
+                    self._dispatch_pending()
+                    for watchers in list(self._watched.values()):
+                        for watcher in watchers:
+                            self._rescan_watcher(watcher)
+                    continue
+
+                if not event.name or event.mask & inotify.IN_ISDIR:
+                    continue
+
+                if event.wd == self._journal_wd:
+                    if event.name.startswith("segment_"):
+                        self._journal_ready.set()
+                    continue
+
+                if event.wd == self._events_wd:
+                    if event.mask & (inotify.IN_CLOSE_WRITE | inotify.IN_MOVED_TO):
+                        if event.name.endswith(".json"):
+                            self._dispatch(self.events_dir / event.name)
+                    continue
+
+                for watcher in self._watched.get(event.wd, []):
+                    if fnmatch.fnmatchcase(event.name, watcher["pattern"]):
+                        self._file_changed(watcher, watcher["path"] / event.name)
+
+    def _rescan_watcher(self, watcher: Dict[str, Any]) -> None:
+        """Compare an inotify watcher's directory against its recorded state"""
+        paths = set(watcher["file_states"])
+        paths.update(str(p) for p in watcher["path"].glob(watcher["pattern"]))
+        for file_path in sorted(paths):
+            self._file_changed(watcher, Path(file_path))
+
     def _check_schedules(self) -> None:
         """Check and trigger scheduled events"""
         now = datetime.now()
@@ -262,25 +536,44 @@ class LocalEventSystem:
             return
 
         self.running = True
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="event-handler"
+        )
 
-        # Start processor thread
-        def process_loop():
-            while self.running:
-                self.process_events()
-                time.sleep(1)
+        if self.backend == "inotify":
+            try:
+                self._inotify = inotify.Inotify()
+                self._events_wd = self._inotify.add_watch(
+                    self.events_dir, self.WATCH_MASK | inotify.IN_ONLYDIR
+                )
+                self._journal_wd = self._inotify.add_watch(
+                    self.journal.journal_dir,
+                    inotify.IN_MODIFY | inotify.IN_CREATE | inotify.IN_ONLYDIR,
+                )
+            except OSError as e:
+                print(f"⚠️ inotify unavailable, falling back to polling: {e}")
+                if self._inotify is not None:
+                    self._inotify.close()
+                self._inotify = None
+
+        if self._inotify is not None:
+            self._wake_pipe = os.pipe()
+            self._processor_thread = threading.Thread(
+                target=self._inotify_loop, daemon=True
+            )
+            self._processor_thread.start()
 
-        self._processor_thread = threading.Thread(target=process_loop, daemon=True)
-        self._processor_thread.start()
+            # Event files written before the watch was added
+            self._dispatch_pending()
 
-        # Start file watcher thread
-        def watcher_loop():
-            while self.running:
-                self._check_file_watchers()
-                time.sleep(2)
+        # Start journal thread; it also polls event files without inotify
+        self._journal_ready.set()
+        self._journal_thread = threading.Thread(target=self._journal_loop, daemon=True)
+        self._journal_thread.start()
 
-        if self.file_watchers:
-            self._watcher_thread = threading.Thread(target=watcher_loop, daemon=True)
-            self._watcher_thread.start()
+        # Start file watchers
+        for watcher in self.file_watchers:
+            self._attach_watcher(watcher)
 
         # Start scheduler thread
         def scheduler_loop():
@@ -298,17 +591,53 @@ class LocalEventSystem:
         """Stop the event processing system"""
         self.running = False
 
+        if self._wake_pipe:
+            os.write(self._wake_pipe[1], b"x")
+        self._journal_ready.set()
+
         if self._processor_thread:
             self._processor_thread.join(timeout=2)
+        if self._journal_thread:
+            self._journal_thread.join(timeout=2)
         if self._watcher_thread:
             self._watcher_thread.join(timeout=2)
         if self._scheduler_thread:
             self._scheduler_thread.join(timeout=2)
+        self._processor_thread = None
+        self._journal_thread = None
+        self._watcher_thread = None
+        self._scheduler_thread = None
+
+        # Queued events not yet started stay pending on disk
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        if self._wake_pipe:
+            for fd in self._wake_pipe:
+                os.close(fd)
+            self._wake_pipe = None
+        self._events_wd = None
+        self._journal_wd = None
+        self._watched = {}
+        for watcher in self.file_watchers:
+            watcher["wd"] = None
 
     def get_pending_events(self) -> List[Event]:
         """Get list of pending events"""
         events = []
 
+        # Journal events past the consumer offset
+        offset = self.journal.get_offset(self.consumer)
+        for _, record in self.journal.read(offset):
+            try:
+                events.append(self._event_from_record(record))
+            except Exception:
+                pass
+
         for event_file in self.events_dir.glob("*.json"):
             if not event_file.name.startswith("processed_"):
                 try:
@@ -321,8 +650,15 @@ class LocalEventSystem:
 
     def get_processed_events(self, limit: int = 100) -> List[Event]:
         """Get list of recently processed events"""
+        offset = self.journal.get_offset(self.consumer)
         events = []
+        for record in self.journal.read_before(offset, limit):
+            try:
+                events.append(self._event_from_record(record, processed=True))
+            except Exception:
+                pass
 
+        # Event files processed before the journal existed
         for event_file in sorted(
             self.processed_dir.glob("*.json"),
             key=lambda p: p.stat().st_mtime,
@@ -334,12 +670,13 @@ class LocalEventSystem:
             except Exception:
                 pass
 
-        return events
+        events.sort(key=lambda e: e.timestamp, reverse=True)
+        return events[:limit]
 
     def cleanup_old_events(self, days: int = 7) -> int:
         """Clean up processed events older than specified days"""
         cutoff = datetime.now() - timedelta(days=days)
-        cleaned = 0
+        cleaned = self.journal.enforce_retention(days)
 
         for event_file in self.processed_dir.glob("*.json"):
             try:
@@ -13,6 +13,7 @@ workflow characteristics and performance requirements.
 """
 
 import asyncio
+import heapq
 import uuid
 from typing import Dict, List, Any, Optional, Callable
 from dataclasses import dataclass, field
@@ -43,6 +44,7 @@ class TaskSlice:
     metadata: Dict[str, Any] = field(default_factory=dict)
     dependencies: List[str] = field(default_factory=list)
     estimated_duration: float = 1.0
+    priority: int = 0  # Higher priority slices are scheduled first
 
 
 @dataclass
@@ -111,17 +113,93 @@ class BaseOrchestrationPattern(ABC):
         }
 
 
+class _PartialReduction:
+    """
+    Running reduction of map results.
+
+    Results are folded in as they arrive instead of being collected first:
+    numeric results keep only their sum and dict results only the merged
+    dict, so memory stays bounded. String and list results are kept until
+    the end. If a result of a different kind arrives, the reduction becomes
+    mixed; a numeric or dict partial is kept as its first entry, so that
+    switch is lossy (_reduce_phase keeps every result).
+    """
+
+    def __init__(self):
+        self.kind = "empty"
+        self.count = 0
+        self._total = 0
+        self._merged: Dict[Any, Any] = {}
+        self._items: List[Any] = []
+
+    @staticmethod
+    def _kind_of(value: Any) -> str:
+        if isinstance(value, (int, float)):
+            return "numeric"
+        if isinstance(value, str):
+            return "string"
+        if isinstance(value, list):
+            return "list"
+        if isinstance(value, dict):
+            return "dict"
+        return "mixed"
+
+    def add(self, value: Any):
+        """Fold one map result into the reduction"""
+        kind = self._kind_of(value)
+        if self.kind == "empty":
+            self.kind = kind
+        elif kind != self.kind and self.kind != "mixed":
+            # Keep what has been folded so far, then collect raw results
+            if self.kind in ("numeric", "dict"):
+                self._items = [self.result()]
+            self.kind = "mixed"
+
+        self.count += 1
+        if self.kind == "numeric":
+            self._total += value
+        elif self.kind == "dict":
+            self._merged.update(value)
+        else:
+            self._items.append(value)
+
+    def result(self) -> Any:
+        """Final reduced value"""
+        if self.kind == "empty":
+            return None
+        if self.kind == "numeric":
+            return self._total
+        if self.kind == "dict":
+            return self._merged
+        if self.kind == "string":
+            return "\n".join(self._items)
+        if self.kind == "list":
+            flattened = []
+            for item in self._items:
+                flattened.extend(item)
+            return flattened
+        return {
+            "results": self._items,
+            "count": self.count,
+            "pattern": "mapreduce",
+        }
+
+
 class MapReducePattern(BaseOrchestrationPattern):
     """
     MapReduce Orchestration Pattern
 
     Distributes work across multiple agents (Map) and aggregates
     results (Reduce). Ideal for parallelizable computational tasks.
+
+    Slices are pulled from a shared priority queue, so an agent that
+    finishes early takes over work a slower agent has not started yet.
     """
 
-    def __init__(self):
+    def __init__(self, max_concurrent_per_agent: int = 1):
         super().__init__(OrchestrationPattern.MAPREDUCE)
         self.custom_reducers: Dict[str, Callable] = {}
+        self.max_concurrent_per_agent = max(1, max_concurrent_per_agent)
 
     async def execute(
         self, task_slices: List[TaskSlice], agents: List[Any]
@@ -135,24 +213,22 @@ class MapReducePattern(BaseOrchestrationPattern):
                 f"🗺️ Starting MapReduce with {len(task_slices)} slices, {len(agents)} agents"
             )
 
-            # Map Phase: Distribute work
-            map_results = await self._map_phase(task_slices, agents)
-
-            # Reduce Phase: Aggregate results
-            final_result = await self._reduce_phase(map_results, task_slices)
+            # Map Phase: Schedule slices, reducing results as they arrive
+            reduction, map_stats = await self._map_phase(task_slices, agents)
 
             execution_time = asyncio.get_event_loop().time() - start_time
 
             result = PatternResult(
                 pattern=OrchestrationPattern.MAPREDUCE,
                 success=True,
-                result=final_result,
+                result=reduction.result(),
                 execution_time=execution_time,
                 slices_processed=len(task_slices),
                 agents_used=len(agents),
                 metadata={
-                    "map_results_count": len(map_results),
-                    "reduction_type": self._determine_reduction_type(map_results),
+                    "map_results_count": reduction.count,
+                    "reduction_type": reduction.kind,
+                    **map_stats,
                 },
             )
 
@@ -172,33 +248,49 @@ class MapReducePattern(BaseOrchestrationPattern):
             self.update_stats(result)
             return result
 
-    async def _map_phase(
-        self, task_slices: List[TaskSlice], agents: List[Any]
-    ) -> List[Any]:
-        """Execute map phase - distribute work"""
-
-        # Distribute slices across agents
-        agent_assignments = self._distribute_slices(task_slices, agents)
-
-        # Execute map tasks in parallel
-        map_coroutines = []
-        for agent, slices in agent_assignments.items():
-            coroutine = self._execute_map_task(agent, slices)
-            map_coroutines.append(coroutine)
-
-        # Wait for all map tasks to complete
-        map_results = await asyncio.gather(*map_coroutines, return_exceptions=True)
-
-        # Filter out exceptions and flatten results
-        successful_results = []
-        for result in map_results:
-            if not isinstance(result, Exception):
-                if isinstance(result, list):
-                    successful_results.extend(result)
-                else:
-                    successful_results.append(result)
+    async def _map_phase(self, task_slices: List[TaskSlice], agents: List[Any]):
+        """
+        Execute map phase with a shared work queue.
+
+        Each agent runs up to max_concurrent_per_agent workers that pull
+        the highest priority slice left in the queue (ties in input
+        order). Results are folded into a partial reduction immediately,
+        so per-agent result lists are never built up.
+
+        Returns:
+            (partial reduction, scheduling stats)
+        """
+        reduction = _PartialReduction()
+        slices_per_agent = [0] * len(agents)
+        failed_slices: List[str] = []
+
+        queue = [(-s.priority, i, s) for i, s in enumerate(task_slices)]
+        heapq.heapify(queue)
+
+        async def worker(agent_index: int):
+            agent = agents[agent_index]
+            while queue:
+                _, _, slice_obj = heapq.heappop(queue)
+                try:
+                    result = await self._execute_map_slice(agent, slice_obj)
+                except Exception as e:
+                    logger.warning(f"Map slice {slice_obj.slice_id} failed: {e}")
+                    failed_slices.append(slice_obj.slice_id)
+                    continue
+                slices_per_agent[agent_index] += 1
+                reduction.add(result)
+
+        workers = [
+            worker(index)
+            for index in range(len(agents))
+            for _ in range(self.max_concurrent_per_agent)
+        ]
+        await asyncio.gather(*workers)
 
-        return successful_results
+        return reduction, {
+            "slices_per_agent": slices_per_agent,
+            "failed_slices": failed_slices,
+        }
 
     async def _reduce_phase(
         self, map_results: List[Any], task_slices: List[TaskSlice]
@@ -261,13 +353,17 @@ class MapReducePattern(BaseOrchestrationPattern):
 
         results = []
         for slice_obj in slices:
-            # Simulate agent execution (replace with actual agent call)
-            await asyncio.sleep(0.01)  # Simulate work
-            result = f"Processed: {slice_obj.content}"
-            results.append(result)
+            results.append(await self._execute_map_slice(agent, slice_obj))
 
         return results
 
+    async def _execute_map_slice(self, agent: Any, slice_obj: TaskSlice) -> Any:
+        """Execute a single map slice on an agent"""
+
+        # Simulate agent execution (replace with actual agent call)
+        await asyncio.sleep(0.01)  # Simulate work
+        return f"Processed: {slice_obj.content}"
+
     def _determine_reduction_type(self, results: List[Any]) -> str:
         """Determine appropriate reduction strategy"""
 
@@ -18,6 +18,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from core.hierarchical_orchestrator import (
     HierarchicalOrchestrator,
+    OrchestrationLevel,
+    OrchestrationTask,
+    TaskComplexity,
 )
 from orchestration.patterns import PatternExecutor, TaskSlice, OrchestrationPattern
 
@@ -103,6 +106,46 @@ class TestOrchestrationScaling:
         print(f"  Coordination overhead: {result.coordination_overhead:.1f}%")
         print(f"  Memory usage: {end_memory - start_memory:.1f}MB")
 
+    @pytest.mark.asyncio
+    async def test_100_agent_fan_out_bounded_by_critical_path(self):
+        """Test 100 subtasks finish in about one subtask's time, not the sum"""
+        orchestrator = HierarchicalOrchestrator(
+            max_agents_per_level={"primary": 1, "secondary": 10, "tertiary": 100}
+        )
+
+        root = OrchestrationTask(
+            "root", "Fan out", OrchestrationLevel.SECONDARY, TaskComplexity.ENTERPRISE
+        )
+        for i in range(100):
+            subtask = OrchestrationTask(
+                f"subtask-{i}",
+                f"Process document {i}",
+                OrchestrationLevel.TERTIARY,
+                TaskComplexity.ATOMIC,
+                parent_id=root.task_id,
+            )
+            orchestrator.tasks[subtask.task_id] = subtask
+            root.subtasks.append(subtask.task_id)
+
+        timings = {}
+        for name, executor in [
+            ("mapreduce", orchestrator._execute_mapreduce),
+            ("fork_join", orchestrator._execute_fork_join),
+            ("scatter_gather", orchestrator._execute_scatter_gather),
+        ]:
+            start_time = time.perf_counter()
+            result = await executor(root, f"fan-out-{name}")
+            timings[name] = time.perf_counter() - start_time
+            assert result is not None
+
+        # Each subtask takes 0.1s; serial execution would take 10s
+        for name, elapsed in timings.items():
+            assert elapsed < 1.0, f"{name} took {elapsed:.2f}s"
+
+        print("100-Subtask Fan-Out Results:")
+        for name, elapsed in timings.items():
+            print(f"  {name}: {elapsed:.2f}s (serial: 10.00s)")
+
     @pytest.mark.asyncio
     async def test_deep_hierarchy_performance(self):
         """Test deep hierarchy performance characteristics"""
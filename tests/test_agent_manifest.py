@@ -0,0 +1,220 @@
+#!/usr/bin/env uv run python
+"""
+Tests for the persistent agent discovery manifest.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.agent_executor import AgentExecutor  # noqa: E402
+from core.agent_manifest import AgentManifest  # noqa: E402
+
+AGENT_TEMPLATE = '''
+from core.agent import BaseAgent
+from core.tools import ToolResponse
+{imports}
+
+
+class {name}({base}):
+    """{doc}"""
+
+    def __init__(self, agent_id: str = None, verbose: bool = False):
+        super().__init__(agent_id)
+
+    def register_tools(self):
+        return []
+
+    def execute_task(self, task):
+        return ToolResponse(success=True, data={{"task": task}})
+
+    def _apply_action(self, action):
+        return ToolResponse(success=True)
+'''
+
+BASE_TEMPLATE = '''
+from core.agent import BaseAgent
+
+
+class SharedBase(BaseAgent):
+    """Shared base"""
+
+    def {method}(self):
+        return True
+'''
+
+
+def _write_agent(path, name, doc, base="BaseAgent", imports=""):
+    path.write_text(
+        AGENT_TEMPLATE.format(name=name, doc=doc, base=base, imports=imports)
+    )
+
+
+def _bump_mtime(path):
+    """Move a file's mtime forward without relying on clock resolution"""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestAgentManifest:
+    """Test manifest building, invalidation and lazy loading"""
+
+    @pytest.fixture
+    def package(self, tmp_path, monkeypatch):
+        """A throwaway agents package importable for the test only"""
+        name = f"manifest_agents_{abs(hash(tmp_path)) % 10**8}"
+        agents_dir = tmp_path / name
+        agents_dir.mkdir()
+        (agents_dir / "__init__.py").write_text("")
+        _write_agent(agents_dir / "alpha_agent.py", "AlphaAgent", "Alpha agent")
+        _write_agent(agents_dir / "beta_agent.py", "BetaAgent", "Beta agent")
+        (agents_dir / "helpers.py").write_text(BASE_TEMPLATE.format(method="helper"))
+        monkeypatch.syspath_prepend(str(tmp_path))
+        yield agents_dir
+        for module in [m for m in sys.modules if m.startswith(name)]:
+            del sys.modules[module]
+
+    def _manifest(self, agents_dir):
+        return AgentManifest(
+            agents_dir.parent,
+            manifest_path=agents_dir.parent / "manifest.json",
+            agents_dir=agents_dir,
+        )
+
+    def _forget(self, agents_dir):
+        """Drop the package's modules so later imports are observable"""
+        for module in [m for m in sys.modules if m.startswith(agents_dir.name)]:
+            del sys.modules[module]
+
+    def test_manifest_describes_agents(self, package):
+        """Discovery records docstrings, methods and init parameters"""
+        agents = self._manifest(package).refresh()
+
+        assert sorted(agents) == ["AlphaAgent", "BetaAgent"]
+        alpha = agents["AlphaAgent"]
+        assert alpha["module"] == f"{package.name}.alpha_agent"
+        assert alpha["docstring"] == "Alpha agent"
+        assert alpha["parameters"] == ["agent_id", "verbose"]
+        assert "execute_task" in alpha["methods"]
+
+    def test_cached_manifest_skips_imports(self, package):
+        """A fresh manifest answers from disk without importing agents"""
+        self._manifest(package).refresh()
+        self._forget(package)
+
+        manifest = self._manifest(package)
+        assert manifest.names() == ["AlphaAgent", "BetaAgent"]
+        assert not any(m.startswith(package.name) for m in sys.modules)
+
+        # Loading one agent imports only its module
+        agent_class = manifest.load_class("BetaAgent")
+        assert agent_class.__name__ == "BetaAgent"
+        assert f"{package.name}.beta_agent" in sys.modules
+        assert f"{package.name}.alpha_agent" not in sys.modules
+
+    def test_changed_file_rebuilds_only_its_entry(self, package):
+        """Edited modules are re-imported; touched-but-identical ones are not"""
+        self._manifest(package).refresh()
+        self._forget(package)
+
+        _write_agent(package / "alpha_agent.py", "AlphaAgent", "Alpha v2")
+        _bump_mtime(package / "alpha_agent.py")
+        _bump_mtime(package / "beta_agent.py")
+        _write_agent(package / "gamma_agent.py", "GammaAgent", "Gamma agent")
+
+        agents = self._manifest(package).refresh()
+
+        assert agents["AlphaAgent"]["docstring"] == "Alpha v2"
+        assert "GammaAgent" in agents
+        assert f"{package.name}.beta_agent" not in sys.modules
+
+        (package / "gamma_agent.py").unlink()
+        assert "GammaAgent" not in self._manifest(package).refresh()
+
+    def test_base_class_change_invalidates_subclasses(self, package):
+        """Entries depend on every project file in the class's MRO"""
+        _write_agent(
+            package / "alpha_agent.py",
+            "AlphaAgent",
+            "Alpha agent",
+            base="SharedBase",
+            imports=f"from {package.name}.helpers import SharedBase",
+        )
+        agents = self._manifest(package).refresh()
+        assert "helper" in agents["AlphaAgent"]["methods"]
+        self._forget(package)
+
+        (package / "helpers.py").write_text(BASE_TEMPLATE.format(method="renamed"))
+        _bump_mtime(package / "helpers.py")
+
+        agents = self._manifest(package).refresh()
+        assert "renamed" in agents["AlphaAgent"]["methods"]
+        assert "helper" not in agents["AlphaAgent"]["methods"]
+        assert f"{package.name}.beta_agent" not in sys.modules
+
+    def test_failed_import_cached_until_fixed(self, package, capsys):
+        """Broken modules are remembered and retried once their file changes"""
+        broken = package / "broken_agent.py"
+        broken.write_text("import module_that_does_not_exist_xyz\n")
+
+        assert "BrokenAgent" not in self._manifest(package).refresh()
+        assert "Could not import broken_agent" in capsys.readouterr().out
+
+        # Still reported from the manifest without importing again
+        self._forget(package)
+        self._manifest(package).refresh()
+        assert "Could not import broken_agent" in capsys.readouterr().out
+        assert f"{package.name}.broken_agent" not in sys.modules
+
+        _write_agent(broken, "BrokenAgent", "Fixed now")
+        _bump_mtime(broken)
+        assert "BrokenAgent" in self._manifest(package).refresh()
+
+
+class TestAgentExecutorManifest:
+    """Test the executor's use of the manifest"""
+
+    def test_default_manifest_outside_project(self, tmp_path, monkeypatch):
+        """The default manifest lives in the user cache, one per project"""
+        monkeypatch.setenv("HOME", str(tmp_path / "home"))
+        first = AgentManifest(tmp_path / "first").manifest_path
+        second = AgentManifest(tmp_path / "second").manifest_path
+
+        assert first.parent == tmp_path / "home" / ".cache" / "12factor-agents"
+        assert first != second
+
+    def test_run_agent_loads_only_target(self, tmp_path, monkeypatch):
+        """run_agent imports the target module and nothing else"""
+        agents_dir = tmp_path / "executor_agents"
+        agents_dir.mkdir()
+        (agents_dir / "__init__.py").write_text("")
+        _write_agent(agents_dir / "alpha_agent.py", "AlphaAgent", "Alpha agent")
+        _write_agent(agents_dir / "beta_agent.py", "BetaAgent", "Beta agent")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.chdir(tmp_path)
+
+        manifest = AgentManifest(
+            tmp_path, manifest_path=tmp_path / "manifest.json", agents_dir=agents_dir
+        )
+        manifest.refresh()
+        for module in [m for m in sys.modules if m.startswith("executor_agents")]:
+            del sys.modules[module]
+
+        executor = AgentExecutor()
+        executor.manifest = AgentManifest(
+            tmp_path, manifest_path=tmp_path / "manifest.json", agents_dir=agents_dir
+        )
+        try:
+            assert executor.list_agents() == ["AlphaAgent", "BetaAgent"]
+            info = executor.get_agent_info("BetaAgent")
+            assert info["parameters"] == ["agent_id", "verbose"]
+            assert executor.run_agent("BetaAgent", "do it")
+            assert "executor_agents.alpha_agent" not in sys.modules
+            assert not executor.run_agent("MissingAgent", "do it")
+        finally:
+            for module in [m for m in sys.modules if m.startswith("executor_agents")]:
+                del sys.modules[module]
@@ -3,17 +3,21 @@ Comprehensive unit tests for Background Agent Executor
 Testing fire-and-forget spawning and true parallel processing
 """
 
+import asyncio
 import pytest
 import tempfile
 import shutil
 import time
 import json
+from collections import deque
 from pathlib import Path
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, AsyncMock
 
 import sys
 import os
+import signal
+import subprocess
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -25,9 +29,28 @@ from core.background_executor import (
     BackgroundAgentInfo,
     EventBus,
     EventBusMessage,
+    QueuedSpawn,
+    CgroupV2Limiter,
+    apply_resource_limits,
+    restore_resource_limits,
 )
 
 
+def _running_agent_info(agent_id: str) -> BackgroundAgentInfo:
+    """Create agent info for an agent that is already running"""
+    return BackgroundAgentInfo(
+        agent_id=agent_id,
+        process_id=None,
+        status=BackgroundStatus.RUNNING,
+        started_at=datetime.now(),
+        completed_at=None,
+        agent_class="BaseAgent",
+        task="running task",
+        workflow_data={},
+        resource_limits=ResourceLimits(),
+    )
+
+
 class TestResourceLimits:
     """Test ResourceLimits configuration"""
 
@@ -184,22 +207,25 @@ class TestEventBus:
 
         async_callback.assert_called_once_with(message)
 
-    def test_get_latest_events(self, event_bus):
+    @pytest.mark.asyncio
+    async def test_get_latest_events(self, event_bus):
         """Test retrieving latest events for agent"""
         # Add multiple events
-        messages = []
         for i in range(5):
-            message = EventBusMessage(
-                agent_id="test_agent", event_type="progress_update", data={"step": i}
+            await event_bus.publish(
+                EventBusMessage(
+                    agent_id="test_agent",
+                    event_type="progress_update",
+                    data={"step": i},
+                )
             )
-            messages.append(message)
-            event_bus.message_history[f"test_agent_{i}"] = message
 
         # Add events for different agent
-        other_message = EventBusMessage(
-            agent_id="other_agent", event_type="progress_update", data={"step": 0}
+        await event_bus.publish(
+            EventBusMessage(
+                agent_id="other_agent", event_type="progress_update", data={"step": 0}
+            )
         )
-        event_bus.message_history["other_agent_0"] = other_message
 
         # Get latest events for test_agent
         latest = event_bus.get_latest_events("test_agent", limit=3)
@@ -208,6 +234,112 @@ class TestEventBus:
         assert all(msg.agent_id == "test_agent" for msg in latest)
         assert latest[-1].data["step"] == 4  # Most recent
 
+    @pytest.mark.asyncio
+    async def test_same_timestamp_events_are_kept(self, event_bus):
+        """Test events sharing agent and timestamp do not overwrite each other"""
+        timestamp = datetime.now()
+        for i in range(3):
+            await event_bus.publish(
+                EventBusMessage(
+                    agent_id="test_agent",
+                    event_type="progress_update",
+                    data={"step": i},
+                    timestamp=timestamp,
+                )
+            )
+
+        assert len(event_bus.message_history) == 3
+        sequences = [m.sequence for m in event_bus.get_latest_events("test_agent")]
+        assert sequences == [1, 2, 3]
+        assert event_bus.last_sequence == 3
+
+    @pytest.mark.asyncio
+    async def test_eviction_keeps_indexes_bounded(self):
+        """Test the history ring evicts from per-agent and per-type indexes"""
+        event_bus = EventBus(max_history=4)
+        for i in range(10):
+            await event_bus.publish(
+                EventBusMessage(
+                    agent_id=f"agent_{i % 2}", event_type=f"type_{i % 3}", data={}
+                )
+            )
+
+        assert len(event_bus.message_history) == 4
+        assert sum(len(d) for d in event_bus._by_agent.values()) == 4
+        assert sum(len(d) for d in event_bus._by_event_type.values()) == 4
+        assert [m.sequence for m in event_bus.get_latest_events("agent_1")] == [
+            8,
+            10,
+        ]
+        assert [m.sequence for m in event_bus.get_latest_events_by_type("type_0")] == [
+            7,
+            10,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_events_since(self, event_bus):
+        """Test incremental polling by sequence number"""
+        for i in range(6):
+            await event_bus.publish(
+                EventBusMessage(
+                    agent_id=f"agent_{i % 2}", event_type="progress_update", data={}
+                )
+            )
+
+        assert [m.sequence for m in event_bus.get_events_since(3)] == [4, 5, 6]
+        assert [m.sequence for m in event_bus.get_events_since(2, "agent_0")] == [
+            3,
+            5,
+        ]
+        assert event_bus.get_events_since(event_bus.last_sequence) == []
+
+    @pytest.mark.asyncio
+    async def test_wildcard_and_prefix_subscriptions(self, event_bus):
+        """Test "*" and "prefix*" subscriptions receive matching events"""
+        everything = Mock()
+        agent_events = Mock()
+        event_bus.subscribe("*", everything)
+        event_bus.subscribe("agent_*", agent_events)
+
+        await event_bus.publish(EventBusMessage("a", "agent_spawned", {}))
+        await event_bus.publish(EventBusMessage("a", "progress_update", {}))
+
+        assert everything.call_count == 2
+        assert agent_events.call_count == 1
+
+        assert event_bus.unsubscribe("agent_*", agent_events)
+        assert "agent_*" not in event_bus.subscribers
+        await event_bus.publish(EventBusMessage("a", "agent_completed", {}))
+        assert agent_events.call_count == 1
+        assert not event_bus.unsubscribe("agent_*", agent_events)
+
+    @pytest.mark.asyncio
+    async def test_async_subscribers_run_concurrently(self, event_bus):
+        """Test a slow or failing async subscriber does not serialize others"""
+        started = []
+        release = asyncio.Event()
+
+        async def slow(message):
+            started.append("slow")
+            await release.wait()
+
+        async def failing(message):
+            started.append("failing")
+            raise RuntimeError("boom")
+
+        async def fast(message):
+            started.append("fast")
+            release.set()
+
+        event_bus.subscribe("test_event", slow)
+        event_bus.subscribe("test_event", failing)
+        event_bus.subscribe("test_event", fast)
+
+        await asyncio.wait_for(
+            event_bus.publish(EventBusMessage("a", "test_event", {})), timeout=2
+        )
+        assert sorted(started) == ["failing", "fast", "slow"]
+
 
 class TestBackgroundAgentExecutor:
     """Test BackgroundAgentExecutor main functionality"""
@@ -395,6 +527,13 @@ exit(0)
         assert result["return_code"] == 0
         assert "Script executed successfully" in result["stdout"]
 
+    def test_process_executor_is_deprecated(self, executor):
+        """Test the process_executor attribute still works but warns"""
+        with pytest.warns(DeprecationWarning):
+            process_executor = executor.process_executor
+
+        assert process_executor is executor._process_executor
+
     def test_thread_agent_execution(self, executor):
         """Test agent execution in thread"""
         agent_info = BackgroundAgentInfo(
@@ -425,6 +564,317 @@ exit(0)
         assert output_data["status"] == "completed"
 
 
+class TestWarmWorkerPool:
+    """Test warm worker pool execution mode"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create temporary directory for tests"""
+        temp_path = Path(tempfile.mkdtemp())
+        yield temp_path
+        shutil.rmtree(temp_path, ignore_errors=True)
+
+    @pytest.fixture
+    def executor(self, temp_dir):
+        """Create executor with a small warm pool"""
+        executor = BackgroundAgentExecutor(
+            max_parallel_agents=10, temp_dir=temp_dir, worker_pool_size=2
+        )
+        yield executor
+        if executor.worker_pool:
+            executor.worker_pool.shutdown(wait=False)
+
+    @pytest.mark.asyncio
+    async def test_pool_agents_complete(self, executor):
+        """Test agents spawned in pool mode run to completion"""
+        agent_ids = [
+            await executor.spawn_background_agent(
+                "BaseAgent", f"pool task {i}", {"i": i}, execution_mode="pool"
+            )
+            for i in range(6)
+        ]
+
+        for _ in range(200):
+            if not executor.active_agents:
+                break
+            await asyncio.sleep(0.05)
+
+        for agent_id in agent_ids:
+            info = executor.completed_agents[agent_id]
+            assert info.status == BackgroundStatus.COMPLETED
+            assert info.process_id is None
+
+            output = json.loads(info.output_file.read_text())
+            assert output["success"] is True
+            assert output["agent_id"] == agent_id
+
+        stats = executor.get_statistics()["worker_pool"]
+        assert stats["size"] == 2
+        assert stats["jobs_completed"] == 6
+        assert stats["alive_workers"] == 2
+
+    @pytest.mark.asyncio
+    async def test_pool_streams_progress_and_result(self, executor):
+        """Test progress and results arrive over the pipe, not via files"""
+        agent_id = await executor.spawn_background_agent(
+            "BaseAgent", "streamed task", execution_mode="pool"
+        )
+
+        status = await executor.wait_for_agent(agent_id, timeout=10)
+
+        assert status["status"] == "completed"
+        assert status["message"] == "Task completed"
+        assert status["result"]["result"] == "Task completed successfully"
+
+        await asyncio.sleep(0)  # Let queued progress events publish
+        progress_events = [
+            msg
+            for msg in executor.event_bus.get_latest_events(agent_id, limit=20)
+            if msg.event_type == "agent_progress"
+        ]
+        assert [msg.data["progress"] for msg in progress_events] == [0.1, 0.5, 1.0]
+
+    @pytest.mark.asyncio
+    async def test_process_mode_streams_progress(self, executor):
+        """Test process agents report progress while they are still running"""
+        seen = []
+
+        def record(message):
+            agent_info = executor.active_agents.get(message.agent_id)
+            if agent_info is not None:
+                seen.append((message.data["progress"], agent_info.status))
+
+        executor.event_bus.subscribe("agent_progress", record)
+        agent_id = await executor.spawn_background_agent(
+            "BaseAgent", "process task", execution_mode="process"
+        )
+
+        status = await executor.wait_for_agent(agent_id, timeout=30)
+
+        assert status["status"] == "completed"
+        assert (0.5, BackgroundStatus.RUNNING) in seen
+        assert "__agent_progress__" not in status["result"]["stdout"]
+
+    @pytest.mark.asyncio
+    async def test_status_does_not_read_output_file(self, executor):
+        """Test status queries are served from memory"""
+        executor.active_agents["memory_agent"] = _running_agent_info("memory_agent")
+
+        with patch("builtins.open") as mock_open:
+            status = await executor.get_agent_status("memory_agent")
+
+        mock_open.assert_not_called()
+        assert status["status"] == "running"
+
+    @pytest.mark.asyncio
+    async def test_pool_reuses_worker_processes(self, executor):
+        """Test workers are started once and reused across agents"""
+        pool = executor.start_worker_pool()
+        pids = {process.pid for process, _ in pool._workers}
+
+        for i in range(4):
+            await executor.spawn_background_agent(
+                "BaseAgent", f"reuse {i}", execution_mode="pool"
+            )
+
+        for _ in range(200):
+            if not executor.active_agents:
+                break
+            await asyncio.sleep(0.05)
+
+        assert {process.pid for process, _ in pool._workers} == pids
+        assert pool.worker_restarts == 0
+
+    @pytest.mark.asyncio
+    async def test_pool_replaces_killed_worker(self, executor):
+        """Test a worker killed mid-task fails the agent and is replaced"""
+        pool = executor.start_worker_pool()
+        victim, _ = pool._workers[0]
+        other, _ = pool._workers[1]
+
+        # Stop both workers so neither can answer before being killed
+        os.kill(victim.pid, signal.SIGSTOP)
+        os.kill(other.pid, signal.SIGSTOP)
+
+        agent_info = _running_agent_info("killed_agent")
+        agent_info.output_file = executor.temp_dir / "killed_output.json"
+        agent_info.error_file = executor.temp_dir / "killed_error.json"
+        future = pool.submit(agent_info)
+
+        # Kill only once the job has been handed to a stopped worker
+        for _ in range(100):
+            if agent_info.process_id:
+                break
+            await asyncio.sleep(0.01)
+
+        victim.kill()
+        other.kill()
+
+        result = await asyncio.wait_for(asyncio.wrap_future(future), timeout=10)
+
+        assert result["success"] is False
+        assert pool.worker_restarts >= 1
+
+    @pytest.mark.asyncio
+    async def test_terminate_pool_agent_recycles_its_worker(self, executor):
+        """Test terminating a pool agent stops only its worker and replaces it"""
+        pool = executor.start_worker_pool()
+        for process, _ in pool._workers:
+            os.kill(process.pid, signal.SIGSTOP)
+
+        agent_id = await executor.spawn_background_agent(
+            "BaseAgent", "long task", execution_mode="pool"
+        )
+        agent_info = executor.active_agents[agent_id]
+        for _ in range(100):
+            if agent_info.process_id:
+                break
+            await asyncio.sleep(0.01)
+        busy_pid = agent_info.process_id
+        idle = [p for p, _ in pool._workers if p.pid != busy_pid]
+
+        assert await executor.terminate_agent(agent_id)
+        assert executor.completed_agents[agent_id].status == BackgroundStatus.TERMINATED
+        assert not pool.cancel(agent_id)
+
+        for process in idle:
+            os.kill(process.pid, signal.SIGCONT)
+        for _ in range(200):
+            if pool.worker_restarts:
+                break
+            await asyncio.sleep(0.01)
+
+        assert pool.worker_restarts == 1
+        assert all(process.is_alive() for process in idle)
+        assert busy_pid not in {process.pid for process, _ in pool._workers}
+
+        # The pool keeps serving agents
+        next_id = await executor.spawn_background_agent(
+            "BaseAgent", "after terminate", execution_mode="pool"
+        )
+        status = await executor.wait_for_agent(next_id, timeout=10)
+        assert status["status"] == "completed"
+
+
+class TestAdmissionQueue:
+    """Test admission queue and backpressure for spawns"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create temporary directory for tests"""
+        temp_path = Path(tempfile.mkdtemp())
+        yield temp_path
+        shutil.rmtree(temp_path, ignore_errors=True)
+
+    @pytest.mark.asyncio
+    async def test_queued_spawns_start_as_slots_free(self, temp_dir):
+        """Test spawns beyond capacity queue up and start automatically"""
+        executor = BackgroundAgentExecutor(
+            max_parallel_agents=2, temp_dir=temp_dir, max_queue_depth=10
+        )
+
+        agent_ids = [
+            await executor.spawn_background_agent(
+                "BaseAgent", f"burst {i}", execution_mode="thread"
+            )
+            for i in range(6)
+        ]
+
+        assert len(executor.active_agents) == 2
+        assert len(executor.queued_agents) == 4
+        queued_status = await executor.get_agent_status(agent_ids[-1])
+        assert queued_status["status"] == "queued"
+
+        for agent_id in agent_ids:
+            status = await executor.wait_for_agent(agent_id, timeout=10)
+            assert status["status"] == "completed"
+
+        stats = executor.get_statistics()["admission_queue"]
+        assert stats["queued_agents"] == 0
+        assert stats["admitted_from_queue"] == 4
+        assert stats["max_wait_seconds"] > 0
+        assert stats["avg_wait_seconds"] <= stats["max_wait_seconds"]
+
+    @pytest.mark.asyncio
+    async def test_reject_when_queue_full(self, temp_dir):
+        """Test the reject policy raises once the queue is full"""
+        executor = BackgroundAgentExecutor(
+            max_parallel_agents=1, temp_dir=temp_dir, max_queue_depth=1
+        )
+        executor.active_agents["busy"] = Mock()
+
+        await executor.spawn_background_agent(
+            "BaseAgent", "queued", execution_mode="thread"
+        )
+
+        with pytest.raises(RuntimeError, match="admission queue is full"):
+            await executor.spawn_background_agent(
+                "BaseAgent", "rejected", execution_mode="thread"
+            )
+
+        assert executor.get_statistics()["admission_queue"]["rejected_spawns"] == 1
+
+    @pytest.mark.asyncio
+    async def test_wait_policy_blocks_until_room(self, temp_dir):
+        """Test the wait policy applies backpressure to the caller"""
+        executor = BackgroundAgentExecutor(
+            max_parallel_agents=1, temp_dir=temp_dir, admission_policy="wait"
+        )
+        first = await executor.spawn_background_agent(
+            "BaseAgent", "first", execution_mode="thread"
+        )
+
+        second = asyncio.create_task(
+            executor.spawn_background_agent(
+                "BaseAgent", "second", execution_mode="thread"
+            )
+        )
+        await asyncio.sleep(0.01)
+        assert not second.done()
+
+        await executor.wait_for_agent(first, timeout=10)
+        second_id = await asyncio.wait_for(second, timeout=10)
+
+        status = await executor.wait_for_agent(second_id, timeout=10)
+        assert status["status"] == "completed"
+
+    def test_priority_order_with_fairness(self, temp_dir):
+        """Test higher priorities go first but old low-priority spawns still run"""
+        executor = BackgroundAgentExecutor(temp_dir=temp_dir, max_queue_depth=10)
+
+        def queue_spawn(agent_id, priority):
+            entry = QueuedSpawn(_running_agent_info(agent_id), "thread", priority)
+            executor._admission_queue.setdefault(priority, deque()).append(entry)
+
+        queue_spawn("low", 1)
+        for i in range(5):
+            queue_spawn(f"high_{i}", 9)
+
+        order = [executor._dequeue_next().agent_info.agent_id for _ in range(6)]
+
+        assert order[:3] == ["high_0", "high_1", "high_2"]
+        assert order[3] == "low"  # Oldest waiter gets every fourth turn
+        assert order[4:] == ["high_3", "high_4"]
+
+    @pytest.mark.asyncio
+    async def test_terminate_queued_agent(self, temp_dir):
+        """Test a queued spawn can be cancelled before it starts"""
+        executor = BackgroundAgentExecutor(
+            max_parallel_agents=1, temp_dir=temp_dir, max_queue_depth=5
+        )
+        executor.active_agents["busy"] = Mock()
+
+        agent_id = await executor.spawn_background_agent(
+            "BaseAgent", "cancel me", execution_mode="thread"
+        )
+
+        assert await executor.terminate_agent(agent_id) is True
+        assert agent_id not in executor.queued_agents
+
+        status = await executor.wait_for_agent(agent_id, timeout=1)
+        assert status["status"] == "terminated"
+
+
 class TestBackgroundEnabledAgent:
     """Test BackgroundEnabledAgent integration"""
 
@@ -496,39 +946,57 @@ class TestBackgroundEnabledAgent:
     @pytest.mark.asyncio
     async def test_wait_for_completion(self, agent):
         """Test waiting for background agent completion"""
-        # Mock status progression
-        status_sequence = [
-            {"status": "running", "progress": 0.3},
-            {"status": "running", "progress": 0.7},
-            {"status": "completed", "progress": 1.0},
-        ]
+        executor = agent.background_executor
+        agent_info = _running_agent_info("bg_agent_123")
+        executor.active_agents["bg_agent_123"] = agent_info
+        executor._completion_futures["bg_agent_123"] = (
+            asyncio.get_running_loop().create_future()
+        )
 
-        with patch.object(agent, "check_background_status") as mock_status:
-            mock_status.side_effect = status_sequence
+        # Stream progress, then complete on the event loop
+        async def finish():
+            await asyncio.sleep(0.05)
+            executor._apply_progress(agent_info, 0.7, "Almost done")
+            agent_info.status = BackgroundStatus.COMPLETED
+            executor._finalize_agent(agent_info)
+
+        asyncio.create_task(finish())
 
+        with patch.object(
+            executor, "get_agent_status", wraps=executor.get_agent_status
+        ) as mock_status:
             final_status = await agent.wait_for_background_completion("bg_agent_123")
 
             assert final_status["status"] == "completed"
             assert final_status["progress"] == 1.0
-            assert mock_status.call_count >= 1
+            assert final_status["message"] == "Almost done"
+            assert mock_status.call_count == 1  # No polling
 
     @pytest.mark.asyncio
     async def test_wait_for_completion_timeout(self, agent):
         """Test waiting with timeout"""
-        # Mock never-completing status
-        with patch.object(agent, "check_background_status") as mock_status:
-            mock_status.return_value = {"status": "running", "progress": 0.5}
+        executor = agent.background_executor
+        executor.active_agents["bg_agent_123"] = _running_agent_info("bg_agent_123")
+        executor._completion_futures["bg_agent_123"] = (
+            asyncio.get_running_loop().create_future()
+        )
 
-            start_time = time.time()
-            result = await agent.wait_for_background_completion(
-                "bg_agent_123", timeout=0.1
-            )
-            elapsed = time.time() - start_time
+        start_time = time.time()
+        result = await agent.wait_for_background_completion("bg_agent_123", timeout=0.1)
+        elapsed = time.time() - start_time
+
+        assert "error" in result
+        assert "Timeout" in result["error"]
+        assert result["status"]["status"] == "running"
+        assert elapsed >= 0.1
+        assert elapsed < 0.5  # Should not wait much longer than timeout
+
+    @pytest.mark.asyncio
+    async def test_wait_for_unknown_agent(self, agent):
+        """Test waiting for an agent the executor never spawned"""
+        result = await agent.wait_for_background_completion("missing_agent")
 
-            assert "error" in result
-            assert "Timeout" in result["error"]
-            assert elapsed >= 0.1
-            assert elapsed < 0.5  # Should not wait much longer than timeout
+        assert result == {"error": "Agent not found"}
 
     @pytest.mark.asyncio
     async def test_get_all_background_status(self, agent):
@@ -639,6 +1107,119 @@ class TestResourceMonitoring:
         assert usage == {}
 
 
+class TestResourceEnforcement:
+    """Test rlimits, cgroup limits and batched sampling"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create temporary directory"""
+        temp_path = Path(tempfile.mkdtemp())
+        yield temp_path
+        shutil.rmtree(temp_path, ignore_errors=True)
+
+    @pytest.fixture
+    def executor(self, temp_dir):
+        """Create executor"""
+        return BackgroundAgentExecutor(temp_dir=temp_dir)
+
+    @pytest.fixture
+    def sleeper(self):
+        """Start a disposable child process"""
+        process = subprocess.Popen(
+            [sys.executable, "-c", "import time; print(flush=True); time.sleep(30)"],
+            stdout=subprocess.PIPE,
+        )
+        # Wait until the interpreter is up so its RSS is representative
+        process.stdout.readline()
+        yield process
+        process.kill()
+        process.wait()
+        process.stdout.close()
+
+    def test_cpu_time_limit_seconds(self):
+        """Test CPU budget derived from percent and execution time"""
+        limits = ResourceLimits(max_cpu_percent=50.0, max_execution_time_minutes=2)
+        assert limits.cpu_time_limit_seconds() == 60
+
+    def test_apply_and_restore_resource_limits(self):
+        """Test rlimits are applied as soft limits and restored"""
+        resource = pytest.importorskip("resource")
+        before = resource.getrlimit(resource.RLIMIT_FSIZE)
+
+        previous = apply_resource_limits(
+            ResourceLimits(max_memory_mb=8192, max_disk_usage_mb=64)
+        )
+        try:
+            soft, hard = resource.getrlimit(resource.RLIMIT_FSIZE)
+            assert soft == 64 * 1024 * 1024
+            assert hard == before[1]
+        finally:
+            restore_resource_limits(previous)
+
+        assert resource.getrlimit(resource.RLIMIT_FSIZE) == before
+
+    @pytest.mark.asyncio
+    async def test_process_mode_records_pid(self, executor):
+        """Test process mode agents expose their child PID"""
+        agent_id = await executor.spawn_background_agent("BaseAgent", "pid test")
+
+        assert executor.active_agents[agent_id].process_id is not None
+
+        status = await executor.wait_for_agent(agent_id, timeout=30)
+        assert status["status"] == "completed"
+
+    @pytest.mark.asyncio
+    async def test_batched_sampling(self, executor, sleeper):
+        """Test one sweep samples every running agent"""
+        for agent_id, pid in [("sampled_a", sleeper.pid), ("sampled_b", os.getpid())]:
+            agent_info = _running_agent_info(agent_id)
+            agent_info.process_id = pid
+            executor.active_agents[agent_id] = agent_info
+
+        samples = executor._sample_resource_usage()
+
+        assert set(samples) == {"sampled_a", "sampled_b"}
+        assert samples["sampled_a"]["memory_mb"] > 0
+        assert set(executor._process_handles) == {sleeper.pid, os.getpid()}
+
+        status = await executor.get_agent_status("sampled_a")
+        assert status["resource_usage"] == samples["sampled_a"]
+
+    @pytest.mark.asyncio
+    async def test_memory_limit_terminates_agent(self, executor, sleeper):
+        """Test agents over their memory limit are killed"""
+        agent_info = _running_agent_info("hungry_agent")
+        agent_info.process_id = sleeper.pid
+        agent_info.resource_limits = ResourceLimits(max_memory_mb=1)
+        agent_info.error_file = executor.temp_dir / "hungry_error.json"
+        executor.active_agents["hungry_agent"] = agent_info
+
+        await executor._enforce_resource_limits()
+
+        assert sleeper.wait(timeout=5) != 0
+        assert executor.completed_agents["hungry_agent"].status == (
+            BackgroundStatus.TERMINATED
+        )
+        assert "Memory limit exceeded" in agent_info.error_file.read_text()
+
+    def test_cgroup_limiter(self, temp_dir):
+        """Test cgroup v2 limits are written into a delegated subtree"""
+        assert CgroupV2Limiter.detect(None) is None
+        assert CgroupV2Limiter.detect(temp_dir) is None
+
+        (temp_dir / "cgroup.subtree_control").write_text("cpu memory pids")
+        limiter = CgroupV2Limiter.detect(temp_dir)
+        assert limiter is not None
+
+        limits = ResourceLimits(max_memory_mb=256, max_cpu_percent=25.0)
+        assert limiter.attach("agent_x", 4242, limits) is True
+
+        group = temp_dir / "agent-agent_x"
+        assert (group / "memory.max").read_text() == str(256 * 1024 * 1024)
+        assert (group / "cpu.max").read_text() == "25000 100000"
+        assert (group / "cgroup.procs").read_text() == "4242"
+
+
 class TestExecutorCleanup:
     """Test executor cleanup and shutdown"""
 
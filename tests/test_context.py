@@ -0,0 +1,110 @@
+"""
+Tests for priority-ordered context window management.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.context import ContextItem, ContextManager  # noqa: E402
+
+
+class TestContextManager:
+    """Test bucketed priority ordering and incremental prompt assembly"""
+
+    def test_priority_order_is_stable(self):
+        """Higher priorities come first, insertion order within a priority"""
+        manager = ContextManager()
+        manager.add_context("low", priority=2)
+        manager.add_context("high", priority=9)
+        manager.add_context("low again", priority=2)
+        manager.add_context("mid", priority=5)
+
+        assert [i.content for i in manager.items] == [
+            "high",
+            "mid",
+            "low",
+            "low again",
+        ]
+        assert manager.get_token_usage()["context"] == sum(
+            i.tokens for i in manager.items
+        )
+
+    def test_out_of_range_priority_is_rejected(self):
+        """Priorities outside 1-10 raise instead of being stored"""
+        manager = ContextManager()
+
+        with pytest.raises(ValueError):
+            manager.add_context("zero", priority=0)
+        with pytest.raises(ValueError):
+            manager.items = [ContextItem("eleven", priority=11, tokens=1)]
+
+        assert len(manager.items) == 0
+
+    def test_items_is_a_live_view(self):
+        """Editing items in place updates the context and its prompt"""
+        manager = ContextManager()
+        manager.add_context("low", priority=2)
+        manager.add_context("mid", priority=5)
+        manager.build_prompt()
+
+        manager.items.append(ContextItem("urgent", priority=9, tokens=2))
+        assert [i.content for i in manager.items] == ["urgent", "mid", "low"]
+        assert manager.build_prompt().startswith("[user]: urgent")
+
+        del manager.items[1]
+        manager.items[-1] = ContextItem("replaced", priority=1, tokens=2)
+        assert manager.items == [
+            ContextItem("urgent", priority=9, tokens=2),
+            ContextItem("replaced", priority=1, tokens=2),
+        ]
+        assert manager.get_token_usage()["context"] == 4
+        assert "mid" not in manager.build_prompt()
+
+        manager.items.clear()
+        assert manager.build_prompt() == ""
+
+    def test_appends_extend_cached_prompt(self, monkeypatch):
+        """Appending at the lowest priority only processes the new items"""
+        manager = ContextManager()
+        for i in range(50):
+            manager.add_context(f"step {i}", priority=5)
+        manager.build_prompt()
+
+        processed = []
+        original_fill = manager._fill
+
+        def counting_fill(items, built):
+            processed.extend(items)
+            return original_fill(items, built)
+
+        monkeypatch.setattr(manager, "_fill", counting_fill)
+        manager.add_context("step 50", priority=5)
+        manager.add_context("note", priority=3)
+        prompt = manager.build_prompt()
+
+        assert [i.content for i in processed] == ["step 50", "note"]
+        assert prompt.endswith("[user]: step 50\n\n[user]: note")
+
+        # A higher-priority insert reorders, so the next build starts over
+        manager.add_context("urgent", priority=9)
+        processed.clear()
+        assert manager.build_prompt().startswith("[user]: urgent")
+        assert len(processed) == 53
+
+    def test_budget_changes_invalidate_prompt(self):
+        """System prompt and limits are part of the cached build"""
+        manager = ContextManager(max_tokens=10400)
+        manager.add_context("a" * 800, priority=5, source="first")
+        manager.add_context("b" * 2000, priority=4, source="second")
+
+        assert "[second][truncated]" in manager.build_prompt()
+
+        manager.max_tokens = 20000
+        assert "[second]: " + "b" * 2000 in manager.build_prompt()
+
+        manager.set_system_prompt("System")
+        assert manager.build_prompt().startswith("System\n\n[first]")
@@ -4,6 +4,8 @@ Testing session persistence, perfect handoffs, and zero context loss
 """
 
 import pytest
+import gzip
+import json
 import tempfile
 import shutil
 from pathlib import Path
@@ -23,6 +25,9 @@ from core.context_bundles import (
     Checkpoint,
     BundleMetadata,
     BundleEnabledAgent,
+    BundleSegmentLog,
+    ChunkStore,
+    LazyActionLog,
 )
 from core.base import ToolResponse
 
@@ -483,6 +488,388 @@ class TestContextBundleManager:
         assert action_counts.get("state_change", 0) >= 2  # Manual + checkpoint
 
 
+class TestLazyBundleLoad:
+    """Test on-demand decoding of loaded action logs"""
+
+    @pytest.fixture
+    def compressed_bundle(self):
+        manager = ContextBundleManager(session_id="lazy_session")
+        for i in range(50):
+            manager.append_action(ActionType.TASK_EXECUTION, {"step": i}, "agent_1")
+        manager.append_action(ActionType.HANDOFF, {"to_agent": "agent_2"}, "agent_1")
+        manager.update_state({"progress": 0.9})
+        manager.create_checkpoint(phase="handoff", progress=0.9)
+        return manager.create_bundle_snapshot().compress()
+
+    def _decoded(self, log):
+        return sum(isinstance(item, TimestampedAction) for item in log._items)
+
+    @pytest.mark.asyncio
+    async def test_remount_decodes_no_actions(self, compressed_bundle):
+        """State and checkpoints are ready while actions stay encoded"""
+        bundle = ContextBundle.decompress(compressed_bundle)
+        assert isinstance(bundle.actions, LazyActionLog)
+        assert bundle.state == {"progress": 0.9}
+        assert bundle.checkpoints[-1].phase == "handoff"
+
+        receiver = ContextBundleManager()
+        assert await receiver.remount_context(bundle)
+        assert len(receiver.append_log) == 54
+        assert self._decoded(bundle.actions) == 0
+        assert self._decoded(receiver.append_log) == 1  # The remount action
+
+    @pytest.mark.asyncio
+    async def test_history_filters_decode_only_matches(self, compressed_bundle):
+        """Filtering by type reads raw entries and decodes the selection"""
+        receiver = ContextBundleManager()
+        await receiver.remount_context(ContextBundle.decompress(compressed_bundle))
+
+        handoffs = receiver.get_action_history(ActionType.HANDOFF)
+        assert [a.action_data for a in handoffs] == [{"to_agent": "agent_2"}]
+
+        latest = receiver.get_action_history(ActionType.TASK_EXECUTION, limit=2)
+        assert [a.action_data["step"] for a in latest] == [48, 49]
+        assert self._decoded(receiver.append_log) == 4
+
+        assert receiver.get_bundle_stats()["action_types"]["task_execution"] == 50
+        assert self._decoded(receiver.append_log) == 4
+
+    def test_round_trip_without_decoding(self, compressed_bundle):
+        """Re-serializing reuses the raw entries"""
+        bundle = ContextBundle.decompress(compressed_bundle)
+        again = ContextBundle.decompress(bundle.compress())
+
+        assert self._decoded(bundle.actions) == 0
+        assert [a.action_data for a in again.actions] == [
+            a.action_data for a in bundle.actions
+        ]
+
+    def test_only_latest_checkpoint_decoded(self, monkeypatch):
+        """Loading decodes the latest checkpoint; others resolve on access"""
+        manager = ContextBundleManager(session_id="lazy_checkpoints")
+        for i in range(5):
+            manager.update_state({"step": i, "files": [f"f{j}.py" for j in range(50)]})
+            manager.create_checkpoint(phase=f"step_{i}", progress=i / 5)
+        data = manager.create_bundle_snapshot().to_dict()
+
+        decoded = []
+        original_get = ChunkStore.get
+        monkeypatch.setattr(
+            ChunkStore,
+            "get",
+            lambda store, digest: decoded.append(digest) or original_get(store, digest),
+        )
+        bundle = ContextBundle.from_dict(data)
+        assert decoded == [data["checkpoints"][-1]["state_ref"]]
+
+        assert bundle.checkpoints[1].state["step"] == 1
+        assert len(decoded) == 2
+
+    def test_loaded_bundles_compare_equal(self, compressed_bundle):
+        """Bundles and action logs compare by content, not identity"""
+        bundle = ContextBundle.decompress(compressed_bundle)
+        again = ContextBundle.decompress(compressed_bundle)
+        again.actions[0]  # Decoding an entry does not change equality
+
+        assert bundle.actions == again.actions
+        assert bundle == again
+        assert bundle.actions == list(again.actions)
+
+    @pytest.mark.asyncio
+    async def test_full_history_is_a_list(self, compressed_bundle):
+        """Unfiltered history is a plain list detached from the log"""
+        receiver = ContextBundleManager()
+        await receiver.remount_context(ContextBundle.decompress(compressed_bundle))
+
+        history = receiver.get_action_history()
+        assert type(history) is list
+        history.clear()
+        assert len(receiver.append_log) == 54
+
+
+class TestChunkStore:
+    """Test content-addressed, deduplicated checkpoint state"""
+
+    @pytest.fixture
+    def manager(self):
+        manager = ContextBundleManager(session_id="chunk_session")
+        manager.update_state(
+            {
+                "files": [f"src/module_{i}.py" for i in range(500)],
+                "config": {"retries": 3, "owners": ["alice", "bob"] * 20},
+            }
+        )
+        return manager
+
+    def test_round_trip(self):
+        """Values survive encoding, with small containers kept inline"""
+        store = ChunkStore()
+        state = {
+            "small": {"a": 1},
+            "big": {"items": list(range(100)), "nested": [{"x": "y" * 80}]},
+            "scalar": "value",
+        }
+
+        digest = store.put(state)
+        assert store.get(digest) == state
+        assert ChunkStore(store.collect([digest])).get(digest) == state
+        assert store.put(dict(state)) == digest
+
+    def test_checkpoints_share_unchanged_subtrees(self, manager):
+        """Serialized checkpoints store the unchanged state once"""
+        for i in range(30):
+            manager.update_state({"step": i})
+            manager.create_checkpoint(phase=f"step_{i}", progress=i / 30)
+
+        bundle = manager.create_bundle_snapshot()
+        data = bundle.to_dict()
+        shared_size = len(json.dumps([data["checkpoints"], data["chunks"]]))
+        naive_size = len(json.dumps([c.to_dict() for c in bundle.checkpoints]))
+        assert shared_size * 10 < naive_size
+
+        loaded = ContextBundle.decompress(bundle.compress())
+        for original, restored in zip(bundle.checkpoints, loaded.checkpoints):
+            assert restored.state == original.state
+
+        # Identical subtrees are restored as independent objects
+        first, last = loaded.checkpoints[0].state, loaded.checkpoints[-1].state
+        assert first["files"] == last["files"]
+        assert first["files"] is not last["files"]
+        assert first["step"] == 0 and last["step"] == 29
+
+    def test_checkpoints_hold_only_state_refs(self, manager):
+        """Checkpoint state is rebuilt from the chunk store when read"""
+        manager.create_checkpoint(phase="start", progress=0.0)
+        checkpoint = manager.checkpoints[0]
+
+        assert checkpoint.__dict__["_state"] is None
+        assert checkpoint.state == manager.current_state
+        assert checkpoint.state is not checkpoint.state
+
+    def test_only_changed_keys_are_encoded(self, manager, monkeypatch):
+        """A checkpoint re-chunks only keys that changed since the last one"""
+        manager.create_checkpoint(phase="start", progress=0.0)
+
+        encoded = []
+        original_encode = manager.chunk_store.encode
+
+        def counting_encode(value):
+            encoded.append(value)
+            return original_encode(value)
+
+        monkeypatch.setattr(manager.chunk_store, "encode", counting_encode)
+        manager.update_state({"step": 1})
+        manager.create_checkpoint(phase="next", progress=0.5)
+        assert encoded == [1]
+
+        # In-place edits are found without update_state
+        encoded.clear()
+        manager.current_state["config"]["retries"] = 4
+        manager.create_checkpoint(phase="edited", progress=0.6)
+        assert encoded[0]["retries"] == 4
+        assert manager.current_state["files"] not in encoded
+        assert manager.checkpoints[2].state["config"]["retries"] == 4
+
+    def test_in_place_state_changes_are_checkpointed(self, manager):
+        """Checkpoints see current_state edits made without update_state"""
+        manager.create_checkpoint(phase="start", progress=0.0)
+
+        manager.current_state["progress"] = {"done": 1}
+        manager.current_state["config"]["retries"] = 5
+        manager.create_checkpoint(phase="next", progress=0.5)
+
+        restored = ChunkStore(manager.chunk_store.chunks).get(
+            manager.checkpoints[1].state_ref
+        )
+        assert restored["progress"] == {"done": 1}
+        assert restored["config"]["retries"] == 5
+        assert manager.checkpoints[0].state["config"]["retries"] == 3
+        assert manager.checkpoints[1].state_ref != manager.checkpoints[0].state_ref
+
+    @pytest.mark.asyncio
+    async def test_restored_state_is_independent(self, manager):
+        """Editing restored state leaves checkpoints and bundles unchanged"""
+        manager.create_checkpoint(phase="first", progress=0.0)
+        manager.create_checkpoint(phase="second", progress=0.5)
+        loaded = ContextBundle.decompress(manager.create_bundle_snapshot().compress())
+
+        target = ContextBundleManager(session_id="target")
+        assert await target.remount_context(loaded)
+        target.current_state["config"]["retries"] = 7
+        assert loaded.state["config"]["retries"] == 3
+
+        assert target.restore_from_checkpoint("checkpoint_1")
+        target.current_state["config"]["owners"].append("carol")
+        for checkpoint in target.checkpoints:
+            assert checkpoint.state["config"]["retries"] == 3
+            assert "carol" not in checkpoint.state["config"]["owners"]
+
+    def test_size_is_cached(self, manager, monkeypatch):
+        """Repeated size and compression calls serialize the bundle once"""
+        bundle = manager.create_bundle_snapshot()
+
+        calls = []
+        original_to_dict = ContextBundle.to_dict
+
+        def counting_to_dict(self):
+            calls.append(self)
+            return original_to_dict(self)
+
+        monkeypatch.setattr(ContextBundle, "to_dict", counting_to_dict)
+        size = bundle.get_size_bytes()
+        assert bundle.get_size_bytes() == size
+        bundle.compress()
+        assert len(calls) == 1
+
+
+class TestBundleSegmentLog:
+    """Test the append-only segment log behind the filesystem backend"""
+
+    @pytest.fixture
+    def storage_root(self, tmp_path, monkeypatch):
+        """Point the filesystem backend at a temp directory"""
+        monkeypatch.setattr("core.context_bundles.BUNDLE_STORAGE_ROOT", tmp_path)
+        return tmp_path
+
+    @pytest.fixture
+    def fs_manager(self, storage_root):
+        return ContextBundleManager(
+            session_id="fs_session", storage_backend="filesystem"
+        )
+
+    def test_actions_go_to_segments(self, fs_manager):
+        """Actions are appended to segment files, not one file each"""
+        for i in range(5):
+            fs_manager.append_action(ActionType.TASK_EXECUTION, {"step": i}, "agent")
+        fs_manager._log.commit()
+
+        path = fs_manager.storage_path
+        assert not list(path.glob("action_*.json"))
+        assert len(list(path.glob("segment_*.log"))) == 1
+        assert (path / "bundle.json.gz").exists()
+
+    @pytest.mark.asyncio
+    async def test_round_trip_replays_tail(self, fs_manager, storage_root):
+        """Loading replays the log tail on top of the snapshot"""
+        fs_manager.update_state({"phase": "build"})
+        fs_manager.create_checkpoint(phase="build", progress=0.5)
+        fs_manager.update_state({"phase": "test", "passed": 3})
+        assert await fs_manager.save_bundle()
+
+        reader = ContextBundleManager(storage_backend="filesystem")
+        bundle = await reader.load_bundle("fs_session")
+
+        assert bundle.state == {"phase": "test", "passed": 3}
+        assert len(bundle.actions) == len(fs_manager.append_log)
+        assert [c.checkpoint_id for c in bundle.checkpoints] == ["checkpoint_1"]
+        assert bundle.checkpoints[0].state == {"phase": "build"}
+
+        # Restoring a checkpoint replaces the state wholesale
+        fs_manager.restore_from_checkpoint("checkpoint_1")
+        assert await fs_manager.save_bundle()
+        restored = BundleSegmentLog.load(storage_root / "fs_session")
+        assert restored["state"] == {"phase": "build"}
+
+    def test_torn_tail_is_ignored(self, fs_manager):
+        """A partially written record is dropped on load"""
+        fs_manager.update_state({"a": 1})
+        fs_manager._log.commit()
+
+        segment = fs_manager._log.segment_file(
+            fs_manager.storage_path, fs_manager._log.segment_index
+        )
+        with open(segment, "ab") as f:
+            f.write(BundleSegmentLog.RECORD_HEADER.pack(100, 0) + b'{"type": "st')
+
+        bundle_data = BundleSegmentLog.load(fs_manager.storage_path)
+        assert bundle_data["state"] == {"a": 1}
+        assert len(bundle_data["actions"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_snapshot_compacts_segments(self, fs_manager):
+        """Snapshots fold the log and delete covered segments"""
+        fs_manager._log.snapshot_interval = 10
+        fs_manager._log.segment_max_bytes = 512
+
+        for i in range(30):
+            fs_manager.append_action(ActionType.TASK_EXECUTION, {"step": i}, "agent")
+            await fs_manager.save_bundle()
+
+        # Only segments written after the last snapshot remain
+        with open(fs_manager.storage_path / "bundle.json.gz", "rb") as f:
+            snapshot = json.loads(gzip.decompress(f.read()))
+        segments = BundleSegmentLog.segment_indexes(fs_manager.storage_path)
+        assert min(segments) == snapshot["log_position"]["segment"] > 0
+
+        bundle_data = BundleSegmentLog.load(fs_manager.storage_path)
+        assert [a["action_data"]["step"] for a in bundle_data["actions"]] == list(
+            range(30)
+        )
+
+    def test_group_commit(self, storage_root, monkeypatch):
+        """Buffered records are fsynced once per group"""
+        fsyncs = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(
+            "core.context_bundles.os.fsync",
+            lambda fd: fsyncs.append(fd) or real_fsync(fd),
+        )
+
+        log = BundleSegmentLog(storage_root / "group", group_commit_size=8)
+        for i in range(20):
+            log.append("action", {"i": i})
+
+        assert len(fsyncs) == 2
+        log.commit()
+        assert len(fsyncs) == 3
+
+    @pytest.mark.asyncio
+    async def test_reopened_session_keeps_state(self, fs_manager):
+        """Opening an existing session resumes it instead of wiping it"""
+        fs_manager.update_state({"a": 1})
+        fs_manager.create_checkpoint(phase="build", progress=0.5)
+        await fs_manager.save_bundle()
+        fs_manager.append_action(ActionType.TASK_EXECUTION, {"step": 1}, "agent")
+        fs_manager.close()
+
+        reopened = ContextBundleManager(
+            session_id="fs_session", storage_backend="filesystem"
+        )
+        assert reopened.current_state == {"a": 1}
+        assert len(reopened.append_log) == len(fs_manager.append_log) == 3
+        assert reopened.checkpoints[0].state == {"a": 1}
+
+        # New changes extend the resumed session
+        reopened.append_action(ActionType.TASK_EXECUTION, {"step": 2}, "agent")
+        reopened.close()
+        bundle_data = BundleSegmentLog.load(fs_manager.storage_path)
+        assert bundle_data["state"] == {"a": 1}
+        assert len(bundle_data["actions"]) == 4
+
+    def test_close_flushes_buffered_actions(self, storage_root):
+        """Actions short of a full group are written when the session ends"""
+        with ContextBundleManager(
+            session_id="closed", storage_backend="filesystem"
+        ) as manager:
+            for i in range(3):
+                manager.append_action(ActionType.TASK_EXECUTION, {"step": i})
+
+        bundle_data = BundleSegmentLog.load(storage_root / "closed")
+        assert [a["action_data"]["step"] for a in bundle_data["actions"]] == [0, 1, 2]
+
+    def test_buffered_actions_committed_at_exit(self, fs_manager):
+        """The exit hook commits logs that were never closed"""
+        from core.context_bundles import _commit_open_segment_logs
+
+        fs_manager.append_action(ActionType.TASK_EXECUTION, {"step": 0})
+        assert fs_manager._log._pending
+
+        _commit_open_segment_logs()
+        assert not fs_manager._log._pending
+        bundle_data = BundleSegmentLog.load(fs_manager.storage_path)
+        assert len(bundle_data["actions"]) == 1
+
+
 class TestBundleEnabledAgent:
     """Test BundleEnabledAgent functionality"""
 
@@ -3,6 +3,7 @@ Comprehensive unit tests for R&D Framework Context Optimizer
 Testing 40-60% context reduction and delegation logic
 """
 
+import json
 import pytest
 from unittest.mock import patch, AsyncMock
 
@@ -16,6 +17,9 @@ from core.context_optimizer import (
     ContextOptimizedAgent,
     ReducedContext,
     ContextReductionStrategy,
+    RelevanceIndex,
+    TokenEstimator,
+    WordTokenModel,
 )
 
 
@@ -294,6 +298,152 @@ class TestContextOptimizer:
         assert len(important) <= 5
 
 
+class TestTokenEstimator:
+    """Test memoized, pluggable token estimation"""
+
+    @pytest.fixture
+    def context(self):
+        return {
+            "requirements": "Implement the parser " * 50,
+            "files": [f"src/module_{i}.py" for i in range(30)],
+            "config": {"strict": True, 1: None},
+            "notes": 'Quotes " and unicode \u00e9',
+        }
+
+    def test_matches_serialized_length(self, context):
+        """Default estimates equal len(json.dumps(context)) // 4"""
+        estimator = TokenEstimator()
+
+        assert estimator.estimate(context) == len(json.dumps(context)) // 4
+        assert estimator.estimate({}) == len(json.dumps({})) // 4
+        assert estimator.estimate("plain text") == len("plain text") // 4
+
+    def test_ledger_measures_each_entry_once(self, context, monkeypatch):
+        """Dropping or replacing keys only measures the new entries"""
+        estimator = TokenEstimator()
+        measured = []
+        original_value_units = estimator.value_units
+
+        def counting_value_units(value):
+            measured.append(value)
+            return original_value_units(value)
+
+        monkeypatch.setattr(estimator, "value_units", counting_value_units)
+        ledger = estimator.ledger()
+
+        ledger.estimate(context)
+        assert len(measured) == 4
+
+        reduced = {k: v for k, v in context.items() if k != "files"}
+        reduced["summary"] = "List of 30 files"
+        assert ledger.estimate(reduced) == len(json.dumps(reduced)) // 4
+        assert measured[4:] == ["List of 30 files"]
+
+    def test_pluggable_model(self, context):
+        """A different tokenizer approximation can be swapped in"""
+        optimizer = ContextOptimizer(token_model=WordTokenModel())
+
+        assert optimizer.estimate_tokens({"text": "Hello world"}) == 12
+        assert optimizer.estimate_tokens(context) > 0
+
+    def test_delegation_keeps_caller_context(self):
+        """Removing delegated subtasks does not mutate the input context"""
+        optimizer = ContextOptimizer()
+        subtasks = ["a", "b"]
+
+        cleaned = optimizer.remove_delegated_content(
+            {"subtasks": subtasks}, [{"task": "a", "context_subset": {}}]
+        )
+
+        assert cleaned["subtasks"] == ["b"]
+        assert subtasks == ["a", "b"]
+
+
+class TestRelevanceIndex:
+    """Test inverted-index relevance filtering and BM25 ranking"""
+
+    @pytest.fixture
+    def context(self):
+        return {
+            "requirements": "Ship it",
+            "auth_notes": "Token refresh flow",
+            "login_page": "Form with authentication and authentication errors",
+            "weather": "Sunny day",
+            "metrics": 42,
+        }
+
+    def test_lookup_matches_substrings(self, context):
+        """Keywords match inside words of keys and values"""
+        index = RelevanceIndex(context)
+
+        assert index.lookup(["auth"]) == {"auth_notes", "login_page"}
+        assert index.lookup(["refresh", "sunny"]) == {"auth_notes", "weather"}
+        assert index.relevant_keys(["missing"]) == {"requirements"}
+
+    def test_index_agrees_with_item_check(self, context):
+        """Index filtering keeps exactly what is_relevant_to_task keeps"""
+        optimizer = ContextOptimizer()
+        task = "debug authentication login flow"
+        keywords = optimizer.extract_keywords(task)
+
+        reduced, _ = optimizer.extract_relevant_only(context, task)
+
+        assert reduced == {
+            k: v
+            for k, v in context.items()
+            if optimizer.is_relevant_to_task(k, v, keywords)
+        }
+
+    def test_bm25_ranks_by_term_frequency(self, context):
+        """Keys mentioning a keyword more often score higher"""
+        scores = RelevanceIndex(context).score(["authentication", "token"])
+
+        assert set(scores) == {"auth_notes", "login_page"}
+        assert scores["login_page"] > 0 and scores["auth_notes"] > 0
+
+        repeated = RelevanceIndex(
+            {"once": "authentication here", "twice": "authentication authentication"}
+        ).score(["authentication"])
+        assert repeated["twice"] > repeated["once"]
+
+    def test_relevance_budget_keeps_top_items(self):
+        """With a budget, only the best-scoring items that fit are kept"""
+        optimizer = ContextOptimizer(relevance_budget=20)
+        context = {
+            "requirements": "Ship the parser",
+            "parser_notes": "parser parser parser",
+            "parser_log": "parser output " * 20,
+            "weather": "Sunny day",
+        }
+
+        reduced, _ = optimizer.extract_relevant_only(context, "fix parser")
+
+        assert list(reduced) == ["requirements", "parser_notes"]
+
+    def test_trigram_lookup_matches_vocabulary_scan(self, context):
+        """Trigram candidates find the same terms as scanning every term"""
+        index = RelevanceIndex(context)
+
+        for keyword in ["auth", "ication", "errors", "refresh", "xyz", "th", "a"]:
+            expected = {term for term in index.postings if keyword in term}
+            assert set(index.matching_terms(keyword)) == expected
+
+    def test_index_is_reused_per_context_version(self, context):
+        """The index is rebuilt only when keys or string values change"""
+        optimizer = ContextOptimizer(relevance_budget=100)
+
+        first = optimizer.relevance_index(context)
+        assert optimizer.relevance_index(dict(context)) is first
+
+        # Non-string values are not indexed
+        assert optimizer.relevance_index({**context, "metrics": 43}) is first
+
+        changed = {**context, "weather": "Rain and authentication"}
+        rebuilt = optimizer.relevance_index(changed)
+        assert rebuilt is not first
+        assert "weather" in rebuilt.lookup(["auth"])
+
+
 class TestContextOptimizedAgent:
     """Test suite for ContextOptimizedAgent with R&D Framework"""
 
@@ -5,6 +5,10 @@ Tests all core functionality including multi-level delegation, task decompositio
 workload distribution, result aggregation, and coordination protocols.
 """
 
+import asyncio
+import random
+import time
+
 import pytest
 from datetime import datetime
 
@@ -17,6 +21,7 @@ from core.hierarchical_orchestrator import (
     HierarchicalOrchestrator,
     TaskDecomposer,
     WorkloadDistributor,
+    OrchestrationCancelled,
     OrchestrationTask,
     AgentInfo,
     OrchestrationResult,
@@ -307,6 +312,129 @@ class TestWorkloadDistributor:
         assert len(distribution) == 1
 
 
+class TestIndexedDistribution:
+    """Test heap and index based strategies against the per-task scans"""
+
+    WORDS = ["api", "database", "sql", "auth", "ui", "cache", "queue", "docs"]
+
+    def _fixture(self, seed, task_count=200, agent_count=15):
+        rng = random.Random(seed)
+        agents = [
+            AgentInfo(
+                f"agent{i}",
+                OrchestrationLevel.TERTIARY,
+                current_load=rng.randint(0, 3),
+                max_capacity=rng.randint(2, 30),
+                specializations=[" ".join(rng.sample(self.WORDS, rng.randint(0, 3)))],
+            )
+            for i in range(agent_count)
+        ]
+        complexities = list(TaskComplexity)
+        tasks = [
+            OrchestrationTask(
+                f"task{i}",
+                " ".join(rng.sample(self.WORDS, rng.randint(1, 3))),
+                OrchestrationLevel.TERTIARY,
+                rng.choice(complexities),
+            )
+            for i in range(task_count)
+        ]
+        return tasks, agents
+
+    def _scan_least_loaded(self, tasks, agents):
+        distribution = {agent.agent_id: [] for agent in agents}
+        for task in tasks:
+            agent = min(agents, key=lambda a: a.current_load)
+            distribution[agent.agent_id].append(task.task_id)
+            agent.current_load += 1
+        return distribution
+
+    def _scan_capability(self, tasks, agents):
+        distribution = {agent.agent_id: [] for agent in agents}
+        for task in tasks:
+            task_keywords = set(task.content.lower().split())
+            best_agent, best_score = agents[0], 0
+            for agent in agents:
+                if agent.current_load >= agent.max_capacity:
+                    continue
+                agent_keywords = set()
+                for spec in agent.specializations:
+                    agent_keywords.update(spec.lower().split())
+                score = len(task_keywords & agent_keywords)
+                if score > best_score:
+                    best_agent, best_score = agent, score
+            distribution[best_agent.agent_id].append(task.task_id)
+            best_agent.current_load += 1
+        return distribution
+
+    def _scan_priority(self, tasks, agents):
+        distribution = {agent.agent_id: [] for agent in agents}
+        order = WorkloadDistributor.COMPLEXITY_RANK
+        for task in sorted(tasks, key=lambda t: order[t.complexity]):
+            capable = [a for a in agents if a.current_load < a.max_capacity]
+            if capable:
+                agent = min(capable, key=lambda a: a.current_load)
+                distribution[agent.agent_id].append(task.task_id)
+                agent.current_load += 1
+        return distribution
+
+    @pytest.mark.parametrize("seed", range(5))
+    @pytest.mark.parametrize(
+        "strategy, scan",
+        [
+            ("least_loaded", "_scan_least_loaded"),
+            ("capability_based", "_scan_capability"),
+            ("priority_based", "_scan_priority"),
+        ],
+    )
+    def test_matches_per_task_scan(self, seed, strategy, scan):
+        """Indexed strategies assign exactly like a scan over all agents"""
+        tasks, agents = self._fixture(seed)
+        expected_tasks, expected_agents = self._fixture(seed)
+
+        distribution = WorkloadDistributor().distribute(tasks, agents, strategy)
+        expected = getattr(self, scan)(expected_tasks, expected_agents)
+
+        assert distribution == expected
+        assert [a.current_load for a in agents] == [
+            a.current_load for a in expected_agents
+        ]
+
+    def test_capability_match_skips_full_agents(self):
+        """A full specialist hands further matching tasks to the next best"""
+        agents = [
+            AgentInfo("generalist", OrchestrationLevel.TERTIARY),
+            AgentInfo(
+                "specialist",
+                OrchestrationLevel.TERTIARY,
+                max_capacity=1,
+                specializations=["database sql"],
+            ),
+            AgentInfo(
+                "backup",
+                OrchestrationLevel.TERTIARY,
+                specializations=["database"],
+            ),
+        ]
+        tasks = [
+            OrchestrationTask(
+                f"t{i}",
+                "sql database",
+                OrchestrationLevel.TERTIARY,
+                TaskComplexity.SIMPLE,
+            )
+            for i in range(3)
+        ]
+
+        distribution = WorkloadDistributor()._capability_based(tasks, agents)
+
+        assert distribution == {
+            "generalist": [],
+            "specialist": ["t0"],
+            "backup": ["t1", "t2"],
+        }
+
+
 class TestHierarchicalOrchestrator:
     """Test hierarchical orchestrator core functionality"""
 
@@ -614,6 +742,120 @@ class TestHierarchicalOrchestrator:
             assert callable(tool)
 
 
+class TestConcurrentSubtasks:
+    """Test concurrent subtask execution in the coordination patterns"""
+
+    def _orchestrator(self, count, limit=4, delay=0.05, fail=None):
+        """Orchestrator with a parent task and `count` timed tertiary subtasks"""
+        orchestrator = HierarchicalOrchestrator(
+            max_agents_per_level={"primary": 1, "secondary": 1, "tertiary": limit}
+        )
+        orchestrator.peak = 0
+        active = 0
+
+        async def execute(task, orchestration_id, input_data=None):
+            nonlocal active
+            active += 1
+            orchestrator.peak = max(orchestrator.peak, active)
+            try:
+                await asyncio.sleep(delay)
+                if task.task_id == fail:
+                    raise ValueError("subtask failed")
+                task.status = "completed"
+                task.result = task.task_id
+                return task.result
+            finally:
+                active -= 1
+
+        orchestrator._execute_single_task = execute
+
+        parent = OrchestrationTask(
+            "parent", "Parent", OrchestrationLevel.SECONDARY, TaskComplexity.COMPLEX
+        )
+        for i in range(count):
+            subtask = OrchestrationTask(
+                f"sub{i}",
+                f"Subtask {i}",
+                OrchestrationLevel.TERTIARY,
+                TaskComplexity.ATOMIC,
+                parent_id="parent",
+            )
+            orchestrator.tasks[subtask.task_id] = subtask
+            parent.subtasks.append(subtask.task_id)
+        orchestrator.tasks["parent"] = parent
+        return orchestrator, parent
+
+    @pytest.mark.asyncio
+    async def test_mapreduce_fan_out_bounded_by_level(self):
+        """Subtasks run concurrently up to the level's agent limit"""
+        orchestrator, parent = self._orchestrator(12, limit=4)
+
+        started = time.monotonic()
+        result = await orchestrator._execute_mapreduce(parent, "orch")
+        elapsed = time.monotonic() - started
+
+        assert result == "\n".join(f"sub{i}" for i in range(12))
+        assert orchestrator.peak == 4
+        # 3 waves of 0.05s instead of 12 sequential subtasks
+        assert elapsed < 0.4
+
+    def test_semaphores_work_across_event_loops(self):
+        """Contended level semaphores do not leak between asyncio.run calls"""
+        orchestrator, parent = self._orchestrator(4, limit=1, delay=0.01)
+
+        for _ in range(2):
+            for subtask_id in parent.subtasks:
+                orchestrator.tasks[subtask_id].status = "pending"
+            result = asyncio.run(orchestrator._execute_mapreduce(parent, "orch"))
+            assert result == "\n".join(f"sub{i}" for i in range(4))
+
+    @pytest.mark.asyncio
+    async def test_scatter_gather_concurrent(self):
+        orchestrator, parent = self._orchestrator(6, limit=6)
+
+        result = await orchestrator._execute_scatter_gather(parent, "orch")
+
+        assert result["gathered_results"] == [f"sub{i}" for i in range(6)]
+        assert orchestrator.peak == 6
+
+    @pytest.mark.asyncio
+    async def test_fork_join_keeps_failures(self):
+        """Fork-Join reports failed subtasks without cancelling the others"""
+        orchestrator, parent = self._orchestrator(4, fail="sub1")
+
+        result = await orchestrator._execute_fork_join(parent, "orch")
+
+        assert result["total_count"] == 4
+        assert result["success_count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_mapreduce_failure_cancels_siblings(self):
+        """The first MapReduce failure stops the subtasks still running"""
+        orchestrator, parent = self._orchestrator(8, limit=2, fail="sub0")
+
+        with pytest.raises(ValueError):
+            await orchestrator._execute_mapreduce(parent, "orch")
+        await asyncio.sleep(0.1)
+
+        completed = [t for t in orchestrator.tasks.values() if t.status == "completed"]
+        assert len(completed) <= 1
+        assert orchestrator._running_subtasks["orch"] == set()
+
+    @pytest.mark.asyncio
+    async def test_cancel_orchestration_stops_subtasks(self):
+        """cancel_orchestration cancels running subtasks of that orchestration"""
+        orchestrator, parent = self._orchestrator(8, limit=2, delay=0.2)
+        orchestrator.active_orchestrations["orch"] = {}
+
+        run = asyncio.ensure_future(orchestrator._execute_mapreduce(parent, "orch"))
+        await asyncio.sleep(0.05)
+        assert await orchestrator.cancel_orchestration("orch")
+
+        with pytest.raises(OrchestrationCancelled):
+            await run
+        assert all(t.status != "completed" for t in orchestrator.tasks.values())
+
+
 class TestOrchestrationDataClasses:
     """Test orchestration data classes"""
 
@@ -5,6 +5,9 @@ Tests all five coordination patterns: MapReduce, Pipeline, Fork-Join,
 Scatter-Gather, and Saga with comprehensive pattern selection and execution.
 """
 
+import asyncio
+import time
+
 import pytest
 from datetime import datetime
 
@@ -24,6 +27,7 @@ from orchestration.patterns import (
     ScatterGatherPattern,
     SagaPattern,
     BaseOrchestrationPattern,
+    _PartialReduction,
 )
 
 
@@ -215,6 +219,139 @@ class TestMapReducePattern:
         assert metrics["average_execution_time"] == 1.5
 
 
+class TimedMapReduce(MapReducePattern):
+    """MapReduce pattern with per-agent delays that records scheduling"""
+
+    def __init__(self, delays, **kwargs):
+        super().__init__(**kwargs)
+        self.delays = delays
+        self.order = []
+        self.active = {}
+        self.peak = {}
+
+    async def _execute_map_slice(self, agent, slice_obj):
+        self.order.append(slice_obj.slice_id)
+        self.active[agent] = self.active.get(agent, 0) + 1
+        self.peak[agent] = max(self.peak.get(agent, 0), self.active[agent])
+        try:
+            await asyncio.sleep(self.delays[agent])
+            if slice_obj.content == "fail":
+                raise ValueError("bad slice")
+            return slice_obj.content
+        finally:
+            self.active[agent] -= 1
+
+
+class TestMapReduceScheduling:
+    """Test the work-stealing map phase and streaming reduction"""
+
+    @pytest.mark.asyncio
+    async def test_idle_agents_take_over_skewed_work(self):
+        """A slow agent does not hold back slices the fast agent can run"""
+        pattern = TimedMapReduce({"slow": 0.2, "fast": 0.01})
+        slices = [TaskSlice(f"slice-{i}", i) for i in range(10)]
+
+        started = time.monotonic()
+        result = await pattern.execute(slices, ["slow", "fast"])
+        elapsed = time.monotonic() - started
+
+        assert result.success
+        assert result.result == sum(range(10))
+        assert result.metadata["reduction_type"] == "numeric"
+        # Round-robin would give the slow agent 5 slices (1s)
+        assert elapsed < 0.6
+        assert result.metadata["slices_per_agent"][0] <= 2
+        assert sum(result.metadata["slices_per_agent"]) == 10
+
+    @pytest.mark.asyncio
+    async def test_priority_order(self):
+        """Higher priority slices start first, ties keep input order"""
+        pattern = TimedMapReduce({"agent": 0})
+        slices = [
+            TaskSlice("low", 1, priority=0),
+            TaskSlice("high", 2, priority=5),
+            TaskSlice("low-2", 3, priority=0),
+            TaskSlice("mid", 4, priority=1),
+        ]
+
+        await pattern.execute(slices, ["agent"])
+
+        assert pattern.order == ["high", "mid", "low", "low-2"]
+
+    @pytest.mark.asyncio
+    async def test_per_agent_concurrency_cap(self):
+        """Each agent runs at most max_concurrent_per_agent slices at once"""
+        pattern = TimedMapReduce({"a": 0.02, "b": 0.02}, max_concurrent_per_agent=3)
+        slices = [TaskSlice(f"slice-{i}", [i]) for i in range(12)]
+
+        result = await pattern.execute(slices, ["a", "b"])
+
+        assert pattern.peak == {"a": 3, "b": 3}
+        assert sorted(result.result) == list(range(12))
+
+    @pytest.mark.asyncio
+    async def test_failed_slices_reported(self):
+        """A failing slice is skipped without losing the agent's other work"""
+        pattern = TimedMapReduce({"agent": 0})
+        slices = [
+            TaskSlice("ok", "a"),
+            TaskSlice("bad", "fail"),
+            TaskSlice("ok-2", "b"),
+        ]
+
+        result = await pattern.execute(slices, ["agent"])
+
+        assert result.success
+        assert result.result == "a\nb"
+        assert result.metadata["failed_slices"] == ["bad"]
+        assert result.metadata["map_results_count"] == 2
+
+    def test_partial_reduction_memory_is_bounded(self):
+        """Numeric and dict reductions keep only the folded value"""
+        numeric = _PartialReduction()
+        for i in range(100_000):
+            numeric.add(i)
+        assert numeric.result() == sum(range(100_000))
+        assert numeric.count == 100_000
+        assert numeric._items == []
+
+        merged = _PartialReduction()
+        for i in range(1000):
+            merged.add({f"k{i % 10}": i})
+        assert len(merged.result()) == 10
+        assert merged._items == []
+
+    def test_partial_reduction_switch_keeps_folded_value(self):
+        """A numeric partial becomes the first entry of a mixed reduction"""
+        reduction = _PartialReduction()
+        for value in [1, 2, "three", [4]]:
+            reduction.add(value)
+
+        assert reduction.result() == {
+            "results": [3, "three", [4]],
+            "count": 4,
+            "pattern": "mapreduce",
+        }
+
+    @pytest.mark.asyncio
+    async def test_mixed_results_keep_raw_results(self):
+        """The batch reduce phase returns every mixed result unchanged"""
+        pattern = MapReducePattern()
+
+        result = await pattern._reduce_phase([1, 2, "three", [4]], [])
+
+        assert result == {
+            "results": [1, 2, "three", [4]],
+            "count": 4,
+            "pattern": "mapreduce",
+        }
+        assert await pattern._reduce_phase([{"a": 1}, {"b": 2}, None], []) == {
+            "results": [{"a": 1}, {"b": 2}, None],
+            "count": 3,
+            "pattern": "mapreduce",
+        }
+
+
 class TestPipelinePattern:
     """Test Pipeline orchestration pattern"""
 
@@ -0,0 +1,261 @@
+#!/usr/bin/env uv run python
+"""
+Tests for concurrent and streaming execution in MultiStagePipeline.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.pipeline import (  # noqa: E402
+    ClassificationStage,
+    DeterministicFilterStage,
+    LatencyHistogram,
+    MultiStagePipeline,
+    PipelineDecision,
+    PipelineStage,
+)
+
+
+class SlowStage(PipelineStage):
+    """Stage that sleeps and records how many items it sees at once"""
+
+    def __init__(self, name, stage_id, delay=0.05, max_concurrency=None):
+        super().__init__(name, stage_id)
+        self.delay = delay
+        self.max_concurrency = max_concurrency
+        self.active = 0
+        self.peak = 0
+        self.contexts = {}
+
+    async def process_async(self, data, context=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self.contexts[data] = context
+        try:
+            await asyncio.sleep(self.delay)
+            if data == "fail":
+                raise ValueError("bad item")
+            return data, {}
+        finally:
+            self.active -= 1
+
+    def should_exit(self, result, metadata):
+        return False
+
+
+class ContextStage(SlowStage):
+    """Stage that needs previous_result/next_item"""
+
+    needs_batch_context = True
+
+
+class TestConcurrentBatch:
+    """Test bounded concurrency, ordering and opt-in batch context"""
+
+    @pytest.fixture
+    def pipeline(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        return MultiStagePipeline("test_pipeline")
+
+    @pytest.mark.asyncio
+    async def test_items_run_concurrently_in_order(self, pipeline):
+        """Results come back in input order while items overlap"""
+        first = SlowStage("first", 1)
+        pipeline.add_stage(first)
+        pipeline.add_stage(SlowStage("second", 2))
+        items = [f"item{i}" for i in range(20)]
+
+        start = time.monotonic()
+        results = await pipeline.process_batch_async(items, max_in_flight=10)
+        elapsed = time.monotonic() - start
+
+        assert [meta["final_result"] for _, meta in results] == items
+        assert [meta["item_index"] for _, meta in results] == list(range(20))
+        assert all(d == PipelineDecision.CONTINUE for d, _ in results)
+        assert first.peak == 10
+        # Sequential processing would take at least 20 * 2 * 0.05 = 2s
+        assert elapsed < 1.0
+
+    @pytest.mark.asyncio
+    async def test_sequential_mode(self, pipeline):
+        """max_in_flight=1 processes one item at a time"""
+        stage = SlowStage("only", 1, delay=0.001)
+        pipeline.add_stage(stage)
+
+        results = await pipeline.process_batch_async(["a", "b", "c"], max_in_flight=1)
+
+        assert [meta["final_result"] for _, meta in results] == ["a", "b", "c"]
+        assert stage.peak == 1
+
+    @pytest.mark.asyncio
+    async def test_stage_concurrency_limit(self, pipeline):
+        """A stage's max_concurrency caps items inside it"""
+        fast = SlowStage("fast", 1, delay=0.01)
+        limited = SlowStage("limited", 2, delay=0.02, max_concurrency=2)
+        pipeline.add_stage(fast)
+        pipeline.add_stage(limited)
+
+        await pipeline.process_batch_async(list("abcdefgh"), max_in_flight=8)
+
+        assert fast.peak == 8
+        assert limited.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_context_is_opt_in(self, pipeline):
+        """Only stages declaring needs_batch_context get neighbour context"""
+        plain = SlowStage("plain", 1, delay=0.01)
+        contextual = ContextStage("contextual", 2, delay=0.01)
+        pipeline.add_stage(plain)
+        pipeline.add_stage(contextual)
+
+        results = await pipeline.process_batch_async(["a", "b", "c"], max_in_flight=3)
+
+        assert plain.contexts == {"a": {}, "b": {}, "c": {}}
+        assert contextual.contexts["a"] == {"next_item": "b"}
+        assert contextual.contexts["b"] == {
+            "previous_result": "a",
+            "previous_decision": PipelineDecision.CONTINUE,
+            "next_item": "c",
+        }
+        assert contextual.contexts["c"]["previous_result"] == "b"
+        assert "next_item" not in contextual.contexts["c"]
+        assert [meta["final_result"] for _, meta in results] == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_failures_keep_their_slot(self, pipeline):
+        """A failing item is reported in place without stopping the batch"""
+        pipeline.add_stage(SlowStage("only", 1, delay=0.01))
+
+        results = await pipeline.process_batch_async(["a", "fail", "c"])
+
+        assert [d for d, _ in results] == [
+            PipelineDecision.CONTINUE,
+            PipelineDecision.EXIT_FAILURE,
+            PipelineDecision.CONTINUE,
+        ]
+        assert results[1][1]["error"] == "bad item"
+
+
+class TestStreamingPipeline:
+    """Test stage-parallel streaming execution"""
+
+    @pytest.fixture
+    def pipeline(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        return MultiStagePipeline("stream_pipeline")
+
+    async def _collect(self, stream):
+        return [result async for result in stream]
+
+    @pytest.mark.asyncio
+    async def test_stages_overlap(self, pipeline):
+        """Different items occupy different stages at the same time"""
+        pipeline.add_stage(SlowStage("first", 1))
+        pipeline.add_stage(SlowStage("second", 2))
+        items = [f"item{i}" for i in range(10)]
+
+        start = time.monotonic()
+        results = await self._collect(pipeline.stream_async(items, workers_per_stage=1))
+        elapsed = time.monotonic() - start
+
+        assert [meta["final_result"] for _, meta in results] == items
+        # One item at a time per stage: ~11 steps of 0.05s instead of 20
+        assert elapsed < 0.85
+
+    @pytest.mark.asyncio
+    async def test_early_exit_skips_downstream(self, pipeline):
+        """Items decided by the filter never reach classification"""
+        pipeline.add_stage(DeterministicFilterStage())
+        pipeline.add_stage(ClassificationStage())
+
+        async def reports():
+            for text in ["skip this", "an error occurred here", "review code", "hi"]:
+                yield text
+
+        results = await self._collect(pipeline.stream_async(reports()))
+
+        decisions = [(d, meta.get("exit_stage")) for d, meta in results]
+        assert decisions == [
+            (PipelineDecision.EXIT_SUCCESS, "deterministic_filter"),
+            (PipelineDecision.CONTINUE, None),
+            (PipelineDecision.EXIT_SUCCESS, "deterministic_filter"),
+            (PipelineDecision.CONTINUE, None),
+        ]
+        assert "classification" in results[1][1]["stage_metadata"]
+        assert "classification" not in results[0][1]["stage_metadata"]
+        assert pipeline.stages[1].stats["processed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_input_consumed_lazily(self, pipeline):
+        """Only a bounded number of items are pulled ahead of the consumer"""
+        pipeline.add_stage(SlowStage("only", 1, delay=0))
+        produced = 0
+        ahead = 0
+
+        async def items():
+            nonlocal produced
+            for i in range(500):
+                produced += 1
+                yield i
+
+        consumed = 0
+        async for _, meta in pipeline.stream_async(items(), queue_size=4):
+            assert meta["item_index"] == consumed
+            consumed += 1
+            ahead = max(ahead, produced - consumed)
+
+        assert consumed == 500
+        assert ahead <= 4 * 2 + 1
+
+    @pytest.mark.asyncio
+    async def test_unordered_results(self, pipeline):
+        """Unordered streaming yields every item as soon as it finishes"""
+        pipeline.add_stage(SlowStage("only", 1, delay=0.01))
+
+        results = await self._collect(pipeline.stream_async(range(20), ordered=False))
+
+        assert sorted(meta["item_index"] for _, meta in results) == list(range(20))
+
+    @pytest.mark.asyncio
+    async def test_batch_context_stages_rejected(self, pipeline):
+        pipeline.add_stage(ContextStage("contextual", 1))
+
+        with pytest.raises(ValueError):
+            await self._collect(pipeline.stream_async(["a"]))
+
+
+class TestLatencyHistogram:
+    """Test fixed-size latency tracking"""
+
+    def test_percentiles_and_fixed_size(self):
+        histogram = LatencyHistogram()
+        size = len(histogram.counts)
+
+        for value in range(1, 1001):
+            histogram.record(float(value))
+
+        assert len(histogram.counts) == size
+        assert histogram.count == 1000
+        assert histogram.mean == pytest.approx(500.5)
+        assert histogram.max == 1000
+        # Buckets are 10 per decade, so values are within ~26%
+        assert 500 <= histogram.percentile(50) <= 500 * 1.26
+        assert 950 <= histogram.percentile(95) <= 1000
+
+    def test_pipeline_stats_report_histograms(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        pipeline = MultiStagePipeline("stats_pipeline")
+        pipeline.add_stage(SlowStage("only", 1, delay=0))
+
+        asyncio.run(pipeline.process_batch_async(["a", "b"]))
+        stats = pipeline.get_pipeline_stats()
+
+        assert stats["processing_times"]["only"]["count"] == 2
+        assert stats["stage_stats"]["only"]["avg_processing_time_ms"] >= 0
+        assert "p95_processing_time_ms" in stats["stage_stats"]["only"]
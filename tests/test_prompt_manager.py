@@ -0,0 +1,117 @@
+#!/usr/bin/env uv run python
+"""
+Tests for the shared prompt catalog and PromptManager caching.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import prompt_manager  # noqa: E402
+from core.prompt_manager import PromptManager, get_prompt_catalog  # noqa: E402
+
+
+def _touch_later(path: Path, content: str):
+    """Rewrite a prompt file with an mtime clearly after the previous one"""
+    stat = path.stat()
+    path.write_text(content)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestPromptCatalog:
+    """Test the process-wide prompt catalog"""
+
+    @pytest.fixture
+    def prompts_dir(self, tmp_path):
+        prompts = tmp_path / "prompts"
+        (prompts / "base").mkdir(parents=True)
+        (prompts / "base" / "system.prompt").write_text(
+            "# Version: 1.0.0\nYou are $agent."
+        )
+        return prompts
+
+    def test_catalog_shared_between_managers(self, prompts_dir):
+        """Managers on the same directory share one parsed catalog"""
+        first = PromptManager(prompts_dir)
+        second = PromptManager(prompts_dir)
+
+        assert first.get_prompt("base/system", agent="A") == "You are A."
+        assert first._catalog() is second._catalog()
+        assert first.templates["base/system"] is second.templates["base/system"]
+        assert second.get_version("base/system") == "1.0.0"
+
+    def test_changed_file_invalidates_catalog(self, prompts_dir, monkeypatch):
+        """Edited files are re-parsed and cached renders are dropped"""
+        monkeypatch.setattr(prompt_manager, "CATALOG_CHECK_INTERVAL", 0)
+        (prompts_dir / "base" / "other.prompt").write_text("Other")
+        manager = PromptManager(prompts_dir)
+        assert manager.get_prompt("base/system", agent="A") == "You are A."
+        other = manager.templates["base/other"]
+
+        _touch_later(prompts_dir / "base" / "system.prompt", "Hello $agent.")
+
+        assert manager.get_prompt("base/system", agent="A") == "Hello A."
+        # Unchanged files keep their parsed template
+        assert manager.templates["base/other"] is other
+
+        (prompts_dir / "base" / "other.prompt").unlink()
+        assert "base/other" not in manager.list_prompts()
+
+    def test_catalog_not_rechecked_within_interval(self, prompts_dir, monkeypatch):
+        """Within the check interval the catalog is returned without stat calls"""
+        monkeypatch.setattr(prompt_manager, "CATALOG_CHECK_INTERVAL", 3600)
+        catalog = get_prompt_catalog(prompts_dir)
+
+        monkeypatch.setattr(
+            prompt_manager.PromptCatalog,
+            "is_stale",
+            lambda self: pytest.fail("catalog re-checked"),
+        )
+        assert get_prompt_catalog(prompts_dir) is catalog
+
+    def test_overrides_are_per_manager(self, prompts_dir):
+        """Registered prompts shadow the catalog only for their manager"""
+        first = PromptManager(prompts_dir)
+        second = PromptManager(prompts_dir)
+
+        first.register_prompt("base/system", "Overridden $agent", {"version": "2"})
+        first.register_prompt("custom/extra", "Extra")
+
+        assert first.get_prompt("base/system", agent="A") == "Overridden A"
+        assert first.get_version("base/system") == "2"
+        assert second.get_prompt("base/system", agent="A") == "You are A."
+        assert second.get_version("base/system") == "1.0.0"
+        assert "custom/extra" not in second.list_prompts()
+        # The shared catalog itself is untouched
+        catalog = first._catalog()
+        assert catalog.templates["base/system"].template == "You are $agent."
+
+    def test_save_prompt_visible_to_all_managers(self, prompts_dir):
+        """Saving a prompt refreshes the shared catalog immediately"""
+        first = PromptManager(prompts_dir)
+        second = PromptManager(prompts_dir)
+        assert second.get_prompt("greeting") is None
+
+        first.save_prompt("greeting", "Hi $agent", {"version": "1.1.0"})
+
+        assert second.get_prompt("custom/greeting", agent="B") == "Hi B"
+        assert second.load_prompt("custom/greeting") == "Hi $agent"
+        assert second.get_version("custom/greeting") == "1.1.0"
+
+    def test_render_cache_is_bounded(self, prompts_dir):
+        """The rendered prompt cache evicts least recently used entries"""
+        manager = PromptManager(prompts_dir, max_cache_size=3)
+
+        for name in ["A", "B", "C"]:
+            manager.get_prompt("base/system", agent=name)
+        manager.get_prompt("base/system", agent="A")
+        manager.get_prompt("base/system", agent="D")
+
+        assert len(manager._cache) == 3
+        keys = list(manager._cache)
+        assert not any('"B"' in key for key in keys)
+        assert '"D"' in keys[-1]
@@ -185,6 +185,92 @@ class TestMemoryBackend(unittest.TestCase):
         self.backend.clear()
         self.assertEqual(len(self.backend._buckets), 0)
 
+    def test_buckets_spread_over_shards(self):
+        """Test that keys are spread over independently locked shards."""
+        for i in range(200):
+            self.backend.get_bucket(f"service:agent{i}", 10, 1.0)
+
+        self.assertEqual(len(self.backend._buckets), 200)
+        used = [shard for shard in self.backend._shards if shard]
+        self.assertGreater(len(used), 1)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used bucket is evicted at the limit."""
+        backend = MemoryBackend(shards=1, max_buckets=3)
+        first = backend.get_bucket("a", 10, 1.0)
+        backend.get_bucket("b", 10, 1.0)
+        backend.get_bucket("c", 10, 1.0)
+
+        # Touch "a" so "b" becomes least recently used
+        self.assertIs(backend.get_bucket("a", 10, 1.0), first)
+        backend.get_bucket("d", 10, 1.0)
+
+        self.assertEqual(set(backend._buckets), {"a", "c", "d"})
+
+    def test_idle_ttl_eviction(self):
+        """Test that idle buckets are evicted when new buckets are created."""
+        backend = MemoryBackend(shards=1, idle_ttl=0.05)
+        backend.get_bucket("idle", 10, 1.0)
+        time.sleep(0.1)
+        backend.get_bucket("fresh", 10, 1.0)
+
+        self.assertEqual(set(backend._buckets), {"fresh"})
+
+    def test_wall_clock_jumps_do_not_refill(self):
+        """Test that buckets use a monotonic clock."""
+        bucket = self.backend.get_bucket("clock", 5, 1.0)
+        bucket.consume(5)
+
+        with patch("time.time", return_value=time.time() + 3600):
+            self.assertEqual(bucket.remaining_tokens(), 0)
+
+    def test_consume_many_is_all_or_nothing(self):
+        """Test that no bucket is charged when one of them is short."""
+        success, retry_after, key = self.backend.consume_many(
+            [("agent", 10, 1.0, 2), ("service", 3, 1.0, 4)]
+        )
+
+        self.assertFalse(success)
+        self.assertEqual(key, "service")
+        self.assertAlmostEqual(retry_after, 1.0, places=2)
+        self.assertEqual(
+            self.backend.get_bucket("agent", 10, 1.0).remaining_tokens(), 10
+        )
+
+        success, _, key = self.backend.consume_many(
+            [("agent", 10, 1.0, 2), ("service", 3, 1.0, 1), ("agent", 10, 1.0, 3)]
+        )
+
+        self.assertTrue(success)
+        self.assertIsNone(key)
+        self.assertEqual(
+            self.backend.get_bucket("agent", 10, 1.0).remaining_tokens(), 5
+        )
+        self.assertEqual(
+            self.backend.get_bucket("service", 3, 1.0).remaining_tokens(), 2
+        )
+
+    def test_concurrent_consume_many(self):
+        """Test that overlapping multi-bucket calls neither deadlock nor overdraw."""
+        allowed = []
+
+        def worker(thread_id):
+            keys = ["shared", f"agent{thread_id % 4}"]
+            if thread_id % 2:
+                keys.reverse()
+            for _ in range(50):
+                success, _, _ = self.backend.consume_many(
+                    [(key, 100, 0.001, 1) for key in keys]
+                )
+                allowed.append(success)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for future in [executor.submit(worker, i) for i in range(8)]:
+                future.result(timeout=10)
+
+        # The shared bucket admits exactly its capacity
+        self.assertEqual(sum(allowed), 100)
+
 
 class TestRateLimiter(unittest.TestCase):
     """Test the main RateLimiter class."""
@@ -288,6 +374,48 @@ class TestRateLimiter(unittest.TestCase):
         self.assertTrue(result)
 
 
+class TestConsumeMany(unittest.TestCase):
+    """Test atomic multi-limit checks on the RateLimiter."""
+
+    def setUp(self):
+        self.limiter = RateLimiter(backend=RateLimitBackend.MEMORY)
+        self.limiter.configure_service(
+            "agent_calls", calls_per_minute=60, burst_capacity=5
+        )
+        self.limiter.configure_service(
+            "github_api", calls_per_minute=6, burst_capacity=2
+        )
+
+    def test_all_limits_charged(self):
+        """Test that every bucket is charged when all limits allow the call."""
+        requests = [("agent_calls", "agent1"), ("github_api", "shared")]
+
+        self.assertTrue(self.limiter.consume_many(requests))
+        self.assertTrue(self.limiter.consume_many(requests))
+
+        self.assertEqual(
+            self.limiter.get_status("agent_calls", "agent1")["remaining_tokens"], 3
+        )
+        self.assertEqual(
+            self.limiter.get_status("github_api", "shared")["remaining_tokens"], 0
+        )
+
+    def test_exceeded_limit_charges_nothing(self):
+        """Test that an exhausted limit raises without charging the others."""
+        self.limiter.consume_many([("github_api", "shared", 2)])
+
+        with self.assertRaises(RateLimitExceeded) as cm:
+            self.limiter.consume_many(
+                [("agent_calls", "agent1"), ("github_api", "shared")]
+            )
+
+        self.assertEqual(cm.exception.service, "github_api")
+        self.assertGreater(cm.exception.retry_after, 0)
+        self.assertEqual(
+            self.limiter.get_status("agent_calls", "agent1")["remaining_tokens"], 5
+        )
+
+
 class TestRateLimitDecorator(unittest.TestCase):
     """Test the rate_limit decorator functionality."""
 
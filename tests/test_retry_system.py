@@ -336,6 +336,61 @@ class TestRetrySystemIntegration:
         handler = RetryHandler(config, "integration_test")
         assert handler.telemetry is not None
 
+    def test_handlers_share_collector(self):
+        """Test retry handlers reuse one process-wide collector"""
+        first = RetryHandler(RetryConfig(), "op_a")
+        second = RetryHandler(RetryConfig(), "op_b")
+        assert first.telemetry is second.telemetry
+
+    def test_first_attempt_success_skips_telemetry(self):
+        """Test unsampled first-attempt successes record nothing"""
+        config = RetryConfig(max_attempts=3, base_delay=0.01, max_delay=0.1)
+        handler = RetryHandler(config, "fast_path")
+
+        with patch.object(handler.telemetry, "record_workflow_event") as record:
+            assert handler.execute_with_retry(lambda: "ok") == "ok"
+        record.assert_not_called()
+
+    def test_retried_call_records_every_attempt(self):
+        """Test a retry still records the first attempt start and its failure"""
+        config = RetryConfig(max_attempts=3, base_delay=0.01, max_delay=0.1)
+        handler = RetryHandler(config, "flaky")
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) == 1:
+                raise OSError("transient")
+            return "ok"
+
+        with patch.object(handler.telemetry, "record_workflow_event") as record:
+            assert handler.execute_with_retry(flaky) == "ok"
+
+        messages = [c.args[3] for c in record.call_args_list]
+        assert messages == [
+            "Attempt 1/3",
+            "Attempt 1 failed: transient",
+            "Attempt 2/3",
+            "Success on attempt 2",
+        ]
+
+    def test_per_operation_sampling(self):
+        """Test sampled operations record first-attempt successes"""
+        config = RetryConfig()
+        handler = RetryHandler(config, "sampled_op")
+        retry_policy_manager.set_sample_rate("sampled_op", 1.0)
+        try:
+            with patch.object(handler.telemetry, "record_workflow_event") as record:
+                handler.execute_with_retry(lambda: "ok")
+            assert record.call_count == 2
+        finally:
+            retry_policy_manager._sample_rates.pop("sampled_op", None)
+
+        with pytest.raises(ValueError):
+            retry_policy_manager.set_sample_rate("sampled_op", 1.5)
+        with pytest.raises(ValueError):
+            RetryConfig(telemetry_sample_rate=-0.1)
+
     def test_performance_impact(self):
         """Test retry system has minimal performance impact on successful operations"""
 
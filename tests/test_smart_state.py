@@ -0,0 +1,108 @@
+#!/usr/bin/env uv run python
+"""
+Tests for the SQLite-backed smart state manager.
+"""
+
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.smart_state import (  # noqa: E402
+    SmartStateManager,
+    StateStatus,
+    StateType,
+)
+
+
+class TestSmartStateStore:
+    """Test indexed queries, lazy loading and legacy import"""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        return SmartStateManager(tmp_path / "state")
+
+    def test_states_survive_restart_without_eager_load(self, manager):
+        """A new manager loads snapshots only when asked for them"""
+        state_id = manager.create_state(
+            StateType.ISSUE_PROCESSING, {"issue_number": 7}, {"repo": "demo"}
+        )
+        manager.update_state(state_id, data_updates={"step": "triage"})
+
+        reopened = SmartStateManager(manager.base_dir)
+        assert reopened._state_cache == {}
+
+        state = reopened.get_state(state_id)
+        assert state.data["issue_number"] == 7
+        assert state.data["step"] == "triage"
+        assert state.context == {"repo": "demo"}
+        assert state.checksum == manager.get_state(state_id).checksum
+        assert not list(manager.base_dir.glob("*.json"))
+
+    def test_active_states_and_dependents(self, manager):
+        """Active, dependent and summary lookups are store queries"""
+        pipeline = manager.create_pipeline_state("build", ["lint", "test"])
+        child = manager.create_state(
+            StateType.AGENT_EXECUTION, {"agent": "linter"}, parent_state_id=pipeline
+        )
+        done = manager.create_state(StateType.AGENT_EXECUTION, {"agent": "docs"})
+        manager.update_state(done, status=StateStatus.COMPLETED)
+
+        reopened = SmartStateManager(manager.base_dir)
+        active = reopened.get_active_states(StateType.AGENT_EXECUTION)
+        assert [s.state_id for s in active] == [child]
+        assert {s.state_id for s in reopened.get_active_states()} == {pipeline, child}
+        assert reopened._find_dependent_states(pipeline) == [child]
+        assert reopened._has_active_dependents(pipeline)
+
+        summary = reopened.get_state_summary()
+        assert summary["total_states"] == 3
+        assert summary["active_by_type"] == {"pipeline_state": 1, "agent_execution": 1}
+        assert summary["total_relationships"] == 1
+
+    def test_cleanup_respects_active_dependents(self, manager):
+        """Old completed states go unless an active state depends on them"""
+        parent = manager.create_state(StateType.PIPELINE_STATE, {"name": "p"})
+        manager.create_state(
+            StateType.AGENT_EXECUTION, {"agent": "a"}, parent_state_id=parent
+        )
+        orphan = manager.create_state(StateType.AGENT_EXECUTION, {"agent": "b"})
+
+        old = (datetime.now() - timedelta(hours=48)).isoformat()
+        with manager.batch():
+            for state_id in (parent, orphan):
+                manager.update_state(state_id, status=StateStatus.COMPLETED)
+                state = manager.get_state(state_id)
+                state.timestamp = old
+                manager._persist_state(state)
+
+        assert manager.cleanup_completed_states(older_than_hours=24) == 1
+        assert manager.get_state(orphan) is None
+        assert manager.get_state(parent) is not None
+
+    def test_legacy_json_states_are_imported(self, tmp_path):
+        """Per-state JSON files from the old layout move into the store"""
+        base_dir = tmp_path / "legacy"
+        base_dir.mkdir()
+        legacy = {
+            "state_id": "abc123",
+            "timestamp": datetime.now().isoformat(),
+            "state_type": "pipeline_state",
+            "status": "active",
+            "data": {"pipeline_name": "old"},
+            "context": {},
+            "checksum": "0123456789abcdef",
+            "parent_state_id": None,
+        }
+        (base_dir / "abc123.json").write_text(json.dumps(legacy, indent=2))
+
+        manager = SmartStateManager(base_dir)
+
+        assert [s.state_id for s in manager.get_active_states()] == ["abc123"]
+        assert manager.get_state("abc123").data == {"pipeline_name": "old"}
+        assert (base_dir / "imported_json" / "abc123.json").exists()
+        assert not (base_dir / "abc123.json").exists()
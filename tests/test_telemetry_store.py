@@ -0,0 +1,338 @@
+#!/usr/bin/env uv run python
+"""
+Tests for the columnar, day-partitioned telemetry store.
+"""
+
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.telemetry import EnhancedTelemetryCollector  # noqa: E402
+from core.telemetry_learner import TelemetryPatternLearner  # noqa: E402
+from core.telemetry_store import TelemetryStore  # noqa: E402
+
+
+def _event(event_id, event_type, agent, when, success=None, message=""):
+    """Build a raw workflow event"""
+    return {
+        "event_id": event_id,
+        "event_type": event_type,
+        "timestamp": when.isoformat(),
+        "repo": "demo-repo",
+        "agent": agent,
+        "message": message,
+        "success": success,
+        "context": {},
+    }
+
+
+def _write_jsonl(path, events):
+    """Append events to a raw telemetry file"""
+    with open(path, "a") as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+
+
+class TestTelemetryStore:
+    """Test partitioning, ingestion and column queries"""
+
+    @pytest.fixture
+    def now(self):
+        return datetime.now().replace(hour=12, minute=0, second=0, microsecond=0)
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        return TelemetryStore(tmp_path / "store")
+
+    def test_events_partitioned_by_day(self, store, now):
+        """Each day of events lands in its own partition"""
+        added = store.append(
+            [
+                _event("a", "error", "AgentA", now - timedelta(days=3)),
+                _event("b", "error", "AgentA", now - timedelta(days=1)),
+                _event("c", "agent_success", "AgentB", now, success=True),
+            ]
+        )
+
+        assert added == 3
+        days = [p.day for p in store.partitions()]
+        assert days == sorted(days) and len(days) == 3
+
+        # A range query only opens the partitions it covers
+        recent = store.partitions(start=now - timedelta(days=1))
+        assert [p.day for p in recent] == days[1:]
+
+    def test_count_and_group_by(self, store, now):
+        """Counts and group-bys come from encoded columns"""
+        store.append(
+            [
+                _event("1", "error", "AgentA", now, success=False),
+                _event("2", "error", "AgentB", now, success=False),
+                _event("3", "agent_success", "AgentA", now, success=True),
+                _event("4", "agent_success", "AgentA", now - timedelta(days=10)),
+            ]
+        )
+
+        assert store.count() == 4
+        assert store.count(start=now - timedelta(days=7)) == 3
+        assert store.count(where={"event_type": "error"}) == 2
+        assert store.count(where={"event_type": "missing"}) == 0
+        assert store.count(where={"success": True}) == 1
+        assert store.count(where={"agent": lambda a: a.endswith("B")}) == 1
+
+        assert store.group_by("event_type", start=now - timedelta(days=7)) == {
+            "error": 2,
+            "agent_success": 1,
+        }
+        assert store.group_by(("agent", "success")) == {
+            ("AgentA", False): 1,
+            ("AgentB", False): 1,
+            ("AgentA", True): 1,
+            ("AgentA", None): 1,
+        }
+
+        with pytest.raises(ValueError):
+            store.group_by("message")
+
+    def test_column_values_and_rows(self, store, now):
+        """Text columns and full rows are read only for matching events"""
+        store.append(
+            [
+                _event("1", "error", "AgentA", now, message="boom"),
+                _event("2", "agent_success", "AgentA", now, message="ok"),
+            ]
+        )
+
+        assert list(store.column_values("message", where={"event_type": "error"})) == [
+            "boom"
+        ]
+        events = list(store.iter_events(where={"event_type": "agent_success"}))
+        assert [e["event_id"] for e in events] == ["2"]
+        assert events[0]["context"] == {}
+
+    def test_incremental_ingest_and_dedupe(self, tmp_path, store, now):
+        """Only new lines are read, and events seen in two files count once"""
+        central = tmp_path / "all_workflow_events.jsonl"
+        per_repo = tmp_path / "demo-repo_workflow.jsonl"
+        first = [_event(str(i), "error", "AgentA", now) for i in range(3)]
+        _write_jsonl(central, first)
+        _write_jsonl(per_repo, first)
+
+        assert store.ingest_directory(tmp_path) == 3
+        assert store.ingest_directory(tmp_path) == 0
+
+        # Partial trailing lines wait for the writer to finish them
+        _write_jsonl(central, [_event("3", "error", "AgentA", now)])
+        with open(central, "a") as f:
+            f.write('{"event_id": "4"')
+        assert store.ingest_file(central) == 1
+
+        with open(central, "a") as f:
+            f.write(
+                ', "event_type": "error", "timestamp": "'
+                + now.isoformat()
+                + '", "agent": "AgentA"}\n'
+            )
+        assert store.ingest_file(central) == 1
+        assert store.count() == 5
+
+        # Ingest state survives a new store instance
+        reopened = TelemetryStore(store.store_dir)
+        assert reopened.ingest_directory(tmp_path) == 0
+        assert reopened.count(where={"agent": "AgentA"}) == 5
+
+    def test_raw_files_can_be_rotated_after_ingest(self, tmp_path, store, now):
+        """Ingested rows are copied, so raw files can be replaced or deleted"""
+        raw = tmp_path / "all_workflow_events.jsonl"
+        _write_jsonl(raw, [_event(str(i), "error", "AgentA", now) for i in range(3)])
+        store.ingest_file(raw)
+
+        raw.write_text(json.dumps(_event("x", "error", "AgentB", now)) + "\n")
+        assert [e["event_id"] for e in store.iter_events()] == ["0", "1", "2"]
+
+        raw.unlink()
+        assert [e["event_id"] for e in store.iter_events()] == ["0", "1", "2"]
+        assert store.count() == 3
+
+    def test_interrupted_append_is_truncated(self, store, now):
+        """Columns a crashed writer left past the committed rows are cut back"""
+        store.append([_event("a", "error", "AgentA", now, message="first")])
+        partition = store.partitions()[0]
+
+        # A writer died after some columns but before committing timestamps
+        for name, garbage in (
+            ("offset.u64", b"\xff" * 8),
+            ("key.u64", b"\xff" * 8),
+            ("agent.u32", b"\xff" * 4),
+            ("rows.jsonl", b'{"event_id": "lost"}\n'),
+            ("message.txt", b'"lost"\n'),
+        ):
+            with open(partition.path / name, "ab") as f:
+                f.write(garbage)
+        with open(partition.path / "timestamp.f64", "ab") as f:
+            f.write(b"\x00" * 3)
+
+        assert store.count() == 1
+        store.append([_event("b", "agent_success", "AgentB", now, message="second")])
+
+        assert [e["event_id"] for e in store.iter_events()] == ["a", "b"]
+        assert store.group_by("agent") == {"AgentA": 1, "AgentB": 1}
+        assert list(store.column_values("message")) == ["first", "second"]
+        assert store.append([_event("b", "error", "AgentB", now)]) == 0
+
+    def test_events_without_timestamp_are_counted(self, store, now):
+        """Undated events count in unranged queries but not in time ranges"""
+        undated = _event("u", "error", "AgentA", now)
+        undated["timestamp"] = "not a date"
+        store.append([undated, _event("d", "error", "AgentA", now)])
+
+        assert store.count() == 2
+        assert store.group_by("agent") == {"AgentA": 2}
+        assert store.count(start=now - timedelta(days=1)) == 1
+        assert [e["event_id"] for e in store.iter_events()] == ["d", "u"]
+
+    def test_without_fcntl(self, store, now, monkeypatch):
+        """Writers fall back to no locking where fcntl is unavailable"""
+        monkeypatch.setattr("core.telemetry_store.FCNTL_AVAILABLE", False)
+
+        assert store.append([_event("a", "error", "AgentA", now)]) == 1
+        assert store.count() == 1
+
+    def test_error_summary_uses_store(self, tmp_path):
+        """get_error_summary answers from the columnar error store"""
+        now = datetime.now().isoformat()
+        errors = [
+            {
+                "telemetry_id": f"err{i}",
+                "timestamp": now,
+                "repo": "demo-repo",
+                "agent": "AgentA" if i % 2 else "AgentB",
+                "error_type": "FileNotFoundError",
+                "error_message": f"File {i} not found",
+            }
+            for i in range(4)
+        ]
+        errors[0].pop("timestamp")
+        _write_jsonl(tmp_path / "all_errors.jsonl", errors)
+
+        summary = EnhancedTelemetryCollector(tmp_path).get_error_summary()
+
+        assert summary["total_errors"] == 4
+        assert summary["by_type"] == {"FileNotFoundError": 4}
+        assert summary["by_agent"] == {"AgentA": 2, "AgentB": 2}
+        assert summary["patterns"][0]["count"] == 4
+
+
+class TestIncrementalPatternLearning:
+    """Test cursor-based incremental pattern learning"""
+
+    @pytest.fixture
+    def learner(self, tmp_path, monkeypatch):
+        """Learner on a private telemetry dir that does not touch the repo"""
+        monkeypatch.chdir(tmp_path)
+        telemetry_dir = tmp_path / "telemetry"
+        telemetry_dir.mkdir()
+        learner = TelemetryPatternLearner(telemetry_dir)
+        monkeypatch.setattr(learner, "_update_pattern_database", lambda insights: None)
+        return learner
+
+    def _log(self, learner, events):
+        _write_jsonl(learner.telemetry_dir / "all_workflow_events.jsonl", events)
+
+    def test_incremental_matches_full_analysis(self, learner):
+        """Folding new events gives the same insights as a full rescan"""
+        now = datetime.now()
+        self._log(
+            learner,
+            [
+                _event("1", "error", "A", now, message="placeholder left in"),
+                _event("2", "agent_success", "A", now, message="test passed"),
+            ],
+        )
+        first = learner.analyze_telemetry(incremental=True)
+        assert first["failure_patterns"] == []
+
+        self._log(
+            learner,
+            [
+                _event("3", "error", "A", now, message="another placeholder"),
+                _event("4", "agent_success", "A", now, message="test passed again"),
+            ],
+        )
+        incremental = learner.analyze_telemetry(incremental=True)
+        full = learner.analyze_telemetry()
+
+        assert [
+            (p.pattern, p.failure_count) for p in incremental["failure_patterns"]
+        ] == [("placeholder_code", 2)]
+        assert [
+            (p.pattern, p.success_count) for p in incremental["success_patterns"]
+        ] == [("comprehensive_tests", 2)]
+        assert [p.common_errors for p in incremental["failure_patterns"]] == [
+            p.common_errors for p in full["failure_patterns"]
+        ]
+        assert [p.contexts for p in incremental["success_patterns"]] == [
+            p.contexts for p in full["success_patterns"]
+        ]
+
+    def test_only_new_events_are_read(self, learner, monkeypatch):
+        """A second incremental run reads nothing when no events arrived"""
+        now = datetime.now()
+        self._log(learner, [_event("1", "error", "A", now, message="todo")])
+        learner.analyze_telemetry(incremental=True)
+
+        read = []
+        original_rows = type(learner.store.partitions()[0]).rows
+
+        def counting_rows(partition, indexes):
+            indexes = list(indexes)
+            read.extend(indexes)
+            return original_rows(partition, indexes)
+
+        monkeypatch.setattr(type(learner.store.partitions()[0]), "rows", counting_rows)
+        learner.analyze_telemetry(incremental=True)
+        assert read == []
+
+        self._log(learner, [_event("2", "error", "A", now, message="todo again")])
+        insights = learner.analyze_telemetry(incremental=True)
+        assert read == [1]
+        assert insights["failure_patterns"][0].failure_count == 2
+
+    def test_fix_mapping_across_runs(self, learner):
+        """A failure and its later fix pair up across incremental runs"""
+        now = datetime.now()
+        failure = _event("f", "ERROR", "A", now, message="broke")
+        failure["parent_event_id"] = "wf1"
+        self._log(learner, [failure])
+        assert learner.analyze_telemetry(incremental=True)["fix_mappings"] == []
+
+        fix = _event("s", "AGENT_SUCCESS", "A", now, message="fixed")
+        fix["parent_event_id"] = "wf1"
+        self._log(learner, [fix])
+        mappings = learner.analyze_telemetry(incremental=True)["fix_mappings"]
+        assert [(m["failure"], m["fix"]) for m in mappings] == [("broke", "fixed")]
+
+    def test_old_buckets_expire(self, learner):
+        """Buckets leave the aggregates as they fall out of the window"""
+        now = datetime.now()
+        self._log(
+            learner,
+            [
+                _event("old1", "error", "A", now - timedelta(days=3), message="todo"),
+                _event("old2", "error", "A", now - timedelta(days=3), message="todo"),
+            ],
+        )
+        wide = learner.analyze_telemetry(days_back=7, incremental=True)
+        assert wide["failure_patterns"][0].failure_count == 2
+
+        narrow = learner.analyze_telemetry(days_back=1, incremental=True)
+        assert narrow["failure_patterns"] == []
+
+        # Widening the window again rebuilds from the store
+        rebuilt = learner.analyze_telemetry(days_back=7, incremental=True)
+        assert rebuilt["failure_patterns"][0].failure_count == 2
@@ -9,6 +9,17 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, Optional
 import hashlib
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.telemetry import (  # noqa: E402
+    BufferedTelemetryWriter,
+    EnhancedTelemetryCollector,
+    EventType,
+    get_telemetry_writer,
+)
 
 
 class TelemetryCollector:
@@ -365,6 +376,86 @@ class TestTelemetryIntegration:
         assert "ValueError" in summary["by_type"]
 
 
+class TestBufferedTelemetryWriter:
+    """Test batched telemetry writes from the real collector"""
+
+    def test_events_buffered_until_flush(self, tmp_path):
+        """Events are queued in memory and written on flush"""
+        writer = BufferedTelemetryWriter(max_batch_size=1000, flush_interval=60)
+        path = tmp_path / "events.jsonl"
+
+        for i in range(5):
+            writer.write(path, json.dumps({"i": i}) + "\n")
+
+        assert not path.exists()
+        assert writer.get_statistics()["pending"] == 5
+
+        writer.flush()
+        lines = path.read_text().splitlines()
+        assert [json.loads(line)["i"] for line in lines] == [0, 1, 2, 3, 4]
+        assert writer.get_statistics()["flush_count"] == 1
+        writer.close()
+
+    def test_size_triggered_flush(self, tmp_path):
+        """A full batch wakes the background flusher"""
+        writer = BufferedTelemetryWriter(max_batch_size=3, flush_interval=60)
+        path = tmp_path / "events.jsonl"
+
+        for i in range(3):
+            writer.write(path, f"{i}\n")
+
+        deadline = time.time() + 5
+        while writer.get_statistics()["lines_written"] < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        assert path.read_text() == "0\n1\n2\n"
+        writer.close()
+
+    def test_time_triggered_flush(self, tmp_path):
+        """Partial batches are written after the flush interval"""
+        writer = BufferedTelemetryWriter(max_batch_size=1000, flush_interval=0.05)
+        path = tmp_path / "events.jsonl"
+        writer.write(path, "one\n")
+
+        deadline = time.time() + 5
+        while not path.exists() and time.time() < deadline:
+            time.sleep(0.01)
+        assert path.read_text() == "one\n"
+        writer.close()
+
+    def test_one_handle_per_sink_and_close(self, tmp_path):
+        """Each sink keeps a single handle, closed with pending data flushed"""
+        writer = BufferedTelemetryWriter(max_batch_size=1000, flush_interval=60)
+        for i in range(10):
+            writer.write(tmp_path / "a.jsonl", f"{i}\n")
+            writer.write(tmp_path / "b.jsonl", f"{i}\n")
+        writer.flush()
+        assert writer.get_statistics()["open_sinks"] == 2
+
+        writer.write(tmp_path / "a.jsonl", "last\n")
+        writer.close()
+        assert writer.get_statistics()["open_sinks"] == 0
+        assert (tmp_path / "a.jsonl").read_text().splitlines()[-1] == "last"
+
+        # Writes after close go straight to disk
+        writer.write(tmp_path / "b.jsonl", "late\n")
+        assert (tmp_path / "b.jsonl").read_text().splitlines()[-1] == "late"
+
+    def test_collector_shares_writer_and_flushes(self, tmp_path):
+        """Collectors on one directory share a writer and both sinks get events"""
+        first = EnhancedTelemetryCollector(tmp_path)
+        second = EnhancedTelemetryCollector(tmp_path)
+        assert first.writer is second.writer is get_telemetry_writer(tmp_path)
+
+        event_id = first.record_workflow_event(
+            EventType.PERFORMANCE, "demo-repo", "TestAgent", "retry attempt"
+        )
+        first.flush()
+
+        for name in ("demo-repo_workflow.jsonl", "all_workflow_events.jsonl"):
+            events = [json.loads(line) for line in (tmp_path / name).open()]
+            assert [e["event_id"] for e in events] == [event_id]
+
+
 if __name__ == "__main__":
     print("🔍 Testing Error Telemetry System\n")
 
@@ -0,0 +1,287 @@
+#!/usr/bin/env uv run python
+"""
+Tests for the local event trigger system.
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.event_journal import EventJournal  # noqa: E402
+from core.inotify import Inotify  # noqa: E402
+from core.triggers import Event, LocalEventSystem  # noqa: E402
+
+requires_inotify = pytest.mark.skipif(
+    not Inotify.available(), reason="inotify not available"
+)
+
+
+def _wait_for(condition, timeout=5.0):
+    """Wait until condition() is true or the timeout passes"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class TestLocalEventSystem:
+    """Test event emission, dispatch and file watching"""
+
+    @pytest.fixture(params=["poll", pytest.param("inotify", marks=requires_inotify)])
+    def events(self, request, tmp_path):
+        system = LocalEventSystem(tmp_path / "events", backend=request.param)
+        yield system
+        system.stop()
+
+    def test_process_events_runs_handlers(self, events):
+        """Synchronous processing runs typed and wildcard handlers once"""
+        seen = []
+        events.watch("build", lambda e: seen.append(("build", e.data["n"])))
+        events.watch("*", lambda e: seen.append(("*", e.data["n"])))
+
+        events.emit("build", {"n": 1})
+        events.emit("build", {"n": 2})
+        assert events.process_events() == 2
+        assert sorted(seen) == [("*", 1), ("*", 2), ("build", 1), ("build", 2)]
+
+        # Wildcard handlers are not appended to the typed handler list
+        assert len(events.handlers["build"]) == 1
+        assert events.get_pending_events() == []
+        assert len(events.get_processed_events()) == 2
+
+    def test_started_system_dispatches_on_pool(self, events):
+        """Running systems pick up pending and new events on worker threads"""
+        done = threading.Event()
+        threads = []
+
+        def handler(event):
+            threads.append(threading.current_thread().name)
+            if len(threads) == 2:
+                done.set()
+
+        events.watch("deploy", handler)
+        events.emit("deploy", {"stage": "pending"})
+        events.start()
+        events.emit("deploy", {"stage": "live"})
+
+        assert done.wait(5)
+        assert all(name.startswith("event-handler") for name in threads)
+        assert _wait_for(lambda: not events.get_pending_events())
+
+    def test_file_watcher_reports_changes(self, events, tmp_path):
+        """Watched directories emit created, modified and deleted events"""
+        watched = tmp_path / "watched"
+        watched.mkdir()
+        (watched / "existing.txt").write_text("old")
+        changes = []
+        events.watch("file_changed", lambda e: changes.append(e.data))
+        events.register_file_watcher(str(watched), "*.txt")
+
+        def observed(count):
+            if events.backend == "poll":
+                # Run one poll cycle instead of waiting for the poller
+                events._check_file_watchers()
+                events.process_events()
+            return _wait_for(lambda: len(changes) == count)
+
+        if events.backend == "inotify":
+            events.start()
+
+        (watched / "ignored.log").write_text("x")
+        (watched / "new.txt").write_text("new")
+        assert observed(1)
+        assert changes[0] == {"path": str(watched / "new.txt"), "change": "created"}
+
+        (watched / "existing.txt").unlink()
+        assert observed(2)
+        assert changes[1]["change"] == "deleted"
+
+    def test_restart_dispatches_cancelled_events(self, tmp_path):
+        """Events queued when stop() cancels the pool run after a restart"""
+        events = LocalEventSystem(tmp_path / "events", max_workers=1)
+        entered = threading.Event()
+        unblock = threading.Event()
+        seen = []
+
+        def handler(event):
+            entered.set()
+            unblock.wait(5)
+            seen.append(event.data["n"])
+
+        events.watch("job", handler)
+        for n in range(3):
+            job = Event("job", {"n": n}, datetime.now(), source="external")
+            (events.events_dir / f"job_{n}.json").write_text(json.dumps(job.to_dict()))
+
+        events.start()
+        assert entered.wait(5)
+        events.stop()
+        unblock.set()
+        assert _wait_for(lambda: len(seen) == 1)
+
+        try:
+            events.start()
+            assert _wait_for(lambda: len(seen) == 3)
+            assert sorted(seen) == [0, 1, 2]
+        finally:
+            events.stop()
+
+    def test_unknown_backend_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            LocalEventSystem(tmp_path / "events", backend="kqueue")
+
+
+@requires_inotify
+class TestInotifyLatency:
+    """Test that inotify removes the poll interval from event latency"""
+
+    def test_event_latency_well_below_poll_interval(self, tmp_path):
+        system = LocalEventSystem(tmp_path / "events", backend="inotify")
+        received = threading.Event()
+        system.watch("ping", lambda e: received.set())
+        system.start()
+        try:
+            started = time.monotonic()
+            system.emit("ping", {})
+            assert received.wait(2)
+            assert time.monotonic() - started < 0.5
+        finally:
+            system.stop()
+
+
+def _append_many(journal_dir, worker, count):
+    """Append records from a separate process"""
+    journal = EventJournal(journal_dir, segment_max_bytes=2048)
+    for i in range(count):
+        journal.append({"worker": worker, "i": i, "pad": "x" * 40})
+
+
+class TestEventJournal:
+    """Test the append-only event journal"""
+
+    @pytest.fixture
+    def journal(self, tmp_path):
+        return EventJournal(tmp_path / "journal", segment_max_bytes=200)
+
+    def test_offsets_track_consumers(self, journal):
+        """Each consumer reads from its own committed offset"""
+        for i in range(3):
+            journal.append({"n": i})
+
+        records = list(journal.read(journal.get_offset("a")))
+        assert [r["n"] for _, r in records] == [0, 1, 2]
+
+        journal.commit("a", records[1][0])
+        assert [r["n"] for _, r in journal.read(journal.get_offset("a"))] == [2]
+        assert len(list(journal.read(journal.get_offset("b")))) == 3
+
+        # A partially written line is not returned until it is complete
+        path = journal.journal_dir / "segment_00000001.log"
+        with open(path, "ab") as f:
+            f.write(b'{"n": 3')
+        assert [r["n"] for _, r in journal.read(records[2][0])] == []
+
+    def test_rotation_and_history(self, journal):
+        """Segments rotate by size and history reads backwards across them"""
+        for i in range(20):
+            journal.append({"n": i, "pad": "x" * 20})
+
+        assert len(journal.segments()) > 3
+        assert [r["n"] for _, r in journal.read()] == list(range(20))
+
+        end = journal.end_position()
+        assert [r["n"] for r in journal.read_before(end, 7)] == list(range(19, 12, -1))
+        middle = list(journal.read())[9][0]
+        assert [r["n"] for r in journal.read_before(middle, 3)] == [9, 8, 7]
+
+    def test_retention_keeps_unconsumed_segments(self, journal):
+        """Only old segments every consumer has read past are deleted"""
+        for i in range(20):
+            journal.append({"n": i, "pad": "x" * 20})
+        segments = journal.segments()
+        for segment in segments:
+            path = journal._segment_path(segment)
+            os.utime(path, (0, 0))
+
+        # No consumer has read anything yet
+        assert journal.enforce_retention(days=1) == 0
+
+        positions = [position for position, _ in journal.read()]
+        journal.commit("reader", positions[9])
+        removed = journal.enforce_retention(days=1)
+
+        remaining = [r["n"] for _, r in journal.read()]
+        assert removed == 20 - len(remaining)
+        assert removed > 0 and remaining[0] <= 9
+        assert journal.segments()[0] == journal.get_offset("reader")[0]
+
+    def test_concurrent_process_appends(self, tmp_path):
+        """Appends from several processes never interleave or get lost"""
+        journal_dir = tmp_path / "journal"
+        EventJournal(journal_dir)
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(target=_append_many, args=(journal_dir, w, 200))
+            for w in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+
+        records = [r for _, r in EventJournal(journal_dir).read()]
+        assert len(records) == 800
+        for w in range(4):
+            assert [r["i"] for r in records if r["worker"] == w] == list(range(200))
+
+
+class TestJournalEventSystem:
+    """Test LocalEventSystem on top of the journal"""
+
+    def test_emit_appends_to_journal(self, tmp_path):
+        """Emitted events live in the journal, not one file per event"""
+        events_dir = tmp_path / "events"
+        system = LocalEventSystem(events_dir, backend="poll")
+        for i in range(5):
+            system.emit("tick", {"i": i})
+
+        assert list(events_dir.glob("*.json")) == []
+        assert [e.data["i"] for e in system.get_pending_events()] == list(range(5))
+
+        assert system.process_events() == 5
+        assert system.get_pending_events() == []
+        history = system.get_processed_events(limit=3)
+        assert [e.data["i"] for e in history] == [4, 3, 2]
+        assert all(e.processed for e in history)
+
+        # A second consumer sees every event
+        other = LocalEventSystem(events_dir, backend="poll", consumer="audit")
+        assert len(other.get_pending_events()) == 5
+
+    def test_event_files_still_processed(self, tmp_path):
+        """Event files written by other tools are handled alongside the journal"""
+        system = LocalEventSystem(tmp_path / "events", backend="poll")
+        seen = []
+        system.watch("*", lambda e: seen.append(e.event_type))
+
+        legacy = Event("legacy", {}, datetime.now(), source="external")
+        (system.events_dir / "legacy_1.json").write_text(json.dumps(legacy.to_dict()))
+        system.emit("journal", {})
+
+        assert system.process_events() == 2
+        assert sorted(seen) == ["journal", "legacy"]
+        assert {e.event_type for e in system.get_processed_events()} == {
+            "journal",
+            "legacy",
+        }